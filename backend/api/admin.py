@@ -0,0 +1,68 @@
+"""
+Admin endpoints — on-demand diagnostics for a running worker.
+
+Every route requires an API key whose owner has `is_admin`. Each request
+is served by whichever worker process receives it, so with several
+workers the profile describes that one worker only.
+"""
+
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_admin_api_key
+from app.core.config import settings
+from app.core.profiling import loop_watchdog, profile_for, slow_callbacks
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(get_admin_api_key)])
+
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, description="How long to sample"),
+    interval_ms: Optional[float] = Query(None, ge=0.5, le=1000, description="Sampling interval"),
+    threads: str = Query("all", pattern="^(all|loop)$", description="all threads, or only the event-loop thread"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    top: int = Query(25, ge=1, le=500, description="Functions listed in the json summary"),
+):
+    """
+    Sample this worker's stacks for `seconds` and return them as
+    collapsed stacks (feed to flamegraph.pl or speedscope) or as a JSON
+    summary of the hottest functions. Only one profile runs at a time.
+    """
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    interval = (interval_ms or settings.PROFILER_DEFAULT_INTERVAL_MS) / 1000
+    thread_ids = [threading.get_ident()] if threads == "loop" else None
+
+    result = await profile_for(seconds, interval, thread_ids=thread_ids)
+    if format == "json":
+        return result.as_dict(top)
+    return PlainTextResponse(
+        result.collapsed(),
+        headers={"X-Profile-Samples": str(result.samples)},
+    )
+
+
+@router.post("/slow-callbacks")
+async def configure_slow_callbacks(
+    threshold_ms: float = Query(..., ge=0, description="Log loop steps slower than this; 0 disables"),
+):
+    """Enable, retune or disable slow event-loop step logging in this worker."""
+    if threshold_ms > 0:
+        slow_callbacks.install(threshold_ms)
+    else:
+        slow_callbacks.uninstall()
+    return slow_callbacks.status()
+
+
+@router.get("/slow-callbacks")
+async def slow_callback_status():
+    return slow_callbacks.status()
+
+
+@router.get("/event-loop")
+async def event_loop_status():
+    """Watchdog lag figures and slow-callback counts for this worker."""
+    return {"watchdog": loop_watchdog.status(), "slow_callbacks": slow_callbacks.status()}
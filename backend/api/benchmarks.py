@@ -1,16 +1,40 @@
 """Benchmark dataset and run endpoints."""
 
+import asyncio
 import logging
+import tempfile
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
-from app.models.benchmark import BenchmarkDataset, BenchmarkRun
-from app.schemas.benchmark import BenchmarkDatasetOut, BenchmarkRunRequest, BenchmarkRunOut
+from app.api.deps import get_admin_api_key
+from app.api.prompts import resolve_matches
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.exceptions import ModelsNotAvailableError
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt, BenchmarkRun
+from app.schemas.benchmark import (
+    BenchmarkDatasetOut,
+    BenchmarkImportOut,
+    BenchmarkRunOut,
+    BenchmarkRunRequest,
+    BenchmarkSampleOut,
+    StrataField,
+)
+from app.schemas.prompt import ContaminatedPromptOut, ContaminationReportOut
+from app.services import sampler
+from app.services.availability import availability
+from app.services.benchmark_importer import detect_format, import_prompts
+from app.services.benchmark_runner import benchmark_runner
+from app.services.evaluation_pipeline import run_evaluation_pipeline
+from app.services.prompt_index import KIND_BENCHMARK_PROMPT, KIND_EVALUATION, prompt_index
+
+# Uploads are spooled to disk past this size before import starts reading them
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+_CONTAMINATION_CHUNK = 2000        # dataset prompts looked up (and resolved) per round
 
 router = APIRouter(prefix="/benchmarks", tags=["Benchmarks"])
 logger = logging.getLogger(__name__)
@@ -19,7 +43,7 @@ logger = logging.getLogger(__name__)
 @router.get("", response_model=List[BenchmarkDatasetOut], summary="List all benchmark datasets")
 async def list_benchmarks(
     status: Optional[str] = Query(None, description="Filter by status: active|beta|deprecated"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[BenchmarkDatasetOut]:
     query = select(BenchmarkDataset).order_by(BenchmarkDataset.prompt_count.desc())
     if status:
@@ -29,7 +53,7 @@ async def list_benchmarks(
 
 
 @router.get("/{slug}", response_model=BenchmarkDatasetOut, summary="Get benchmark by slug")
-async def get_benchmark(slug: str, db: AsyncSession = Depends(get_db)) -> BenchmarkDatasetOut:
+async def get_benchmark(slug: str, db: AsyncSession = Depends(get_read_db)) -> BenchmarkDatasetOut:
     result = await db.execute(
         select(BenchmarkDataset).where(BenchmarkDataset.slug == slug)
     )
@@ -39,6 +63,45 @@ async def get_benchmark(slug: str, db: AsyncSession = Depends(get_db)) -> Benchm
     return dataset
 
 
+@router.post(
+    "/{slug}/prompts",
+    response_model=BenchmarkImportOut,
+    summary="Import prompts into a benchmark (JSONL, CSV or Parquet body)",
+    dependencies=[Depends(get_admin_api_key)],
+)
+async def import_benchmark_prompts(
+    slug: str,
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv|parquet)$", description="Default: from Content-Type"),
+    strict: bool = Query(False, description="Reject the whole file if any record is invalid"),
+    db: AsyncSession = Depends(get_db),
+) -> BenchmarkImportOut:
+    """
+    Stream the request body into the dataset. Records with an unknown
+    dialect or category are skipped and listed in `errors` (or, with
+    `strict`, fail the import); prompts already in the dataset are skipped.
+    """
+    result = await db.execute(select(BenchmarkDataset).where(BenchmarkDataset.slug == slug))
+    dataset = result.scalar_one_or_none()
+    if not dataset:
+        raise HTTPException(status_code=404, detail=f"Benchmark '{slug}' not found.")
+
+    fmt = format or detect_format(content_type=request.headers.get("content-type"))
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        summary = await import_prompts(
+            db, dataset, upload, fmt, batch_size=settings.BENCHMARK_IMPORT_BATCH_SIZE, strict=strict,
+        )
+
+    logger.info(
+        "Imported %d prompts into %s (%d duplicates, %d rejected) in %.2fs",
+        summary.inserted, slug, summary.duplicates, summary.rejected, summary.seconds,
+    )
+    return BenchmarkImportOut(**summary.as_dict())
+
+
 @router.post("/runs", response_model=BenchmarkRunOut, status_code=202, summary="Start a benchmark run")
 async def start_benchmark_run(
     request: BenchmarkRunRequest,
@@ -52,16 +115,28 @@ async def start_benchmark_run(
     if not dataset:
         raise HTTPException(status_code=404, detail=f"Benchmark '{request.dataset_slug}' not found.")
 
+    unavailable = {
+        m: reason for m in request.model_ids
+        if (reason := availability.unavailable_reason(m)) is not None
+    }
+    if unavailable:
+        raise ModelsNotAvailableError(unavailable)
+
     run = BenchmarkRun(
         dataset_id=dataset.id,
         model_ids=request.model_ids,
         sample_size=request.sample_size,
+        seed=request.seed if request.seed is not None else sampler.new_seed(),
+        sampling={"stratify_by": request.stratify_by, "allocation": request.allocation},
+        sequential=request.sequential.model_dump() if request.sequential else None,
         status="pending",
     )
     db.add(run)
     await db.commit()
     await db.refresh(run)
 
+    benchmark_runner.submit(run.id, run_evaluation_pipeline)
+
     logger.info("Benchmark run %s created for dataset %s", run.id, request.dataset_slug)
     return run
 
@@ -72,3 +147,108 @@ async def get_benchmark_run(run_id: UUID, db: AsyncSession = Depends(get_db)) ->
     if not run:
         raise HTTPException(status_code=404, detail=f"Benchmark run '{run_id}' not found.")
     return run
+
+
+def _sample_out(sample: sampler.Sample) -> BenchmarkSampleOut:
+    return BenchmarkSampleOut(
+        seed=sample.seed,
+        size=len(sample.prompt_ids),
+        population=sample.population,
+        strata=sample.strata,
+        prompt_ids=sample.prompt_ids,
+    )
+
+
+@router.get("/runs/{run_id}/prompts", response_model=BenchmarkSampleOut, summary="Prompts sampled for a run")
+async def get_benchmark_run_prompts(run_id: UUID, db: AsyncSession = Depends(get_db)) -> BenchmarkSampleOut:
+    """Re-derive the run's sample from its stored seed and stratification."""
+    run = await db.get(BenchmarkRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Benchmark run '{run_id}' not found.")
+    sampling = run.sampling or {}
+    sample = await sampler.draw(
+        db,
+        run.dataset_id,
+        run.sample_size,
+        run.seed if run.seed is not None else 0,
+        stratify_by=sampling.get("stratify_by", []),
+        allocation=sampling.get("allocation", "proportional"),
+    )
+    return _sample_out(sample)
+
+
+@router.get("/{slug}/sample", response_model=BenchmarkSampleOut, summary="Preview a seeded sample")
+async def preview_benchmark_sample(
+    slug: str,
+    size: int = Query(100, ge=1, le=1000),
+    seed: Optional[int] = Query(None, ge=0, lt=sampler.MAX_SEED),
+    stratify_by: List[StrataField] = Query([]),
+    allocation: str = Query("proportional", pattern="^(proportional|equal)$"),
+    db: AsyncSession = Depends(get_read_db),
+) -> BenchmarkSampleOut:
+    result = await db.execute(select(BenchmarkDataset.id).where(BenchmarkDataset.slug == slug))
+    dataset_id = result.scalar_one_or_none()
+    if not dataset_id:
+        raise HTTPException(status_code=404, detail=f"Benchmark '{slug}' not found.")
+    sample = await sampler.draw(
+        db,
+        dataset_id,
+        size,
+        seed if seed is not None else sampler.new_seed(),
+        stratify_by=list(dict.fromkeys(stratify_by)),
+        allocation=allocation,
+    )
+    return _sample_out(sample)
+
+
+@router.get(
+    "/{slug}/contamination",
+    response_model=ContaminationReportOut,
+    summary="Near-duplicate prompts within and across datasets",
+)
+async def benchmark_contamination(
+    slug: str,
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0, description="Default: PROMPT_SIMILARITY_THRESHOLD"),
+    limit: int = Query(100, ge=0, le=1000, description="Flagged prompts listed in full"),
+    db: AsyncSession = Depends(get_read_db),
+) -> ContaminationReportOut:
+    """
+    Looks every prompt of the dataset up in the prompt index: near
+    duplicates inside the dataset, prompts shared with other datasets, and
+    prompts users have already submitted as evaluations (which may have
+    leaked into tuning data). Counts cover the whole dataset.
+    """
+    result = await db.execute(select(BenchmarkDataset.id).where(BenchmarkDataset.slug == slug))
+    dataset_id = result.scalar_one_or_none()
+    if not dataset_id:
+        raise HTTPException(status_code=404, detail=f"Benchmark '{slug}' not found.")
+    threshold = threshold if threshold is not None else settings.PROMPT_SIMILARITY_THRESHOLD
+
+    report = ContaminationReportOut(
+        dataset_slug=slug, threshold=threshold, index_ready=prompt_index.ready,
+        prompts_checked=0, flagged=0, within_dataset=0, cross_dataset=0, evaluations=0, prompts=[],
+    )
+    after = None
+    while True:                                        # keyset pages: lookups run between reads
+        query = select(BenchmarkPrompt.id, BenchmarkPrompt.prompt_text).where(BenchmarkPrompt.dataset_id == dataset_id)
+        if after is not None:
+            query = query.where(BenchmarkPrompt.id > after)
+        chunk = (await db.execute(query.order_by(BenchmarkPrompt.id).limit(_CONTAMINATION_CHUNK))).all()
+        if not chunk:
+            break
+        after = chunk[-1][0]
+        ids, texts = [r[0] for r in chunk], [r[1] for r in chunk]
+        found = await asyncio.to_thread(
+            prompt_index.similar_many, texts, threshold, 10, None, [[i] for i in ids],
+        )
+        for prompt_id, text, matches in zip(ids, texts, await resolve_matches(db, found)):
+            report.prompts_checked += 1
+            if not matches:
+                continue
+            report.flagged += 1
+            report.within_dataset += any(m.dataset_slug == slug for m in matches)
+            report.cross_dataset += any(m.kind == KIND_BENCHMARK_PROMPT and m.dataset_slug != slug for m in matches)
+            report.evaluations += any(m.kind == KIND_EVALUATION for m in matches)
+            if len(report.prompts) < limit:
+                report.prompts.append(ContaminatedPromptOut(prompt_id=prompt_id, prompt=text[:120], matches=matches))
+    return report
@@ -67,3 +67,17 @@ async def get_optional_api_key(
         return await get_current_api_key(authorization=authorization, db=db)
     except HTTPException:
         return None
+
+
+async def get_admin_api_key(
+    api_key: APIKey = Depends(get_current_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> APIKey:
+    """Dependency: like get_current_api_key, but the key's owner must be an admin."""
+    user = await db.get(User, api_key.user_id)
+    if user is None or not user.is_active or not user.is_admin:
+        raise HTTPException(
+            status_code=403,
+            detail={"code": "ADMIN_REQUIRED", "message": "This endpoint requires an admin API key."},
+        )
+    return api_key
@@ -1,123 +1,70 @@
 """
 Evaluation API routes.
-POST /evaluations/run  — create and run an evaluation
+POST /evaluations/run  — create and run an evaluation (or reuse a finished identical one)
+POST /evaluations/batch — create and queue many evaluations (JSON array or JSONL)
+GET  /evaluations/batch/{id} — aggregate batch progress
 GET  /evaluations      — list with pagination
 GET  /evaluations/{id} — retrieve single evaluation
+GET  /evaluations/{id}/timeline — span timeline of the evaluation's trace
+GET  /evaluations/{id}/responses/{model_id}/text — one response text, by character range
 """
 
+import asyncio
+import functools
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional
-from uuid import UUID
+from typing import List, Optional
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, Query, BackgroundTasks, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-
-from app.core.database import get_db
-from app.core.exceptions import EvaluationNotFoundError
-from app.models.evaluation import Evaluation, ModelResponse
+from sqlalchemy import select, func, insert
+from sqlalchemy.orm import load_only
+
+from app.core.compression import accepts_gzip
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.exceptions import (
+    BatchNotFoundError,
+    InvalidBatchError,
+    InvalidFieldsError,
+    ModelsNotAvailableError,
+    ModelResponseNotFoundError,
+    TimelineNotFoundError,
+)
+from app.core.tracing import EVALUATION_ID, parse_traceparent, tracer
+from app.models.evaluation import Evaluation, EvaluationBatch, ModelResponse, ResponseBlob
 from app.schemas.evaluation import (
+    EvaluationBatchOut,
     EvaluationCreateRequest,
     EvaluationOut,
     EvaluationListItem,
     PaginatedEvaluations,
-    ModelResponseOut,
-    ScoreBreakdown,
+    ModelResponseSummary,
+    ResponseTextChunk,
+    EvaluationTimeline,
+    SpanLink,
+    TimelineSpan,
+)
+from app.schemas.projection import includes, parse_fields
+from app.services.availability import availability
+from app.services.batch_runner import batch_runner
+from app.services.blob_store import blob_store
+from app.services.evaluation_cache import evaluation_cache
+from app.services.evaluation_pipeline import run_evaluation_pipeline
+from app.services.evaluation_reader import (
+    evaluation_to_out, load_for_read, load_payloads, render_completed, serialize_evaluation,
 )
-from app.services.evaluator import run_parallel_evaluation
-from app.services.scorer import score_all_responses
+from app.services.prompt_index import KIND_EVALUATION, prompt_index
+from app.services.search import KIND_PROMPT, search_index
 
 router = APIRouter(prefix="/evaluations", tags=["Evaluations"])
 logger = logging.getLogger(__name__)
 
-
-async def _run_evaluation_pipeline(
-    evaluation_id: UUID,
-    request: EvaluationCreateRequest,
-    db: AsyncSession,
-) -> None:
-    """
-    Background task: run models, score responses, persist to DB.
-    """
-    # Fetch fresh session for background task
-    from app.core.database import AsyncSessionLocal
-    async with AsyncSessionLocal() as bg_db:
-        try:
-            # Mark as running
-            eval_obj = await bg_db.get(Evaluation, evaluation_id)
-            if not eval_obj:
-                return
-            eval_obj.status = "running"
-            await bg_db.commit()
-
-            # Run all models in parallel
-            results = await run_parallel_evaluation(
-                prompt=request.prompt,
-                dialect=request.dialect,
-                model_ids=request.models,
-                max_tokens=request.max_tokens,
-            )
-
-            # Score all responses concurrently
-            all_scores = await score_all_responses(
-                results=results,
-                prompt=request.prompt,
-                dialect=request.dialect,
-                category=request.category,
-                reference_answer=request.reference_answer,
-            )
-
-            # Determine winner (highest overall score among non-error responses)
-            winner_id: Optional[str] = None
-            best_score: float = -1.0
-            for result, scores in zip(results, all_scores):
-                overall = scores.get("overall") or 0.0
-                if not result.error and overall > best_score:
-                    best_score = overall
-                    winner_id = result.model_id
-
-            # Persist model responses
-            for result, scores in zip(results, all_scores):
-                mr = ModelResponse(
-                    evaluation_id=evaluation_id,
-                    model_id=result.model_id,
-                    model_name=result.model_name,
-                    provider=result.provider,
-                    response_text=result.response_text,
-                    latency_ms=result.latency_ms,
-                    token_count=result.token_count,
-                    cost_usd=result.cost_usd,
-                    error=result.error,
-                    score_arabic_quality=scores.get("arabic_quality"),
-                    score_accuracy=scores.get("accuracy"),
-                    score_dialect_adherence=scores.get("dialect_adherence"),
-                    score_technical_precision=scores.get("technical_precision"),
-                    score_completeness=scores.get("completeness"),
-                    score_cultural_sensitivity=scores.get("cultural_sensitivity"),
-                    score_overall=scores.get("overall"),
-                    score_reasoning=scores.get("reasoning"),
-                    arabic_metrics=result.arabic_metrics,
-                )
-                bg_db.add(mr)
-
-            # Update evaluation
-            eval_obj = await bg_db.get(Evaluation, evaluation_id)
-            eval_obj.status = "completed"
-            eval_obj.winner_model_id = winner_id
-            eval_obj.completed_at = datetime.now(timezone.utc)
-            await bg_db.commit()
-
-            logger.info("Evaluation %s completed. Winner: %s", evaluation_id, winner_id)
-
-        except Exception as exc:
-            logger.exception("Evaluation %s failed: %s", evaluation_id, exc)
-            async with AsyncSessionLocal() as err_db:
-                eval_obj = await err_db.get(Evaluation, evaluation_id)
-                if eval_obj:
-                    eval_obj.status = "failed"
-                    eval_obj.error_message = str(exc)
-                    await err_db.commit()
+_PROMPT_PREVIEW = 120      # characters of the prompt shown in list items
 
 
 @router.post(
@@ -131,40 +78,266 @@ async def _run_evaluation_pipeline(
 async def run_evaluation(
     request: EvaluationCreateRequest,
     background_tasks: BackgroundTasks,
+    reuse: bool = Query(
+        False,
+        description="Return a completed evaluation of the same normalized prompt, dialect, "
+                    "category, max_tokens, reference answer and models (200, X-Reused-Evaluation) "
+                    "instead of running a new one",
+    ),
     db: AsyncSession = Depends(get_db),
+    traceparent: Optional[str] = Header(None),
 ) -> EvaluationOut:
-    # Create evaluation record
-    evaluation = Evaluation(
-        prompt=request.prompt,
-        dialect=request.dialect,
-        category=request.category,
-        reference_answer=request.reference_answer,
-        max_tokens=request.max_tokens,
-        status="pending",
-    )
-    db.add(evaluation)
-    await db.commit()
-    await db.refresh(evaluation)
-
-    # Schedule background pipeline
-    background_tasks.add_task(
-        _run_evaluation_pipeline,
-        evaluation.id,
-        request,
-        db,
-    )
+    if reuse and (reused := await _find_reusable(db, request)) is not None:
+        rendered = await evaluation_cache.get(reused) or await render_completed(db, reused)
+        if rendered is not None:
+            logger.info("Evaluation %s reused", reused)
+            return Response(
+                content=rendered.body, media_type="application/json",
+                headers={"X-Reused-Evaluation": str(reused)},
+            )
+
+    with tracer.span(
+        "evaluation.create",
+        {"evaluation.dialect": request.dialect, "evaluation.model_count": len(request.models)},
+        parent=parse_traceparent(traceparent),
+    ) as span:
+        # Reject up front rather than scheduling calls that are known to fail
+        unavailable = {
+            m: reason for m in request.models
+            if (reason := availability.unavailable_reason(m)) is not None
+        }
+        if unavailable:
+            raise ModelsNotAvailableError(unavailable)
+
+        # Create evaluation record
+        evaluation = Evaluation(
+            prompt=request.prompt,
+            dialect=request.dialect,
+            category=request.category,
+            reference_answer=request.reference_answer,
+            max_tokens=request.max_tokens,
+            status="pending",
+        )
+        db.add(evaluation)
+        with tracer.span("db.commit", {"db.purpose": "create_evaluation"}):
+            await db.commit()
+        await db.refresh(evaluation)
+        span.set_attribute(EVALUATION_ID, str(evaluation.id))
+        prompt_index.add(KIND_EVALUATION, evaluation.id, request.prompt)
+        search_index.add(KIND_PROMPT, evaluation.id, request.dialect, request.prompt)
+
+        # Schedule background pipeline, continuing this request's trace
+        background_tasks.add_task(
+            run_evaluation_pipeline,
+            evaluation.id,
+            request,
+            db,
+            span.context,
+        )
+
+        logger.info(
+            "Evaluation %s created (%d models, dialect=%s)",
+            evaluation.id, len(request.models), request.dialect,
+        )
 
-    logger.info(
-        "Evaluation %s created (%d models, dialect=%s)",
-        evaluation.id, len(request.models), request.dialect,
+        return evaluation_to_out(evaluation)
+
+
+async def _find_reusable(db: AsyncSession, request: EvaluationCreateRequest) -> Optional[UUID]:
+    """
+    Latest completed evaluation whose prompt normalizes to the same text
+    and whose settings and model set match `request` exactly, with no
+    model erroring. Candidates come from the prompt index, so this never
+    scans the evaluations table.
+    """
+    ids = prompt_index.exact(request.prompt, kinds=[KIND_EVALUATION])
+    if not ids:
+        return None
+    candidates = (await db.scalars(
+        select(Evaluation.id)
+        .where(
+            Evaluation.id.in_(ids),
+            Evaluation.status == "completed",
+            Evaluation.dialect == request.dialect,
+            Evaluation.category == request.category,
+            Evaluation.max_tokens == request.max_tokens,
+            Evaluation.reference_answer.is_not_distinct_from(request.reference_answer),
+        )
+        .order_by(Evaluation.completed_at.desc())
+    )).all()
+    if not candidates:
+        return None
+    models: dict = {c: set() for c in candidates}
+    failed = set()
+    rows = await db.execute(
+        select(ModelResponse.evaluation_id, ModelResponse.model_id, ModelResponse.error)
+        .where(ModelResponse.evaluation_id.in_(candidates))
     )
+    for evaluation_id, model_id, error in rows:
+        models[evaluation_id].add(model_id)
+        if error is not None:
+            failed.add(evaluation_id)
+    wanted = set(request.models)
+    return next((c for c in candidates if c not in failed and models[c] == wanted), None)
+
+
+_JSONL_TYPES = ("application/x-ndjson", "application/jsonl", "application/jsonlines", "application/x-jsonlines")
+_MAX_REPORTED_ERRORS = 50
+
+
+def _parse_batch_body(raw: bytes, content_type: str) -> list:
+    """Items of a JSON array ({"evaluations": [...]} also accepted) or of JSONL."""
+    try:
+        if content_type.split(";")[0].strip().lower() in _JSONL_TYPES:
+            return [json.loads(line) for line in raw.splitlines() if line.strip()]
+        body = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidBatchError(f"Body is not valid JSON/JSONL: {exc}")
+    if isinstance(body, dict) and isinstance(body.get("evaluations"), list):
+        body = body["evaluations"]
+    if not isinstance(body, list):
+        raise InvalidBatchError("Expected a JSON array of evaluation requests.")
+    return body
+
+
+def _validate_batch(items: list) -> List[EvaluationCreateRequest]:
+    """All-or-nothing: every item must validate, or none is accepted."""
+    if not items:
+        raise InvalidBatchError("The batch is empty.")
+    if len(items) > settings.BATCH_MAX_EVALUATIONS:
+        raise InvalidBatchError(
+            f"A batch holds at most {settings.BATCH_MAX_EVALUATIONS} evaluations (got {len(items)})."
+        )
+    requests, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            requests.append(EvaluationCreateRequest.model_validate(item))
+        except ValidationError as exc:
+            errors.append({
+                "index": index,
+                "errors": [{"loc": e["loc"], "msg": e["msg"]} for e in exc.errors(include_url=False)],
+            })
+    if errors:
+        raise InvalidBatchError(
+            f"{len(errors)} of {len(items)} evaluations are invalid.", errors[:_MAX_REPORTED_ERRORS],
+        )
 
-    return _evaluation_to_out(evaluation)
+    unavailable = {
+        m: reason for m in {m for r in requests for m in r.models}
+        if (reason := availability.unavailable_reason(m)) is not None
+    }
+    if unavailable:
+        raise ModelsNotAvailableError(unavailable)
+    return requests
+
+
+@router.post(
+    "/batch",
+    response_model=EvaluationBatchOut,
+    status_code=202,
+    summary="Submit many evaluations at once",
+    description="Body: a JSON array of evaluation requests, or JSONL "
+                "(Content-Type: application/x-ndjson) with one request per line. "
+                "The whole batch is validated before anything is stored; poll "
+                "GET /evaluations/batch/{batch_id} for progress.",
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/EvaluationCreateRequest"}}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def submit_batch(
+    http_request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> EvaluationBatchOut:
+    with tracer.span("evaluation.batch_create") as span:
+        items = _parse_batch_body(await http_request.body(), http_request.headers.get("content-type", ""))
+        requests = _validate_batch(items)
+
+        now = datetime.now(timezone.utc)
+        batch = EvaluationBatch(id=uuid4(), total=len(requests), created_at=now)
+        rows = [
+            {
+                "id": uuid4(),
+                "prompt": r.prompt,
+                "dialect": r.dialect,
+                "category": r.category,
+                "reference_answer": r.reference_answer,
+                "max_tokens": r.max_tokens,
+                "status": "pending",
+                "batch_id": batch.id,
+                "created_at": now,
+            }
+            for r in requests
+        ]
+        db.add(batch)
+        await db.flush()
+        await db.execute(insert(Evaluation), rows)     # one executemany for the whole batch
+        with tracer.span("db.commit", {"db.purpose": "create_batch"}):
+            await db.commit()
+        span.set_attributes({"batch.id": str(batch.id), "batch.size": len(rows)})
+
+        await asyncio.to_thread(
+            prompt_index.add_many, KIND_EVALUATION, [row["id"] for row in rows], [r.prompt for r in requests],
+        )
+        await asyncio.to_thread(
+            search_index.add_many, [(KIND_PROMPT, row["id"], r.dialect, r.prompt, None) for row, r in zip(rows, requests)],
+        )
+        # Each evaluation gets a trace of its own, linked back to this request
+        batch_runner.submit(
+            batch.id,
+            [(row["id"], r) for row, r in zip(rows, requests)],
+            functools.partial(run_evaluation_pipeline, trace_link=span.context),
+        )
+        logger.info("Batch %s created (%d evaluations)", batch.id, len(rows))
+
+        return EvaluationBatchOut(
+            id=batch.id,
+            status="pending",
+            total=batch.total,
+            pending=batch.total,
+            created_at=now,
+            evaluation_ids=[row["id"] for row in rows],
+        )
+
+
+@router.get(
+    "/batch/{batch_id}",
+    response_model=EvaluationBatchOut,
+    response_model_exclude_none=True,
+    summary="Aggregate progress of a batch",
+)
+async def get_batch(batch_id: UUID, db: AsyncSession = Depends(get_db)) -> EvaluationBatchOut:
+    batch = await db.get(EvaluationBatch, batch_id)
+    if batch is None:
+        raise BatchNotFoundError(str(batch_id))
+    counts = dict((await db.execute(
+        select(Evaluation.status, func.count())
+        .where(Evaluation.batch_id == batch_id)
+        .group_by(Evaluation.status)
+    )).all())
+    finished = counts.get("completed", 0) + counts.get("failed", 0)
+    if finished >= batch.total:
+        status = "completed"
+    elif finished or counts.get("running"):
+        status = "running"
+    else:
+        status = "pending"
+    return EvaluationBatchOut(
+        id=batch.id,
+        status=status,
+        total=batch.total,
+        pending=counts.get("pending", 0),
+        running=counts.get("running", 0),
+        completed=counts.get("completed", 0),
+        failed=counts.get("failed", 0),
+        created_at=batch.created_at,
+    )
 
 
 @router.get(
     "",
     response_model=PaginatedEvaluations,
+    response_model_exclude_unset=True,        # model_responses only when included
     summary="List evaluations with pagination",
 )
 async def list_evaluations(
@@ -172,48 +345,90 @@ async def list_evaluations(
     page_size: int = Query(20, ge=1, le=100),
     dialect: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
-) -> PaginatedEvaluations:
-    query = select(Evaluation).order_by(Evaluation.created_at.desc())
-
+    fields: Optional[str] = Query(
+        None, description="Comma-separated item fields to return, e.g. id,status,winner_model_id",
+    ),
+    include: Optional[str] = Query(
+        None, description="model_responses — embed per-model scores, latency and cost in each item",
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    `fields` narrows each item to the named fields (only those columns are
+    read); `include=model_responses` adds per-model summaries fetched
+    with one extra query for the whole page.
+    """
+    projection = parse_fields(fields, EvaluationListItem, always=("id",))
+    embed = _parse_include(include) or (projection is not None and "model_responses" in projection)
+    if embed and projection is not None:
+        projection.setdefault("model_responses", True)
+    filters = []
     if dialect:
-        query = query.where(Evaluation.dialect == dialect)
+        filters.append(Evaluation.dialect == dialect)
     if status:
-        query = query.where(Evaluation.status == status)
+        filters.append(Evaluation.status == status)
 
     # Total count
-    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = count_result.scalar_one()
-
-    # Paginated items
+    total = (await db.execute(select(func.count(Evaluation.id)).where(*filters))).scalar_one()
+
+    # Paginated items: only the listed columns, the prompt already cut to
+    # the preview length, and response counts from a correlated subquery
+    # instead of one COUNT per row.
+    model_count = (
+        select(func.count(ModelResponse.id))
+        .where(ModelResponse.evaluation_id == Evaluation.id)
+        .correlate(Evaluation)
+        .scalar_subquery()
+    )
+    columns = [
+        Evaluation.id,
+        func.substr(Evaluation.prompt, 1, _PROMPT_PREVIEW + 1).label("prompt"),
+        Evaluation.dialect,
+        Evaluation.category,
+        Evaluation.status,
+        Evaluation.winner_model_id,
+        Evaluation.created_at,
+        model_count.label("model_count"),
+    ]
+    if projection is not None:
+        columns = [c for c in columns if c.key == "id" or includes(projection, c.key)]
     offset = (page - 1) * page_size
-    result = await db.execute(query.offset(offset).limit(page_size))
-    evaluations = result.scalars().all()
-
-    items = []
-    for ev in evaluations:
-        count_resp = await db.execute(
-            select(func.count(ModelResponse.id)).where(ModelResponse.evaluation_id == ev.id)
-        )
-        model_count = count_resp.scalar_one()
-        items.append(EvaluationListItem(
-            id=ev.id,
-            prompt=ev.prompt[:120] + ("..." if len(ev.prompt) > 120 else ""),
-            dialect=ev.dialect,
-            category=ev.category,
-            status=ev.status,
-            winner_model_id=ev.winner_model_id,
-            model_count=model_count,
-            created_at=ev.created_at,
-        ))
-
-    return PaginatedEvaluations(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=(total + page_size - 1) // page_size,
+    result = await db.execute(
+        select(*columns)
+        .where(*filters)
+        .order_by(Evaluation.created_at.desc())
+        .offset(offset)
+        .limit(page_size)
     )
+    rows = result.all()
+    summaries = await _response_summaries(db, [row.id for row in rows]) if embed else {}
+
+    values = []
+    for row in rows:
+        item = row._asdict()
+        if "prompt" in item:
+            prompt = item["prompt"]
+            item["prompt"] = prompt[:_PROMPT_PREVIEW] + ("..." if len(prompt) > _PROMPT_PREVIEW else "")
+        if embed:
+            item["model_responses"] = summaries.get(row.id, [])
+        values.append(item)
+
+    pages = (total + page_size - 1) // page_size
+    if projection is None:
+        return PaginatedEvaluations(
+            items=[EvaluationListItem(**item) for item in values],
+            total=total, page=page, page_size=page_size, pages=pages,
+        )
+    return JSONResponse({
+        "items": [
+            EvaluationListItem.model_construct(**item).model_dump(mode="json", include=projection)
+            for item in values
+        ],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+    })
 
 
 @router.get(
@@ -223,72 +438,205 @@ async def list_evaluations(
 )
 async def get_evaluation(
     evaluation_id: UUID,
-    db: AsyncSession = Depends(get_db),
-) -> EvaluationOut:
-    result = await db.execute(
-        select(Evaluation).where(Evaluation.id == evaluation_id)
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, dotted for nested ones, "
+                    "e.g. status,model_responses.model_id,model_responses.scores.overall",
+    ),
+    text_limit: Optional[int] = Query(
+        None, ge=0, le=100_000,
+        description="Cut each response_text to this many characters; fetch the rest "
+                    "with GET /evaluations/{id}/responses/{model_id}/text",
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Completed evaluations are served from a pre-serialized body with an
+    ETag; send it back in If-None-Match to get a 304. A `fields`
+    projection or `text_limit` reads only the columns it needs (response
+    bodies and metrics come from the blob store only when asked for) and
+    is not cached.
+    """
+    projection = parse_fields(fields, EvaluationOut, always=("id",))
+    if projection is not None or text_limit is not None:
+        evaluation = await load_for_read(db, evaluation_id, projection)
+        payloads = await load_payloads(evaluation, projection)
+        wants_responses = includes(projection, "model_responses") or includes(projection, "ranking")
+        out = evaluation_to_out(
+            evaluation, include_responses=wants_responses, payloads=payloads, text_limit=text_limit,
+        )
+        return JSONResponse(out.model_dump(mode="json", include=projection))
+
+    rendered = await evaluation_cache.get(evaluation_id)
+    if rendered is None:
+        evaluation = await load_for_read(db, evaluation_id)
+        payloads = await load_payloads(evaluation)
+        if evaluation.status != "completed":
+            return evaluation_to_out(evaluation, include_responses=True, payloads=payloads)
+        rendered = await evaluation_cache.put(evaluation_id, serialize_evaluation(evaluation, payloads))
+
+    gzipped = accepts_gzip(accept_encoding) and len(rendered.body) >= settings.GZIP_MINIMUM_SIZE
+    headers = {
+        "ETag": rendered.gzip_etag if gzipped else rendered.etag,
+        "Cache-Control": "public, max-age=3600",
+        "Vary": "Accept-Encoding",
+    }
+    if rendered.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=rendered.gzipped, media_type="application/json", headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/{evaluation_id}/responses/{model_id}/text",
+    response_model=ResponseTextChunk,
+    summary="Page through one model's response text",
+)
+async def get_response_text(
+    evaluation_id: UUID,
+    model_id: str,
+    offset: int = Query(0, ge=0, description="First character to return (0-based)"),
+    limit: int = Query(4000, ge=1, le=100_000, description="Characters to return"),
+    db: AsyncSession = Depends(get_read_db),
+) -> ResponseTextChunk:
+    """
+    A character range of a single response, so only the requested slice
+    is sent. Follow `next_offset` until it is null to get the whole text.
+    """
+    from app.core.database import AsyncSessionLocal, has_replica
+    query = (
+        select(ModelResponse.response_length, ResponseBlob.digest, ResponseBlob.codec, ResponseBlob.frames)
+        .outerjoin(ResponseBlob, ResponseBlob.digest == ModelResponse.response_digest)
+        .where(
+            ModelResponse.evaluation_id == evaluation_id,
+            ModelResponse.model_id == model_id,
+        )
     )
-    evaluation = result.scalar_one_or_none()
-    if not evaluation:
-        raise EvaluationNotFoundError(str(evaluation_id))
 
-    # Load model responses
-    resp_result = await db.execute(
-        select(ModelResponse)
-        .where(ModelResponse.evaluation_id == evaluation_id)
-        .order_by(ModelResponse.score_overall.desc().nulls_last())
+    async def read(session: AsyncSession) -> Optional[tuple]:
+        row = (await session.execute(query)).one_or_none()
+        if row is None:
+            return None
+        if row.digest is None:
+            return 0, ""
+        # Long texts are stored in frames; only the ones covering the range are fetched and decompressed
+        return row.response_length, await blob_store.read_text(
+            session, row.digest, row.codec, row.frames, offset, limit,
+        )
+
+    found = await read(db)
+    if found is None and has_replica():
+        # Responses written moments ago may not have been replicated yet
+        async with AsyncSessionLocal() as primary:
+            found = await read(primary)
+    if found is None:
+        raise ModelResponseNotFoundError(str(evaluation_id), model_id)
+
+    total, text = found
+    end = offset + len(text)
+    return ResponseTextChunk(
+        evaluation_id=evaluation_id,
+        model_id=model_id,
+        offset=offset,
+        length=len(text),
+        total_length=total,
+        next_offset=end if end < total else None,
+        text=text,
     )
-    responses = resp_result.scalars().all()
-    evaluation.model_responses = responses
 
-    return _evaluation_to_out(evaluation, include_responses=True)
+
+@router.get(
+    "/{evaluation_id}/timeline",
+    response_model=EvaluationTimeline,
+    summary="Span timeline of an evaluation (debugging tail latency)",
+)
+async def get_evaluation_timeline(evaluation_id: UUID) -> EvaluationTimeline:
+    """
+    Spans recorded for the evaluation's trace — request handling, DB
+    commits, each model call, analyzer and judge attempts — ordered by
+    start time, with offsets relative to the first span. Only the most
+    recent TRACING_TIMELINE_RETENTION traces are kept, in process, each
+    with at most TRACING_TIMELINE_MAX_SPANS spans (`dropped_spans` counts
+    the rest).
+    """
+    spans = tracer.timelines.get(str(evaluation_id))
+    if not spans:
+        raise TimelineNotFoundError(str(evaluation_id))
+
+    origin = spans[0].start_ns
+    end = max(s.end_ns or s.start_ns for s in spans)
+    return EvaluationTimeline(
+        evaluation_id=evaluation_id,
+        trace_id=spans[0].context.trace_id,
+        duration_ms=round((end - origin) / 1e6, 3),
+        spans=[
+            TimelineSpan(
+                name=s.name,
+                span_id=s.context.span_id,
+                parent_id=s.parent_id,
+                offset_ms=round((s.start_ns - origin) / 1e6, 3),
+                duration_ms=round(s.duration_ms or 0.0, 3),
+                status=s.status,
+                status_message=s.status_message,
+                attributes=s.attributes,
+                links=[SpanLink(trace_id=link.trace_id, span_id=link.span_id) for link in s.links],
+            )
+            for s in spans
+        ],
+        dropped_spans=tracer.timelines.dropped(str(evaluation_id)),
+    )
 
 
 # ── Helpers ────────────────────────────────────────────────
 
-def _evaluation_to_out(
-    evaluation: Evaluation,
-    include_responses: bool = False,
-) -> EvaluationOut:
-    responses_out = []
-    if include_responses and evaluation.model_responses:
-        for mr in evaluation.model_responses:
-            responses_out.append(ModelResponseOut(
-                model_id=mr.model_id,
-                model_name=mr.model_name,
-                provider=mr.provider,
-                response_text=mr.response_text,
-                latency_ms=mr.latency_ms,
-                token_count=mr.token_count,
-                cost_usd=mr.cost_usd,
-                error=mr.error,
-                scores=ScoreBreakdown(
-                    arabic_quality=mr.score_arabic_quality,
-                    accuracy=mr.score_accuracy,
-                    dialect_adherence=mr.score_dialect_adherence,
-                    technical_precision=mr.score_technical_precision,
-                    completeness=mr.score_completeness,
-                    cultural_sensitivity=mr.score_cultural_sensitivity,
-                    overall=mr.score_overall,
-                    reasoning=mr.score_reasoning,
-                ),
-                arabic_metrics=mr.arabic_metrics,
-            ))
-
-    ranking = [
-        r.model_id for r in evaluation.model_responses
-        if r.score_overall is not None
-    ] if evaluation.model_responses else []
-
-    return EvaluationOut(
-        id=evaluation.id,
-        prompt=evaluation.prompt,
-        dialect=evaluation.dialect,
-        category=evaluation.category,
-        status=evaluation.status,
-        winner_model_id=evaluation.winner_model_id,
-        ranking=ranking,
-        model_responses=responses_out,
-        created_at=evaluation.created_at,
-        completed_at=evaluation.completed_at,
+_SCORE_COLUMNS = (
+    ModelResponse.score_arabic_quality, ModelResponse.score_accuracy,
+    ModelResponse.score_dialect_adherence, ModelResponse.score_technical_precision,
+    ModelResponse.score_completeness, ModelResponse.score_cultural_sensitivity,
+    ModelResponse.score_overall,
+)
+
+_LIST_INCLUDES = ("model_responses",)
+
+
+def _parse_include(raw: Optional[str]) -> bool:
+    """True when `include` asks for model_responses; 422 on anything unknown."""
+    names = [n.strip() for n in (raw or "").split(",") if n.strip()]
+    unknown = [n for n in names if n not in _LIST_INCLUDES]
+    if unknown:
+        raise InvalidFieldsError(unknown, list(_LIST_INCLUDES))
+    return bool(names)
+
+
+async def _response_summaries(db: AsyncSession, evaluation_ids: list) -> dict:
+    """evaluation id → ModelResponseSummary list (best score first), in one query."""
+    if not evaluation_ids:
+        return {}
+    result = await db.execute(
+        select(ModelResponse)
+        .options(load_only(
+            ModelResponse.evaluation_id, ModelResponse.model_id, ModelResponse.provider,
+            ModelResponse.latency_ms, ModelResponse.token_count, ModelResponse.cost_usd,
+            ModelResponse.error, *_SCORE_COLUMNS,
+        ))
+        .where(ModelResponse.evaluation_id.in_(evaluation_ids))
+        .order_by(ModelResponse.evaluation_id, ModelResponse.score_overall.desc().nulls_last())
     )
+    summaries: dict = {}
+    for mr in result.scalars():
+        summaries.setdefault(mr.evaluation_id, []).append(ModelResponseSummary(
+            model_id=mr.model_id,
+            provider=mr.provider,
+            latency_ms=mr.latency_ms,
+            token_count=mr.token_count,
+            cost_usd=mr.cost_usd,
+            error=mr.error,
+            scores=mr.scores_dict,
+        ))
+    return summaries
+
+
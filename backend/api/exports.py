@@ -0,0 +1,67 @@
+"""
+Evaluation export route.
+GET /evaluations/export — stream evaluations with responses and scores (JSONL, CSV, Parquet)
+
+Registered ahead of the evaluations router so `/export` is not taken for
+an evaluation id.
+"""
+
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.exceptions import ExportFormatUnavailableError
+from app.services import exporter
+
+router = APIRouter(prefix="/evaluations", tags=["Evaluations"])
+
+
+async def _export_body(fmt: str, filters: exporter.ExportFilters) -> AsyncIterator[bytes]:
+    # The stream outlives the request handler, so it holds its own session
+    # (and server-side cursor) for exactly as long as the client reads.
+    from app.core.database import ReadSessionLocal
+    async with ReadSessionLocal() as db:
+        partitions = exporter.stream_rows(db, filters, batch_size=settings.EXPORT_BATCH_SIZE)
+        async for chunk in exporter.encoder(fmt, exporter.columns(filters))(partitions):
+            if chunk:
+                yield chunk
+
+
+@router.get("/export", summary="Stream evaluations with their responses and scores")
+async def export_evaluations(
+    format: str = Query("jsonl", pattern="^(jsonl|csv|parquet)$"),
+    dialect: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    model: Optional[str] = Query(None, description="Only responses from this model (and evaluations that have one)"),
+    status: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="created_at >= since"),
+    until: Optional[datetime] = Query(None, description="created_at < until"),
+    include_text: bool = Query(True, description="Include full response texts"),
+) -> StreamingResponse:
+    """
+    Export every matching evaluation, oldest first. JSONL nests responses
+    under each evaluation; CSV and Parquet have one row per response.
+    Rows are read through a server-side cursor and written as they
+    arrive, so memory stays flat however large the export.
+    """
+    if format == "parquet" and not exporter.PARQUET_AVAILABLE:
+        raise ExportFormatUnavailableError(format, "pyarrow")
+
+    filters = exporter.ExportFilters(
+        dialect=dialect,
+        category=category,
+        model_id=model,
+        status=status,
+        since=since,
+        until=until,
+        include_text=include_text,
+    )
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        _export_body(format, filters),
+        media_type=exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="evaluations-{stamp}.{format}"'},
+    )
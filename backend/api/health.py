@@ -9,6 +9,8 @@ import redis.asyncio as aioredis
 from app.core.config import settings
 from app.core.database import get_db
 from app.schemas.common import HealthResponse
+from app.services.availability import availability
+from app.services.circuit_breaker import CLOSED, OPEN, circuit_breakers
 
 router = APIRouter(tags=["Health"])
 logger = logging.getLogger(__name__)
@@ -37,10 +39,21 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
         logger.error("Redis health check failed: %s", exc)
         redis_status = f"error: {exc}"
 
+    circuits = circuit_breakers.snapshot()
+    providers = {
+        key: status | circuits.get(key, {"state": CLOSED})
+        for key, status in availability.snapshot().items()
+    }
+    providers_ok = all(p["state"] != OPEN for p in providers.values())
+
     return HealthResponse(
-        status="ok" if db_status == "ok" and redis_status == "ok" else "degraded",
+        status=(
+            "ok" if db_status == "ok" and redis_status == "ok" and providers_ok
+            else "degraded"
+        ),
         version=settings.APP_VERSION,
         environment=settings.ENVIRONMENT,
         database=db_status,
         redis=redis_status,
+        providers=providers,
     )
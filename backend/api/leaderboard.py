@@ -0,0 +1,70 @@
+"""
+Leaderboard endpoints.
+GET /leaderboard                        — models ranked by mean judge score
+GET /leaderboard/{model_id}/trend       — one model's score per day, week or month
+GET /leaderboard/{model_id}/responses   — a model's best or worst scored responses
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.schemas.evaluation import VALID_DIALECTS
+from app.schemas.leaderboard import LeaderboardOut, ScoredResponsesOut, TrendOut
+from app.services import leaderboard as queries
+from app.services.leaderboard import Bucket, Order
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+
+def _check_dialect(dialect: Optional[str]) -> None:
+    if dialect is not None and dialect not in VALID_DIALECTS:
+        raise HTTPException(status_code=422, detail=f"Dialect must be one of: {sorted(VALID_DIALECTS)}")
+
+
+@router.get("", response_model=LeaderboardOut, summary="Models ranked by mean judge score")
+async def get_leaderboard(
+    dialect: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="Responses created at or after"),
+    until: Optional[datetime] = Query(None, description="Responses created before"),
+    db: AsyncSession = Depends(get_read_db),
+) -> LeaderboardOut:
+    """Only scored responses count; a model with none in the window is absent."""
+    _check_dialect(dialect)
+    models = await queries.leaderboard(db, dialect=dialect, category=category, since=since, until=until)
+    return LeaderboardOut(dialect=dialect, category=category, since=since, until=until, models=models)
+
+
+@router.get("/{model_id}/trend", response_model=TrendOut, summary="A model's mean score over time")
+async def get_trend(
+    model_id: str,
+    bucket: Bucket = Query("day"),
+    dialect: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+) -> TrendOut:
+    """Periods without scored responses are left out rather than zero-filled."""
+    _check_dialect(dialect)
+    points = await queries.trend(
+        db, model_id, bucket, dialect=dialect, category=category, since=since, until=until,
+    )
+    return TrendOut(model_id=model_id, bucket=bucket, dialect=dialect, points=points)
+
+
+@router.get("/{model_id}/responses", response_model=ScoredResponsesOut, summary="A model's best or worst responses")
+async def get_scored_responses(
+    model_id: str,
+    dialect: Optional[str] = Query(None),
+    order: Order = Query("best"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> ScoredResponsesOut:
+    _check_dialect(dialect)
+    items = await queries.top_responses(db, model_id, dialect=dialect, order=order, limit=limit)
+    return ScoredResponsesOut(model_id=model_id, order=order, items=items)
@@ -0,0 +1,16 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Response
+
+from app.core import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """Expose all application metrics in the Prometheus text format."""
+    if not metrics.METRICS_AVAILABLE:
+        return Response("prometheus_client is not installed\n", status_code=503, media_type="text/plain")
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -1,8 +1,15 @@
 """Model registry endpoint — returns metadata for all supported models."""
 
-from fastapi import APIRouter
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Optional
+
+from app.core.metrics import record_cache
+from app.core.model_registry import ModelSpec, model_registry
+from app.services.availability import availability
 
 router = APIRouter(prefix="/models", tags=["Models"])
 
@@ -22,50 +29,65 @@ class ModelInfo(BaseModel):
     available: bool
 
 
-REGISTRY: List[ModelInfo] = [
-    ModelInfo(id="gpt-4o", name="GPT-4o", provider="OpenAI", tier="flagship",
-              description="OpenAI's best omni model. Strong Arabic with MSA and Egyptian dialects.",
-              context_window=128000, max_output_tokens=4096,
-              cost_per_1k_input_usd=0.005, cost_per_1k_output_usd=0.015,
-              supports_arabic=True, arabic_native=False, available=True),
-    ModelInfo(id="claude-3-5-sonnet", name="Claude 3.5 Sonnet", provider="Anthropic", tier="flagship",
-              description="Anthropic's top model. Excellent Arabic quality and cultural awareness.",
-              context_window=200000, max_output_tokens=8096,
-              cost_per_1k_input_usd=0.003, cost_per_1k_output_usd=0.015,
-              supports_arabic=True, arabic_native=False, available=True),
-    ModelInfo(id="gemini-1.5-pro", name="Gemini 1.5 Pro", provider="Google", tier="flagship",
-              description="Google's multimodal model. Good MSA, weaker on dialects.",
-              context_window=1000000, max_output_tokens=8192,
-              cost_per_1k_input_usd=0.00125, cost_per_1k_output_usd=0.005,
-              supports_arabic=True, arabic_native=False, available=True),
-    ModelInfo(id="jais-30b", name="Jais 30B", provider="G42 / MBZUAI", tier="arabic-native",
-              description="First Arabic-native LLM. Trained on massive Arabic corpus. Best dialect coverage.",
-              context_window=4096, max_output_tokens=2048,
-              cost_per_1k_input_usd=0.001, cost_per_1k_output_usd=0.002,
-              supports_arabic=True, arabic_native=True, available=True),
-    ModelInfo(id="llama-3-70b", name="LLaMA 3 70B", provider="Meta", tier="open-source",
-              description="Meta's open-source model. Decent MSA, limited dialect support.",
-              context_window=8192, max_output_tokens=2048,
-              cost_per_1k_input_usd=0.0004, cost_per_1k_output_usd=0.0008,
-              supports_arabic=True, arabic_native=False, available=True),
-    ModelInfo(id="mistral-large", name="Mistral Large", provider="Mistral AI", tier="challenger",
-              description="Mistral's largest model. Good multilingual including Arabic.",
-              context_window=32768, max_output_tokens=4096,
-              cost_per_1k_input_usd=0.002, cost_per_1k_output_usd=0.006,
-              supports_arabic=True, arabic_native=False, available=True),
-]
+def _to_info(spec: ModelSpec, available: bool) -> ModelInfo:
+    return ModelInfo(
+        id=spec.id,
+        name=spec.name,
+        provider=spec.provider,
+        tier=spec.tier,
+        description=spec.description,
+        context_window=spec.context_window,
+        max_output_tokens=spec.max_output_tokens,
+        cost_per_1k_input_usd=spec.cost_per_1k_input_usd,
+        cost_per_1k_output_usd=spec.cost_per_1k_output_usd,
+        supports_arabic=spec.supports_arabic,
+        arabic_native=spec.arabic_native,
+        available=available,
+    )
+
+
+class _Rendered:
+    """A pre-serialized JSON body with its strong ETag."""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+
+# Bodies are re-rendered only when provider availability changes.
+_cache: Dict[str, object] = {"key": None, "list": None, "by_id": {}}
+
+
+def _rendered() -> tuple:
+    state = availability.state_key
+    hit = _cache["key"] == state
+    record_cache("models", hit)
+    if not hit:
+        infos = [_to_info(m, availability.is_available(m.id)) for m in model_registry.all()]
+        _cache["list"] = _Rendered([i.model_dump() for i in infos])
+        _cache["by_id"] = {i.id: _Rendered(i.model_dump()) for i in infos}
+        _cache["key"] = state
+    return _cache["list"], _cache["by_id"]
+
+
+def _respond(rendered: _Rendered, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": rendered.etag, "Cache-Control": "public, max-age=60"}
+    if if_none_match and rendered.etag in {t.strip() for t in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
 
 
 @router.get("", response_model=List[ModelInfo], summary="List all available models")
-async def list_models() -> List[ModelInfo]:
+async def list_models(if_none_match: Optional[str] = Header(None)) -> Response:
     """Return metadata for all models supported by the evaluation platform."""
-    return REGISTRY
+    listing, _ = _rendered()
+    return _respond(listing, if_none_match)
 
 
 @router.get("/{model_id}", response_model=ModelInfo, summary="Get model details")
-async def get_model(model_id: str) -> ModelInfo:
-    from fastapi import HTTPException
-    model = next((m for m in REGISTRY if m.id == model_id), None)
-    if not model:
+async def get_model(model_id: str, if_none_match: Optional[str] = Header(None)) -> Response:
+    _, by_id = _rendered()
+    rendered = by_id.get(model_id)
+    if rendered is None:
         raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found.")
-    return model
+    return _respond(rendered, if_none_match)
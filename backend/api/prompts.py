@@ -0,0 +1,79 @@
+"""
+Prompt similarity endpoints.
+POST /prompts/similar — stored prompts that are exact or near duplicates of a prompt
+GET  /prompts/index   — size and state of the in-memory prompt index
+"""
+
+import asyncio
+from typing import Dict, List, Sequence
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+from app.models.evaluation import Evaluation
+from app.schemas.prompt import PromptIndexStatsOut, PromptMatchOut, SimilarPromptsOut, SimilarPromptsRequest
+from app.services.prompt_index import KIND_BENCHMARK_PROMPT, KIND_EVALUATION, Match, prompt_index
+
+router = APIRouter(prefix="/prompts", tags=["Prompts"])
+
+_PROMPT_PREVIEW = 120      # characters of each matching prompt returned
+
+
+async def resolve_matches(db: AsyncSession, results: Sequence[List[Match]]) -> List[List[PromptMatchOut]]:
+    """
+    Index matches → PromptMatchOut, two queries however many lists. The
+    index only holds ids; matches whose row no longer exists are dropped.
+    """
+    wanted: Dict[str, set] = {KIND_EVALUATION: set(), KIND_BENCHMARK_PROMPT: set()}
+    for matches in results:
+        for m in matches:
+            wanted[m.kind].add(m.id)
+    found: Dict[tuple, dict] = {}
+    if wanted[KIND_EVALUATION]:
+        rows = await db.execute(
+            select(Evaluation.id, func.substr(Evaluation.prompt, 1, _PROMPT_PREVIEW), Evaluation.dialect, Evaluation.status)
+            .where(Evaluation.id.in_(wanted[KIND_EVALUATION]))
+        )
+        for id_, prompt, dialect, status in rows:
+            found[(KIND_EVALUATION, id_)] = {"prompt": prompt, "dialect": dialect, "status": status}
+    if wanted[KIND_BENCHMARK_PROMPT]:
+        rows = await db.execute(
+            select(
+                BenchmarkPrompt.id, func.substr(BenchmarkPrompt.prompt_text, 1, _PROMPT_PREVIEW),
+                BenchmarkPrompt.dialect, BenchmarkDataset.slug,
+            )
+            .join(BenchmarkDataset, BenchmarkDataset.id == BenchmarkPrompt.dataset_id)
+            .where(BenchmarkPrompt.id.in_(wanted[KIND_BENCHMARK_PROMPT]))
+        )
+        for id_, prompt, dialect, slug in rows:
+            found[(KIND_BENCHMARK_PROMPT, id_)] = {"prompt": prompt, "dialect": dialect, "dataset_slug": slug}
+    return [
+        [
+            PromptMatchOut(kind=m.kind, id=m.id, similarity=m.similarity, exact=m.exact, **found[(m.kind, m.id)])
+            for m in matches if (m.kind, m.id) in found
+        ]
+        for matches in results
+    ]
+
+
+@router.post("/similar", response_model=SimilarPromptsOut, summary="Find exact and near-duplicate prompts")
+async def similar_prompts(request: SimilarPromptsRequest, db: AsyncSession = Depends(get_db)) -> SimilarPromptsOut:
+    """
+    Searches evaluations and benchmark prompts. Prompts are compared after
+    normalization (diacritics, letter variants, punctuation and spacing
+    folded); `similarity` estimates the share of character 5-grams they
+    have in common. Exact matches come first.
+    """
+    threshold = request.threshold if request.threshold is not None else settings.PROMPT_SIMILARITY_THRESHOLD
+    matches = await asyncio.to_thread(prompt_index.similar, request.prompt, threshold, request.limit, request.kinds)
+    resolved, = await resolve_matches(db, [matches])
+    return SimilarPromptsOut(threshold=threshold, index_ready=prompt_index.ready, matches=resolved)
+
+
+@router.get("/index", response_model=PromptIndexStatsOut, summary="Prompt index statistics")
+async def prompt_index_stats() -> PromptIndexStatsOut:
+    return PromptIndexStatsOut(**prompt_index.stats())
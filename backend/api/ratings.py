@@ -0,0 +1,70 @@
+"""
+Model rating endpoints.
+GET  /ratings        — Elo and Bradley-Terry ratings, overall or per dialect
+POST /ratings/refit  — refit Bradley-Terry ratings from every battle (admin)
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_admin_api_key
+from app.core.database import get_db, get_read_db
+from app.models.rating import ModelRating
+from app.schemas.evaluation import VALID_DIALECTS
+from app.schemas.rating import ModelRatingOut, RatingMethod, RatingRefitOut, RatingsOut
+from app.services import ratings
+
+router = APIRouter(prefix="/ratings", tags=["Ratings"])
+
+
+@router.get("", response_model=RatingsOut, summary="Model ratings from evaluation battles")
+async def get_ratings(
+    dialect: Optional[str] = Query(None, description="Ratings within one dialect; omit for all evaluations"),
+    method: RatingMethod = Query("bt", description="Rank by batch Bradley-Terry (bt) or online Elo (elo)"),
+    db: AsyncSession = Depends(get_read_db),
+) -> RatingsOut:
+    """
+    Every evaluation's winner beat each other model that answered. `elo`
+    is updated as evaluations complete; `bt_rating` is the latest batch
+    fit over all battles. Models without a fit rank after those with one.
+    """
+    if dialect is not None and dialect not in VALID_DIALECTS:
+        raise HTTPException(status_code=422, detail=f"Dialect must be one of: {sorted(VALID_DIALECTS)}")
+    scope = dialect or ratings.SCOPE_ALL
+    rows = list(await db.scalars(select(ModelRating).where(ModelRating.scope == scope)))
+    if method == "bt":
+        rows.sort(key=lambda r: (r.bt_rating is None, -(r.bt_rating or 0.0), -r.elo, r.model_id))
+    else:
+        rows.sort(key=lambda r: (-r.elo, r.model_id))
+    fitted = [r.fitted_at for r in rows if r.fitted_at is not None]
+    return RatingsOut(
+        scope=scope,
+        method=method,
+        fitted_at=max(fitted) if fitted else None,
+        models=[
+            ModelRatingOut(
+                rank=i + 1,
+                model_id=r.model_id,
+                elo=round(r.elo, 1),
+                battles=r.battles,
+                wins=r.wins,
+                win_rate=round(r.wins / r.battles, 4) if r.battles else None,
+                bt_rating=r.bt_rating,
+                bt_battles=r.bt_battles,
+            )
+            for i, r in enumerate(rows)
+        ],
+    )
+
+
+@router.post(
+    "/refit",
+    response_model=RatingRefitOut,
+    summary="Refit Bradley-Terry ratings from all battles",
+    dependencies=[Depends(get_admin_api_key)],
+)
+async def refit_ratings(db: AsyncSession = Depends(get_db)) -> RatingRefitOut:
+    return RatingRefitOut(**await ratings.refit(db))
@@ -0,0 +1,168 @@
+"""
+Full-text search endpoint.
+GET /search — ranked prompts and responses matching a query, with highlights
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import String, func, literal, literal_column, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.models.evaluation import SEARCH_CONFIG, Evaluation, ModelResponse, ResponseBlob
+from app.schemas.evaluation import VALID_DIALECTS
+from app.schemas.search import SearchHitOut, SearchResultsOut, SearchScope
+from app.services import search as fts
+from app.services.blob_store import blob_store
+from app.services.search import KIND_PROMPT, KIND_RESPONSE, Hit, search_index
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+_PROMPT_PREVIEW = 120          # characters of the evaluation prompt in each hit
+_HIGHLIGHT_SCAN = 50_000       # characters of a response scanned for highlighting
+
+
+@router.get("", response_model=SearchResultsOut, summary="Search prompts and responses")
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description='Words are ANDed; -word excludes'),
+    scope: SearchScope = Query("all", description="Search prompts, responses, or both"),
+    dialect: Optional[str] = Query(None),
+    model: Optional[str] = Query(None, description="Only this model's responses"),
+    status: Optional[str] = Query(None),
+    page: int = Query(1, ge=1, le=100),
+    page_size: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+) -> SearchResultsOut:
+    """
+    Prompts and responses are matched after Arabic normalization
+    (diacritics, letter variants and punctuation folded) and light
+    stemming, best match first. Each hit carries highlighted snippets.
+    """
+    if dialect is not None and dialect not in VALID_DIALECTS:
+        raise HTTPException(status_code=422, detail=f"Dialect must be one of: {sorted(VALID_DIALECTS)}")
+    query = fts.Query.parse(q)
+    kinds = [k for k in ((KIND_PROMPT, KIND_RESPONSE) if scope == "all" else (scope,)) if not model or k == KIND_RESPONSE]
+    postgres = not search_index.active and db.get_bind().dialect.name == "postgresql"
+    offset = (page - 1) * page_size
+
+    hits: List[Hit] = []
+    if query.include and kinds:
+        search_hits = _postgres_hits if postgres else _memory_hits
+        hits = await search_hits(db, q, query, kinds, dialect, model, status, offset, page_size + 1)
+    return SearchResultsOut(
+        query=q,
+        backend="postgres" if postgres else "memory",
+        page=page,
+        page_size=page_size,
+        has_more=len(hits) > page_size,
+        items=await _hits_out(db, hits[:page_size], query.include),
+    )
+
+
+async def _memory_hits(db, q, query, kinds, dialect, model, status, offset: int, count: int) -> List[Hit]:
+    """
+    Ranked by the in-process index; hits whose evaluation is gone or has
+    another status are dropped here, so the window is widened until the
+    page fills or the matches run out.
+    """
+    wanted, fetch = offset + count, offset + count
+    while True:
+        hits = await asyncio.to_thread(search_index.search, query, kinds, dialect, model, fetch)
+        ids = {h.evaluation_id for h in hits}
+        filters = [Evaluation.id.in_(ids)] + ([Evaluation.status == status] if status else [])
+        existing = set((await db.scalars(select(Evaluation.id).where(*filters))).all()) if ids else set()
+        seen, kept = set(), []
+        for h in hits:
+            key = (h.kind, h.evaluation_id, h.model_id)
+            if h.evaluation_id in existing and key not in seen:
+                seen.add(key)
+                kept.append(h)
+        if len(kept) >= wanted or len(hits) < fetch:
+            return kept[offset:offset + count]
+        fetch *= 4
+
+
+async def _postgres_hits(db, q, query, kinds, dialect, model, status, offset: int, count: int) -> List[Hit]:
+    """One UNION ALL over the GIN-indexed search_vector columns, ranked by ts_rank_cd."""
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), func.arabic_fold(q))
+    filters = [Evaluation.dialect == dialect] if dialect else []
+    if status:
+        filters.append(Evaluation.status == status)
+    parts = []
+    if KIND_PROMPT in kinds:
+        vector = literal_column("evaluations.search_vector")
+        parts.append(
+            select(
+                literal(KIND_PROMPT).label("kind"), Evaluation.id.label("evaluation_id"),
+                null().cast(String).label("model_id"), func.ts_rank_cd(vector, tsquery).label("score"),
+            )
+            .where(vector.op("@@")(tsquery), *filters)
+        )
+    if KIND_RESPONSE in kinds:
+        vector = literal_column("response_blobs.search_vector")
+        parts.append(
+            select(
+                literal(KIND_RESPONSE).label("kind"), ModelResponse.evaluation_id.label("evaluation_id"),
+                ModelResponse.model_id.label("model_id"), func.ts_rank_cd(vector, tsquery).label("score"),
+            )
+            .join(ResponseBlob, ResponseBlob.digest == ModelResponse.response_digest)
+            .join(Evaluation, Evaluation.id == ModelResponse.evaluation_id)
+            .where(vector.op("@@")(tsquery), *filters, *([ModelResponse.model_id == model] if model else []))
+        )
+    ranked = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+    rows = await db.execute(
+        select(ranked).order_by(ranked.c.score.desc(), ranked.c.evaluation_id).offset(offset).limit(count)
+    )
+    return [Hit(kind, evaluation_id, model_id, round(float(score), 4)) for kind, evaluation_id, model_id, score in rows]
+
+
+async def _hits_out(db: AsyncSession, hits: Sequence[Hit], wanted: List[str]) -> List[SearchHitOut]:
+    """Evaluation fields for every hit and the matched texts for highlighting, in two queries."""
+    if not hits:
+        return []
+    evaluations = {
+        row.id: row for row in await db.execute(
+            select(
+                Evaluation.id, Evaluation.prompt, Evaluation.dialect, Evaluation.category,
+                Evaluation.status, Evaluation.created_at,
+            ).where(Evaluation.id.in_({h.evaluation_id for h in hits}))
+        )
+    }
+    responses: Dict[Tuple, str] = {}
+    response_ids = {h.evaluation_id for h in hits if h.kind == KIND_RESPONSE}
+    if response_ids:
+        rows = (await db.execute(
+            select(
+                ModelResponse.evaluation_id, ModelResponse.model_id,
+                ResponseBlob.digest, ResponseBlob.codec, ResponseBlob.data,
+            )
+            .join(ResponseBlob, ResponseBlob.digest == ModelResponse.response_digest)
+            .where(
+                ModelResponse.evaluation_id.in_(response_ids),
+                ModelResponse.model_id.in_({h.model_id for h in hits if h.kind == KIND_RESPONSE}),
+            )
+        )).all()
+        bodies = await blob_store.resolve((d, codec, data) for _, _, d, codec, data in rows)
+        responses = {(e, m): bodies[d].decode("utf-8")[:_HIGHLIGHT_SCAN] for e, m, d, _, _ in rows}
+
+    out = []
+    for h in hits:
+        ev = evaluations.get(h.evaluation_id)
+        if ev is None:
+            continue
+        text = ev.prompt if h.kind == KIND_PROMPT else responses.get((h.evaluation_id, h.model_id), "")
+        out.append(SearchHitOut(
+            evaluation_id=h.evaluation_id,
+            kind=h.kind,
+            model_id=h.model_id,
+            score=h.score,
+            highlights=fts.highlight(text, wanted),
+            prompt=ev.prompt[:_PROMPT_PREVIEW],
+            dialect=ev.dialect,
+            category=ev.category,
+            status=ev.status,
+            created_at=ev.created_at,
+        ))
+    return out
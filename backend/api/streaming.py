@@ -7,12 +7,20 @@ import asyncio
 import json
 import logging
 import uuid
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.core.config import settings
+from app.core.exceptions import CircuitOpenError
+from app.core.metrics import ACTIVE_STREAMS, record_model_call
+from app.services.accounting import (
+    USAGE_PROVIDER, TokenUsage, compute_cost, estimate_usage, extract_usage,
+)
 from app.services.arabic_analyzer import arabic_analyzer
+from app.services.availability import availability
+from app.services.circuit_breaker import circuit_breakers
+from app.services.evaluator import _build_llm, provider_key
 
 router = APIRouter(tags=["Streaming"])
 logger = logging.getLogger(__name__)
@@ -35,61 +43,92 @@ async def _stream_model(
     from langchain_core.messages import HumanMessage, SystemMessage
 
     full_tokens: List[str] = []
+    provider = provider_key(model_id)
+    breaker = circuit_breakers.get(provider) if settings.CIRCUIT_BREAKER_ENABLED else None
+    first_token_ms: Optional[int] = None
+    reported = TokenUsage(0, 0, USAGE_PROVIDER)
+    has_reported_usage = False
+    start = time.monotonic()
+    ACTIVE_STREAMS.inc()
 
     try:
-        # Build LLM with streaming
-        if model_id.startswith("gpt"):
-            if not settings.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not configured")
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(model=model_id, api_key=settings.OPENAI_API_KEY,
-                             temperature=0.3, streaming=True)
-        elif model_id.startswith("claude"):
-            if not settings.ANTHROPIC_API_KEY:
-                raise ValueError("ANTHROPIC_API_KEY not configured")
-            from langchain_anthropic import ChatAnthropic
-            model_map = {"claude-3-5-sonnet": "claude-3-5-sonnet-20241022"}
-            llm = ChatAnthropic(model=model_map.get(model_id, model_id),
-                                api_key=settings.ANTHROPIC_API_KEY, temperature=0.3)
-        elif model_id.startswith("gemini"):
-            if not settings.GOOGLE_API_KEY:
-                raise ValueError("GOOGLE_API_KEY not configured")
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            llm = ChatGoogleGenerativeAI(model=model_id,
-                                         google_api_key=settings.GOOGLE_API_KEY,
-                                         temperature=0.3)
-        else:
-            raise ValueError(f"Model '{model_id}' does not support streaming")
+        llm = _build_llm(model_id, streaming=True)
 
         messages = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)]
+        if breaker is not None:
+            breaker.ensure_call_permitted()
         start = time.monotonic()
 
-        await ws.send_json({"type": "stream_start", "model_id": model_id})
-
-        async for chunk in llm.astream(messages, max_tokens=max_tokens):
-            token = chunk.content if hasattr(chunk, "content") else str(chunk)
-            if token:
-                full_tokens.append(token)
-                await ws.send_json({"type": "token", "model_id": model_id, "token": token})
+        # Everything after taking the permit is guarded, so a client that
+        # disconnects here gives the half-open trial slot back.
+        try:
+            await ws.send_json({"type": "stream_start", "model_id": model_id})
+            async for chunk in llm.astream(messages, max_tokens=max_tokens):
+                # Providers report usage on the first and/or last chunk only.
+                chunk_usage = extract_usage(chunk)
+                if chunk_usage is not None:
+                    has_reported_usage = True
+                    reported.input_tokens += chunk_usage.input_tokens
+                    reported.output_tokens += chunk_usage.output_tokens
+                token = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if token:
+                    if first_token_ms is None:
+                        first_token_ms = int((time.monotonic() - start) * 1000)
+                    full_tokens.append(token)
+                    await ws.send_json({"type": "token", "model_id": model_id, "token": token})
+        except (WebSocketDisconnect, asyncio.CancelledError):
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        except Exception as exc:
+            if breaker is not None:
+                breaker.record_failure(str(exc) or type(exc).__name__)
+            raise
+
+        # Slow-call detection uses time-to-first-token: long answers are not slow providers.
+        if breaker is not None:
+            breaker.record_success(first_token_ms if first_token_ms is not None else 0)
 
         latency_ms = int((time.monotonic() - start) * 1000)
         full_text = "".join(full_tokens)
         metrics = arabic_analyzer.analyze(full_text, dialect=dialect)
+        usage = (
+            reported if has_reported_usage
+            else estimate_usage((m.content for m in messages), full_text)
+        )
+
+        cost = compute_cost(model_id, usage)
+        record_model_call(
+            provider, model_id, dialect, "ok", latency_ms / 1000,
+            usage.input_tokens, usage.output_tokens, cost,
+        )
 
         await ws.send_json({
             "type": "stream_end",
             "model_id": model_id,
             "latency_ms": latency_ms,
-            "token_count": len(full_text.split()),
+            "token_count": usage.output_tokens,
+            "input_tokens": usage.input_tokens,
+            "cost_usd": cost,
             "arabic_metrics": metrics,
         })
         return full_text
 
+    except CircuitOpenError as exc:
+        logger.warning("Streaming skipped for %s: %s", model_id, exc.message)
+        record_model_call(provider, model_id, dialect, "circuit_open", 0.0)
+        await ws.send_json({"type": "stream_error", "model_id": model_id, "error": exc.message})
+        return ""
+
     except Exception as exc:
         logger.error("Streaming error for %s: %s", model_id, exc)
+        record_model_call(provider, model_id, dialect, "error", time.monotonic() - start)
         await ws.send_json({"type": "stream_error", "model_id": model_id, "error": str(exc)})
         return ""
 
+    finally:
+        ACTIVE_STREAMS.dec()
+
 
 @router.websocket("/ws/evaluate")
 async def websocket_evaluate(ws: WebSocket) -> None:
@@ -127,6 +166,18 @@ async def websocket_evaluate(ws: WebSocket) -> None:
             await ws.send_json({"type": "error", "message": "Prompt is required."})
             return
 
+        unavailable = {
+            m: reason for m in model_ids
+            if (reason := availability.unavailable_reason(m)) is not None
+        }
+        if unavailable:
+            await ws.send_json({
+                "type": "error",
+                "message": f"Models not available: {', '.join(unavailable)}",
+                "models": unavailable,
+            })
+            return
+
         await ws.send_json({
             "type": "evaluation_start",
             "evaluation_id": evaluation_id,
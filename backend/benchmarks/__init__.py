@@ -0,0 +1 @@
+"""Performance benchmarks for the backend — see `python -m app.benchmarks --help`."""
@@ -0,0 +1,77 @@
+"""
+Standalone benchmark runner.
+
+Usage:
+    python -m app.benchmarks                          # run everything
+    python -m app.benchmarks -k analyzer -k scorer    # name substring filter
+    python -m app.benchmarks --output results.json
+    python -m app.benchmarks --compare baseline.json --fail-threshold 0.15
+    python -m app.benchmarks --database-url postgresql+asyncpg://...  --dataset-size 50000
+
+--compare exits non-zero when any shared benchmark's median regressed by
+more than the threshold, so CI can gate on it.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from app.benchmarks import cases  # noqa: F401 — registers the cases
+from app.benchmarks.harness import RunConfig, compare, format_table, run, select, to_report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic benchmark suite")
+    parser.add_argument("-k", dest="patterns", action="append", help="substring filter (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--fail-threshold", type=float, default=0.15)
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--max-time", type=float, default=2.0, help="seconds per case")
+    parser.add_argument("--dataset-size", type=int, default=5000)
+    parser.add_argument("--database-url", default="", help="defaults to a temporary SQLite file")
+    parser.add_argument("--ws-clients", type=int, default=8)
+    parser.add_argument("--ws-models", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    selected = select(args.patterns)
+    if args.list:
+        for c in selected:
+            print(f"{c.group:<10} {c.name}")
+        return 0
+
+    logging.disable(logging.WARNING)      # keep per-call log lines out of the timings
+    config = RunConfig(
+        min_rounds=args.min_rounds,
+        max_time=args.max_time,
+        params={
+            "dataset_size": args.dataset_size,
+            "database_url": args.database_url,
+            "ws_clients": args.ws_clients,
+            "ws_models": args.ws_models,
+        },
+    )
+    results = run(selected, config)
+    report = to_report(results, config)
+    print(format_table(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            rows = compare(json.load(f), report, args.fail_threshold)
+        print()
+        for row in rows:
+            flag = "REGRESSED" if row["regressed"] else ""
+            print(f"{row['name']:<44} {row['change']:>+8.1%} {flag}")
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,521 @@
+"""
+Benchmark cases. Each factory sets up its fixtures once and yields the
+callable that gets timed.
+
+Providers are never called — anything that reaches a model runs on the
+mock provider with zero latency, so the numbers measure our own code
+(analysis, scoring glue, ORM, serialization, WebSocket framing).
+"""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.benchmarks.harness import case
+from app.core.config import settings
+
+TEXT_SIZES = {"small": 50, "medium": 500, "large": 5000}   # words
+DIALECTS = ["msa", "gulf", "egyptian", "levantine", "maghrebi", "iraqi"]
+BENCH_MODELS = ["gpt-4o", "claude-3-5-sonnet", "gemini-1.5-pro", "jais-30b"]
+
+
+# ── Fixtures ──────────────────────────────────────────────
+
+@contextmanager
+def mock_providers(response_tokens: int = 200):
+    """Route every model through the mock provider with no simulated delay."""
+    from app.services.availability import availability
+
+    overrides = {
+        "MOCK_LLM_ENABLED": True,
+        "MOCK_LATENCY_DISTRIBUTION": "fixed",
+        "MOCK_LATENCY_MS_MEAN": 0.0,
+        "MOCK_TOKENS_PER_SECOND": 1e9,
+        "MOCK_RESPONSE_TOKENS": response_tokens,
+        "MOCK_ERROR_RATE": 0.0,
+    }
+    saved = {k: getattr(settings, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(settings, k, v)
+    availability.refresh_static()
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(settings, k, v)
+        availability.refresh_static()
+
+
+def arabic_text(words: int, seed: int = 0) -> str:
+    from app.services.mock_llm import SENTENCES
+
+    rng = random.Random(seed)
+    pool = [s for sentences in SENTENCES.values() for s in sentences]
+    out: list = []
+    while len(out) < words:
+        out.extend(rng.choice(pool).split())
+    return " ".join(out[:words])
+
+
+@asynccontextmanager
+async def bench_database(database_url: str = ""):
+    """
+    A fresh schema on `database_url`, or on a throwaway SQLite file when
+    none is given. Tables are dropped on exit.
+    """
+    from app.core.database import Base
+    from app.models import benchmark, evaluation, rating, user  # noqa: F401
+
+    tmpdir = None
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory(prefix="llm-eval-bench-")
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+async def seed_evaluations(
+    sessionmaker,
+    count: int,
+    responses_per_eval: int = 3,
+    seed: int = 0,
+    batch: int = 1000,
+) -> None:
+    """Bulk-insert `count` completed evaluations with scored responses."""
+    from app.models.evaluation import Evaluation, ModelResponse
+    from app.services.blob_store import blob_store
+
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    prompt = arabic_text(40, seed)
+    response = arabic_text(200, seed + 1)
+    async with sessionmaker() as db:
+        [response_digest] = await blob_store.put_texts(db, [response])
+        for offset in range(0, count, batch):
+            evals, resps = [], []
+            for i in range(offset, min(count, offset + batch)):
+                eval_id = uuid.uuid4()
+                created = start + timedelta(minutes=i)
+                dialect = rng.choice(DIALECTS)
+                evals.append({
+                    "id": eval_id, "prompt": prompt, "dialect": dialect,
+                    "category": "general", "max_tokens": 1024, "status": "completed",
+                    "winner_model_id": BENCH_MODELS[0], "created_at": created,
+                    "completed_at": created,
+                })
+                for m in BENCH_MODELS[:responses_per_eval]:
+                    resps.append({
+                        "id": uuid.uuid4(), "evaluation_id": eval_id, "model_id": m,
+                        "model_name": m, "provider": "bench", "dialect": dialect, "category": "general",
+                        "response_digest": response_digest, "response_length": len(response),
+                        "latency_ms": rng.randint(300, 4000), "token_count": 200,
+                        "input_tokens": 40, "cost_usd": 0.001,
+                        "score_overall": round(rng.uniform(4, 9.5), 2),
+                        "created_at": created,
+                    })
+            await db.execute(insert(Evaluation), evals)
+            if resps:
+                await db.execute(insert(ModelResponse), resps)
+        await db.commit()
+
+
+async def seed_prompts(sessionmaker, count: int, seed: int = 0, batch: int = 10_000):
+    """Bulk-insert a benchmark dataset of `count` prompts; returns its id."""
+    from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+    from app.schemas.evaluation import VALID_CATEGORIES
+
+    rng = random.Random(seed)
+    categories = sorted(VALID_CATEGORIES)
+    difficulties = ["easy", "medium", "hard", "expert"]
+    async with sessionmaker() as db:
+        dataset = BenchmarkDataset(slug=f"bench-{seed}", name="bench", prompt_count=count)
+        db.add(dataset)
+        await db.flush()
+        for offset in range(0, count, batch):
+            await db.execute(insert(BenchmarkPrompt), [
+                {
+                    "id": uuid.uuid4(), "dataset_id": dataset.id, "prompt_text": f"prompt {i}",
+                    "dialect": rng.choice(DIALECTS), "category": rng.choice(categories),
+                    "difficulty": rng.choice(difficulties), "sample_key": rng.random(),
+                }
+                for i in range(offset, min(count, offset + batch))
+            ])
+        await db.commit()
+        return dataset.id
+
+
+@asynccontextmanager
+async def api_client(sessionmaker):
+    """ASGI client whose `get_db` and `get_read_db` dependencies use `sessionmaker`."""
+    from app.core.database import get_db, get_read_db
+    from app.main import app
+
+    async def override_get_db():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+
+
+async def websocket_session(app, path: str, payload: dict) -> list:
+    """
+    Drive one WebSocket conversation directly over ASGI, in this event
+    loop, and return every message the server sent.
+    """
+    incoming: asyncio.Queue = asyncio.Queue()
+    await incoming.put({"type": "websocket.connect"})
+    await incoming.put({"type": "websocket.receive", "text": json.dumps(payload)})
+    sent: list = []
+    closed = asyncio.Event()
+
+    async def receive():
+        if incoming.empty() and closed.is_set():
+            return {"type": "websocket.disconnect", "code": 1000}
+        return await incoming.get()
+
+    async def send(message):
+        if message["type"] == "websocket.send":
+            sent.append(json.loads(message["text"]))
+        elif message["type"] == "websocket.close":
+            closed.set()
+            await incoming.put({"type": "websocket.disconnect", "code": 1000})
+
+    scope = {
+        "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws",
+        "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0),
+        "server": ("bench", 80), "subprotocols": [],
+    }
+    await app(scope, receive, send)
+    return sent
+
+
+# ── Arabic analyzer ───────────────────────────────────────
+
+def _analyzer_case(size: str):
+    @case(f"analyzer.analyze[{size}]", group="analyzer", unit="words")
+    @asynccontextmanager
+    async def factory(**_):
+        from app.services.arabic_analyzer import arabic_analyzer
+
+        words = TEXT_SIZES[size]
+        text = arabic_text(words)
+
+        def fn() -> int:
+            arabic_analyzer.analyze(text, dialect="msa")
+            return words
+
+        yield fn
+
+
+for _size in TEXT_SIZES:
+    _analyzer_case(_size)
+
+
+# ── Judge JSON parsing ────────────────────────────────────
+
+_JUDGE_PAYLOAD = {
+    "arabic_quality": 8.5, "accuracy": 9, "dialect_adherence": 7.5,
+    "technical_precision": 8, "completeness": 9, "cultural_sensitivity": 10,
+    "reasoning": "الإجابة دقيقة وشاملة مع التزام جيد بالفصحى.",
+}
+JUDGE_OUTPUTS = {
+    "clean": json.dumps(_JUDGE_PAYLOAD, ensure_ascii=False),
+    "fenced": "```json\n" + json.dumps(_JUDGE_PAYLOAD, ensure_ascii=False, indent=2) + "\n```",
+    "invalid": "The response scores well overall, roughly 8/10.",
+}
+
+
+def _parse_case(kind: str):
+    @case(f"scorer.parse_score_json[{kind}]", group="scorer")
+    @asynccontextmanager
+    async def factory(**_):
+        import logging
+        from app.services.scorer import _parse_score_json
+
+        raw = JUDGE_OUTPUTS[kind]
+        scorer_logger = logging.getLogger("app.services.scorer")
+        level = scorer_logger.level
+        scorer_logger.setLevel(logging.ERROR)     # the invalid case logs a warning per call
+        try:
+            yield lambda: _parse_score_json(raw)
+        finally:
+            scorer_logger.setLevel(level)
+
+
+for _kind in JUDGE_OUTPUTS:
+    _parse_case(_kind)
+
+
+# ── list_evaluations over a seeded dataset ────────────────
+
+def _list_case(name: str, query: str):
+    @case(f"api.list_evaluations[{name}]", group="api", unit="requests")
+    @asynccontextmanager
+    async def factory(dataset_size: int = 5000, database_url: str = "", **_):
+        async with bench_database(database_url) as sessionmaker:
+            await seed_evaluations(sessionmaker, int(dataset_size))
+            async with api_client(sessionmaker) as client:
+                async def fn() -> int:
+                    resp = await client.get(f"/api/v1/evaluations?{query}")
+                    resp.raise_for_status()
+                    return 1
+
+                yield fn
+
+
+_list_case("first_page", "page=1&page_size=20")
+_list_case("deep_page", "page=200&page_size=20")
+_list_case("filtered", "page=1&page_size=100&dialect=gulf&status=completed")
+
+
+# ── get_evaluation: cached body vs render per request ─────
+
+def _get_case(name: str, cached: bool):
+    @case(f"api.get_evaluation[{name}]", group="api", unit="requests")
+    @asynccontextmanager
+    async def factory(database_url: str = "", **_):
+        from sqlalchemy import select
+        from app.models.evaluation import Evaluation
+        from app.services.evaluation_cache import evaluation_cache
+
+        async with bench_database(database_url) as sessionmaker:
+            await seed_evaluations(sessionmaker, 100, responses_per_eval=4)
+            async with sessionmaker() as db:
+                eval_id = (await db.execute(select(Evaluation.id).limit(1))).scalar_one()
+            async with api_client(sessionmaker) as client:
+                async def fn() -> int:
+                    if not cached:
+                        evaluation_cache.clear()
+                    resp = await client.get(f"/api/v1/evaluations/{eval_id}")
+                    resp.raise_for_status()
+                    return 1
+
+                try:
+                    yield fn
+                finally:
+                    evaluation_cache.clear()
+
+
+_get_case("cached", True)
+_get_case("uncached", False)
+
+
+# ── Seeded benchmark sampling ─────────────────────────────
+
+def _sample_case(name: str, stratify_by: tuple):
+    @case(f"sampler.draw[{name}]", group="sampler", unit="samples")
+    @asynccontextmanager
+    async def factory(dataset_size: int = 5000, database_url: str = "", **_):
+        from app.services.sampler import draw
+
+        async with bench_database(database_url) as sessionmaker:
+            dataset_id = await seed_prompts(sessionmaker, int(dataset_size))
+            seeds = iter(range(1_000_000))
+            async with sessionmaker() as db:
+                async def fn() -> int:
+                    await draw(db, dataset_id, 1000, next(seeds), stratify_by=stratify_by)
+                    return 1
+
+                yield fn
+
+
+_sample_case("simple", ())
+_sample_case("by_dialect", ("dialect",))
+_sample_case("by_all", ("dialect", "category", "difficulty"))
+
+
+# ── Benchmark summary statistics ──────────────────────────
+
+@case("aggregation.summarize", group="aggregation", unit="prompts")
+@asynccontextmanager
+async def summarize_case(dataset_size: int = 5000, **_):
+    import numpy as np
+    from app.services.aggregation import ScoreMatrix, summarize
+    from app.services.scorer import SCORE_DIMENSIONS
+
+    rng = np.random.default_rng(0)
+    p, m = int(dataset_size), 10
+    difficulty = rng.uniform(3, 9, size=(p, 1, 1))
+    scores = np.clip(difficulty + rng.normal(0, 1, size=(p, m, len(SCORE_DIMENSIONS))), 0, 10)
+    scores[rng.random(p) < 0.02, 0] = np.nan              # a few failed responses
+    matrix = ScoreMatrix(
+        model_ids=[f"model-{j}" for j in range(m)],
+        scores=scores,
+        overall=scores.mean(axis=2),
+        dialects=rng.choice(["msa", "gulf", "egyptian", "levantine", "maghrebi"], size=p),
+    )
+
+    def fn() -> int:
+        summarize(matrix, n_bootstrap=500)
+        return p
+
+    yield fn
+
+
+# ── Prompt index: near-duplicate lookups and inserts ──────
+
+def _prompt_index_case(name: str, op: str):
+    @case(f"prompt_index.{name}", group="prompt_index", unit="prompts")
+    @asynccontextmanager
+    async def factory(dataset_size: int = 5000, **_):
+        import uuid
+        from app.services.prompt_index import KIND_EVALUATION, PromptIndex
+
+        n, per_call = int(dataset_size), 100
+        texts = [arabic_text(25, seed=i) + f" {i}" for i in range(n + per_call)]
+        index = PromptIndex()
+        index.add_many(KIND_EVALUATION, [uuid.uuid4() for _ in range(n)], texts[:n])
+        probes = texts[n:] if op == "add" else texts[:per_call]
+
+        def fn() -> int:
+            for text in probes:
+                if op == "add":
+                    index.add(KIND_EVALUATION, uuid.uuid4(), text)
+                else:
+                    index.similar(text, threshold=0.8)
+            return per_call
+
+        yield fn
+
+    return factory
+
+
+_prompt_index_case("similar", "similar")
+_prompt_index_case("add", "add")
+
+
+# ── Full-text search (in-process BM25 index) ──────────────
+
+@case("search.memory", group="search", unit="queries")
+@asynccontextmanager
+async def search_memory_case(dataset_size: int = 5000, **_):
+    import uuid
+    from app.core.config import settings
+    from app.services.search import KIND_RESPONSE, Query, SearchIndex, terms
+
+    backend, settings.SEARCH_BACKEND = settings.SEARCH_BACKEND, "memory"
+    try:
+        n, per_call = int(dataset_size), 50
+        index = SearchIndex()
+        index.add_many([
+            (KIND_RESPONSE, uuid.uuid4(), "msa", arabic_text(80, seed=i), BENCH_MODELS[i % len(BENCH_MODELS)])
+            for i in range(n)
+        ])
+        queries = []
+        for i in range(per_call):
+            words = terms(arabic_text(12, seed=n + i))
+            queries.append(Query.parse(" ".join(words[:2])))
+
+        def fn() -> int:
+            for query in queries:
+                index.search(query, limit=21)
+            return per_call
+
+        yield fn
+    finally:
+        settings.SEARCH_BACKEND = backend
+
+
+# ── Ratings refit over every battle ───────────────────────
+
+@case("ratings.refit", group="ratings", unit="battles")
+@asynccontextmanager
+async def ratings_refit_case(dataset_size: int = 5000, database_url: str = "", **_):
+    from app.services.ratings import refit
+
+    responses = len(BENCH_MODELS)                          # winner + 3 losers per evaluation
+    async with bench_database(database_url) as sessionmaker:
+        await seed_evaluations(sessionmaker, int(dataset_size), responses_per_eval=responses)
+        async with sessionmaker() as db:
+            async def fn() -> int:
+                return (await refit(db))["battles"]
+
+            yield fn
+
+
+# ── Full pipeline on the mock provider ────────────────────
+
+@case("pipeline.run_evaluation", group="pipeline", unit="evaluations")
+@asynccontextmanager
+async def pipeline_case(database_url: str = "", pipeline_models=None, **_):
+    import app.core.database as database
+    from app.services.evaluation_pipeline import run_evaluation_pipeline
+    from app.models.evaluation import Evaluation
+    from app.schemas.evaluation import EvaluationCreateRequest
+
+    models = list(pipeline_models or BENCH_MODELS[:3])
+    request = EvaluationCreateRequest(
+        prompt=arabic_text(30), dialect="msa", category="reasoning", models=models,
+    )
+    async with bench_database(database_url) as sessionmaker:
+        original = database.AsyncSessionLocal
+        database.AsyncSessionLocal = sessionmaker
+        try:
+            with mock_providers():
+                async def fn() -> int:
+                    async with sessionmaker() as db:
+                        ev = Evaluation(
+                            prompt=request.prompt, dialect=request.dialect,
+                            category=request.category, status="pending",
+                        )
+                        db.add(ev)
+                        await db.commit()
+                    await run_evaluation_pipeline(ev.id, request, None)
+                    return 1
+
+                yield fn
+        finally:
+            database.AsyncSessionLocal = original
+
+
+# ── WebSocket fan-out ─────────────────────────────────────
+
+@case("ws.evaluate_fanout", group="websocket", unit="tokens")
+@asynccontextmanager
+async def websocket_case(ws_clients: int = 8, ws_models: int = 4, **_):
+    from app.main import app
+
+    payload = {
+        "prompt": arabic_text(30), "dialect": "msa",
+        "models": BENCH_MODELS[:int(ws_models)], "max_tokens": 256,
+    }
+    with mock_providers(response_tokens=256):
+        async def fn() -> int:
+            sessions = await asyncio.gather(*(
+                websocket_session(app, "/ws/evaluate", payload) for _ in range(int(ws_clients))
+            ))
+            tokens = 0
+            for messages in sessions:
+                if messages[-1]["type"] != "evaluation_complete":
+                    raise RuntimeError(f"WebSocket session failed: {messages[-1]}")
+                tokens += sum(1 for m in messages if m["type"] == "token")
+            return tokens
+
+        yield fn
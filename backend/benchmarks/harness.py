@@ -0,0 +1,208 @@
+"""
+Benchmark harness — a small, dependency-free take on pytest-benchmark.
+
+Cases register themselves with `@case(...)`. A case is an async context
+manager factory: setup runs once before it enters, teardown runs when it
+exits, and the value it yields is the timed callable. That callable may
+be sync or async. It can return the number of work items it processed
+(evaluations, tokens, rows); the harness turns that into items/sec.
+
+Results are written in the pytest-benchmark JSON layout (machine_info,
+commit_info, benchmarks[].stats), so existing tooling can read them and
+two runs can be compared with `compare()`.
+"""
+
+import asyncio
+import inspect
+import os
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    group: str
+    factory: Callable[..., AbstractAsyncContextManager]
+    unit: str = "ops"           # what the callable's return value counts
+
+
+@dataclass
+class CaseResult:
+    name: str
+    group: str
+    unit: str
+    timings: List[float]
+    items: int = 0
+    extra: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def stats(self) -> dict:
+        t = sorted(self.timings)
+        total = sum(t)
+        mean = total / len(t)
+        return {
+            "min": t[0],
+            "max": t[-1],
+            "mean": mean,
+            "median": statistics.median(t),
+            "stddev": statistics.stdev(t) if len(t) > 1 else 0.0,
+            "p95": t[min(len(t) - 1, int(round(0.95 * (len(t) - 1))))],
+            "rounds": len(t),
+            "total": total,
+            "ops": 1 / mean if mean else 0.0,
+            "items_per_second": self.items / total if total else 0.0,
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "group": self.group,
+            "unit": self.unit,
+            "stats": self.stats,
+            "extra_info": self.extra,
+        }
+
+
+# ── Registry ──────────────────────────────────────────────
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, group: str, unit: str = "ops"):
+    """Register an async-context-manager factory as a benchmark case."""
+    def decorator(factory):
+        CASES[name] = Case(name=name, group=group, factory=factory, unit=unit)
+        return factory
+    return decorator
+
+
+def select(patterns: Optional[List[str]]) -> List[Case]:
+    if not patterns:
+        return list(CASES.values())
+    return [c for c in CASES.values() if any(p in c.name for p in patterns)]
+
+
+# ── Running ───────────────────────────────────────────────
+
+@dataclass
+class RunConfig:
+    min_rounds: int = 5
+    max_rounds: int = 1000
+    max_time: float = 2.0       # seconds of timed work per case
+    warmup_rounds: int = 1
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+async def _call(fn: Callable) -> int:
+    result = fn()
+    if inspect.isawaitable(result):
+        result = await result
+    return result if isinstance(result, int) else 1
+
+
+async def run_case(c: Case, config: RunConfig) -> CaseResult:
+    async with c.factory(**config.params) as fn:
+        for _ in range(config.warmup_rounds):
+            await _call(fn)
+        timings: List[float] = []
+        items = 0
+        budget_end = time.perf_counter() + config.max_time
+        while len(timings) < config.max_rounds:
+            start = time.perf_counter()
+            items += await _call(fn)
+            timings.append(time.perf_counter() - start)
+            if len(timings) >= config.min_rounds and time.perf_counter() >= budget_end:
+                break
+    return CaseResult(name=c.name, group=c.group, unit=c.unit, timings=timings, items=items)
+
+
+async def run_all(cases: List[Case], config: RunConfig) -> List[CaseResult]:
+    results = []
+    for c in cases:
+        results.append(await run_case(c, config))
+    return results
+
+
+def run(cases: List[Case], config: RunConfig) -> List[CaseResult]:
+    return asyncio.run(run_all(cases, config))
+
+
+# ── Reporting ─────────────────────────────────────────────
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def commit_info() -> dict:
+    return {
+        "id": _git("rev-parse", "HEAD"),
+        "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def machine_info() -> dict:
+    return {
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def to_report(results: List[CaseResult], config: RunConfig) -> dict:
+    return {
+        "machine_info": machine_info(),
+        "commit_info": commit_info(),
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "params": {k: str(v) for k, v in config.params.items()},
+        "benchmarks": [r.as_dict() for r in results],
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.15) -> List[dict]:
+    """
+    Compare median timings by benchmark name. Returns one row per shared
+    benchmark; `regressed` is True when the current median is more than
+    `threshold` (fractional) slower than the baseline.
+    """
+    before = {b["name"]: b["stats"] for b in baseline.get("benchmarks", [])}
+    rows = []
+    for bench in current.get("benchmarks", []):
+        old = before.get(bench["name"])
+        if old is None or not old["median"]:
+            continue
+        change = bench["stats"]["median"] / old["median"] - 1
+        rows.append({
+            "name": bench["name"],
+            "baseline_median": old["median"],
+            "median": bench["stats"]["median"],
+            "change": change,
+            "regressed": change > threshold,
+        })
+    return rows
+
+
+def format_table(results: List[CaseResult]) -> str:
+    lines = [f"{'benchmark':<44} {'median':>11} {'p95':>11} {'rounds':>7} {'items/s':>11}"]
+    for r in results:
+        s = r.stats
+        lines.append(
+            f"{r.name:<44} {s['median'] * 1000:>9.3f}ms {s['p95'] * 1000:>9.3f}ms "
+            f"{s['rounds']:>7} {s['items_per_second']:>9.1f} {r.unit}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Starlette's GZipMiddleware compresses whenever the header contains the
+substring "gzip", so `gzip;q=0` — an explicit refusal — still gets a
+gzip body. `accepts_gzip` reads the header as coding/q pairs (RFC 9110
+§12.5.3): gzip (or its alias x-gzip) is acceptable when its q is above
+zero, or when it is not listed and a `*` entry has q above zero.
+"""
+
+from typing import Optional
+
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import Receive, Scope, Send
+
+
+def _qualities(accept_encoding: str) -> dict:
+    """coding → q for each entry; a malformed q counts as 0."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    return qualities
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    if not accept_encoding:
+        return False
+    qualities = _qualities(accept_encoding)
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+class NegotiatingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that honours q-values in Accept-Encoding."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(Headers(scope=scope).get("Accept-Encoding")):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
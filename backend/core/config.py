@@ -37,11 +37,18 @@ class Settings(BaseSettings):
     )
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0           # seconds a checkout waits before failing
+    DATABASE_POOL_RECYCLE: int = 3600             # reconnect connections older than this
     DATABASE_ECHO: bool = False
+    DATABASE_REPLICA_URL: str = ""                # read-only endpoints use it when set (else the primary)
+    DATABASE_REPLICA_POOL_SIZE: int = 10
+    DATABASE_REPLICA_MAX_OVERFLOW: int = 20
 
     # ── Redis ────────────────────────────────────────
     REDIS_URL: str = "redis://localhost:6379"
     CACHE_TTL_SECONDS: int = 3600
+    EVALUATION_CACHE_SIZE: int = 1024             # completed evaluations kept serialized in process
+    EVALUATION_CACHE_REDIS: bool = False          # also share them across workers via REDIS_URL
 
     # ── Security ─────────────────────────────────────
     SECRET_KEY: str = "dev-secret-key-change-in-production"
@@ -53,6 +60,9 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     GOOGLE_API_KEY: str = ""
 
+    # ── Model Registry ───────────────────────────────
+    MODEL_REGISTRY_PATH: str = ""       # empty → bundled core/models.json
+
     # ── Evaluation ───────────────────────────────────
     DEFAULT_MAX_TOKENS: int = 1024
     DEFAULT_TEMPERATURE: float = 0.3
@@ -63,12 +73,92 @@ class Settings(BaseSettings):
     JUDGE_MODEL: str = "gpt-4o"
     JUDGE_TEMPERATURE: float = 0.0
 
+    # ── Mock Provider (load testing) ─────────────────
+    MOCK_LLM_ENABLED: bool = False      # serve every model and the judge locally
+    MOCK_SEED: int = 0
+    MOCK_LATENCY_DISTRIBUTION: str = "lognormal"   # fixed | uniform | normal | lognormal
+    MOCK_LATENCY_MS_MEAN: float = 800.0            # time to first token
+    MOCK_LATENCY_MS_STDDEV: float = 300.0
+    MOCK_TOKENS_PER_SECOND: float = 80.0
+    MOCK_RESPONSE_TOKENS: int = 200
+    MOCK_ERROR_RATE: float = 0.0
+
+    # ── Circuit Breaker ──────────────────────────────
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_WINDOW_SECONDS: int = 60
+    CIRCUIT_MIN_CALLS: int = 5
+    CIRCUIT_ERROR_RATE_THRESHOLD: float = 0.5
+    CIRCUIT_SLOW_CALL_MS: int = 30000
+    CIRCUIT_SLOW_RATE_THRESHOLD: float = 0.8
+    CIRCUIT_OPEN_SECONDS: int = 30
+    CIRCUIT_PROBE_INTERVAL_SECONDS: int = 10
+
+    # ── Provider Availability ────────────────────────
+    AVAILABILITY_PROBE_INTERVAL_SECONDS: int = 300
+    AVAILABILITY_LIVENESS_CHECK: bool = False     # paid 1-token call per provider per interval; key/package checks only when off
+
     # ── Rate Limiting ────────────────────────────────
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_EVALS_PER_HOUR: int = 100
 
+    # ── Batches ──────────────────────────────────────
+    BATCH_MAX_EVALUATIONS: int = 10_000           # per POST /evaluations/batch
+    BATCH_CONCURRENCY: int = 16                   # pipelines running at once, across all batches
+
+    # ── Export ───────────────────────────────────────
+    EXPORT_BATCH_SIZE: int = 1000                 # rows fetched per server-side cursor partition
+
+    # ── Benchmark import ─────────────────────────────
+    BENCHMARK_IMPORT_BATCH_SIZE: int = 5000       # prompts per COPY / executemany
+    BENCHMARK_RUN_CONCURRENCY: int = 8            # prompts evaluated at once, across all benchmark runs
+    STATS_BOOTSTRAP_SAMPLES: int = 500            # replicates behind benchmark summary CIs
+
+    # ── Ratings ──────────────────────────────────────
+    RATING_ELO_K: float = 16.0                    # online Elo step per battle
+    RATING_REFIT_INTERVAL_SECONDS: float = 0.0    # batch Bradley-Terry refit; 0 = only on demand
+
+    # ── Prompt index ─────────────────────────────────
+    PROMPT_INDEX_PATH: str = ""                   # <path>.npz + <path>.log; "" = memory only, rebuilt at startup
+    PROMPT_INDEX_CHECKPOINT_EVERY: int = 100_000  # logged inserts before a fresh snapshot is written
+    PROMPT_SIMILARITY_THRESHOLD: float = 0.8      # default for near-duplicate lookups
+
+    # ── Response blobs ───────────────────────────────
+    BLOB_STORE: str = "database"                  # database | local (files under BLOB_STORE_PATH)
+    BLOB_STORE_PATH: str = "./data/blobs"
+    BLOB_CODEC: str = "zstd"                      # zstd (gzip without the zstandard package) | gzip | raw
+    BLOB_COMPRESS_MIN_BYTES: int = 512            # smaller payloads are stored uncompressed
+    BLOB_FRAME_CHARS: int = 8192                  # longer texts are compressed in frames; ranged reads fetch only theirs
+    BLOB_SWEEP_GRACE_SECONDS: float = 3600.0      # unreferenced blobs/files younger than this are kept (writes in flight)
+    BLOB_SWEEP_INTERVAL_SECONDS: float = 0.0      # background sweep of unreferenced blobs; 0 = only the sweep_blobs script
+
+    # ── Search ───────────────────────────────────────
+    SEARCH_BACKEND: str = "auto"                  # postgres | memory | auto (postgres when DATABASE_URL is)
+
+    # ── Compression ──────────────────────────────────
+    GZIP_MINIMUM_SIZE: int = 500                  # Arabic UTF-8 is 2 bytes/char and compresses well
+    GZIP_COMPRESS_LEVEL: int = 6                  # ~level 9 ratio at a third of the CPU
+
     # ── Logging ──────────────────────────────────────
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+
+    # ── Metrics ──────────────────────────────────────
+    METRICS_ENABLED: bool = True                  # GET /metrics + HTTP latency middleware
+
+    # ── Tracing ──────────────────────────────────────
+    TRACING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "none"                # none | memory | log
+    TRACING_TIMELINE_RETENTION: int = 1000        # traces kept for /evaluations/{id}/timeline
+    TRACING_TIMELINE_MAX_SPANS: int = 500         # spans kept per trace; the rest are only counted
+
+    # ── Profiling ────────────────────────────────────
+    PROFILER_MAX_SECONDS: float = 60.0            # cap for POST /admin/profile
+    PROFILER_DEFAULT_INTERVAL_MS: float = 5.0
+    ASYNCIO_SLOW_CALLBACK_MS: float = 0.0         # >0 logs event-loop steps slower than this
+    LOOP_WATCHDOG_ENABLED: bool = True            # lag metric + blocking-stack logging
+    LOOP_WATCHDOG_INTERVAL_MS: float = 100.0
+    LOOP_BLOCK_THRESHOLD_MS: float = 250.0
+    LOOP_BLOCK_LOG_INTERVAL_SECONDS: float = 10.0
 
     @field_validator("ALLOWED_ORIGINS", mode="before")
     @classmethod
@@ -84,7 +174,7 @@ class Settings(BaseSettings):
     @property
     def sync_database_url(self) -> str:
         """Synchronous URL used only by Alembic."""
-        return self.DATABASE_URL.replace("+asyncpg", "")
+        return self.DATABASE_URL.replace("+asyncpg", "").replace("+aiosqlite", "")
 
 
 @lru_cache
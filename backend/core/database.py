@@ -1,32 +1,75 @@
 """
-Async SQLAlchemy database engine + session factory.
+Async SQLAlchemy database engines + session factories.
 Uses asyncpg driver for high-throughput async queries.
+
+Writes go to the primary (DATABASE_URL). Read-only endpoints take their
+session from `get_read_db`, which uses DATABASE_REPLICA_URL when set —
+a streaming replica, so read traffic scales apart from the writer that
+handles pipeline commits — and the primary otherwise. Read sessions are
+never committed. Replicas lag the primary slightly; endpoints that read
+back what the same client just wrote (batch and benchmark run progress)
+stay on get_db.
 """
 
+import time
 from typing import AsyncGenerator
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine, instrument_pool, record_pool_wait
+
+
+# ── Engines ───────────────────────────────────────────────
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited, labelled by its logging name."""
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            record_pool_wait(self.logging_name, time.perf_counter() - start, timed_out)
+
 
+def make_engine(url: str, name: str, pool_size: int, max_overflow: int):
+    """An instrumented engine; `name` labels its pool metrics."""
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        poolclass=TimedQueuePool,
+        pool_logging_name=name,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_pre_ping=True,                          # test connections before use
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    )
+    instrument_engine(new_engine)
+    instrument_pool(new_engine, name)
+    return new_engine
 
-# ── Engine ────────────────────────────────────────────────
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_pre_ping=True,          # test connections before use
-    pool_recycle=3600,           # recycle after 1 hour
+
+engine = make_engine(
+    settings.DATABASE_URL, "primary", settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW,
 )
+read_engine = make_engine(
+    settings.DATABASE_REPLICA_URL, "replica",
+    settings.DATABASE_REPLICA_POOL_SIZE, settings.DATABASE_REPLICA_MAX_OVERFLOW,
+) if settings.DATABASE_REPLICA_URL else engine
 
 
-# ── Session factory ───────────────────────────────────────
+# ── Session factories ─────────────────────────────────────
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -34,6 +77,17 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
     autocommit=False,
 )
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
+
+
+def has_replica() -> bool:
+    return read_engine is not engine
 
 
 # ── Base model ────────────────────────────────────────────
@@ -59,6 +113,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only endpoints: a session on the replica
+    (or the primary without one). Never committed — closing it rolls the
+    transaction back, so anything written through it is discarded.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 # ── Lifecycle helpers ─────────────────────────────────────
 async def create_tables() -> None:
     """Create all tables. Used in tests; prefer Alembic for production."""
@@ -34,12 +34,106 @@ class EvaluationNotFoundError(AppException):
         )
 
 
+class BatchNotFoundError(AppException):
+    def __init__(self, batch_id: str):
+        super().__init__(
+            message=f"Evaluation batch '{batch_id}' not found.",
+            error_code="BATCH_NOT_FOUND",
+            status_code=404,
+        )
+
+
+class InvalidBatchError(AppException):
+    def __init__(self, message: str, errors: Optional[list] = None):
+        super().__init__(
+            message=message,
+            error_code="INVALID_BATCH",
+            status_code=422,
+            detail={"errors": errors or []},
+        )
+
+
+class InvalidImportError(AppException):
+    def __init__(self, message: str, errors: Optional[list] = None):
+        super().__init__(
+            message=message,
+            error_code="INVALID_IMPORT",
+            status_code=422,
+            detail={"errors": errors or []},
+        )
+
+
+class ModelResponseNotFoundError(AppException):
+    def __init__(self, evaluation_id: str, model_id: str):
+        super().__init__(
+            message=f"No response from model '{model_id}' in evaluation '{evaluation_id}'.",
+            error_code="MODEL_RESPONSE_NOT_FOUND",
+            status_code=404,
+        )
+
+
+class TimelineNotFoundError(AppException):
+    def __init__(self, evaluation_id: str):
+        super().__init__(
+            message=f"No trace retained for evaluation '{evaluation_id}'.",
+            error_code="TIMELINE_NOT_FOUND",
+            status_code=404,
+        )
+
+
+class ProfilerBusyError(AppException):
+    def __init__(self):
+        super().__init__(
+            message="A profile is already running in this worker.",
+            error_code="PROFILER_BUSY",
+            status_code=409,
+        )
+
+
+class ExportFormatUnavailableError(AppException):
+    def __init__(self, fmt: str, package: str):
+        super().__init__(
+            message=f"Export format '{fmt}' needs the optional '{package}' package.",
+            error_code="EXPORT_FORMAT_UNAVAILABLE",
+            status_code=501,
+        )
+
+
 class ModelNotAvailableError(AppException):
-    def __init__(self, model_id: str):
+    def __init__(self, model_id: str, detail: Optional[Any] = None):
         super().__init__(
             message=f"Model '{model_id}' is not available or misconfigured.",
             error_code="MODEL_NOT_AVAILABLE",
             status_code=422,
+            detail=detail,
+        )
+
+
+class ModelsNotAvailableError(AppException):
+    """Several requested models rejected at once; `reasons` maps model id → reason."""
+
+    def __init__(self, reasons: dict):
+        names = ", ".join(f"'{m}'" for m in sorted(reasons))
+        message = (
+            f"Model {names} is not available or misconfigured."
+            if len(reasons) == 1
+            else f"Models {names} are not available or misconfigured."
+        )
+        super().__init__(
+            message=message,
+            error_code="MODEL_NOT_AVAILABLE",
+            status_code=422,
+            detail={"models": reasons},
+        )
+
+
+class InvalidFieldsError(AppException):
+    def __init__(self, unknown: list, allowed: list):
+        super().__init__(
+            message=f"Unknown fields: {', '.join(unknown)}",
+            error_code="INVALID_FIELDS",
+            status_code=422,
+            detail={"unknown": unknown, "allowed": allowed},
         )
 
 
@@ -79,6 +173,19 @@ class EvaluationTimeoutError(AppException):
         )
 
 
+class CircuitOpenError(AppException):
+    def __init__(self, provider: str, retry_after: int):
+        super().__init__(
+            message=(
+                f"Provider '{provider}' is temporarily unavailable "
+                f"(circuit open). Retry in {retry_after}s."
+            ),
+            error_code="PROVIDER_UNAVAILABLE",
+            status_code=503,
+            detail={"provider": provider, "retry_after_seconds": retry_after},
+        )
+
+
 class ScoringError(AppException):
     def __init__(self, reason: str):
         super().__init__(
@@ -0,0 +1,352 @@
+"""
+Prometheus metrics — metric definitions plus the small helpers used to
+record them from services and API modules.
+
+Recording is cheap: a label lookup plus a float add. Call sites record
+once per model call / query / request, never per streamed token; token
+counts are accumulated as plain ints and observed when the stream ends.
+
+prometheus_client is optional. Without it every metric is a no-op and
+/metrics returns 503. Set PROMETHEUS_MULTIPROC_DIR when running several
+worker processes so /metrics aggregates across them.
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from app.schemas.evaluation import VALID_DIALECTS
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+    METRICS_AVAILABLE = True
+except ImportError:                                    # pragma: no cover
+    prometheus_client = None
+    METRICS_AVAILABLE = False
+
+
+class _NoopMetric:
+    """Stands in for every metric type when prometheus_client is absent."""
+
+    def __init__(self, *_, **__):
+        pass
+
+    def labels(self, *_, **__):
+        return self
+
+    def observe(self, *_):
+        pass
+
+    def inc(self, *_):
+        pass
+
+    def dec(self, *_):
+        pass
+
+    def set(self, *_):
+        pass
+
+
+if not METRICS_AVAILABLE:                              # pragma: no cover
+    Counter = Gauge = Histogram = _NoopMetric
+
+
+# ── Buckets ───────────────────────────────────────────────
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+CPU_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TPS_BUCKETS = (5, 10, 20, 40, 80, 160, 320, 640)
+
+# ── Metrics ───────────────────────────────────────────────
+MODEL_LATENCY = Histogram(
+    "llm_eval_model_latency_seconds", "Model call latency (full response or time to last token).",
+    ["provider", "model", "dialect", "outcome"], buckets=LLM_BUCKETS,
+)
+MODEL_TOKENS_PER_SECOND = Histogram(
+    "llm_eval_model_tokens_per_second", "Output tokens per second per successful model call.",
+    ["provider", "model"], buckets=TPS_BUCKETS,
+)
+MODEL_TOKENS = Counter(
+    "llm_eval_model_tokens", "Tokens consumed by model calls.",
+    ["provider", "model", "direction"],
+)
+MODEL_COST = Counter(
+    "llm_eval_model_cost_usd", "Estimated spend on model calls in USD.",
+    ["provider", "model", "dialect"],
+)
+JUDGE_LATENCY = Histogram(
+    "llm_eval_judge_latency_seconds", "LLM-as-Judge scoring call latency.",
+    ["provider", "model", "outcome"], buckets=LLM_BUCKETS,
+)
+ANALYZER_CPU = Histogram(
+    "llm_eval_analyzer_cpu_seconds", "CPU time spent in ArabicAnalyzer.analyze.",
+    ["dialect"], buckets=CPU_BUCKETS,
+)
+DB_QUERY = Histogram(
+    "llm_eval_db_query_seconds", "Database statement execution time.",
+    ["operation"], buckets=DB_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "llm_eval_db_pool_wait_seconds", "Time a checkout waited for a pooled connection (including connecting).",
+    ["pool"], buckets=DB_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "llm_eval_db_pool_timeouts", "Checkouts that gave up after DATABASE_POOL_TIMEOUT.",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "llm_eval_db_pool_checked_out", "Pooled connections currently in use.",
+    ["pool"], multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "llm_eval_db_pool_overflow", "Open connections beyond pool_size (bounded by max_overflow).",
+    ["pool"], multiprocess_mode="livesum",
+)
+HTTP_LATENCY = Histogram(
+    "llm_eval_http_request_seconds", "HTTP request latency by route template.",
+    ["method", "route", "status"], buckets=HTTP_BUCKETS,
+)
+PIPELINE_DURATION = Histogram(
+    "llm_eval_pipeline_seconds", "Wall time of the background evaluation pipeline.",
+    buckets=LLM_BUCKETS,
+)
+EVALUATION_QUEUE = Gauge(
+    "llm_eval_evaluation_queue_depth", "Evaluations currently in the background pipeline.",
+    multiprocess_mode="livesum",
+)
+BATCH_BACKLOG = Gauge(
+    "llm_eval_batch_backlog", "Batch evaluations waiting for a concurrency slot.",
+    multiprocess_mode="livesum",
+)
+ACTIVE_STREAMS = Gauge(
+    "llm_eval_active_streams", "Model streams currently open over WebSocket.",
+    multiprocess_mode="livesum",
+)
+EVENT_LOOP_LAG = Histogram(
+    "llm_eval_event_loop_lag_seconds", "How late the event-loop watchdog woke up.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "llm_eval_event_loop_blocked", "Stalls where the event loop stayed blocked past the threshold.",
+)
+CACHE_REQUESTS = Counter(
+    "llm_eval_cache_requests", "Cache lookups by cache and result (hit/miss).",
+    ["cache", "result"],
+)
+
+
+# ── Label helpers ─────────────────────────────────────────
+
+def dialect_label(dialect: Optional[str]) -> str:
+    """Clamp client-supplied dialects to the known set to bound cardinality."""
+    return dialect if dialect in VALID_DIALECTS else "other"
+
+
+_SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+def _sql_operation(statement: str) -> str:
+    head = statement.lstrip()[:8].split(None, 1)
+    op = head[0].upper() if head else ""
+    return op if op in _SQL_OPERATIONS else "OTHER"
+
+
+# ── Recording helpers ─────────────────────────────────────
+
+@contextmanager
+def timed(metric, clock=time.perf_counter, **labels):
+    """Observe the elapsed time of the block on `metric`."""
+    start = clock()
+    try:
+        yield
+    finally:
+        elapsed = clock() - start
+        (metric.labels(**labels) if labels else metric).observe(elapsed)
+
+
+def cpu_timed(metric, **labels):
+    """Like `timed`, but measures CPU time of the current thread."""
+    return timed(metric, clock=time.thread_time, **labels)
+
+
+def observe_duration(metric, **labels):
+    """Decorator form of `timed` for sync and async functions with fixed labels."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timed(metric, **labels):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(metric, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def track_in_progress(gauge):
+    """Decorator: hold `gauge` incremented while the async function runs."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            gauge.inc()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                gauge.dec()
+        return wrapper
+    return decorator
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_model_call(
+    provider: str,
+    model: str,
+    dialect: str,
+    outcome: str,
+    seconds: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cost_usd: float = 0.0,
+) -> None:
+    """One observation per model call, streamed or not."""
+    dialect = dialect_label(dialect)
+    MODEL_LATENCY.labels(provider=provider, model=model, dialect=dialect, outcome=outcome).observe(seconds)
+    if outcome != "ok":
+        return
+    if input_tokens:
+        MODEL_TOKENS.labels(provider=provider, model=model, direction="input").inc(input_tokens)
+    if output_tokens:
+        MODEL_TOKENS.labels(provider=provider, model=model, direction="output").inc(output_tokens)
+        if seconds > 0:
+            MODEL_TOKENS_PER_SECOND.labels(provider=provider, model=model).observe(output_tokens / seconds)
+    if cost_usd:
+        MODEL_COST.labels(provider=provider, model=model, dialect=dialect).inc(cost_usd)
+
+
+# ── Database instrumentation ──────────────────────────────
+
+def instrument_engine(engine) -> None:
+    """Time every statement executed through `engine` (sync or async)."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if starts:
+            DB_QUERY.labels(operation=_sql_operation(statement)).observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+def record_pool_wait(pool: str, seconds: float, timed_out: bool = False) -> None:
+    DB_POOL_WAIT.labels(pool=pool).observe(seconds)
+    if timed_out:
+        DB_POOL_TIMEOUTS.labels(pool=pool).inc()
+
+
+def instrument_pool(engine, pool: str) -> None:
+    """
+    Keep the checked-out and overflow gauges of `engine`'s pool current.
+    Counted from pool events rather than read from the pool, so the
+    values stay right across pool recreation and per-process sums work
+    in multiprocess mode. Wait time is recorded by the pool class itself
+    (see core/database.py), as no event fires before a checkout.
+    """
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    size = sync_engine.pool.size()
+    opened = 0
+
+    def _opened(delta):
+        def handler(*_):
+            nonlocal opened
+            opened += delta
+            DB_POOL_OVERFLOW.labels(pool=pool).set(max(opened - size, 0))
+        return handler
+
+    def _in_use(delta):
+        def handler(*_):
+            DB_POOL_CHECKED_OUT.labels(pool=pool).inc(delta)
+        return handler
+
+    event.listen(sync_engine, "connect", _opened(1))
+    event.listen(sync_engine, "close", _opened(-1))
+    event.listen(sync_engine, "close_detached", _opened(-1))
+    event.listen(sync_engine, "checkout", _in_use(1))
+    event.listen(sync_engine, "checkin", _in_use(-1))
+    event.listen(sync_engine, "detach", _in_use(-1))
+
+
+# ── HTTP middleware ───────────────────────────────────────
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency by route template
+    (e.g. /api/v1/evaluations/{evaluation_id}) so label cardinality stays
+    bounded. WebSocket and lifespan traffic passes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            ).observe(time.perf_counter() - start)
+
+
+# ── Exposition ────────────────────────────────────────────
+
+def render() -> Tuple[bytes, str]:
+    """Return (body, content_type) in the Prometheus text format."""
+    if not METRICS_AVAILABLE:
+        raise RuntimeError("prometheus_client is not installed")
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
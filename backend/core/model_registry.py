@@ -0,0 +1,127 @@
+"""
+Model registry — the single source of truth for supported models.
+Loaded once at startup from a JSON config file (MODEL_REGISTRY_PATH, or the
+bundled core/models.json) and indexed by model ID. Request validation,
+provider dispatch, pricing and the /models endpoints all read from here,
+so adding a model is a config change.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = Path(__file__).with_name("models.json")
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """How to construct a LangChain chat model for one provider."""
+    key: str
+    module: str
+    class_name: str
+    api_key_setting: Optional[str] = None     # Settings attribute holding the key
+    api_key_kwarg: Optional[str] = None       # constructor kwarg the key is passed as
+
+    @property
+    def api_key(self) -> Optional[str]:
+        if not self.api_key_setting:
+            return None
+        return getattr(settings, self.api_key_setting, "") or None
+
+    @property
+    def is_configured(self) -> bool:
+        """False when the provider needs an API key that is not set."""
+        return self.api_key_setting is None or self.api_key is not None
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    id: str
+    name: str
+    provider: str                             # display name, e.g. "OpenAI"
+    provider_key: str                         # dispatch / circuit-breaker key
+    tier: str
+    description: str
+    context_window: int
+    max_output_tokens: int
+    cost_per_1k_input_usd: float
+    cost_per_1k_output_usd: float
+    supports_arabic: bool = True
+    arabic_native: bool = False
+    api_model: Optional[str] = None           # upstream model name if different from id
+
+    @property
+    def upstream_model(self) -> str:
+        return self.api_model or self.id
+
+
+@dataclass
+class ModelRegistry:
+    models: Dict[str, ModelSpec] = field(default_factory=dict)
+    providers: Dict[str, ProviderSpec] = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ModelRegistry":
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        return cls.from_dict(raw)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "ModelRegistry":
+        providers = {
+            key: ProviderSpec(key=key, **spec)
+            for key, spec in raw.get("providers", {}).items()
+        }
+        models: Dict[str, ModelSpec] = {}
+        for entry in raw.get("models", []):
+            spec = ModelSpec(**entry)
+            if spec.id in models:
+                raise ValueError(f"Duplicate model id in registry: {spec.id}")
+            models[spec.id] = spec
+        return cls(models=models, providers=providers)
+
+    # ── Lookups (all O(1)) ─────────────────────────────────
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self.models
+
+    def get(self, model_id: str) -> Optional[ModelSpec]:
+        return self.models.get(model_id)
+
+    def provider_for(self, model_id: str) -> Optional[ProviderSpec]:
+        spec = self.models.get(model_id)
+        return self.providers.get(spec.provider_key) if spec else None
+
+    def provider_key(self, model_id: str) -> str:
+        spec = self.models.get(model_id)
+        return spec.provider_key if spec else "unknown"
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self.models)
+
+    def all(self) -> List[ModelSpec]:
+        return list(self.models.values())
+
+    def cheapest_for_provider(self, provider_key: str) -> Optional[ModelSpec]:
+        """Lowest output-cost model of a provider (used for liveness probes)."""
+        candidates = [m for m in self.models.values() if m.provider_key == provider_key]
+        return min(candidates, key=lambda m: m.cost_per_1k_output_usd, default=None)
+
+
+def load_registry() -> ModelRegistry:
+    path = Path(settings.MODEL_REGISTRY_PATH) if settings.MODEL_REGISTRY_PATH else DEFAULT_REGISTRY_PATH
+    registry = ModelRegistry.from_file(path)
+    logger.info("Loaded %d models / %d providers from %s",
+                len(registry.models), len(registry.providers), path)
+    return registry
+
+
+# Module-level singleton
+model_registry = load_registry()
@@ -0,0 +1,367 @@
+"""
+Profiling — a stdlib sampling profiler and an asyncio slow-callback
+detector, both safe to switch on in a production worker.
+
+SamplingProfiler runs a daemon thread that reads `sys._current_frames()`
+every `interval` seconds and counts whole stacks. The profiled threads
+are never paused or traced, so overhead scales with the sampling rate,
+not with the work being done. Output is the collapsed-stack format
+(`frame;frame;frame count` per line), which flamegraph.pl, speedscope
+and inferno read directly.
+
+SlowCallbackDetector wraps `asyncio.Handle._run` so that any single
+event-loop step longer than a threshold is logged with the callback that
+ran, rate-limited. It costs two perf_counter calls per loop step and
+avoids the much heavier `loop.set_debug(True)`. (Not effective under
+uvloop, whose handles are implemented in C.)
+
+LoopWatchdog is always on: a task that sleeps for a fixed interval and
+records how late it wakes up (event-loop lag), plus a thread that notices
+when that task stops beating and logs the event-loop thread's current
+stack — i.e. the sync code that is blocking every request in the worker.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.exceptions import ProfilerBusyError
+from app.core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def collapse_stack(frame, thread_name: str, limit: int = 128) -> str:
+    """Root-first `thread;file:func;...` string for one sampled frame."""
+    labels: List[str] = []
+    while frame is not None and len(labels) < limit:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+@dataclass
+class ProfileResult:
+    stacks: Counter
+    samples: int
+    duration_s: float
+    interval_s: float
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, n: int = 25) -> List[dict]:
+        """Self and total sample counts per function (leaf = self)."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]         # drop the thread name
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for fn in set(frames):
+                total_counts[fn] += count
+        return [
+            {
+                "function": fn,
+                "self_samples": self_counts[fn],
+                "total_samples": total,
+                "self_pct": round(100 * self_counts[fn] / self.samples, 2) if self.samples else 0.0,
+                "total_pct": round(100 * total / self.samples, 2) if self.samples else 0.0,
+            }
+            for fn, total in sorted(total_counts.items(), key=lambda kv: -self_counts[kv[0]])[:n]
+        ]
+
+    def as_dict(self, top: int = 25) -> dict:
+        return {
+            "samples": self.samples,
+            "duration_s": round(self.duration_s, 3),
+            "interval_ms": round(self.interval_s * 1000, 3),
+            "distinct_stacks": len(self.stacks),
+            "top_functions": self.top_functions(top),
+        }
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of `thread_ids` (default: every thread except the
+    sampler) from a background thread. Use as a context manager or call
+    start()/stop().
+    """
+
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    def _thread_names(self) -> Dict[int, str]:
+        return {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = self._thread_names()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                if ident not in names:
+                    names = self._thread_names()
+                self._stacks[collapse_stack(frame, names.get(ident, f"thread-{ident}"))] += 1
+            self._samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> ProfileResult:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._stopped_at = time.perf_counter()
+        return self.result()
+
+    def result(self) -> ProfileResult:
+        return ProfileResult(
+            stacks=Counter(self._stacks),
+            samples=self._samples,
+            duration_s=(self._stopped_at or time.perf_counter()) - self._started_at,
+            interval_s=self.interval,
+        )
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# One profile per process at a time — concurrent samplers would skew each other.
+_profile_lock = threading.Lock()
+
+
+async def profile_for(
+    seconds: float,
+    interval: float,
+    thread_ids: Optional[Iterable[int]] = None,
+) -> ProfileResult:
+    """Profile this process for `seconds` without blocking the event loop."""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError()
+    try:
+        profiler = SamplingProfiler(interval=interval, thread_ids=thread_ids).start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = profiler.stop()
+    finally:
+        _profile_lock.release()
+    logger.info(
+        "Profile captured: %d samples over %.1fs (%d distinct stacks)",
+        result.samples, result.duration_s, len(result.stacks),
+    )
+    return result
+
+
+# ── Slow asyncio callbacks ────────────────────────────────
+
+class SlowCallbackDetector:
+    """Logs event-loop steps that run longer than `threshold_ms`."""
+
+    def __init__(self, min_log_interval: float = 1.0):
+        self.threshold_s: Optional[float] = None
+        self.min_log_interval = min_log_interval
+        self.slow_count = 0
+        self.suppressed = 0
+        self._last_log = 0.0
+        self._original_run = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._original_run is not None
+
+    def install(self, threshold_ms: float) -> None:
+        self.threshold_s = threshold_ms / 1000
+        if self._original_run is not None:
+            return
+        original = asyncio.events.Handle._run
+        detector = self
+
+        def _timed_run(handle):
+            threshold = detector.threshold_s      # uninstall() may run inside this step
+            start = time.perf_counter()
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.perf_counter() - start
+                if threshold is not None and elapsed >= threshold:
+                    detector._report(handle, elapsed)
+
+        self._original_run = original
+        asyncio.events.Handle._run = _timed_run
+
+    def uninstall(self) -> None:
+        if self._original_run is not None:
+            asyncio.events.Handle._run = self._original_run
+            self._original_run = None
+        self.threshold_s = None
+
+    def _report(self, handle, elapsed: float) -> None:
+        self.slow_count += 1
+        now = time.monotonic()
+        if now - self._last_log < self.min_log_interval:
+            self.suppressed += 1
+            return
+        self._last_log = now
+        suppressed, self.suppressed = self.suppressed, 0
+        logger.warning(
+            "Slow event-loop step: %.1fms in %s%s",
+            elapsed * 1000, _describe_handle(handle),
+            f" ({suppressed} more suppressed)" if suppressed else "",
+        )
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_s * 1000 if self.threshold_s is not None else None,
+            "slow_callbacks": self.slow_count,
+        }
+
+
+def _describe_handle(handle) -> str:
+    """Name the coroutine a Task step ran, or fall back to the callback repr."""
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        code = getattr(coro, "cr_code", None)
+        if code is not None:
+            name = getattr(code, "co_qualname", code.co_name)
+            return f"task {task.get_name()} {name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return f"task {task.get_name()}"
+    return repr(handle)
+
+
+# ── Event-loop watchdog ───────────────────────────────────
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag every `interval` seconds and, when the loop
+    stays blocked for `threshold` seconds, logs the blocking stack once
+    per stall (rate-limited to one line per `min_log_interval`).
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        min_log_interval: float = 10.0,
+        max_frames: int = 25,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.min_log_interval = min_log_interval
+        self.max_frames = max_frames
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self.suppressed = 0
+        self.running = False
+        self._beat = time.monotonic()
+        self._last_log = 0.0
+
+    async def run(self) -> None:
+        """Run until cancelled; start it from the lifespan."""
+        loop_thread = threading.get_ident()
+        stop = threading.Event()
+        watcher = threading.Thread(
+            target=self._watch, args=(loop_thread, stop), name="loop-watchdog", daemon=True,
+        )
+        self._beat = time.monotonic()
+        self.running = True
+        watcher.start()
+        try:
+            while True:
+                start = time.monotonic()
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                lag = max(0.0, now - start - self.interval)
+                self._beat = now
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                EVENT_LOOP_LAG.observe(lag)
+        finally:
+            self.running = False
+            stop.set()
+            watcher.join()
+
+    def _watch(self, loop_thread: int, stop: threading.Event) -> None:
+        reported_beat = None
+        while not stop.wait(self.threshold / 4):
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            self._report(stalled, sys._current_frames().get(loop_thread))
+
+    def _report(self, stalled: float, frame) -> None:
+        self.blocked_count += 1
+        EVENT_LOOP_BLOCKED.inc()
+        now = time.monotonic()
+        if now - self._last_log < self.min_log_interval:
+            self.suppressed += 1
+            return
+        self._last_log = now
+        suppressed, self.suppressed = self.suppressed, 0
+        stack = "".join(traceback.format_stack(frame)[-self.max_frames:]) if frame is not None else "  <unavailable>\n"
+        logger.warning(
+            "Event loop blocked for %.0fms%s; event-loop thread is in:\n%s",
+            stalled * 1000,
+            f" ({suppressed} earlier stalls not logged)" if suppressed else "",
+            stack.rstrip(),
+        )
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "blocked_count": self.blocked_count,
+        }
+
+
+def build_loop_watchdog() -> LoopWatchdog:
+    return LoopWatchdog(
+        interval=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+        threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+        min_log_interval=settings.LOOP_BLOCK_LOG_INTERVAL_SECONDS,
+    )
+
+
+# Module-level singletons
+slow_callbacks = SlowCallbackDetector()
+loop_watchdog = build_loop_watchdog()
@@ -0,0 +1,315 @@
+"""
+Tracing — lightweight spans for the evaluation pipeline.
+
+The span model follows OpenTelemetry: 128-bit trace ids, 64-bit span ids,
+parent links, attributes, status, and W3C `traceparent` propagation. A
+request that arrives with a `traceparent` header joins the caller's
+trace. The current span lives in a contextvar, so children created
+inside `asyncio.gather` / `create_task` attach to the right parent.
+Background work gets its parent passed explicitly as a SpanContext.
+
+Finished spans go to the configured exporter:
+    none    — discard (default)
+    memory  — keep in a list; used by tests
+    log     — one JSON log line per span, for log-based collectors
+
+Independently of the exporter, the most recent TRACING_TIMELINE_RETENTION
+traces are kept in process (up to TRACING_TIMELINE_MAX_SPANS spans each),
+indexed by their spans' `evaluation.id` attribute, and served by
+GET /evaluations/{id}/timeline. With several
+workers a timeline lives in the worker that ran the pipeline.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_UNSET = "unset"
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+EVALUATION_ID = "evaluation.id"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C traceparent header; None if absent or malformed."""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if not match or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return SpanContext(trace_id=match.group(1), span_id=match.group(2))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    links: List[SpanContext] = field(default_factory=list)       # related spans in other traces
+    status: str = STATUS_UNSET
+    status_message: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        self.status = status
+        self.status_message = message
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "links": [{"trace_id": link.trace_id, "span_id": link.span_id} for link in self.links],
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled — every method is a no-op."""
+
+    context = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ── Exporters ─────────────────────────────────────────────
+
+class NoopExporter:
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemoryExporter:
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def by_name(self, name: str) -> List[Span]:
+        return [s for s in self.spans if s.name == name]
+
+
+class LogExporter:
+    def __init__(self):
+        self._logger = logging.getLogger("app.tracing.spans")
+
+    def export(self, span: Span) -> None:
+        self._logger.info(json.dumps(span.as_dict(), ensure_ascii=False, default=str))
+
+
+EXPORTERS = {"none": NoopExporter, "memory": InMemoryExporter, "log": LogExporter}
+
+
+# ── Per-evaluation timelines ──────────────────────────────
+
+class TimelineStore:
+    """
+    Bounded LRU of trace id → finished spans, indexed by evaluation id.
+    Each trace keeps at most `max_spans` spans; later ones are counted,
+    not stored, and no longer refresh the trace's place in the LRU.
+    """
+
+    def __init__(self, capacity: int, max_spans: int = 500):
+        self.capacity = capacity
+        self.max_spans = max_spans
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._dropped: Dict[str, int] = {}
+        self._by_evaluation: Dict[str, str] = {}
+        self._evaluations: Dict[str, Set[str]] = {}       # trace id → evaluation ids, for eviction
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        trace_id = span.context.trace_id
+        with self._lock:
+            evaluation_id = span.attributes.get(EVALUATION_ID)
+            if evaluation_id is not None:
+                self._index(str(evaluation_id), trace_id)
+            spans = self._traces.setdefault(trace_id, [])
+            if len(spans) >= self.max_spans:
+                self._dropped[trace_id] = self._dropped.get(trace_id, 0) + 1
+                return
+            spans.append(span)
+            self._traces.move_to_end(trace_id)
+            if len(self._traces) > self.capacity:
+                evicted, _ = self._traces.popitem(last=False)
+                self._dropped.pop(evicted, None)
+                for key in self._evaluations.pop(evicted, ()):
+                    del self._by_evaluation[key]
+
+    def _index(self, evaluation_id: str, trace_id: str) -> None:
+        previous = self._by_evaluation.get(evaluation_id)
+        if previous == trace_id:
+            return
+        if previous is not None:
+            self._evaluations[previous].discard(evaluation_id)
+        self._by_evaluation[evaluation_id] = trace_id
+        self._evaluations.setdefault(trace_id, set()).add(evaluation_id)
+
+    def get(self, evaluation_id: str) -> Optional[List[Span]]:
+        with self._lock:
+            trace_id = self._by_evaluation.get(str(evaluation_id))
+            spans = self._traces.get(trace_id) if trace_id else None
+            return sorted(spans, key=lambda s: s.start_ns) if spans else None
+
+    def dropped(self, evaluation_id: str) -> int:
+        """Spans of the evaluation's trace left out because it was full."""
+        with self._lock:
+            trace_id = self._by_evaluation.get(str(evaluation_id))
+            return self._dropped.get(trace_id, 0) if trace_id else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._dropped.clear()
+            self._by_evaluation.clear()
+            self._evaluations.clear()
+
+
+# ── Tracer ────────────────────────────────────────────────
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(
+        self, exporter=None, enabled: bool = True, timeline_capacity: int = 1000, timeline_max_spans: int = 500,
+    ):
+        self.enabled = enabled
+        self.exporter = exporter or NoopExporter()
+        self.timelines = TimelineStore(timeline_capacity, timeline_max_spans)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        links: Optional[List[SpanContext]] = None,
+    ) -> Iterator[Span]:
+        """
+        Start a span as a child of `parent` (or of the current span) and
+        make it current for the duration of the block. `links` point at
+        related spans without joining their trace. An exception marks the
+        span as errored and propagates.
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        if parent is None:
+            current = _current.get()
+            parent = current.context if current is not None else None
+        span = Span(
+            name=name,
+            context=SpanContext(
+                trace_id=parent.trace_id if parent else f"{random.getrandbits(128):032x}",
+                span_id=f"{random.getrandbits(64):016x}",
+            ),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+            links=list(links or ()),
+        )
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_status(STATUS_ERROR, str(exc) or type(exc).__name__)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            if span.status == STATUS_UNSET:
+                span.status = STATUS_OK
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        self.timelines.add(span)
+        try:
+            self.exporter.export(span)
+        except Exception as exc:        # an exporter must never break a request
+            logger.warning("Span export failed: %s", exc)
+
+    @staticmethod
+    def current_span():
+        return _current.get() or NOOP_SPAN
+
+    @staticmethod
+    def current_context() -> Optional[SpanContext]:
+        span = _current.get()
+        return span.context if span is not None else None
+
+
+def build_tracer() -> Tracer:
+    exporter_cls = EXPORTERS.get(settings.TRACING_EXPORTER)
+    if exporter_cls is None:
+        logger.warning("Unknown TRACING_EXPORTER %r — spans will not be exported", settings.TRACING_EXPORTER)
+        exporter_cls = NoopExporter
+    return Tracer(
+        exporter=exporter_cls(),
+        enabled=settings.TRACING_ENABLED,
+        timeline_capacity=settings.TRACING_TIMELINE_RETENTION,
+        timeline_max_spans=settings.TRACING_TIMELINE_MAX_SPANS,
+    )
+
+
+# Module-level singleton
+tracer = build_tracer()
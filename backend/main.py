@@ -2,16 +2,30 @@
 LLM-Eval-Arabic — FastAPI Application Entry Point
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
+from app.core.compression import NegotiatingGZipMiddleware
 from app.core.config import settings
 from app.core.logging import logger
 from app.core.exceptions import AppException, app_exception_handler, generic_exception_handler
-from app.api import health, evaluations, models_registry, benchmarks, streaming
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import loop_watchdog, slow_callbacks
+from app.api import (
+    health, evaluations, exports, models_registry, benchmarks, ratings, leaderboard, prompts, search,
+    streaming, metrics, admin,
+)
+from app.services.availability import availability
+from app.services.batch_runner import batch_runner
+from app.services.benchmark_runner import benchmark_runner
+from app.services.blob_store import run_sweeps
+from app.services.circuit_breaker import circuit_breakers
+from app.services.prompt_index import prompt_index
+from app.services.search import search_index
+from app.services.ratings import run_refits
 
 
 @asynccontextmanager
@@ -23,7 +37,35 @@ async def lifespan(app: FastAPI):
         settings.APP_VERSION,
         settings.ENVIRONMENT,
     )
+    availability.refresh_static()
+    if settings.ASYNCIO_SLOW_CALLBACK_MS > 0:
+        slow_callbacks.install(settings.ASYNCIO_SLOW_CALLBACK_MS)
+    background: list[asyncio.Task] = [
+        asyncio.create_task(availability.run(settings.AVAILABILITY_PROBE_INTERVAL_SECONDS)),
+        asyncio.create_task(prompt_index.warm()),     # load or rebuild; lookups work meanwhile
+    ]
+    if settings.LOOP_WATCHDOG_ENABLED:
+        background.append(asyncio.create_task(loop_watchdog.run()))
+    if settings.CIRCUIT_BREAKER_ENABLED:
+        background.append(asyncio.create_task(
+            circuit_breakers.run_prober(settings.CIRCUIT_PROBE_INTERVAL_SECONDS)
+        ))
+    if search_index.active:
+        background.append(asyncio.create_task(search_index.warm()))
+    if settings.RATING_REFIT_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(run_refits(settings.RATING_REFIT_INTERVAL_SECONDS)))
+    if settings.BLOB_SWEEP_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(run_sweeps(settings.BLOB_SWEEP_INTERVAL_SECONDS)))
     yield
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await batch_runner.shutdown()
+    await benchmark_runner.shutdown()
+    if prompt_index.ready:
+        await asyncio.to_thread(prompt_index.checkpoint)
+    prompt_index.close()
+    slow_callbacks.uninstall()
     logger.info("Shutting down %s", settings.APP_NAME)
 
 
@@ -51,7 +93,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(
+    NegotiatingGZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # ── Exception handlers ────────────────────────────────────
 app.add_exception_handler(AppException, app_exception_handler)
@@ -61,10 +109,18 @@ app.add_exception_handler(Exception, generic_exception_handler)
 API_PREFIX = "/api/v1"
 
 app.include_router(health.router, prefix=API_PREFIX)
+app.include_router(exports.router, prefix=API_PREFIX)       # before /evaluations/{id}
 app.include_router(evaluations.router, prefix=API_PREFIX)
 app.include_router(models_registry.router, prefix=API_PREFIX)
 app.include_router(benchmarks.router, prefix=API_PREFIX)
+app.include_router(ratings.router, prefix=API_PREFIX)
+app.include_router(leaderboard.router, prefix=API_PREFIX)
+app.include_router(prompts.router, prefix=API_PREFIX)
+app.include_router(search.router, prefix=API_PREFIX)
+app.include_router(admin.router, prefix=API_PREFIX)
 app.include_router(streaming.router)   # WebSocket — no prefix
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)  # Prometheus scrape path — no prefix
 
 # ── Root ──────────────────────────────────────────────────
 @app.get("/", include_in_schema=False)
@@ -12,10 +12,11 @@ from app.core.config import settings
 from app.core.database import Base
 
 # Import all models so Alembic knows about them
-from app.models import evaluation, user, benchmark  # noqa: F401
+from app.models import evaluation, user, benchmark, rating  # noqa: F401
 
 config = context.config
-config.set_main_option("sqlalchemy.url", settings.sync_database_url)
+if not config.get_main_option("sqlalchemy.url", "").startswith(("postgresql", "sqlite")):
+    config.set_main_option("sqlalchemy.url", settings.sync_database_url)
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -34,6 +35,14 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
+    # A connection handed over by the caller (tests, scripts) is used as is
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -0,0 +1,167 @@
+"""Initial schema
+
+Every table exactly as create_tables() built it before migrations were
+introduced. A database created that way is already at this revision:
+run `alembic stamp 0001` once, then `alembic upgrade head`. Tables,
+columns and search DDL added since then come in 0001a.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 04:29:23.334375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+eval_status = sa.Enum("pending", "running", "completed", "failed", name="eval_status")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("organization", sa.String(length=255), nullable=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("key_hash", sa.String(length=64), nullable=False),
+        sa.Column("prefix", sa.String(length=12), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key_hash"),
+    )
+    op.create_index("ix_api_keys_key_hash", "api_keys", ["key_hash"])
+
+    op.create_table(
+        "benchmark_datasets",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("slug", sa.String(length=80), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("prompt_count", sa.Integer(), nullable=True),
+        sa.Column("dialect", sa.String(length=20), nullable=True),
+        sa.Column("categories", sa.JSON(), nullable=True),
+        sa.Column("source_doi", sa.String(length=200), nullable=True),
+        sa.Column("is_public", sa.Boolean(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_benchmark_datasets_slug", "benchmark_datasets", ["slug"], unique=True)
+
+    op.create_table(
+        "benchmark_prompts",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("dataset_id", sa.UUID(), nullable=False),
+        sa.Column("prompt_text", sa.Text(), nullable=False),
+        sa.Column("reference_answer", sa.Text(), nullable=True),
+        sa.Column("dialect", sa.String(length=20), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("difficulty", sa.String(length=20), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["dataset_id"], ["benchmark_datasets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_benchmark_prompts_dataset_id", "benchmark_prompts", ["dataset_id"])
+
+    op.create_table(
+        "benchmark_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("dataset_id", sa.UUID(), nullable=False),
+        sa.Column("model_ids", sa.JSON(), nullable=False),
+        sa.Column("sample_size", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("results_summary", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["dataset_id"], ["benchmark_datasets.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_table(
+        "evaluations",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("dialect", sa.String(length=20), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("reference_answer", sa.Text(), nullable=True),
+        sa.Column("max_tokens", sa.Integer(), nullable=True),
+        sa.Column("status", eval_status, nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("winner_model_id", sa.String(length=50), nullable=True),
+        sa.Column("api_key_id", sa.UUID(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["api_key_id"], ["api_keys.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_evaluations_created_at", "evaluations", ["created_at"])
+    op.create_index("ix_evaluations_dialect", "evaluations", ["dialect"])
+    op.create_index("ix_evaluations_status", "evaluations", ["status"])
+
+    op.create_table(
+        "model_responses",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("evaluation_id", sa.UUID(), nullable=False),
+        sa.Column("model_id", sa.String(length=50), nullable=False),
+        sa.Column("model_name", sa.String(length=100), nullable=False),
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=True),
+        sa.Column("latency_ms", sa.Integer(), nullable=True),
+        sa.Column("token_count", sa.Integer(), nullable=True),
+        sa.Column("cost_usd", sa.Float(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("score_arabic_quality", sa.Float(), nullable=True),
+        sa.Column("score_accuracy", sa.Float(), nullable=True),
+        sa.Column("score_dialect_adherence", sa.Float(), nullable=True),
+        sa.Column("score_technical_precision", sa.Float(), nullable=True),
+        sa.Column("score_completeness", sa.Float(), nullable=True),
+        sa.Column("score_cultural_sensitivity", sa.Float(), nullable=True),
+        sa.Column("score_overall", sa.Float(), nullable=True),
+        sa.Column("score_reasoning", sa.Text(), nullable=True),
+        sa.Column("arabic_metrics", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["evaluation_id"], ["evaluations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_model_responses_evaluation_id", "model_responses", ["evaluation_id"])
+    op.create_index("ix_model_responses_model_id", "model_responses", ["model_id"])
+
+
+def downgrade() -> None:
+    for table in (
+        "model_responses", "evaluations", "benchmark_runs", "benchmark_prompts", "benchmark_datasets",
+        "api_keys", "users",
+    ):
+        op.drop_table(table)            # indexes go with it
+    if op.get_bind().dialect.name == "postgresql":
+        eval_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,253 @@
+"""Batches, ratings, benchmark sampling/dedupe/sequential runs, token usage, search
+
+Everything the models gained after the schema 0001 records, before
+0002 starts changing access paths:
+
+- model_responses.input_tokens and .usage_source (token accounting)
+- evaluation_batches, and evaluations.batch_id (POST /evaluations/batch)
+- benchmark_prompts.content_hash (import dedupe) and .sample_key
+  (seeded sampling) with their indexes; benchmark_runs.seed, .sampling
+  and .sequential
+- evaluations.benchmark_run_id and .benchmark_prompt_id (benchmark runs
+  record their evaluations)
+- model_ratings (Elo and Bradley-Terry)
+- on PostgreSQL, arabic_fold(), the arabic_eval text-search
+  configuration, and generated search_vector columns with GIN indexes
+  on evaluations and model_responses (0004 moves the response one to
+  response_blobs)
+
+Existing benchmark prompts get a random sample_key, so the sampler sees
+them, and a content_hash; a prompt repeating an earlier one of the same
+dataset keeps a NULL hash, as the unique index allows.
+
+Each object is only created when missing, so a database that
+create_tables() built part-way through these additions upgrades too.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 04:41:07.129604
+
+"""
+import hashlib
+import random
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 5_000           # benchmark prompts per UPDATE
+
+# The full-text search DDL is copied here as it stood at this revision, not
+# imported from app.models: a later change to the models must not change
+# what an already-published revision builds.
+
+# arabic_fold() and the arabic_eval text-search configuration
+SEARCH_SETUP_DDL = (
+    # diacritics, Quranic marks and tatweel dropped; alef, ya, ta marbuta and hamza seats folded
+    r"""CREATE OR REPLACE FUNCTION arabic_fold(t text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT translate(
+            regexp_replace(lower(normalize(coalesce(t, ''), NFKC)),
+                           '[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]', '', 'g'),
+            'أإآٱىةؤئ', 'اااايهوي')
+        $$""",
+    """DO $$ BEGIN
+        CREATE TEXT SEARCH CONFIGURATION arabic_eval (COPY = pg_catalog.arabic);
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$""",
+)
+
+# Generated search columns (0004 moves the response one to response_blobs)
+SEARCH_COLUMN_DDL = {
+    "evaluations": (
+        "ALTER TABLE evaluations ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('arabic_eval'::regconfig, arabic_fold(prompt))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_evaluations_search ON evaluations USING gin (search_vector)",
+    ),
+    "model_responses": (
+        "ALTER TABLE model_responses ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('arabic_eval'::regconfig, arabic_fold(response_text))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_model_responses_search ON model_responses USING gin (search_vector)",
+    ),
+}
+
+# table → columns without foreign keys
+NEW_COLUMNS = {
+    "model_responses": (
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("usage_source", sa.String(length=20), nullable=True),
+    ),
+    "benchmark_prompts": (
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("sample_key", sa.Float(), nullable=True),
+    ),
+    "benchmark_runs": (
+        sa.Column("seed", sa.BigInteger(), nullable=True),
+        sa.Column("sampling", sa.JSON(), nullable=True),
+        sa.Column("sequential", sa.JSON(), nullable=True),
+    ),
+}
+
+# evaluations column → (foreign key name, referenced table)
+EVALUATION_LINKS = {
+    "batch_id": ("evaluations_batch_id_fkey", "evaluation_batches"),
+    "benchmark_run_id": ("evaluations_benchmark_run_id_fkey", "benchmark_runs"),
+    "benchmark_prompt_id": ("evaluations_benchmark_prompt_id_fkey", "benchmark_prompts"),
+}
+
+# (name, table, columns, unique)
+NEW_INDEXES = (
+    ("ux_benchmark_prompts_dataset_hash", "benchmark_prompts", ["dataset_id", "content_hash"], True),
+    ("ix_benchmark_prompts_sample", "benchmark_prompts", ["dataset_id", "sample_key"], False),
+    ("ix_benchmark_prompts_strata_sample", "benchmark_prompts",
+     ["dataset_id", "dialect", "category", "difficulty", "sample_key"], False),
+    ("ix_evaluations_batch_id", "evaluations", ["batch_id"], False),
+    ("ix_evaluations_benchmark_run_id", "evaluations", ["benchmark_run_id"], False),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _content_hash(text: str) -> str:
+    """services/benchmark_importer.content_hash as of this revision: NFC, whitespace collapsed."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _backfill_prompts() -> None:
+    """sample_key and content_hash for prompts stored before they existed, one dataset at a time."""
+    bind = op.get_bind()
+    pending = "(sample_key IS NULL OR content_hash IS NULL)"
+    dataset, after, seen = None, None, set()
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT dataset_id, id, prompt_text, content_hash, sample_key FROM benchmark_prompts "
+                f"WHERE {pending}"
+                + (" AND (dataset_id > :dataset OR (dataset_id = :dataset AND id > :after))" if after else "")
+                + " ORDER BY dataset_id, id LIMIT :n"
+            ),
+            {"dataset": dataset, "after": after, "n": BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            return
+        updates = []
+        for dataset_id, id_, text, current_hash, sample_key in rows:
+            if dataset_id != dataset:
+                dataset = dataset_id
+                seen = set(bind.execute(
+                    sa.text("SELECT content_hash FROM benchmark_prompts "
+                            "WHERE dataset_id = :dataset AND content_hash IS NOT NULL"),
+                    {"dataset": dataset},
+                ).scalars())
+            if current_hash is None:
+                current_hash = _content_hash(text)
+                current_hash = None if current_hash in seen else current_hash
+                seen.add(current_hash)
+            updates.append({
+                "id": id_,
+                "content_hash": current_hash,
+                "sample_key": sample_key if sample_key is not None else random.random(),
+            })
+            after = id_
+        bind.execute(
+            sa.text("UPDATE benchmark_prompts SET content_hash = :content_hash, sample_key = :sample_key WHERE id = :id"),
+            updates,
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgres = bind.dialect.name == "postgresql"
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if postgres:
+        for statement in SEARCH_SETUP_DDL:
+            op.execute(statement)
+
+    if "evaluation_batches" not in tables:
+        op.create_table(
+            "evaluation_batches",
+            sa.Column("id", sa.UUID(), nullable=False),
+            sa.Column("total", sa.Integer(), nullable=False),
+            sa.Column("api_key_id", sa.UUID(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.ForeignKeyConstraint(["api_key_id"], ["api_keys.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "model_ratings" not in tables:
+        op.create_table(
+            "model_ratings",
+            sa.Column("scope", sa.String(length=20), nullable=False),
+            sa.Column("model_id", sa.String(length=50), nullable=False),
+            sa.Column("elo", sa.Float(), nullable=False),
+            sa.Column("battles", sa.Integer(), nullable=False),
+            sa.Column("wins", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("bt_rating", sa.Float(), nullable=True),
+            sa.Column("bt_battles", sa.Integer(), nullable=True),
+            sa.Column("fitted_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("scope", "model_id"),
+        )
+
+    for table, columns in NEW_COLUMNS.items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        for column in columns:
+            if column.name not in existing:
+                op.add_column(table, column.copy())
+
+    existing = {c["name"] for c in inspector.get_columns("evaluations")}
+    missing = [name for name in EVALUATION_LINKS if name not in existing]
+    if missing:
+        # SQLite cannot add a foreign key in place; batch mode rebuilds the table there
+        with op.batch_alter_table("evaluations") as batch:
+            for name in missing:
+                constraint, target = EVALUATION_LINKS[name]
+                batch.add_column(sa.Column(name, sa.UUID(), nullable=True))
+                batch.create_foreign_key(constraint, target, [name], ["id"], ondelete="SET NULL")
+
+    _backfill_prompts()
+
+    for table in {table for _, table, _, _ in NEW_INDEXES}:
+        existing = {i["name"] for i in inspector.get_indexes(table)}
+        for name, index_table, columns, unique in NEW_INDEXES:
+            if index_table == table and name not in existing:
+                op.create_index(name, table, columns, unique=unique)
+
+    if postgres:
+        for table in ("evaluations", "model_responses"):
+            for statement in SEARCH_COLUMN_DDL[table]:
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    if postgres:
+        for table in ("evaluations", "model_responses"):
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")   # its index goes with it
+        op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS arabic_eval")
+        op.execute("DROP FUNCTION IF EXISTS arabic_fold(text)")
+
+    for name, table, _, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("evaluations") as batch:
+        for name, (constraint, _) in EVALUATION_LINKS.items():
+            if postgres:
+                batch.drop_constraint(constraint, type_="foreignkey")
+            batch.drop_column(name)
+    for table, columns in NEW_COLUMNS.items():
+        with op.batch_alter_table(table) as batch:
+            for column in reversed(columns):
+                batch.drop_column(column.name)
+    op.drop_table("model_ratings")
+    op.drop_table("evaluation_batches")
@@ -0,0 +1,111 @@
+"""Copy dialect/category onto model_responses; composite indexes for its access paths
+
+Leaderboard, trend and best/worst queries (services/leaderboard.py) read
+model_responses alone, filtered by model, dialect and time and ordered
+by score_overall. This revision:
+
+- adds model_responses.dialect and .category and backfills them from
+  the parent evaluation
+- replaces the single-column model_id index with composite ones whose
+  INCLUDE columns make those queries index-only scans on PostgreSQL
+- replaces the single-column evaluations dialect/status indexes with
+  (dialect, created_at) and (status, created_at), matching the list
+  endpoint's filter + ORDER BY created_at
+
+On PostgreSQL the backfill commits per batch of evaluations and the
+indexes are built CONCURRENTLY, so writers are not blocked for the
+length of a full-table rewrite.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-19 05:02:11.408213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 10_000          # evaluations per committed UPDATE
+
+# (name, table, columns, INCLUDE columns on PostgreSQL)
+NEW_INDEXES = (
+    ("ix_model_responses_model_created", "model_responses", ["model_id", "created_at"],
+     ["score_overall", "dialect", "category"]),
+    ("ix_model_responses_dialect_model_created", "model_responses", ["dialect", "model_id", "created_at"],
+     ["score_overall", "category"]),
+    ("ix_model_responses_model_score", "model_responses", ["model_id", "score_overall"], ["dialect"]),
+    ("ix_evaluations_dialect_created", "evaluations", ["dialect", "created_at"], []),
+    ("ix_evaluations_status_created", "evaluations", ["status", "created_at"], []),
+)
+OLD_INDEXES = (
+    ("ix_model_responses_model_id", "model_responses", ["model_id"]),
+    ("ix_evaluations_dialect", "evaluations", ["dialect"]),
+    ("ix_evaluations_status", "evaluations", ["status"]),
+)
+
+
+def _backfill_postgres() -> None:
+    """Keyset over evaluations.id; each batch joins through ix_model_responses_evaluation_id."""
+    bind = op.get_bind()
+    params = {"n": BACKFILL_BATCH}
+    while True:
+        page = "SELECT id, dialect, category FROM evaluations {} ORDER BY id LIMIT :n".format(
+            "WHERE id > :after" if "after" in params else ""
+        )
+        last = bind.execute(sa.text(f"SELECT id FROM ({page}) p ORDER BY id DESC LIMIT 1"), params).scalar()
+        if last is None:
+            return
+        bind.execute(
+            sa.text(
+                "UPDATE model_responses r SET dialect = p.dialect, category = p.category "
+                f"FROM ({page}) p WHERE r.evaluation_id = p.id"
+            ),
+            params,
+        )
+        params = {"n": BACKFILL_BATCH, "after": last}
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    op.add_column("model_responses", sa.Column("dialect", sa.String(length=20), nullable=True))
+    op.add_column("model_responses", sa.Column("category", sa.String(length=50), nullable=True))
+
+    if postgres:
+        with op.get_context().autocommit_block():
+            _backfill_postgres()
+            for name, table, columns, include in NEW_INDEXES:
+                op.create_index(
+                    name, table, columns, postgresql_include=include,
+                    postgresql_concurrently=True, if_not_exists=True,
+                )
+            for name, table, _ in OLD_INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+
+    op.execute(
+        "UPDATE model_responses SET "
+        "dialect = (SELECT dialect FROM evaluations WHERE evaluations.id = model_responses.evaluation_id), "
+        "category = (SELECT category FROM evaluations WHERE evaluations.id = model_responses.evaluation_id)"
+    )
+    for name, table, columns, _ in NEW_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in OLD_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns in OLD_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("model_responses") as batch:
+        batch.drop_column("category")
+        batch.drop_column("dialect")
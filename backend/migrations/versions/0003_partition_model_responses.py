@@ -0,0 +1,134 @@
+"""Optional monthly range partitioning of model_responses (PostgreSQL)
+
+Opt-in, because the table is rewritten:
+
+    alembic -x partition=monthly upgrade head
+
+Without the flag, or on any other database, this revision is a no-op.
+To partition later, go back and come forward again with the flag
+(`alembic downgrade 0002`, then the command above). Downgrading
+un-partitions a partitioned table and does nothing otherwise.
+
+model_responses becomes PARTITION BY RANGE (created_at). It gets one
+partition per month from its oldest row to three months ahead, plus a
+DEFAULT partition, and the rows are copied across. Time-bounded
+leaderboard and trend queries then prune to the months they cover, and
+old months can be detached or dropped whole. New months come from
+`SELECT create_monthly_partitions('model_responses', ...)`, installed
+here and wrapped by `python -m app.scripts.create_partitions`; run that
+monthly from cron. A month that already has rows in the DEFAULT
+partition cannot be added later.
+
+The primary key becomes (id, created_at), because PostgreSQL requires
+the partition key in every unique constraint. Nothing references
+model_responses, so no foreign key depends on it. evaluations is not
+partitioned: its id is the target of model_responses' foreign key,
+which a (id, created_at) key would break. It is also only a fraction of
+the size.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 05:31:47.120954
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+CREATE_MONTHLY_PARTITIONS = r"""
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent regclass, first_month date, last_month date)
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    month date := date_trunc('month', first_month)::date;
+    base text := (SELECT relname FROM pg_class WHERE oid = parent);
+    created integer := 0;
+BEGIN
+    WHILE month <= last_month LOOP
+        IF to_regclass(format('%s_%s', base, to_char(month, 'YYYY_MM'))) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                format('%s_%s', base, to_char(month, 'YYYY_MM')), parent,
+                month::timestamp AT TIME ZONE 'UTC', (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END $$
+"""
+
+# Same as revision 0002 leaves them; indexes on the parent cascade to every partition
+INDEXES = (
+    ("ix_model_responses_evaluation_id", ["evaluation_id"], []),
+    ("ix_model_responses_model_created", ["model_id", "created_at"], ["score_overall", "dialect", "category"]),
+    ("ix_model_responses_dialect_model_created", ["dialect", "model_id", "created_at"], ["score_overall", "category"]),
+    ("ix_model_responses_model_score", ["model_id", "score_overall"], ["dialect"]),
+)
+
+
+def _partitioned() -> bool:
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('model_responses')"
+    )).scalar())
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Swap model_responses for a partitioned (or plain) copy of itself, then restore keys and indexes."""
+    bind = op.get_bind()
+    op.execute("ALTER TABLE model_responses RENAME TO model_responses_old")
+    op.execute(
+        "CREATE TABLE model_responses "
+        "(LIKE model_responses_old INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+    if partitioned:
+        op.execute(sa.text(
+            "SELECT create_monthly_partitions('model_responses', "
+            "coalesce((SELECT min(created_at) FROM model_responses_old), now())::date, "
+            f"(now() + interval '{MONTHS_AHEAD} months')::date)"
+        ))
+        op.execute("CREATE TABLE model_responses_default PARTITION OF model_responses DEFAULT")
+
+    columns = ", ".join(bind.execute(sa.text(
+        "SELECT quote_ident(column_name) FROM information_schema.columns "
+        "WHERE table_name = 'model_responses_old' AND table_schema = current_schema() "
+        "AND is_generated = 'NEVER' ORDER BY ordinal_position"
+    )).scalars())
+    op.execute(f"INSERT INTO model_responses ({columns}) SELECT {columns} FROM model_responses_old")
+    op.execute("DROP TABLE model_responses_old CASCADE")       # its indexes, key and foreign key
+
+    op.create_primary_key("model_responses_pkey", "model_responses", ["id", "created_at"] if partitioned else ["id"])
+    op.create_foreign_key(
+        "model_responses_evaluation_id_fkey", "model_responses", "evaluations",
+        ["evaluation_id"], ["id"], ondelete="CASCADE",
+    )
+    for name, columns, include in INDEXES:
+        op.create_index(name, "model_responses", columns, postgresql_include=include)
+    op.execute("CREATE INDEX ix_model_responses_search ON model_responses USING gin (search_vector)")
+    op.execute("ANALYZE model_responses")
+
+
+def upgrade() -> None:
+    requested = context.get_x_argument(as_dictionary=True).get("partition") == "monthly"
+    if op.get_bind().dialect.name != "postgresql" or not requested or _partitioned():
+        return
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not _partitioned():
+        return
+    _rebuild(partitioned=False)
+    op.execute("DROP FUNCTION IF EXISTS create_monthly_partitions(regclass, date, date)")
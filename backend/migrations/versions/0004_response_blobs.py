@@ -0,0 +1,322 @@
+"""Move response texts and Arabic metrics into response_blobs
+
+model_responses.response_text and .arabic_metrics become
+response_digest / metrics_digest pointing at response_blobs, which
+holds each distinct payload once, compressed in the format
+services/blob_store.py reads (BLOB_STORE, BLOB_CODEC and BLOB_STORE_PATH
+apply to the moved data).
+response_length keeps the character count that previews and paged text
+reads report without loading the body.
+
+On PostgreSQL the response search vector moves with the text: the
+generated model_responses.search_vector of each new body is copied to a
+plain response_blobs.search_vector (GIN-indexed) before the column is
+dropped, and new bodies get theirs when they are stored.
+
+Rows are moved in keyset batches of model_responses.id, each batch
+committed on its own on PostgreSQL. The move is resumable: the DDL
+before it is skipped when already applied, and only rows without digests
+are picked up, so re-running `alembic upgrade` after a failure carries
+on where the last committed batch stopped. Within a batch, blobs (with
+their vectors) are written before the responses point at them.
+Downgrading inflates the blobs back into the old columns; blob files of
+the local backend are left on disk.
+
+The blob encoding is frozen below as it stood at this revision rather
+than imported from services/blob_store.py. Every blob records its
+codec, and the application keeps reading all of them. Only the BLOB_*
+settings are read from the application, so the moved data goes where
+the running application looks for it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 08:12:40.551027
+
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:                                    # pragma: no cover
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MOVE_BATCH = 5_000               # responses per batch
+
+blobs = sa.table(
+    "response_blobs",
+    sa.column("digest", sa.String), sa.column("codec", sa.String), sa.column("size", sa.Integer),
+    sa.column("stored_size", sa.Integer), sa.column("data", sa.LargeBinary),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+NEW_COLUMNS = (
+    ("response_digest", sa.String(length=64)),
+    ("response_length", sa.Integer()),
+    ("metrics_digest", sa.String(length=64)),
+)
+
+
+# ── Blob format as of this revision ───────────────────────
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _document_bytes(document: dict) -> bytes:
+    return json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _encode(data: bytes) -> Tuple[str, bytes]:
+    codec = settings.BLOB_CODEC
+    if codec == "zstd" and zstandard is None:
+        codec = "gzip"
+    if codec == "raw" or len(data) < settings.BLOB_COMPRESS_MIN_BYTES:
+        return "raw", data
+    if codec == "zstd":
+        packed = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        packed = gzip.compress(data, compresslevel=settings.GZIP_COMPRESS_LEVEL, mtime=0)
+    return (codec, packed) if len(packed) < len(data) else ("raw", data)
+
+
+def _decode(codec: str, stored: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("A zstd-compressed blob needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(stored)
+    if codec == "gzip":
+        return gzip.decompress(stored)
+    return stored
+
+
+def _file(key: str) -> str:
+    return os.path.join(settings.BLOB_STORE_PATH, key[:2], key[2:4], key)
+
+
+def _write_local(files: Dict[str, bytes]) -> None:
+    for key, stored in files.items():
+        target = _file(key)
+        if os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(stored)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _read_local(keys: Iterable[str]) -> Dict[str, bytes]:
+    out = {}
+    for key in keys:
+        with open(_file(key), "rb") as f:
+            out[key] = f.read()
+    return out
+
+
+# ── Moving the data ───────────────────────────────────────
+
+def _batches(columns: str, where: str = ""):
+    """model_responses rows in id order, MOVE_BATCH at a time."""
+    bind = op.get_bind()
+    after = None
+    while True:
+        conditions = [c for c in (where, "id > :after" if after is not None else "") if c]
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, {columns} FROM model_responses "
+                + (f"WHERE {' AND '.join(conditions)} " if conditions else "")
+                + "ORDER BY id LIMIT :n"
+            ),
+            {"n": MOVE_BATCH, "after": after},
+        ).all()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][0]
+
+
+def _store(payloads: dict) -> None:
+    """Insert encoded blobs (digest → raw bytes), skipping those already present."""
+    if not payloads:
+        return
+    now = datetime.now(timezone.utc)
+    rows, local = [], {}
+    for key, data in payloads.items():
+        codec, stored = _encode(data)
+        row = {
+            "digest": key, "codec": codec, "size": len(data), "stored_size": len(stored),
+            "data": stored, "created_at": now,
+        }
+        if settings.BLOB_STORE == "local":
+            local[key], row["data"] = stored, None
+        rows.append(row)
+    _write_local(local)
+    if op.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        insert = sqlite.insert
+    op.get_bind().execute(insert(blobs).on_conflict_do_nothing(index_elements=["digest"]), rows)
+
+
+def _move_to_blobs(postgres: bool) -> None:
+    """Responses that have no digests yet; those a failed run already moved are not read again."""
+    bind = op.get_bind()
+    pending = "response_digest IS NULL AND metrics_digest IS NULL"
+    for rows in _batches("response_text, arabic_metrics", pending):
+        payloads, sources, updates = {}, {}, []
+        for id_, text, metrics in rows:
+            if isinstance(metrics, str):
+                metrics = json.loads(metrics)
+            update = {"id": str(id_), "body": None, "length": None, "metrics": None}
+            if text is not None:
+                body = text.encode("utf-8")
+                update["body"], update["length"] = _digest(body), len(text)
+                payloads[update["body"]] = body
+                sources.setdefault(update["body"], str(id_))
+            if metrics is not None:
+                document = _document_bytes(metrics)
+                update["metrics"] = _digest(document)
+                payloads[update["metrics"]] = document
+            updates.append(update)
+
+        _store(payloads)
+        if not postgres:
+            bind.execute(
+                sa.text(
+                    "UPDATE model_responses SET response_digest = :body, response_length = :length, "
+                    "metrics_digest = :metrics WHERE id = :id"
+                ),
+                updates,
+            )
+            continue
+        # One set-based statement each. The vectors are copied before the
+        # responses point at their blobs, so a failure in between is
+        # repaired when the batch is picked up again.
+        if sources:
+            bind.execute(
+                sa.text(
+                    "UPDATE response_blobs b SET search_vector = r.search_vector "
+                    "FROM model_responses r, unnest(CAST(:digests AS text[]), CAST(:ids AS uuid[])) AS s(digest, id) "
+                    "WHERE b.digest = s.digest AND r.id = s.id AND b.search_vector IS NULL"
+                ),
+                {"digests": list(sources), "ids": list(sources.values())},
+            )
+        bind.execute(
+            sa.text(
+                "UPDATE model_responses r SET response_digest = u.body, response_length = u.length, "
+                "metrics_digest = u.metrics "
+                "FROM unnest(CAST(:ids AS uuid[]), CAST(:bodies AS text[]), CAST(:lengths AS int[]), "
+                "CAST(:metrics AS text[])) AS u(id, body, length, metrics) WHERE r.id = u.id"
+            ),
+            {
+                "ids": [u["id"] for u in updates], "bodies": [u["body"] for u in updates],
+                "lengths": [u["length"] for u in updates], "metrics": [u["metrics"] for u in updates],
+            },
+        )
+
+
+def _move_from_blobs() -> None:
+    bind = op.get_bind()
+    for rows in _batches("response_digest, metrics_digest"):
+        wanted = {d for _, body, metrics in rows for d in (body, metrics) if d}
+        stored = bind.execute(
+            sa.select(blobs.c.digest, blobs.c.codec, blobs.c.data).where(blobs.c.digest.in_(wanted))
+        ).all() if wanted else []
+        files = _read_local([key for key, _, data in stored if data is None])
+        payloads = {key: _decode(codec, data if data is not None else files[key]) for key, codec, data in stored}
+        bind.execute(
+            sa.text("UPDATE model_responses SET response_text = :text, arabic_metrics = :metrics WHERE id = :id"),
+            [
+                {
+                    "id": id_,
+                    "text": payloads[body].decode("utf-8") if body else None,
+                    "metrics": payloads[metrics].decode("utf-8") if metrics else None,
+                }
+                for id_, body, metrics in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgres = bind.dialect.name == "postgresql"
+    # On PostgreSQL everything up to the move is committed before it starts;
+    # after a failed move it is already in place and skipped here.
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("response_blobs"):
+        op.create_table(
+            "response_blobs",
+            sa.Column("digest", sa.String(length=64), nullable=False),
+            sa.Column("codec", sa.String(length=10), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("stored_size", sa.Integer(), nullable=False),
+            sa.Column("data", sa.LargeBinary(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("digest"),
+        )
+    existing = {c["name"] for c in inspector.get_columns("model_responses")}
+    for name, type_ in NEW_COLUMNS:
+        if name not in existing:
+            op.add_column("model_responses", sa.Column(name, type_, nullable=True))
+
+    if postgres:
+        op.execute("ALTER TABLE response_blobs ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        with op.get_context().autocommit_block():
+            _move_to_blobs(postgres=True)
+            # A concurrent build that failed leaves an invalid index behind
+            if bind.execute(sa.text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = 'ix_response_blobs_search' AND NOT i.indisvalid"
+            )).first():
+                op.execute("DROP INDEX CONCURRENTLY ix_response_blobs_search")
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_response_blobs_search "
+                       "ON response_blobs USING gin (search_vector)")
+        op.execute("ALTER TABLE model_responses DROP COLUMN search_vector")   # generated from response_text
+    else:
+        _move_to_blobs(postgres=False)
+
+    with op.batch_alter_table("model_responses") as batch:
+        batch.drop_column("arabic_metrics")
+        batch.drop_column("response_text")
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    op.add_column("model_responses", sa.Column("response_text", sa.Text(), nullable=True))
+    op.add_column("model_responses", sa.Column("arabic_metrics", sa.JSON(), nullable=True))
+    _move_from_blobs()
+
+    if postgres:
+        op.execute(
+            "ALTER TABLE model_responses ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('arabic_eval'::regconfig, arabic_fold(response_text))) STORED"
+        )
+        op.execute("CREATE INDEX ix_model_responses_search ON model_responses USING gin (search_vector)")
+    with op.batch_alter_table("model_responses") as batch:
+        batch.drop_column("metrics_digest")
+        batch.drop_column("response_length")
+        batch.drop_column("response_digest")
+    op.drop_table("response_blobs")                     # its search index goes with it
@@ -0,0 +1,109 @@
+"""Framed response texts; blob reuse and references tracked for the sweep
+
+services/blob_store.py compresses texts longer than BLOB_FRAME_CHARS a
+frame at a time, so paged reads decompress only the frames they cover,
+and sweeps blobs that no response references. This revision adds:
+
+- response_blobs.frames, where each frame of a framed text ends in the
+  stored bytes. Blobs stored before it have none and are read whole,
+  as before.
+- response_blobs.used_at, refreshed whenever existing content is stored
+  again; NULL for blobs not stored again since created_at
+- indexes on model_responses.response_digest and .metrics_digest, for
+  the sweep's reference checks
+
+On PostgreSQL the indexes are built CONCURRENTLY. CONCURRENTLY is not
+available on a partitioned table, so a model_responses partitioned by
+0003 gets each index on the parent alone (invalid at first), built
+concurrently on every partition and attached; it turns valid once all
+partitions have theirs, and partitions created later inherit it. A
+failed build is cleaned up and redone by re-running `alembic upgrade`.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 14:26:53.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_COLUMNS = (
+    ("frames", sa.JSON()),
+    ("used_at", sa.DateTime(timezone=True)),
+)
+
+# (name, model_responses column)
+NEW_INDEXES = (
+    ("ix_model_responses_response_digest", "response_digest"),
+    ("ix_model_responses_metrics_digest", "metrics_digest"),
+)
+
+
+def _build_concurrently(bind, name: str, table: str, column: str) -> None:
+    # A concurrent build that failed leaves an invalid index behind
+    if bind.execute(sa.text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first():
+        op.execute(f"DROP INDEX CONCURRENTLY {name}")
+    op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def _create_indexes_postgres(bind) -> None:
+    partitioned = bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('model_responses')"
+    )).first()
+    if not partitioned:
+        for name, column in NEW_INDEXES:
+            _build_concurrently(bind, name, "model_responses", column)
+        return
+
+    partitions = bind.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('model_responses') ORDER BY c.relname"
+    )).scalars().all()
+    for name, column in NEW_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY model_responses ({column})")
+        for partition in partitions:
+            child = f"{partition}_{column}_idx"
+            _build_concurrently(bind, child, partition, column)
+            attached = bind.execute(sa.text(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:child) AND inhparent = to_regclass(:name)"
+            ), {"child": child, "name": name}).first()
+            if not attached:
+                op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = {c["name"] for c in sa.inspect(bind).get_columns("response_blobs")}
+    for name, type_ in NEW_COLUMNS:
+        if name not in existing:
+            op.add_column("response_blobs", sa.Column(name, type_, nullable=True))
+
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            _create_indexes_postgres(bind)
+        return
+
+    existing = {i["name"] for i in sa.inspect(bind).get_indexes("model_responses")}
+    for name, column in NEW_INDEXES:
+        if name not in existing:
+            op.create_index(name, "model_responses", [column])
+
+
+def downgrade() -> None:
+    for name, _ in NEW_INDEXES:
+        op.drop_index(name, table_name="model_responses")       # on a partitioned table, with its partitions'
+    with op.batch_alter_table("response_blobs") as batch:
+        for name, _ in reversed(NEW_COLUMNS):
+            batch.drop_column(name)
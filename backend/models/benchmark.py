@@ -2,11 +2,12 @@
 Benchmark dataset and run ORM models.
 """
 
+import random
 import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import (
-    Column, String, Integer, Float, DateTime,
+    Column, String, Integer, BigInteger, Float, DateTime,
     ForeignKey, JSON, Text, Boolean, Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -59,10 +60,20 @@ class BenchmarkPrompt(Base):
     category = Column(String(50), nullable=True)
     difficulty = Column(String(20), nullable=True)    # easy | medium | hard | expert
     tags = Column(JSON, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of the normalized prompt text
+    sample_key = Column(Float, nullable=True, default=random.random)   # uniform [0, 1), see services/sampler
 
     dataset = relationship("BenchmarkDataset", back_populates="prompts")
 
-    __table_args__ = (Index("ix_benchmark_prompts_dataset_id", "dataset_id"),)
+    __table_args__ = (
+        Index("ix_benchmark_prompts_dataset_id", "dataset_id"),
+        Index("ux_benchmark_prompts_dataset_hash", "dataset_id", "content_hash", unique=True),
+        Index("ix_benchmark_prompts_sample", "dataset_id", "sample_key"),
+        Index(
+            "ix_benchmark_prompts_strata_sample",
+            "dataset_id", "dialect", "category", "difficulty", "sample_key",
+        ),
+    )
 
 
 class BenchmarkRun(Base):
@@ -76,6 +87,9 @@ class BenchmarkRun(Base):
     )
     model_ids = Column(JSON, nullable=False)          # list of model IDs
     sample_size = Column(Integer, nullable=True)      # null = full dataset
+    seed = Column(BigInteger, nullable=True)          # sampler seed; same seed + dataset = same prompts
+    sampling = Column(JSON, nullable=True)            # {"stratify_by": [...], "allocation": "..."}
+    sequential = Column(JSON, nullable=True)          # early-stopping options; null = run the full sample
     status = Column(String(20), default="pending")    # pending | running | completed | failed
     results_summary = Column(JSON, nullable=True)     # aggregated scores per model
     error_message = Column(Text, nullable=True)
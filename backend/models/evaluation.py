@@ -8,7 +8,7 @@ from typing import Optional
 
 from sqlalchemy import (
     Column, String, Float, Integer, Text, DateTime,
-    ForeignKey, JSON, Enum as SAEnum, Boolean, Index,
+    ForeignKey, JSON, LargeBinary, Enum as SAEnum, Boolean, Index, DDL, event,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -20,6 +20,22 @@ def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+class EvaluationBatch(Base):
+    """
+    A group of evaluations submitted together via POST /evaluations/batch.
+    Progress is aggregated from the member evaluations' statuses.
+    """
+    __tablename__ = "evaluation_batches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    total = Column(Integer, nullable=False)
+    api_key_id = Column(UUID(as_uuid=True), ForeignKey("api_keys.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EvaluationBatch id={self.id} total={self.total}>"
+
+
 class Evaluation(Base):
     """
     A single evaluation run — one prompt compared across N models.
@@ -40,19 +56,40 @@ class Evaluation(Base):
     error_message = Column(Text, nullable=True)
     winner_model_id = Column(String(50), nullable=True)
     api_key_id = Column(UUID(as_uuid=True), ForeignKey("api_keys.id"), nullable=True)
+    batch_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("evaluation_batches.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    benchmark_run_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("benchmark_runs.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    benchmark_prompt_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("benchmark_prompts.id", ondelete="SET NULL"),
+        nullable=True,
+    )
 
     created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
-    # Relationships
+    # Relationships — best score first, unscored responses last
     model_responses = relationship(
-        "ModelResponse", back_populates="evaluation", cascade="all, delete-orphan"
+        "ModelResponse",
+        back_populates="evaluation",
+        cascade="all, delete-orphan",
+        order_by=lambda: ModelResponse.score_overall.desc().nulls_last(),
     )
 
+    # List filters (dialect, status) come with ORDER BY created_at DESC
     __table_args__ = (
         Index("ix_evaluations_created_at", "created_at"),
-        Index("ix_evaluations_dialect", "dialect"),
-        Index("ix_evaluations_status", "status"),
+        Index("ix_evaluations_dialect_created", "dialect", "created_at"),
+        Index("ix_evaluations_status_created", "status", "created_at"),
+        Index("ix_evaluations_batch_id", "batch_id"),
+        Index("ix_evaluations_benchmark_run_id", "benchmark_run_id"),
     )
 
     def __repr__(self) -> str:
@@ -74,10 +111,21 @@ class ModelResponse(Base):
     model_id = Column(String(50), nullable=False)
     model_name = Column(String(100), nullable=False)
     provider = Column(String(50), nullable=False)
-
-    response_text = Column(Text, nullable=True)
+    # Copied from the evaluation so leaderboard and trend queries filter
+    # and group without joining it (see services/leaderboard.py)
+    dialect = Column(String(20), nullable=True)
+    category = Column(String(50), nullable=True)
+
+    # Body and Arabic metrics are stored once per distinct content in
+    # response_blobs (see services/blob_store.py); only their digests and
+    # the body's length in characters live here
+    response_digest = Column(String(64), nullable=True)
+    response_length = Column(Integer, nullable=True)
+    metrics_digest = Column(String(64), nullable=True)
     latency_ms = Column(Integer, nullable=True)
-    token_count = Column(Integer, nullable=True)
+    token_count = Column(Integer, nullable=True)      # output tokens
+    input_tokens = Column(Integer, nullable=True)
+    usage_source = Column(String(20), nullable=True)  # provider | tokenizer | estimate
     cost_usd = Column(Float, nullable=True)
     error = Column(Text, nullable=True)
 
@@ -91,16 +139,35 @@ class ModelResponse(Base):
     score_overall = Column(Float, nullable=True)
     score_reasoning = Column(Text, nullable=True)
 
-    # Arabic NLP metrics
-    arabic_metrics = Column(JSON, nullable=True)
-
     created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
 
     evaluation = relationship("Evaluation", back_populates="model_responses")
+    # Blob rows, joined in only by queries that return the payloads
+    text_blob = relationship(
+        "ResponseBlob", primaryjoin="foreign(ModelResponse.response_digest) == ResponseBlob.digest",
+        viewonly=True, lazy="raise",
+    )
+    metrics_blob = relationship(
+        "ResponseBlob", primaryjoin="foreign(ModelResponse.metrics_digest) == ResponseBlob.digest",
+        viewonly=True, lazy="raise",
+    )
 
+    # Leaderboard, trend and best/worst queries are index-only scans on
+    # PostgreSQL: the INCLUDE columns cover everything they read.
     __table_args__ = (
         Index("ix_model_responses_evaluation_id", "evaluation_id"),
-        Index("ix_model_responses_model_id", "model_id"),
+        Index(
+            "ix_model_responses_model_created", "model_id", "created_at",
+            postgresql_include=["score_overall", "dialect", "category"],
+        ),
+        Index(
+            "ix_model_responses_dialect_model_created", "dialect", "model_id", "created_at",
+            postgresql_include=["score_overall", "category"],
+        ),
+        Index("ix_model_responses_model_score", "model_id", "score_overall", postgresql_include=["dialect"]),
+        # Reference checks of the blob sweep
+        Index("ix_model_responses_response_digest", "response_digest"),
+        Index("ix_model_responses_metrics_digest", "metrics_digest"),
     )
 
     @property
@@ -117,3 +184,68 @@ class ModelResponse(Base):
 
     def __repr__(self) -> str:
         return f"<ModelResponse model={self.model_id} overall={self.score_overall}>"
+
+
+class ResponseBlob(Base):
+    """
+    A response body or metrics document, stored once per distinct content
+    under the SHA-256 of its uncompressed bytes. See services/blob_store.py.
+    """
+    __tablename__ = "response_blobs"
+
+    digest = Column(String(64), primary_key=True)
+    codec = Column(String(10), nullable=False)         # zstd | gzip | raw
+    size = Column(Integer, nullable=False)             # bytes, uncompressed
+    stored_size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=True)          # NULL when BLOB_STORE=local keeps it on disk
+    # {"chars": n, "ends": [...]}: a long text compressed n characters at a
+    # time, with each frame's end offset in the stored bytes. NULL: one frame
+    frames = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    used_at = Column(DateTime(timezone=True), default=utcnow, nullable=True)   # last stored again; NULL: created_at
+
+    def __repr__(self) -> str:
+        return f"<ResponseBlob {self.digest[:12]} {self.codec} {self.stored_size}/{self.size}>"
+
+
+# ── Full-text search (PostgreSQL only) ────────────────────
+# A GIN-indexed tsvector per searchable text: each prompt, and each
+# distinct response body; see services/search.py. Not mapped: only the
+# search queries read it. Other databases use the in-process index instead.
+
+SEARCH_CONFIG = "arabic_eval"
+
+# Migrations keep frozen copies of this DDL; a change here needs a new revision too.
+SEARCH_SETUP_DDL = (
+    # diacritics, Quranic marks and tatweel dropped; alef, ya, ta marbuta and hamza seats folded
+    r"""CREATE OR REPLACE FUNCTION arabic_fold(t text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT translate(
+            regexp_replace(lower(normalize(coalesce(t, ''), NFKC)),
+                           '[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]', '', 'g'),
+            'أإآٱىةؤئ', 'اااايهوي')
+        $$""",
+    """DO $$ BEGIN
+        CREATE TEXT SEARCH CONFIGURATION arabic_eval (COPY = pg_catalog.arabic);
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$""",
+)
+
+SEARCH_COLUMN_DDL = {
+    "evaluations": (
+        "ALTER TABLE evaluations ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('arabic_eval'::regconfig, arabic_fold(prompt))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_evaluations_search ON evaluations USING gin (search_vector)",
+    ),
+    # Filled when a response body is stored (blob_store); metrics documents leave it NULL
+    "response_blobs": (
+        "ALTER TABLE response_blobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        "CREATE INDEX IF NOT EXISTS ix_response_blobs_search ON response_blobs USING gin (search_vector)",
+    ),
+}
+
+for _statement in SEARCH_SETUP_DDL:
+    event.listen(Base.metadata, "before_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _table in (Evaluation.__table__, ResponseBlob.__table__):
+    for _statement in SEARCH_COLUMN_DDL[_table.name]:
+        event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,39 @@
+"""
+Model rating ORM model — pairwise-battle ratings per scope.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, Float, Integer, DateTime
+
+from app.core.database import Base
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+class ModelRating(Base):
+    """
+    One model's rating within a scope: "all", or a single dialect.
+
+    `elo`, `battles` and `wins` move online, one completed evaluation at a
+    time. `bt_rating` is the latest batch Bradley-Terry fit over every
+    battle in the scope (see services/ratings).
+    """
+    __tablename__ = "model_ratings"
+
+    scope = Column(String(20), primary_key=True)
+    model_id = Column(String(50), primary_key=True)
+
+    elo = Column(Float, nullable=False, default=1500.0)
+    battles = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False)
+
+    bt_rating = Column(Float, nullable=True)
+    bt_battles = Column(Integer, nullable=True)
+    fitted_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ModelRating scope={self.scope} model={self.model_id} elo={self.elo:.0f}>"
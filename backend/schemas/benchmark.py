@@ -1,9 +1,11 @@
 """Pydantic schemas for benchmarks."""
 
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+StrataField = Literal["dialect", "category", "difficulty"]
 
 
 class BenchmarkDatasetOut(BaseModel):
@@ -21,10 +23,111 @@ class BenchmarkDatasetOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BenchmarkImportError(BaseModel):
+    position: int                                      # line (JSONL/CSV) or row (Parquet) number
+    message: str
+
+
+class BenchmarkImportOut(BaseModel):
+    read: int
+    inserted: int
+    duplicates: int
+    rejected: int
+    prompt_count: int
+    seconds: float
+    errors: List[BenchmarkImportError] = []
+
+
+class BenchmarkSampleOut(BaseModel):
+    seed: int
+    size: int
+    population: int
+    strata: Dict[str, int]
+    prompt_ids: List[UUID]
+
+
+class SequentialOptionsIn(BaseModel):
+    """Stop a run early once its ranking is statistically settled (or the budget is spent)."""
+    confidence: float = Field(0.95, gt=0.5, lt=1.0)
+    min_prompts: int = Field(20, ge=2, description="Never stop before this many prompts")
+    check_every: int = Field(10, ge=1, description="Prompts between looks at the data")
+    tie_margin: float = Field(0.0, ge=0.0, le=10.0, description="Mean differences below this count as ties")
+    budget_usd: Optional[float] = Field(None, gt=0, description="Stop once provider spend reaches this")
+
+
 class BenchmarkRunRequest(BaseModel):
     dataset_slug: str
     model_ids: List[str] = Field(..., min_length=1, max_length=6)
     sample_size: Optional[int] = Field(None, ge=10, le=1000)
+    seed: Optional[int] = Field(None, ge=0, lt=2 ** 53, description="Reuse a run's seed to draw the same prompts")
+    stratify_by: List[StrataField] = Field(default=[], description="Sample each dialect/category/difficulty stratum")
+    allocation: Literal["proportional", "equal"] = "proportional"
+    sequential: Optional[SequentialOptionsIn] = Field(None, description="Early stopping; omit to run the full sample")
+
+    @field_validator("stratify_by")
+    @classmethod
+    def validate_stratify_by(cls, v: List[str]) -> List[str]:
+        if len(set(v)) != len(v):
+            raise ValueError("Duplicate stratification fields are not allowed.")
+        return v
+
+
+# ── Run summaries (services/aggregation + services/sequential) ──
+
+class ScoreInterval(BaseModel):
+    mean: Optional[float] = None
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+
+
+class ModelSummary(ScoreInterval):
+    n: int                                             # prompts with an overall score
+    rating: Optional[float] = None                     # Bradley-Terry, Elo scale
+    dimensions: Dict[str, ScoreInterval] = {}
+
+
+class PairwiseWinRate(BaseModel):
+    models: List[str]                                  # [a, b]
+    n: int                                             # prompts both were scored on
+    win_rate: Optional[float] = None                   # share won by a; ties count half
+
+
+class DialectBreakdown(BaseModel):
+    dialect: str
+    prompts: int
+    models: Dict[str, Optional[float]]                 # mean overall score
+    ranking: List[str]
+
+
+class PairVerdict(BaseModel):
+    models: List[str]
+    n: int
+    mean_difference: float
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    verdict: Literal["separated", "tied", "undecided"]
+
+
+class StoppingInfo(BaseModel):
+    reason: Optional[str] = None                       # ranking_settled | budget_exhausted | sample_exhausted
+    prompts_evaluated: int
+    prompts_planned: int
+    prompts_saved: int
+    cost_usd: float
+    confidence: float
+    decision_z: float
+
+
+class BenchmarkSummary(BaseModel):
+    prompts: int
+    confidence: float
+    bootstrap_samples: int
+    ranking: List[str]
+    models: Dict[str, ModelSummary]
+    pairwise: List[PairwiseWinRate] = []
+    dialects: List[DialectBreakdown] = []
+    adjacent_pairs: List[PairVerdict] = []
+    stopping: Optional[StoppingInfo] = None
 
 
 class BenchmarkRunOut(BaseModel):
@@ -32,9 +135,14 @@ class BenchmarkRunOut(BaseModel):
     dataset_id: UUID
     model_ids: List[str]
     sample_size: Optional[int] = None
+    seed: Optional[int] = None
+    sampling: Optional[Dict] = None
+    sequential: Optional[Dict] = None
     status: str
-    results_summary: Optional[Dict] = None
+    results_summary: Optional[BenchmarkSummary] = None
+    error_message: Optional[str] = None
     created_at: datetime
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
@@ -1,6 +1,6 @@
 """Shared Pydantic response schemas."""
 
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from pydantic import BaseModel
 
 
@@ -10,6 +10,7 @@ class HealthResponse(BaseModel):
     environment: str
     database: str
     redis: str
+    providers: Dict[str, Dict[str, Any]] = {}
 
 
 class ErrorDetail(BaseModel):
@@ -3,11 +3,13 @@ Pydantic schemas for evaluation request/response validation.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.model_registry import model_registry
+
 
 # ── Enums ─────────────────────────────────────────────────
 
@@ -17,12 +19,6 @@ VALID_CATEGORIES = {
     "instruction_following", "translation", "creative_writing",
     "code_generation", "culture_heritage",
 }
-VALID_MODELS = {
-    "gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo",
-    "claude-3-5-sonnet", "claude-3-opus",
-    "gemini-1.5-pro", "gemini-1.5-flash",
-    "llama-3-70b", "mistral-large", "jais-30b",
-}
 
 
 # ── Request Schemas ───────────────────────────────────────
@@ -57,9 +53,9 @@ class EvaluationCreateRequest(BaseModel):
     @field_validator("models")
     @classmethod
     def validate_models(cls, v: List[str]) -> List[str]:
-        invalid = [m for m in v if m not in VALID_MODELS]
+        invalid = [m for m in v if m not in model_registry]
         if invalid:
-            raise ValueError(f"Unknown models: {invalid}. Valid: {sorted(VALID_MODELS)}")
+            raise ValueError(f"Unknown models: {invalid}. Valid: {sorted(model_registry.ids)}")
         if len(set(v)) != len(v):
             raise ValueError("Duplicate models are not allowed.")
         return v
@@ -93,9 +89,15 @@ class ModelResponseOut(BaseModel):
     model_name: str
     provider: str
     response_text: Optional[str] = None
+    response_text_length: Optional[int] = None     # characters, before any truncation
+    response_text_truncated: bool = False
     latency_ms: Optional[int] = None
     token_count: Optional[int] = None
+    input_tokens: Optional[int] = None
+    usage_source: Optional[str] = None
+    tokens_per_second: Optional[float] = None
     cost_usd: Optional[float] = None
+    cost_per_score_point: Optional[float] = None
     error: Optional[str] = None
     scores: ScoreBreakdown
     arabic_metrics: Optional[Dict] = None
@@ -118,6 +120,17 @@ class EvaluationOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ModelResponseSummary(BaseModel):
+    """Per-model figures embedded in list items by include=model_responses."""
+    model_id: str
+    provider: str
+    latency_ms: Optional[int] = None
+    token_count: Optional[int] = None
+    cost_usd: Optional[float] = None
+    error: Optional[str] = None
+    scores: Dict[str, Optional[float]] = Field(default_factory=dict)
+
+
 class EvaluationListItem(BaseModel):
     id: UUID
     prompt: str
@@ -127,6 +140,7 @@ class EvaluationListItem(BaseModel):
     winner_model_id: Optional[str] = None
     model_count: int = 0
     created_at: datetime
+    model_responses: Optional[List[ModelResponseSummary]] = None
 
     model_config = {"from_attributes": True}
 
@@ -137,3 +151,50 @@ class PaginatedEvaluations(BaseModel):
     page: int
     page_size: int
     pages: int
+
+
+class EvaluationBatchOut(BaseModel):
+    id: UUID
+    status: str                       # pending | running | completed (all finished)
+    total: int
+    pending: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    created_at: datetime
+    evaluation_ids: Optional[List[UUID]] = None   # only in the submission response
+
+
+class ResponseTextChunk(BaseModel):
+    evaluation_id: UUID
+    model_id: str
+    offset: int                       # characters, 0-based
+    length: int                       # characters in `text`
+    total_length: int
+    next_offset: Optional[int] = None  # None once the end is reached
+    text: str
+
+
+class SpanLink(BaseModel):
+    trace_id: str
+    span_id: str
+
+
+class TimelineSpan(BaseModel):
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    offset_ms: float                  # start, relative to the first span in the trace
+    duration_ms: float
+    status: str
+    status_message: Optional[str] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+    links: List[SpanLink] = Field(default_factory=list)   # related spans in other traces (e.g. the batch)
+
+
+class EvaluationTimeline(BaseModel):
+    evaluation_id: UUID
+    trace_id: str
+    duration_ms: float
+    spans: List[TimelineSpan]
+    dropped_spans: int = 0                        # beyond TRACING_TIMELINE_MAX_SPANS
@@ -0,0 +1,48 @@
+"""Pydantic schemas for leaderboard and trend queries."""
+
+from datetime import date, datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    model_id: str
+    responses: int                                     # scored responses in the window
+    mean_score: float                                  # mean overall judge score, 0–10
+
+
+class LeaderboardOut(BaseModel):
+    dialect: Optional[str] = None
+    category: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    models: List[LeaderboardEntryOut]
+
+
+class TrendPointOut(BaseModel):
+    period: date                                       # first day of the bucket (UTC)
+    responses: int
+    mean_score: float
+
+
+class TrendOut(BaseModel):
+    model_id: str
+    bucket: Literal["day", "week", "month"]
+    dialect: Optional[str] = None
+    points: List[TrendPointOut]
+
+
+class ScoredResponseOut(BaseModel):
+    evaluation_id: UUID
+    dialect: Optional[str] = None
+    category: Optional[str] = None
+    score_overall: float
+    created_at: datetime
+
+
+class ScoredResponsesOut(BaseModel):
+    model_id: str
+    order: Literal["best", "worst"]
+    items: List[ScoredResponseOut]
@@ -0,0 +1,100 @@
+"""
+Sparse fieldsets — turn a `fields=` query parameter into a pydantic
+`include` spec for `model_dump`.
+
+Paths are comma-separated and dotted into nested models:
+
+    fields=id,status,ranking
+    fields=model_responses.model_id,model_responses.scores.overall
+
+Naming a nested model (`model_responses`) includes all of it. Lists of
+models are addressed the same way as single models.
+"""
+
+import typing
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.core.exceptions import InvalidFieldsError
+
+Include = Dict[str, object]
+
+
+def _nested_model(annotation) -> Optional[Type[BaseModel]]:
+    """The BaseModel inside Optional[...] / List[...], if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        found = _nested_model(arg)
+        if found is not None:
+            return found
+    return None
+
+
+def _is_list(annotation) -> bool:
+    if typing.get_origin(annotation) in (list, List):
+        return True
+    return any(_is_list(arg) for arg in typing.get_args(annotation))
+
+
+def field_paths(model: Type[BaseModel], prefix: str = "") -> List[str]:
+    """Every addressable path of `model`, for error messages and docs."""
+    paths = []
+    for name, info in model.model_fields.items():
+        path = f"{prefix}{name}"
+        paths.append(path)
+        nested = _nested_model(info.annotation)
+        if nested is not None:
+            paths.extend(field_paths(nested, f"{path}."))
+    return paths
+
+
+def _add(spec: Include, model: Type[BaseModel], parts: List[str]) -> bool:
+    name, rest = parts[0], parts[1:]
+    info = model.model_fields.get(name)
+    if info is None:
+        return False
+    if not rest:
+        spec[name] = True
+        return True
+    nested = _nested_model(info.annotation)
+    if nested is None:
+        return False
+    if spec.get(name) is True:                # already included whole; just validate
+        return _add({}, nested, rest)
+    if _is_list(info.annotation):
+        inner = spec.setdefault(name, {"__all__": {}})["__all__"]
+    else:
+        inner = spec.setdefault(name, {})
+    return _add(inner, nested, rest)
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel], always: tuple = ()) -> Optional[Include]:
+    """
+    Parse `raw` against `model`. Returns None when no projection was
+    asked for; raises InvalidFieldsError on unknown paths.
+    """
+    if raw is None or not raw.strip():
+        return None
+    spec: Include = {name: True for name in always}
+    unknown = [
+        path for path in (p.strip() for p in raw.split(","))
+        if path and not _add(spec, model, path.split("."))
+    ]
+    if unknown:
+        raise InvalidFieldsError(unknown, field_paths(model))
+    return spec
+
+
+def includes(spec: Optional[Include], *path: str) -> bool:
+    """True when `spec` (None = everything) selects anything under `path`."""
+    node: object = spec
+    for name in path:
+        if node is None or node is True:
+            return True
+        node = node.get("__all__", node)
+        if name not in node:
+            return False
+        node = node[name]
+    return True
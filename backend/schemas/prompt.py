@@ -0,0 +1,59 @@
+"""Pydantic schemas for prompt similarity lookups and dataset contamination."""
+
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+PromptKind = Literal["evaluation", "benchmark_prompt"]
+
+
+class SimilarPromptsRequest(BaseModel):
+    prompt: str = Field(..., min_length=1, max_length=8000)
+    threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Default: PROMPT_SIMILARITY_THRESHOLD")
+    limit: int = Field(10, ge=1, le=100)
+    kinds: Optional[List[PromptKind]] = Field(None, description="Default: both kinds")
+
+
+class PromptMatchOut(BaseModel):
+    kind: PromptKind
+    id: UUID                                           # evaluation id or benchmark prompt id
+    similarity: float                                  # estimated Jaccard of 5-gram shingles
+    exact: bool                                        # same text after normalization
+    prompt: str                                        # first characters of the matching prompt
+    dataset_slug: Optional[str] = None                 # benchmark prompts only
+    dialect: Optional[str] = None
+    status: Optional[str] = None                       # evaluations only
+
+
+class SimilarPromptsOut(BaseModel):
+    threshold: float
+    index_ready: bool                                  # False while the index is still loading
+    matches: List[PromptMatchOut]
+
+
+class PromptIndexStatsOut(BaseModel):
+    ready: bool
+    entries: int
+    merged: int
+    pending_merge: int
+    memory_bytes: int
+    logged_since_checkpoint: int
+    persistent: bool
+
+
+class ContaminatedPromptOut(BaseModel):
+    prompt_id: UUID
+    prompt: str
+    matches: List[PromptMatchOut]
+
+
+class ContaminationReportOut(BaseModel):
+    dataset_slug: str
+    threshold: float
+    index_ready: bool
+    prompts_checked: int
+    flagged: int                                       # prompts with at least one match below
+    within_dataset: int                                # … matching another prompt of this dataset
+    cross_dataset: int                                 # … matching a prompt of another dataset
+    evaluations: int                                   # … matching a user-submitted evaluation
+    prompts: List[ContaminatedPromptOut]               # first `limit` flagged prompts
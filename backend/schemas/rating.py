@@ -0,0 +1,32 @@
+"""Pydantic schemas for model ratings."""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+RatingMethod = Literal["elo", "bt"]
+
+
+class ModelRatingOut(BaseModel):
+    rank: int
+    model_id: str
+    elo: float                                         # online, updated per completed evaluation
+    battles: int
+    wins: int
+    win_rate: Optional[float] = None
+    bt_rating: Optional[float] = None                  # latest batch Bradley-Terry fit
+    bt_battles: Optional[int] = None
+
+
+class RatingsOut(BaseModel):
+    scope: str                                         # "all" or a dialect
+    method: RatingMethod                               # what `rank` orders by
+    fitted_at: Optional[datetime] = None               # last Bradley-Terry refit of this scope
+    models: List[ModelRatingOut]
+
+
+class RatingRefitOut(BaseModel):
+    battles: int
+    scopes: int
+    models: int
+    fitted_at: datetime
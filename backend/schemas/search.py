@@ -0,0 +1,30 @@
+"""Pydantic schemas for full-text search."""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+SearchScope = Literal["all", "prompt", "response"]
+
+
+class SearchHitOut(BaseModel):
+    evaluation_id: UUID
+    kind: Literal["prompt", "response"]
+    model_id: Optional[str] = None                     # responses only
+    score: float                                       # BM25 (memory) or ts_rank_cd (postgres)
+    highlights: List[str]                              # HTML-escaped snippets, matches in <mark>
+    prompt: str                                        # first characters of the evaluation's prompt
+    dialect: str
+    category: str
+    status: str
+    created_at: datetime
+
+
+class SearchResultsOut(BaseModel):
+    query: str
+    backend: Literal["postgres", "memory"]
+    page: int
+    page_size: int
+    has_more: bool
+    items: List[SearchHitOut]
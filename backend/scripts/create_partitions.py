@@ -0,0 +1,65 @@
+"""
+Create upcoming monthly partitions of model_responses.
+
+Usage:
+    python -m app.scripts.create_partitions
+    python -m app.scripts.create_partitions --months-ahead 6
+
+Only for a table partitioned by migration 0003
+(`alembic -x partition=monthly upgrade head`); otherwise it reports that
+and exits. Creates any missing partition from the current month to
+--months-ahead months out, so rows never land in the DEFAULT partition.
+Existing partitions are left alone, so it is safe to run from cron
+(monthly, or more often).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _create(args) -> dict:
+    from sqlalchemy import text
+
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        partitioned = (await db.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('model_responses')"
+        ))).scalar()
+        if not partitioned:
+            return {"partitioned": False, "created": 0}
+        created = (await db.execute(
+            text(
+                "SELECT create_monthly_partitions('model_responses', current_date, "
+                "(current_date + make_interval(months => :months))::date)"
+            ),
+            {"months": args.months_ahead},
+        )).scalar()
+        await db.commit()
+        partitions = (await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'model_responses'::regclass ORDER BY c.relname"
+        ))).scalars().all()
+    return {"partitioned": True, "created": created, "partitions": partitions}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic model_responses partitions")
+    parser.add_argument("--months-ahead", type=int, default=3, help="create partitions up to this many months out")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    summary = asyncio.run(_create(args))
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if summary["partitioned"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Query plans and timings for the leaderboard, trend and history access paths.
+
+Usage:
+    python -m app.scripts.explain_queries --database-url postgresql+asyncpg://.../llm_eval_bench --seed 10000000
+    python -m app.scripts.explain_queries --database-url postgresql+asyncpg://.../llm_eval_bench   # reuse the data
+    python -m app.scripts.explain_queries --seed 100000                 # throwaway SQLite file
+    python -m app.scripts.explain_queries -k leaderboard --runs 10
+
+--seed N inserts N scored responses into a database with no
+evaluations yet. Each evaluation gets one response per model, spread
+over the past year across every dialect and category; on PostgreSQL the
+rows are generated server-side with generate_series. Migrate the
+database first (`alembic upgrade head`, plus `-x partition=monthly` to
+measure partitioning). A database without tables is given the models'
+schema instead.
+
+Every query runs once to warm the cache, then --runs times. Prints the
+plan (EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL, EXPLAIN QUERY PLAN on
+SQLite) and the median time. --output also writes everything as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+MODELS = {"gpt-4o": 0.6, "claude-3-5-sonnet": 0.5, "jais-30b": 0.3, "gemini-1.5-pro": 0.0}   # score bias
+DIALECTS = ["msa", "gulf", "egyptian", "levantine", "maghrebi", "iraqi"]
+CATEGORIES = [
+    "dialect_understanding", "technical_terminology", "reasoning", "instruction_following",
+    "translation", "creative_writing", "code_generation", "culture_heritage",
+]
+SPAN = timedelta(days=365)
+CHUNK = 250_000                   # evaluations per INSERT on PostgreSQL
+
+
+def _queries(dialect_name: str, end: datetime) -> dict:
+    from sqlalchemy import func, select
+
+    from app.models.evaluation import Evaluation
+    from app.services import leaderboard as q
+
+    model = next(iter(MODELS))
+    return {
+        "leaderboard": q.leaderboard_query(),
+        "leaderboard.dialect": q.leaderboard_query("gulf"),
+        "leaderboard.dialect.joined": q.leaderboard_join_query("gulf"),
+        "leaderboard.dialect.30d": q.leaderboard_query("gulf", since=end - timedelta(days=30)),
+        "leaderboard.dialect.category.30d": q.leaderboard_query("gulf", "reasoning", since=end - timedelta(days=30)),
+        "trend.day.dialect.90d": q.trend_query(model, "day", dialect_name, "gulf", since=end - timedelta(days=90)),
+        "trend.week": q.trend_query(model, "week", dialect_name),
+        "responses.best.dialect": q.responses_query(model, "gulf", "best", 20),
+        "history.dialect.page": (
+            select(Evaluation.id, func.substr(Evaluation.prompt, 1, 121), Evaluation.status, Evaluation.created_at)
+            .where(Evaluation.dialect == "gulf")
+            .order_by(Evaluation.created_at.desc())
+            .limit(20)
+        ),
+    }
+
+
+# ── Seeding ────────────────────────────────────────────────
+
+def _array(values) -> str:
+    return "ARRAY[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+async def _seed_postgres(conn, evaluations: int, start: datetime) -> None:
+    from sqlalchemy import text
+
+    step = SPAN.total_seconds() / evaluations
+    partitioned = (await conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('model_responses')"
+    ))).scalar()
+    if partitioned:
+        await conn.execute(
+            text("SELECT create_monthly_partitions('model_responses', :first, :last)"),
+            {"first": start.date(), "last": (start + SPAN).date()},
+        )
+    dialects, categories = _array(DIALECTS), _array(CATEGORIES)
+    models = ", ".join(f"('{m}', {bias})" for m, bias in MODELS.items())
+    for lo in range(0, evaluations, CHUNK):
+        hi = min(evaluations, lo + CHUNK)
+        created = f"(:start + (g * {step}) * interval '1 second')"
+        await conn.execute(text(f"""
+            INSERT INTO evaluations (id, prompt, dialect, category, max_tokens, status, created_at, completed_at)
+            SELECT md5('e' || g)::uuid, 'bench prompt', {dialects}[1 + g % {len(DIALECTS)}],
+                   {categories}[1 + (g / {len(DIALECTS)}) % {len(CATEGORIES)}], 1024, 'completed', {created}, {created}
+            FROM generate_series({lo}, {hi - 1}) g
+        """), {"start": start})
+        await conn.execute(text(f"""
+            INSERT INTO model_responses (id, evaluation_id, model_id, model_name, provider, dialect, category,
+                                         latency_ms, token_count, score_overall, created_at)
+            SELECT md5('r' || g || m.model_id)::uuid, md5('e' || g)::uuid, m.model_id, m.model_id, 'bench',
+                   {dialects}[1 + g % {len(DIALECTS)}], {categories}[1 + (g / {len(DIALECTS)}) % {len(CATEGORIES)}],
+                   300 + (random() * 3700)::int, 200, round((3 + random() * 6.4 + m.bias)::numeric, 2), {created}
+            FROM generate_series({lo}, {hi - 1}) g, (VALUES {models}) AS m(model_id, bias)
+        """), {"start": start})
+        await conn.commit()
+        print(f"  seeded {hi * len(MODELS):,} responses", file=sys.stderr)
+
+
+def _id(n: int) -> uuid.UUID:
+    # Leading "b": SQLite gives the PostgreSQL UUID type numeric affinity and would coerce all-digit hex
+    return uuid.UUID(int=(0xB << 124) | n)
+
+
+async def _seed_generic(conn, evaluations: int, start: datetime) -> None:
+    from sqlalchemy import insert
+
+    from app.models.evaluation import Evaluation, ModelResponse
+
+    rng = random.Random(0)
+    step = SPAN / evaluations
+    for lo in range(0, evaluations, 10_000):
+        evals, resps = [], []
+        for g in range(lo, min(evaluations, lo + 10_000)):
+            eval_id, created = _id((g + 1) << 8), start + g * step
+            dialect, category = DIALECTS[g % len(DIALECTS)], CATEGORIES[(g // len(DIALECTS)) % len(CATEGORIES)]
+            evals.append({
+                "id": eval_id, "prompt": "bench prompt", "dialect": dialect, "category": category,
+                "status": "completed", "created_at": created, "completed_at": created,
+            })
+            for k, (model_id, bias) in enumerate(MODELS.items(), 1):
+                resps.append({
+                    "id": _id(((g + 1) << 8) + k), "evaluation_id": eval_id,
+                    "model_id": model_id, "model_name": model_id,
+                    "provider": "bench", "dialect": dialect, "category": category,
+                    "latency_ms": rng.randint(300, 4000), "token_count": 200,
+                    "score_overall": round(3 + rng.random() * 6.4 + bias, 2), "created_at": created,
+                })
+        await conn.execute(insert(Evaluation), evals)
+        await conn.execute(insert(ModelResponse), resps)
+        await conn.commit()
+
+
+async def _prepare(engine, responses: int) -> None:
+    from sqlalchemy import func, inspect, select, text
+
+    from app.core.database import Base
+    from app.models import benchmark, evaluation, rating, user  # noqa: F401
+    from app.models.evaluation import Evaluation
+
+    async with engine.connect() as conn:
+        if not await conn.run_sync(lambda c: inspect(c).has_table("evaluations")):
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.commit()
+        if not responses:
+            return
+        if (await conn.execute(select(func.count()).select_from(Evaluation))).scalar():
+            raise SystemExit("--seed needs a database without evaluations")
+        evaluations = max(1, responses // len(MODELS))
+        start = datetime.now(timezone.utc) - SPAN
+        started = time.perf_counter()
+        if engine.dialect.name == "postgresql":
+            await _seed_postgres(conn, evaluations, start)
+        else:
+            await _seed_generic(conn, evaluations, start)
+        print(f"seeded {evaluations * len(MODELS):,} responses in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    # Fresh statistics, and on PostgreSQL a visibility map so index-only scans skip the heap
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE" if engine.dialect.name == "postgresql" else "ANALYZE"))
+
+
+# ── Plans and timings ──────────────────────────────────────
+
+async def _explain(engine, patterns, runs: int) -> list:
+    from sqlalchemy import func, select, text
+
+    from app.models.evaluation import ModelResponse
+
+    postgres = engine.dialect.name == "postgresql"
+    results = []
+    async with engine.connect() as conn:
+        end = (await conn.execute(select(func.max(ModelResponse.created_at)))).scalar() or datetime.now(timezone.utc)
+        if isinstance(end, str):
+            end = datetime.fromisoformat(end)
+        for name, statement in _queries(engine.dialect.name, end).items():
+            if patterns and not any(p in name for p in patterns):
+                continue
+            sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            explain = "EXPLAIN (ANALYZE, BUFFERS) " if postgres else "EXPLAIN QUERY PLAN "
+            plan_rows = (await conn.execute(text(explain + sql))).all()
+            plan = [row[0] for row in plan_rows] if postgres else [row[-1] for row in plan_rows]
+            await conn.execute(text(sql))                     # warm-up
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                rows = (await conn.execute(text(sql))).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append({
+                "query": name,
+                "rows": len(rows),
+                "median_ms": round(statistics.median(timings), 3),
+                "min_ms": round(min(timings), 3),
+                "sql": sql,
+                "plan": plan,
+            })
+    return results
+
+
+async def _main(args) -> list:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory(prefix="llm-eval-explain-")
+        url = f"sqlite+aiosqlite:///{os.path.join(tmpdir.name, 'explain.db')}"
+    engine = create_async_engine(url)
+    try:
+        await _prepare(engine, args.seed)
+        return await _explain(engine, args.patterns, args.runs)
+    finally:
+        await engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic query plans")
+    parser.add_argument("--database-url", default="", help="defaults to a temporary SQLite file")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="first insert N scored responses")
+    parser.add_argument("-k", dest="patterns", action="append", help="query name substring filter (repeatable)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="also write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_main(args))
+    for r in results:
+        print(f"\n── {r['query']} — median {r['median_ms']:.1f} ms, {r['rows']} rows")
+        for line in r["plan"]:
+            print(f"   {line}")
+    print()
+    print(f"{'query':<36} {'median ms':>10} {'min ms':>10} {'rows':>7}")
+    for r in results:
+        print(f"{r['query']:<36} {r['median_ms']:>10.2f} {r['min_ms']:>10.2f} {r['rows']:>7}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Export evaluations with their responses and scores.
+
+Two sources:
+
+    db  — read the database directly (DATABASE_URL) through a server-side cursor
+    url — stream GET /api/v1/evaluations/export from a running server
+
+Usage:
+    python -m app.scripts.export_evaluations -o evals.jsonl
+    python -m app.scripts.export_evaluations -f parquet --dialect gulf --since 2026-01-01 -o gulf.parquet
+    python -m app.scripts.export_evaluations --url http://localhost:8000 -f csv --model gpt-4o -o gpt4o.csv
+
+Output is written chunk by chunk, so memory stays flat for any export size.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _from_db(args, out) -> None:
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.services import exporter
+
+    if args.format == "parquet" and not exporter.PARQUET_AVAILABLE:
+        raise SystemExit("parquet export needs pyarrow (pip install pyarrow)")
+    filters = exporter.ExportFilters(
+        dialect=args.dialect,
+        category=args.category,
+        model_id=args.model,
+        status=args.status,
+        since=args.since,
+        until=args.until,
+        include_text=not args.no_text,
+    )
+    async with AsyncSessionLocal() as db:
+        partitions = exporter.stream_rows(db, filters, batch_size=args.batch_size or settings.EXPORT_BATCH_SIZE)
+        async for chunk in exporter.encoder(args.format, exporter.columns(filters))(partitions):
+            out.write(chunk)
+
+
+async def _from_url(args, out) -> None:
+    import httpx
+
+    params = {
+        "format": args.format,
+        "dialect": args.dialect,
+        "category": args.category,
+        "model": args.model,
+        "status": args.status,
+        "since": args.since.isoformat() if args.since else None,
+        "until": args.until.isoformat() if args.until else None,
+        "include_text": str(not args.no_text).lower(),
+    }
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        async with client.stream(
+            "GET",
+            "/api/v1/evaluations/export",
+            params={k: v for k, v in params.items() if v is not None},
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                out.write(chunk)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic evaluation export")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv", "parquet"], default="jsonl")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--url", help="stream from a running server instead of the database")
+    parser.add_argument("--dialect")
+    parser.add_argument("--category")
+    parser.add_argument("--model", help="only responses from this model id")
+    parser.add_argument("--status")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="created_at >= (ISO date/time)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="created_at < (ISO date/time)")
+    parser.add_argument("--no-text", action="store_true", help="leave out response texts")
+    parser.add_argument("--batch-size", type=int, help="rows per cursor partition (db source)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        asyncio.run(_from_url(args, out) if args.url else _from_db(args, out))
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"wrote {os.path.getsize(args.output)} bytes to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Import benchmark prompts from a JSONL, CSV or Parquet file.
+
+Two targets:
+
+    db  — write to the database directly (DATABASE_URL); COPY on PostgreSQL
+    url — upload to POST /api/v1/benchmarks/{slug}/prompts on a running server
+
+Usage:
+    python -m app.scripts.import_benchmark prompts.jsonl --dataset arabic-mmlu
+    python -m app.scripts.import_benchmark gulf.parquet --dataset gulf-qa --create --name "Gulf QA" --dialect gulf
+    python -m app.scripts.import_benchmark prompts.csv --dataset arabic-mmlu --url http://localhost:8000 --api-key eval_...
+
+The file is streamed in batches, never loaded whole. The import runs in
+one transaction: it is all there or, if it fails, none of it is.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _to_db(args) -> dict:
+    from sqlalchemy import select
+
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.models.benchmark import BenchmarkDataset
+    from app.services.benchmark_importer import detect_format, import_prompts
+
+    fmt = args.format or detect_format(filename=args.path)
+    async with AsyncSessionLocal() as db:
+        dataset = (
+            await db.execute(select(BenchmarkDataset).where(BenchmarkDataset.slug == args.dataset))
+        ).scalar_one_or_none()
+        if dataset is None:
+            if not args.create:
+                raise SystemExit(f"benchmark '{args.dataset}' does not exist (use --create)")
+            dataset = BenchmarkDataset(
+                slug=args.dataset, name=args.name or args.dataset, dialect=args.dialect, prompt_count=0,
+            )
+            db.add(dataset)
+            await db.flush()
+        try:
+            with open(args.path, "rb") as source:
+                result = await import_prompts(
+                    db, dataset, source, fmt,
+                    batch_size=args.batch_size or settings.BENCHMARK_IMPORT_BATCH_SIZE,
+                    strict=args.strict,
+                )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    return result.as_dict()
+
+
+async def _to_url(args) -> dict:
+    import httpx
+
+    from app.services.benchmark_importer import detect_format
+
+    fmt = args.format or detect_format(filename=args.path)
+
+    async def body():
+        with open(args.path, "rb") as source:
+            while chunk := source.read(1 << 20):
+                yield chunk
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        resp = await client.post(
+            f"/api/v1/benchmarks/{args.dataset}/prompts",
+            params={"format": fmt, "strict": str(args.strict).lower()},
+            headers={"Authorization": f"Bearer {args.api_key}"},
+            content=body(),
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic benchmark import")
+    parser.add_argument("path", help="JSONL, CSV or Parquet file")
+    parser.add_argument("--dataset", required=True, help="benchmark slug")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv", "parquet"], help="default: from the file extension")
+    parser.add_argument("--strict", action="store_true", help="import nothing if any record is invalid")
+    parser.add_argument("--batch-size", type=int, help="prompts per insert (db target)")
+    parser.add_argument("--create", action="store_true", help="create the benchmark if it does not exist")
+    parser.add_argument("--name", help="name for --create")
+    parser.add_argument("--dialect", help="dataset dialect for --create; the default for records without one")
+    parser.add_argument("--url", help="upload to a running server instead of writing to the database")
+    parser.add_argument("--api-key", default=os.environ.get("LLM_EVAL_API_KEY", ""))
+    args = parser.parse_args(argv)
+
+    if args.url and not args.api_key:
+        parser.error("--url needs an admin --api-key (or LLM_EVAL_API_KEY)")
+    logging.disable(logging.WARNING)
+
+    summary = asyncio.run(_to_url(args) if args.url else _to_db(args))
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Load generator for the evaluation pipeline.
+
+Pairs with the mock provider (MOCK_LLM_ENABLED=true) to measure end-to-end
+throughput without provider keys. Three modes:
+
+    pipeline  — in-process: run_parallel_evaluation + score_all_responses
+    http      — POST /api/v1/evaluations/run, then poll until completed
+    ws        — stream through /ws/evaluate (needs the `websockets` package)
+
+Usage:
+    python -m app.scripts.load_test pipeline -n 200 -c 20
+    python -m app.scripts.load_test http --url http://localhost:8000 -n 500 -c 50
+    python -m app.scripts.load_test ws --url ws://localhost:8000 -n 100 -c 10
+
+Prints a JSON summary (throughput, latency percentiles, error rate).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+PROMPTS = [
+    "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي",
+    "ما هي أبرز التحديات التي يواجهها الذكاء الاصطناعي العربي؟",
+    "وش رأيك في استخدام الحوسبة السحابية للشركات الصغيرة؟",
+    "إيه هي أحسن طريقة لتعلم البرمجة من الصفر؟",
+    "شو الفرق بين قاعدة البيانات العلائقية وغير العلائقية؟",
+    "اكتب قصة قصيرة عن رحلة في الصحراء العربية",
+]
+DIALECTS = ["msa", "gulf", "egyptian", "levantine"]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 1)
+
+
+async def _drive(
+    one: Callable[[int], Awaitable[bool]],
+    total: int,
+    concurrency: int,
+) -> dict:
+    """Run `one(i)` `total` times with at most `concurrency` in flight."""
+    sem = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def wrapped(i: int) -> None:
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                ok = await one(i)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(wrapped(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(max(latencies), 1) if latencies else 0.0,
+        },
+    }
+
+
+# ── Modes ─────────────────────────────────────────────────
+
+async def run_pipeline(args) -> dict:
+    os.environ.setdefault("MOCK_LLM_ENABLED", "true")
+    from app.services.evaluator import run_parallel_evaluation
+    from app.services.scorer import score_all_responses
+
+    async def one(i: int) -> bool:
+        prompt = PROMPTS[i % len(PROMPTS)] + f" ({i})"
+        dialect = DIALECTS[i % len(DIALECTS)]
+        results = await run_parallel_evaluation(prompt, dialect, args.models, args.max_tokens)
+        await score_all_responses(results, prompt, dialect, "reasoning", None)
+        return all(r.error is None for r in results)
+
+    return await _drive(one, args.requests, args.concurrency)
+
+
+async def run_http(args) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        async def one(i: int) -> bool:
+            resp = await client.post("/api/v1/evaluations/run", json={
+                "prompt": PROMPTS[i % len(PROMPTS)] + f" ({i})",
+                "dialect": DIALECTS[i % len(DIALECTS)],
+                "category": "reasoning",
+                "models": args.models,
+                "max_tokens": args.max_tokens,
+            })
+            if resp.status_code != 202:
+                return False
+            eval_id = resp.json()["id"]
+            deadline = time.monotonic() + args.timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(args.poll_interval * (0.5 + random.random()))
+                status = (await client.get(f"/api/v1/evaluations/{eval_id}")).json()["status"]
+                if status in ("completed", "failed"):
+                    return status == "completed"
+            return False
+
+        return await _drive(one, args.requests, args.concurrency)
+
+
+async def run_ws(args) -> dict:
+    try:
+        import websockets
+    except ImportError:
+        sys.exit("ws mode needs the `websockets` package (pip install websockets)")
+
+    async def one(i: int) -> bool:
+        async with websockets.connect(f"{args.url}/ws/evaluate") as ws:
+            await ws.send(json.dumps({
+                "prompt": PROMPTS[i % len(PROMPTS)] + f" ({i})",
+                "dialect": DIALECTS[i % len(DIALECTS)],
+                "models": args.models,
+                "max_tokens": args.max_tokens,
+            }))
+            ok = True
+            async for raw in ws:
+                event = json.loads(raw)
+                if event["type"] in ("stream_error", "error"):
+                    ok = False
+                if event["type"] in ("evaluation_complete", "error"):
+                    return ok
+            return False
+
+    return await _drive(one, args.requests, args.concurrency)
+
+
+MODES = {"pipeline": run_pipeline, "http": run_http, "ws": run_ws}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic load generator")
+    parser.add_argument("mode", choices=sorted(MODES))
+    parser.add_argument("-n", "--requests", type=int, default=100)
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--models", nargs="+", default=["gpt-4o", "claude-3-5-sonnet"])
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = parser.parse_args()
+    os.environ.setdefault("LOG_LEVEL", "WARNING")   # keep stdout clean for the JSON
+
+    summary = asyncio.run(MODES[args.mode](args))
+    summary["mode"] = args.mode
+    summary["models"] = args.models
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
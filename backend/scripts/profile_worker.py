@@ -0,0 +1,82 @@
+"""
+Capture a CPU profile as collapsed stacks.
+
+Two modes:
+
+    remote — ask a running worker to profile itself via POST /api/v1/admin/profile
+    bench  — profile benchmark cases in-process with the same sampler
+
+Usage:
+    python -m app.scripts.profile_worker remote --url http://localhost:8000 --api-key eval_... -s 30 -o worker.folded
+    python -m app.scripts.profile_worker bench -k pipeline --max-time 10 -o pipeline.folded
+
+The output is `frame;frame;frame count` lines; render it with
+`flamegraph.pl worker.folded > worker.svg` or open it in speedscope.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _remote(args) -> str:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.seconds + 30) as client:
+        resp = await client.post(
+            "/api/v1/admin/profile",
+            params={"seconds": args.seconds, "interval_ms": args.interval_ms, "threads": args.threads},
+            headers={"Authorization": f"Bearer {args.api_key}"},
+        )
+        resp.raise_for_status()
+        return resp.text
+
+
+async def _bench(args) -> str:
+    from app.benchmarks import cases  # noqa: F401 — registers the cases
+    from app.benchmarks.harness import RunConfig, run_all, select
+    from app.core.profiling import SamplingProfiler
+
+    selected = select(args.patterns)
+    if not selected:
+        raise SystemExit("no benchmark case matches the -k filters")
+    config = RunConfig(min_rounds=1, max_time=args.max_time)
+    with SamplingProfiler(interval=args.interval_ms / 1000) as profiler:
+        await run_all(selected, config)
+    return profiler.result().collapsed()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic sampling profiler")
+    parser.add_argument("mode", choices=["remote", "bench"])
+    parser.add_argument("-o", "--output", help="write collapsed stacks here (default: stdout)")
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-key", default=os.environ.get("LLM_EVAL_API_KEY", ""))
+    parser.add_argument("-s", "--seconds", type=float, default=10.0)
+    parser.add_argument("--threads", choices=["all", "loop"], default="all")
+    parser.add_argument("-k", dest="patterns", action="append", help="benchmark substring filter")
+    parser.add_argument("--max-time", type=float, default=5.0, help="seconds per benchmark case")
+    args = parser.parse_args(argv)
+
+    if args.mode == "remote" and not args.api_key:
+        parser.error("remote mode needs --api-key (or LLM_EVAL_API_KEY)")
+    if args.mode == "bench":
+        logging.disable(logging.WARNING)
+
+    collapsed = asyncio.run(_remote(args) if args.mode == "remote" else _bench(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(collapsed)
+        print(f"wrote {len(collapsed.splitlines())} stacks to {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(collapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
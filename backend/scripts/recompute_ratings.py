@@ -0,0 +1,64 @@
+"""
+Refit Bradley-Terry model ratings from every evaluation battle.
+
+Usage:
+    python -m app.scripts.recompute_ratings
+    python -m app.scripts.recompute_ratings --dialect gulf
+
+Writes bt_rating for every scope ("all" and each dialect) to the
+model_ratings table, then prints the requested scope's ratings. Online
+Elo ratings are left as they are. Meant for cron when the server does
+not refit on its own (RATING_REFIT_INTERVAL_SECONDS=0).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _refit(args) -> dict:
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.rating import ModelRating
+    from app.services.ratings import SCOPE_ALL, refit
+
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        result = await refit(db)
+        scope = args.dialect or SCOPE_ALL
+        rows = await db.scalars(
+            select(ModelRating)
+            .where(ModelRating.scope == scope, ModelRating.bt_rating.is_not(None))
+            .order_by(ModelRating.bt_rating.desc())
+        )
+        ratings = {r.model_id: {"bt_rating": r.bt_rating, "battles": r.bt_battles} for r in rows}
+    return {
+        **result,
+        "fitted_at": result["fitted_at"].isoformat(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "scope": scope,
+        "ratings": ratings,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic ratings refit")
+    parser.add_argument("--dialect", help="print this dialect's ratings (all scopes are refit)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    summary = asyncio.run(_refit(args))
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
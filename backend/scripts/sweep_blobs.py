@@ -0,0 +1,54 @@
+"""
+Delete response blobs that no model response references any more.
+
+Usage:
+    python -m app.scripts.sweep_blobs
+    python -m app.scripts.sweep_blobs --grace-seconds 86400
+
+Blobs are left behind when evaluations are deleted or old partitions of
+model_responses are dropped; the local backend (BLOB_STORE=local) also
+keeps the files of rolled-back writes. Removes those blobs, their files
+and orphaned files once not stored for --grace-seconds (default
+BLOB_SWEEP_GRACE_SECONDS), then prints what it removed. Safe while the
+server runs; meant for cron when the server does not sweep on its own
+(BLOB_SWEEP_INTERVAL_SECONDS=0).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+async def _sweep(args) -> dict:
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.services.blob_store import blob_store
+
+    grace = settings.BLOB_SWEEP_GRACE_SECONDS if args.grace_seconds is None else args.grace_seconds
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        removed = await blob_store.sweep(db, grace, batch_size=args.batch_size)
+    return {**removed, "grace_seconds": grace, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LLM-Eval-Arabic response blob sweep")
+    parser.add_argument("--grace-seconds", type=float, help="keep blobs stored more recently than this")
+    parser.add_argument("--batch-size", type=int, default=1000, help="blobs deleted per transaction")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    summary = asyncio.run(_sweep(args))
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Accounting — token counting and cost calculation for model calls.
+Prefers the usage the provider reports through LangChain
+(`usage_metadata` / `response_metadata`); falls back to a local tokenizer
+estimate when a provider omits it. tiktoken is optional — without it a
+byte-length heuristic is used. Prices come from the model registry.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple
+
+from app.core.model_registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+USAGE_PROVIDER = "provider"
+USAGE_TOKENIZER = "tokenizer"
+USAGE_ESTIMATE = "estimate"
+
+
+@dataclass
+class TokenUsage:
+    input_tokens: int
+    output_tokens: int
+    source: str                 # provider | tokenizer | estimate
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+# ── Provider-reported usage ───────────────────────────────
+
+def _first_int(data: dict, *keys: str) -> Optional[int]:
+    for key in keys:
+        value = data.get(key)
+        if isinstance(value, (int, float)):
+            return int(value)
+    return None
+
+
+def extract_usage(response: Any) -> Optional[TokenUsage]:
+    """
+    Read token usage from a LangChain message. Handles the standard
+    `usage_metadata` field plus the raw OpenAI, Anthropic and Google shapes
+    in `response_metadata`. Returns None when nothing usable is present.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if isinstance(usage, dict):
+        inp = _first_int(usage, "input_tokens")
+        out = _first_int(usage, "output_tokens")
+        if inp is not None and out is not None:
+            return TokenUsage(inp, out, USAGE_PROVIDER)
+
+    meta = getattr(response, "response_metadata", None) or {}
+    for key in ("token_usage", "usage", "usage_metadata"):
+        raw = meta.get(key)
+        if not isinstance(raw, dict):
+            continue
+        inp = _first_int(raw, "prompt_tokens", "input_tokens", "prompt_token_count")
+        out = _first_int(raw, "completion_tokens", "output_tokens", "candidates_token_count")
+        if inp is not None and out is not None:
+            return TokenUsage(inp, out, USAGE_PROVIDER)
+    return None
+
+
+# ── Local tokenizer fallback ──────────────────────────────
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:    # ImportError or missing encoding file
+        logger.info("tiktoken unavailable, using byte-length token estimate: %s", exc)
+        return None
+
+
+def count_tokens(text: Optional[str]) -> Tuple[int, str]:
+    """Return (token_count, source) for `text` using the local tokenizer."""
+    if not text:
+        return 0, USAGE_TOKENIZER
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=())), USAGE_TOKENIZER
+    # BPE vocabularies average roughly 4 UTF-8 bytes per token.
+    return max(1, (len(text.encode("utf-8")) + 3) // 4), USAGE_ESTIMATE
+
+
+def estimate_usage(input_texts: Iterable[str], output_text: Optional[str]) -> TokenUsage:
+    input_tokens, source = 0, USAGE_TOKENIZER
+    for text in input_texts:
+        n, source = count_tokens(text)
+        input_tokens += n
+    output_tokens, out_source = count_tokens(output_text)
+    if USAGE_ESTIMATE in (source, out_source):
+        source = USAGE_ESTIMATE
+    return TokenUsage(input_tokens, output_tokens, source)
+
+
+def resolve_usage(
+    response: Any,
+    input_texts: Iterable[str],
+    output_text: Optional[str],
+) -> TokenUsage:
+    """Provider usage if reported, otherwise a local estimate."""
+    return extract_usage(response) or estimate_usage(input_texts, output_text)
+
+
+# ── Cost ──────────────────────────────────────────────────
+
+def compute_cost(model_id: str, usage: TokenUsage) -> float:
+    """Input + output cost in USD, rounded to 6 decimal places."""
+    spec = model_registry.get(model_id)
+    if spec is None:
+        return 0.0
+    cost = (
+        (usage.input_tokens / 1000) * spec.cost_per_1k_input_usd
+        + (usage.output_tokens / 1000) * spec.cost_per_1k_output_usd
+    )
+    return round(cost, 6)
+
+
+def tokens_per_second(output_tokens: Optional[int], latency_ms: Optional[int]) -> Optional[float]:
+    if not output_tokens or not latency_ms or latency_ms <= 0:
+        return None
+    return round(output_tokens / (latency_ms / 1000), 2)
@@ -0,0 +1,229 @@
+"""
+Aggregation — vectorized statistics over benchmark score matrices.
+
+Input is a ScoreMatrix: per-prompt scores shaped (prompts × models ×
+dimensions) plus the overall score (prompts × models), NaN where a model
+has no score. One call to `summarize` produces everything a benchmark
+summary shows:
+
+    means + CIs   — per model, overall and per dimension, by Poisson
+                    bootstrap: each replicate weights every prompt with a
+                    Poisson(1) count, so a block of replicates is one
+                    (replicates × prompts) @ (prompts × columns) matmul
+                    instead of a Python loop over resamples
+    win rates     — for every model pair, the share of shared prompts won
+                    on overall score (ties count half)
+    ratings       — Bradley-Terry strengths fitted to those pairwise
+                    results, on the Elo scale (mean 1500)
+    dialects      — mean overall score per model within each dialect
+
+Everything is seeded, so the same matrix and seed give the same summary.
+"""
+
+import math
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.scorer import SCORE_DIMENSIONS
+
+ELO_SCALE = 400 / np.log(10)
+ELO_BASE = 1500.0
+_BOOTSTRAP_BLOCK = 100          # replicates per matmul; bounds memory to block × prompts floats
+
+# Poisson(1) by inverse CDF over 16-bit uniforms: ~6x faster than Generator.poisson,
+# and no probability is off by more than 2**-16.
+_POISSON_LUT = np.searchsorted(
+    np.cumsum([math.exp(-1) / math.factorial(k) for k in range(20)]),
+    (np.arange(2 ** 16) + 0.5) / 2 ** 16,
+).astype(np.float32)
+
+
+def poisson_weights(rng: np.random.Generator, shape) -> np.ndarray:
+    return _POISSON_LUT[rng.integers(0, 2 ** 16, size=shape, dtype=np.uint16)]
+
+
+@dataclass
+class ScoreMatrix:
+    model_ids: List[str]
+    scores: np.ndarray                  # (P, M, D) — dimension scores, NaN = missing
+    overall: np.ndarray                 # (P, M)
+    dialects: np.ndarray                # (P,) dialect label per prompt
+    dimensions: Sequence[str] = tuple(SCORE_DIMENSIONS)
+
+    @property
+    def prompts(self) -> int:
+        return self.overall.shape[0]
+
+
+# ── Bootstrap ─────────────────────────────────────────────
+
+def bootstrap_means(
+    values: np.ndarray,
+    n_bootstrap: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """
+    Means and percentile CIs of each column of `values` (P × K, NaN =
+    missing) from `n_bootstrap` Poisson-weighted replicates.
+    """
+    mask = ~np.isnan(values)
+    filled = np.where(mask, values, 0.0).astype(np.float32)
+    counts = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0, dtype=np.float64) / counts
+    complete = bool(mask.all())
+    mask32 = mask.astype(np.float32)
+
+    replicates = np.empty((n_bootstrap, values.shape[1]), dtype=np.float64)
+    for start in range(0, n_bootstrap, _BOOTSTRAP_BLOCK):
+        block = min(_BOOTSTRAP_BLOCK, n_bootstrap - start)
+        weights = poisson_weights(rng, (block, values.shape[0]))
+        sums = weights @ filled
+        totals = weights.sum(axis=1, keepdims=True) if complete else weights @ mask32
+        with np.errstate(invalid="ignore", divide="ignore"):
+            replicates[start:start + block] = sums / totals
+
+    alpha = (1 - confidence) / 2
+    if not n_bootstrap:
+        return {"mean": mean, "low": mean, "high": mean, "n": counts}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)       # all-NaN column: model never scored
+        low, high = np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+    return {"mean": mean, "low": low, "high": high, "n": counts}
+
+
+# ── Pairwise results and ratings ──────────────────────────
+
+def pairwise_wins(overall: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    wins[i, j]: prompts where model i beat model j on overall score (ties
+    count half); games[i, j]: prompts both were scored on.
+    """
+    a = overall[:, :, None]
+    b = overall[:, None, :]
+    valid = ~(np.isnan(a) | np.isnan(b))
+    wins = ((a > b) + 0.5 * (a == b)) * valid
+    return {"wins": wins.sum(axis=0), "games": valid.sum(axis=0)}
+
+
+def bradley_terry(wins: np.ndarray, prior: float = 0.5, max_iter: int = 500, tol: float = 1e-9) -> np.ndarray:
+    """
+    Log-strengths from a (models × models) win matrix by the MM algorithm
+    (Hunter, 2004). `prior` adds that many virtual ties between every pair,
+    which keeps strengths finite for unbeaten or winless models and ties
+    together players that never met.
+    """
+    m = wins.shape[0]
+    wins = wins.astype(np.float64) + prior * (1 - np.eye(m))
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+    p = np.ones(m)
+    for _ in range(max_iter):
+        denom = (games / (p[:, None] + p[None, :])).sum(axis=1)
+        updated = total_wins / denom
+        updated /= np.exp(np.log(updated).mean())       # fix the scale: geometric mean 1
+        if np.max(np.abs(updated - p)) < tol:
+            p = updated
+            break
+        p = updated
+    return np.log(p)
+
+
+def elo_scale(log_strengths: np.ndarray) -> np.ndarray:
+    return ELO_BASE + ELO_SCALE * (log_strengths - log_strengths.mean())
+
+
+# ── Dialect breakdown ─────────────────────────────────────
+
+def dialect_means(overall: np.ndarray, dialects: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    labels, inverse = np.unique(dialects.astype(str), return_inverse=True)
+    mask = ~np.isnan(overall)
+    filled = np.where(mask, overall, 0.0)
+    k = len(labels)
+    out = {}
+    sums = np.stack([np.bincount(inverse, weights=filled[:, j], minlength=k) for j in range(overall.shape[1])], axis=1)
+    counts = np.stack([np.bincount(inverse, weights=mask[:, j], minlength=k) for j in range(overall.shape[1])], axis=1)
+    prompts = np.bincount(inverse, minlength=k)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    for i, label in enumerate(labels):
+        out[str(label)] = {"prompts": prompts[i], "mean": means[i], "n": counts[i]}
+    return out
+
+
+# ── Summary ───────────────────────────────────────────────
+
+def _num(x) -> Optional[float]:
+    x = float(x)
+    return None if np.isnan(x) else round(x, 4)
+
+
+def _rank(means: Dict[str, Optional[float]]) -> List[str]:
+    """Best mean first; unscored models last; ties by id."""
+    return sorted(means, key=lambda mid: (means[mid] is None, -(means[mid] or 0.0), mid))
+
+
+def summarize(
+    matrix: ScoreMatrix,
+    confidence: float = 0.95,
+    n_bootstrap: int = 500,
+    seed: int = 0,
+) -> dict:
+    """Everything in BenchmarkSummary except run-specific stopping details."""
+    rng = np.random.default_rng(seed)
+    p, m, d = matrix.scores.shape
+    columns = np.concatenate([matrix.overall, matrix.scores.reshape(p, m * d)], axis=1)
+    boot = bootstrap_means(columns, n_bootstrap, confidence, rng)
+
+    pairs = pairwise_wins(matrix.overall)
+    ratings = elo_scale(bradley_terry(pairs["wins"]))
+
+    models = {}
+    for j, model_id in enumerate(matrix.model_ids):
+        dims = {}
+        for k, dim in enumerate(matrix.dimensions):
+            c = m + j * d + k
+            dims[dim] = {"mean": _num(boot["mean"][c]), "ci_low": _num(boot["low"][c]), "ci_high": _num(boot["high"][c])}
+        models[model_id] = {
+            "n": int(boot["n"][j]),
+            "mean": _num(boot["mean"][j]),
+            "ci_low": _num(boot["low"][j]),
+            "ci_high": _num(boot["high"][j]),
+            "rating": round(float(ratings[j]), 1),
+            "dimensions": dims,
+        }
+    ranking = _rank({mid: models[mid]["mean"] for mid in matrix.model_ids})
+
+    pairwise = []
+    for a in range(m):
+        for b in range(a + 1, m):
+            games = int(pairs["games"][a, b])
+            pairwise.append({
+                "models": [matrix.model_ids[a], matrix.model_ids[b]],
+                "n": games,
+                "win_rate": round(float(pairs["wins"][a, b] / games), 4) if games else None,
+            })
+
+    dialects = []
+    for label, stats in dialect_means(matrix.overall, matrix.dialects).items():
+        means = {mid: _num(stats["mean"][j]) for j, mid in enumerate(matrix.model_ids)}
+        dialects.append({
+            "dialect": label,
+            "prompts": int(stats["prompts"]),
+            "models": means,
+            "ranking": _rank(means),
+        })
+
+    return {
+        "prompts": p,
+        "confidence": confidence,
+        "bootstrap_samples": n_bootstrap,
+        "ranking": ranking,
+        "models": models,
+        "pairwise": pairwise,
+        "dialects": dialects,
+    }
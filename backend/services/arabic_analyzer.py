@@ -8,6 +8,8 @@ Provides: arabic ratio, dialect detection, formal/colloquial markers,
 import re
 from typing import Optional
 
+from app.core.metrics import ANALYZER_CPU, cpu_timed, dialect_label
+
 
 # ── Arabic Unicode range ───────────────────────────────────
 ARABIC_PATTERN = re.compile(r"[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufeef]")
@@ -60,26 +62,27 @@ class ArabicAnalyzer:
         if not text or not text.strip():
             return self._empty()
 
-        tokens = self._tokenize(text)
-        sentences = self._split_sentences(text)
-        detected = self._detect_dialect(text)
-
-        return {
-            "token_count": len(tokens),
-            "arabic_token_count": sum(1 for t in tokens if self._is_arabic(t)),
-            "arabic_char_ratio": self._arabic_ratio(text),
-            "detected_dialect": detected,
-            "dialect_match": detected == dialect or detected == "msa",
-            "sentence_count": len(sentences),
-            "avg_sentence_length_tokens": (
-                len(tokens) / len(sentences) if sentences else 0
-            ),
-            "formal_marker_count": self._count_markers(text, FORMAL_MARKERS),
-            "technical_term_count": self._count_markers(text, TECHNICAL_TERMS),
-            "unique_word_ratio": (
-                len(set(tokens)) / len(tokens) if tokens else 0
-            ),
-        }
+        with cpu_timed(ANALYZER_CPU, dialect=dialect_label(dialect)):
+            tokens = self._tokenize(text)
+            sentences = self._split_sentences(text)
+            detected = self._detect_dialect(text)
+
+            return {
+                "token_count": len(tokens),
+                "arabic_token_count": sum(1 for t in tokens if self._is_arabic(t)),
+                "arabic_char_ratio": self._arabic_ratio(text),
+                "detected_dialect": detected,
+                "dialect_match": detected == dialect or detected == "msa",
+                "sentence_count": len(sentences),
+                "avg_sentence_length_tokens": (
+                    len(tokens) / len(sentences) if sentences else 0
+                ),
+                "formal_marker_count": self._count_markers(text, FORMAL_MARKERS),
+                "technical_term_count": self._count_markers(text, TECHNICAL_TERMS),
+                "unique_word_ratio": (
+                    len(set(tokens)) / len(tokens) if tokens else 0
+                ),
+            }
 
     # ── Private helpers ────────────────────────────────────
 
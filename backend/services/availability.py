@@ -0,0 +1,165 @@
+"""
+AvailabilityProber — tracks which providers (and therefore models) can
+actually serve requests right now.
+
+Each check looks at three things, cheapest first:
+    1. the provider's API key is configured
+    2. its LangChain package imports (the import result is cached once)
+    3. a one-token liveness call succeeds (opt-in with
+       AVAILABILITY_LIVENESS_CHECK, on an interval — it is a paid call)
+
+An open circuit breaker also marks a provider unavailable. Results are
+cached; `version` increments whenever any status changes so callers can
+cache derived responses.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.model_registry import model_registry
+from app.services.circuit_breaker import circuit_breakers
+from app.services.evaluator import load_provider_class, probe_provider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderStatus:
+    provider: str
+    key_configured: bool = False
+    package_installed: bool = False
+    live: Optional[bool] = None          # None = not probed yet
+    error: Optional[str] = None
+    checked_at: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def available(self) -> bool:
+        # An unprobed provider is assumed live until a probe says otherwise.
+        return self.key_configured and self.package_installed and self.live is not False
+
+    def as_dict(self) -> dict:
+        return {
+            "available": self.available,
+            "key_configured": self.key_configured,
+            "package_installed": self.package_installed,
+            "live": self.live,
+            "error": self.error,
+        }
+
+
+class AvailabilityProber:
+    def __init__(self):
+        self._status: Dict[str, ProviderStatus] = {}
+        self.version = 0
+
+    # ── Checks ─────────────────────────────────────────────
+
+    def _static_status(self, provider_key: str) -> ProviderStatus:
+        status = ProviderStatus(provider=provider_key, checked_at=time.time())
+        if settings.MOCK_LLM_ENABLED:
+            status.key_configured = status.package_installed = True
+            return status
+        spec = model_registry.providers.get(provider_key)
+        if spec is None:
+            status.error = "No provider integration configured."
+            return status
+        status.key_configured = spec.is_configured
+        if not status.key_configured:
+            status.error = f"{spec.api_key_setting} not configured."
+            return status
+        status.package_installed = load_provider_class(spec.module, spec.class_name) is not None
+        if not status.package_installed:
+            status.error = f"Package '{spec.module}' not installed."
+        return status
+
+    async def _check(self, provider_key: str, liveness: bool) -> ProviderStatus:
+        status = self._static_status(provider_key)
+        previous = self._status.get(provider_key)
+        if not status.available:
+            return status
+        if not liveness:
+            status.live = previous.live if previous else None
+            return status
+        try:
+            await probe_provider(provider_key)
+            status.live = True
+        except Exception as exc:
+            status.live = False
+            status.error = str(exc) or type(exc).__name__
+        return status
+
+    def _provider_keys(self) -> List[str]:
+        return sorted({m.provider_key for m in model_registry.all()})
+
+    def refresh_static(self) -> None:
+        """Synchronous key/package check — run at startup before any probe."""
+        for key in self._provider_keys():
+            self._update(self._static_status(key))
+
+    async def refresh(self, liveness: Optional[bool] = None) -> None:
+        if liveness is None:
+            liveness = settings.AVAILABILITY_LIVENESS_CHECK
+        keys = self._provider_keys()
+        results = await asyncio.gather(*(self._check(k, liveness) for k in keys))
+        for status in results:
+            self._update(status)
+
+    def _update(self, status: ProviderStatus) -> None:
+        previous = self._status.get(status.provider)
+        if previous is None or previous.as_dict() != status.as_dict():
+            self.version += 1
+            if previous is not None and previous.available != status.available:
+                logger.warning(
+                    "Provider %s is now %s%s", status.provider,
+                    "available" if status.available else "unavailable",
+                    f" ({status.error})" if status.error else "",
+                )
+        self._status[status.provider] = status
+
+    async def run(self, interval: float) -> None:
+        """Background loop started from the application lifespan."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.exception("Availability refresh failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    # ── Queries ────────────────────────────────────────────
+
+    def provider_status(self, provider_key: str) -> ProviderStatus:
+        status = self._status.get(provider_key)
+        if status is None:
+            status = self._static_status(provider_key)
+            self._update(status)
+        return status
+
+    def is_available(self, model_id: str) -> bool:
+        return self.unavailable_reason(model_id) is None
+
+    def unavailable_reason(self, model_id: str) -> Optional[str]:
+        if model_id not in model_registry:
+            return "Unknown model."
+        key = model_registry.provider_key(model_id)
+        status = self.provider_status(key)
+        if not status.available:
+            return status.error or "Provider unavailable."
+        if circuit_breakers.is_open(key):
+            return "Provider circuit open after repeated failures."
+        return None
+
+    @property
+    def state_key(self) -> tuple:
+        """Changes whenever any model's availability may have changed."""
+        return (self.version, circuit_breakers.open_circuits())
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {k: self.provider_status(k).as_dict() for k in self._provider_keys()}
+
+
+# Module-level singleton
+availability = AvailabilityProber()
@@ -0,0 +1,95 @@
+"""
+Batch runner — drives the evaluation pipeline for submitted batches.
+
+All batches in a worker share one concurrency limit (BATCH_CONCURRENCY),
+so a 10k-evaluation batch and a 10-evaluation batch submitted after it
+interleave instead of the first monopolising providers. Each batch is a
+single task that starts pipelines only as slots free up; nothing is
+scheduled ahead, so memory stays flat however large the batch.
+
+Evaluations not yet started when the worker stops stay `pending`.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import BATCH_BACKLOG
+
+logger = logging.getLogger(__name__)
+
+Pipeline = Callable[..., Awaitable[None]]
+
+
+class BatchRunner:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._batches: Dict[UUID, asyncio.Task] = {}
+
+    def _slots(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def submit(self, batch_id: UUID, jobs: List[Tuple[UUID, object]], pipeline: Pipeline) -> None:
+        """Start working through `jobs` ((evaluation_id, request) pairs) in the background."""
+        BATCH_BACKLOG.inc(len(jobs))
+        # An empty context: the drain (and every pipeline it starts) must not
+        # inherit the submitting request's current span, or all evaluations
+        # of the batch would pile into that one trace.
+        task = asyncio.create_task(
+            self._drain(batch_id, jobs, pipeline), name=f"batch-{batch_id}", context=contextvars.Context(),
+        )
+        self._batches[batch_id] = task
+        task.add_done_callback(lambda _: self._batches.pop(batch_id, None))
+
+    async def _drain(self, batch_id: UUID, jobs: List[Tuple[UUID, object]], pipeline: Pipeline) -> None:
+        slots = self._slots()
+        running: set = set()
+
+        async def one(evaluation_id: UUID, request) -> None:
+            try:
+                await pipeline(evaluation_id, request, None)
+            finally:
+                slots.release()
+
+        started = 0
+        try:
+            for evaluation_id, request in jobs:
+                await slots.acquire()
+                BATCH_BACKLOG.dec()
+                started += 1
+                task = asyncio.create_task(one(evaluation_id, request))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            await asyncio.gather(*running)
+            logger.info("Batch %s finished (%d evaluations)", batch_id, len(jobs))
+        finally:
+            BATCH_BACKLOG.dec(len(jobs) - started)
+            for task in running:
+                task.cancel()
+
+    async def join(self, batch_id: UUID) -> None:
+        """Wait until every evaluation of `batch_id` has run (tests, CLI)."""
+        task = self._batches.get(batch_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    @property
+    def active(self) -> int:
+        return len(self._batches)
+
+    async def shutdown(self) -> None:
+        tasks = list(self._batches.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None
+
+
+# Module-level singleton
+batch_runner = BatchRunner(settings.BATCH_CONCURRENCY)
@@ -0,0 +1,297 @@
+"""
+Benchmark import — stream JSONL, CSV or Parquet prompt files into a dataset.
+
+The file is read record by record (Parquet: record batch by record batch)
+in a worker thread and handed to the event loop BENCHMARK_IMPORT_BATCH_SIZE
+records at a time, so only one batch is ever in memory. Each batch is
+inserted in one round trip: COPY on PostgreSQL, a single executemany
+INSERT elsewhere.
+
+Records look like
+
+    {"prompt": "...", "dialect": "gulf", "category": "reasoning",
+     "reference_answer": "...", "difficulty": "hard", "tags": ["finance"]}
+
+(`prompt_text` is accepted for `prompt`; CSV tags are a JSON list or
+`|`-separated). Dialect and category are checked against
+VALID_DIALECTS / VALID_CATEGORIES. Prompts are deduplicated by the
+SHA-256 of their normalized text, against both the file and what the
+dataset already holds. Invalid records are skipped and reported, or in
+strict mode fail the whole import. The caller owns the transaction.
+Inserted prompts are added to the prompt index batch by batch; if the
+transaction is rolled back they simply fail to resolve.
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import random
+import re
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import InvalidImportError
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+from app.schemas.evaluation import VALID_CATEGORIES, VALID_DIALECTS
+from app.services.prompt_index import KIND_BENCHMARK_PROMPT, prompt_index
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:                                    # pragma: no cover
+    pq = None
+    PARQUET_AVAILABLE = False
+
+FORMATS = ("jsonl", "csv", "parquet")
+VALID_DIFFICULTIES = {"easy", "medium", "hard", "expert"}
+MAX_PROMPT_CHARS = 8000
+MAX_REPORTED_ERRORS = 20
+
+_COLUMNS = (
+    "id", "dataset_id", "prompt_text", "reference_answer",
+    "dialect", "category", "difficulty", "tags", "content_hash", "sample_key",
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> str:
+    """Hash of the prompt as a reader sees it: NFC, whitespace collapsed."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    ctype = (content_type or "").split(";")[0].strip().lower()
+    if name.endswith(".parquet") or "parquet" in ctype:
+        return "parquet"
+    if name.endswith(".csv") or ctype == "text/csv":
+        return "csv"
+    return "jsonl"
+
+
+# ── Readers ───────────────────────────────────────────────
+# Each yields (position, record): the line or row number used in error
+# reports, and the decoded record — or the error if it could not be decoded.
+
+def _read_jsonl(source: BinaryIO) -> Iterator[Tuple[int, object]]:
+    for lineno, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            yield lineno, json.loads(line)
+        except ValueError as exc:
+            yield lineno, ValueError(f"invalid JSON: {exc}")
+
+
+def _read_csv(source: BinaryIO) -> Iterator[Tuple[int, object]]:
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()                                  # leave `source` open for the caller
+
+
+def _read_parquet(source: BinaryIO, batch_size: int) -> Iterator[Tuple[int, object]]:
+    position = 0
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+        for record in batch.to_pylist():
+            position += 1
+            yield position, record
+
+
+def read_records(source: BinaryIO, fmt: str, batch_size: int = 5000) -> Iterator[Tuple[int, object]]:
+    if fmt == "parquet":
+        if not PARQUET_AVAILABLE:
+            raise InvalidImportError("Parquet import needs the optional 'pyarrow' package.")
+        return _read_parquet(source, batch_size)
+    if fmt == "csv":
+        return _read_csv(source)
+    return _read_jsonl(source)
+
+
+# ── Validation ────────────────────────────────────────────
+
+def _optional(record: dict, key: str) -> Optional[str]:
+    value = record.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _tags(value) -> Optional[List[str]]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = json.loads(value) if value.lstrip().startswith("[") else value.split("|")
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("tags must be a list")
+    return [str(t).strip() for t in value if str(t).strip()] or None
+
+
+def to_row(record: object, dataset_id: uuid.UUID, default_dialect: Optional[str] = None) -> dict:
+    """Validate one record and map it onto benchmark_prompts columns; ValueError if invalid."""
+    if isinstance(record, Exception):
+        raise ValueError(str(record))
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+
+    text = record.get("prompt") or record.get("prompt_text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("prompt is required")
+    if len(text) > MAX_PROMPT_CHARS:
+        raise ValueError(f"prompt is longer than {MAX_PROMPT_CHARS} characters")
+
+    dialect = _optional(record, "dialect") or default_dialect
+    if dialect is not None and dialect not in VALID_DIALECTS:
+        raise ValueError(f"dialect must be one of: {sorted(VALID_DIALECTS)}")
+    category = _optional(record, "category")
+    if category is not None and category not in VALID_CATEGORIES:
+        raise ValueError(f"category must be one of: {sorted(VALID_CATEGORIES)}")
+    difficulty = _optional(record, "difficulty")
+    if difficulty is not None and difficulty not in VALID_DIFFICULTIES:
+        raise ValueError(f"difficulty must be one of: {sorted(VALID_DIFFICULTIES)}")
+
+    return {
+        "id": uuid.uuid4(),
+        "dataset_id": dataset_id,
+        "prompt_text": text.strip(),
+        "reference_answer": _optional(record, "reference_answer"),
+        "dialect": dialect,
+        "category": category,
+        "difficulty": difficulty,
+        "tags": _tags(record.get("tags")),
+        "content_hash": content_hash(text),
+        "sample_key": random.random(),
+    }
+
+
+# ── Import ────────────────────────────────────────────────
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    prompt_count: int = 0
+    seconds: float = 0.0
+    errors: List[dict] = field(default_factory=list)
+
+    def reject(self, position: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"position": position, "message": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "read": self.read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "prompt_count": self.prompt_count,
+            "seconds": round(self.seconds, 3),
+            "errors": self.errors,
+        }
+
+
+async def _copy(db: AsyncSession, rows: List[dict]) -> None:
+    """PostgreSQL: one binary COPY per batch through the session's connection."""
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    records = [
+        tuple(json.dumps(row[c], ensure_ascii=False) if c == "tags" and row[c] is not None else row[c]
+              for c in _COLUMNS)
+        for row in rows
+    ]
+    await raw.driver_connection.copy_records_to_table(
+        BenchmarkPrompt.__tablename__, records=records, columns=list(_COLUMNS),
+    )
+
+
+async def _insert(db: AsyncSession, rows: List[dict]) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await _copy(db, rows)
+    else:
+        # render_nulls keeps rows with different missing fields in one executemany
+        await db.execute(insert(BenchmarkPrompt).execution_options(render_nulls=True), rows)
+
+
+async def _existing_hashes(db: AsyncSession, dataset_id: uuid.UUID) -> Set[str]:
+    result = await db.stream_scalars(
+        select(BenchmarkPrompt.content_hash)
+        .where(BenchmarkPrompt.dataset_id == dataset_id, BenchmarkPrompt.content_hash.isnot(None))
+        .execution_options(yield_per=10_000)
+    )
+    return {h async for h in result}
+
+
+async def import_prompts(
+    db: AsyncSession,
+    dataset: BenchmarkDataset,
+    source: BinaryIO,
+    fmt: str,
+    batch_size: int = 5000,
+    strict: bool = False,
+) -> ImportResult:
+    """Stream `source` into `dataset` and refresh its prompt_count. Does not commit."""
+    if fmt not in FORMATS:
+        raise InvalidImportError(f"Unknown import format '{fmt}'; expected one of {list(FORMATS)}.")
+    started = time.perf_counter()
+    result = ImportResult()
+    seen = await _existing_hashes(db, dataset.id)
+    records = read_records(source, fmt, batch_size)
+
+    def next_chunk() -> list:
+        return list(islice(records, batch_size))
+
+    while True:
+        chunk = await asyncio.to_thread(next_chunk)    # file I/O and parsing off the loop
+        if not chunk:
+            break
+        rows = []
+        for position, record in chunk:
+            result.read += 1
+            try:
+                row = to_row(record, dataset.id, dataset.dialect)
+            except ValueError as exc:
+                result.reject(position, str(exc))
+                continue
+            if row["content_hash"] in seen:
+                result.duplicates += 1
+                continue
+            seen.add(row["content_hash"])
+            rows.append(row)
+        if rows and not (strict and result.rejected):
+            await _insert(db, rows)
+            await asyncio.to_thread(
+                prompt_index.add_many, KIND_BENCHMARK_PROMPT, [r["id"] for r in rows], [r["prompt_text"] for r in rows],
+            )
+            result.inserted += len(rows)
+
+    if strict and result.rejected:
+        raise InvalidImportError(
+            f"{result.rejected} of {result.read} records are invalid; nothing was imported.",
+            errors=result.errors,
+        )
+
+    result.prompt_count = await db.scalar(
+        select(func.count()).select_from(BenchmarkPrompt).where(BenchmarkPrompt.dataset_id == dataset.id)
+    )
+    await db.execute(
+        update(BenchmarkDataset).where(BenchmarkDataset.id == dataset.id).values(prompt_count=result.prompt_count)
+    )
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,244 @@
+"""
+Benchmark runner — executes benchmark runs over their sampled prompts.
+
+A run draws its sample (services/sampler), then evaluates prompts in
+sample order through the regular evaluation pipeline, at most
+BENCHMARK_RUN_CONCURRENCY at a time across all runs. Each prompt becomes
+an Evaluation linked to the run and prompt, so results can be inspected
+and re-aggregated later.
+
+Every finished prompt feeds its overall scores into a sequential test
+(services/sequential). In sequential mode the run stops launching prompts
+once the ranking is settled or the cost budget is spent; prompts already
+in flight finish and are counted. Without it the full sample runs: the
+budget is one of the sequential options, so there is none to apply, and
+the test only records the stopping details. When the run ends, its
+scores are loaded as a prompts × models × dimensions matrix and
+summarized by services/aggregation (bootstrap CIs, win rates, ratings, dialects); that
+summary plus the stopping details is the run's `results_summary`.
+
+A run interrupted by shutdown stays `running`; its finished evaluations
+are kept.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt, BenchmarkRun
+from app.models.evaluation import Evaluation, ModelResponse
+from app.schemas.benchmark import BenchmarkSummary
+from app.schemas.evaluation import EvaluationCreateRequest
+from app.services import aggregation, sampler
+from app.services.search import KIND_PROMPT, search_index
+from app.services.sequential import STOP_EXHAUSTED, STOP_SETTLED, SequentialOptions, SequentialTest
+
+logger = logging.getLogger(__name__)
+
+Pipeline = Callable[..., Awaitable[None]]
+
+_PROMPT_CHUNK = 500        # prompts loaded per query while walking the sample
+_DIMENSION_COLUMNS = [getattr(ModelResponse, f"score_{dim}") for dim in aggregation.SCORE_DIMENSIONS]
+
+
+async def load_score_matrix(db: AsyncSession, run_id: UUID, model_ids: List[str]) -> aggregation.ScoreMatrix:
+    """Scores of the run's completed evaluations as a prompts × models × dimensions matrix."""
+    completed = (Evaluation.benchmark_run_id == run_id, Evaluation.status == "completed")
+    p = await db.scalar(select(func.count()).select_from(Evaluation).where(*completed))
+    m, d = len(model_ids), len(_DIMENSION_COLUMNS)
+    scores = np.full((p, m, d), np.nan)
+    overall = np.full((p, m), np.nan)
+    dialects = np.empty(p, dtype=object)
+    column = {model_id: j for j, model_id in enumerate(model_ids)}
+    row_of: Dict[UUID, int] = {}
+
+    result = await db.stream(
+        select(Evaluation.id, Evaluation.dialect, ModelResponse.model_id, ModelResponse.score_overall, *_DIMENSION_COLUMNS)
+        .join(ModelResponse, ModelResponse.evaluation_id == Evaluation.id)
+        .where(*completed)
+        .execution_options(yield_per=5000)
+    )
+    async for partition in result.partitions():
+        for evaluation_id, dialect, model_id, score, *dims in partition:
+            i = row_of.setdefault(evaluation_id, len(row_of))
+            if i >= p or model_id not in column:                 # completed after the count
+                continue
+            j = column[model_id]
+            dialects[i] = dialect
+            overall[i, j] = np.nan if score is None else score
+            scores[i, j] = [np.nan if x is None else x for x in dims]
+    n = min(len(row_of), p)
+    return aggregation.ScoreMatrix(list(model_ids), scores[:n], overall[:n], dialects[:n])
+
+
+class BenchmarkRunner:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._runs: Dict[UUID, asyncio.Task] = {}
+
+    def _slots(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def submit(self, run_id: UUID, pipeline: Pipeline) -> None:
+        task = asyncio.create_task(self._execute(run_id, pipeline), name=f"benchmark-run-{run_id}")
+        self._runs[run_id] = task
+        task.add_done_callback(lambda _: self._runs.pop(run_id, None))
+
+    async def _execute(self, run_id: UUID, pipeline: Pipeline) -> None:
+        from app.core.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            run = await db.get(BenchmarkRun, run_id)
+            if run is None:
+                return
+            try:
+                dataset = await db.get(BenchmarkDataset, run.dataset_id)
+                sampling = run.sampling or {}
+                sample = await sampler.draw(
+                    db, run.dataset_id, run.sample_size, run.seed if run.seed is not None else 0,
+                    stratify_by=sampling.get("stratify_by", []),
+                    allocation=sampling.get("allocation", "proportional"),
+                )
+                run.status = "running"
+                run.started_at = datetime.now(timezone.utc)
+                await db.commit()
+
+                sequential = run.sequential is not None
+                test = SequentialTest(
+                    list(run.model_ids), planned=len(sample.prompt_ids),
+                    options=SequentialOptions(**(run.sequential or {})),
+                )
+                reason = await self._evaluate(run, dataset, sample.prompt_ids, test, sequential, pipeline)
+
+                matrix = await load_score_matrix(db, run.id, list(run.model_ids))
+                summary = await asyncio.to_thread(
+                    aggregation.summarize, matrix,
+                    confidence=test.options.confidence,
+                    n_bootstrap=settings.STATS_BOOTSTRAP_SAMPLES,
+                    seed=run.seed or 0,
+                )
+                stopping = test.summary(reason or STOP_EXHAUSTED)
+                summary["adjacent_pairs"] = stopping["adjacent_pairs"]
+                summary["stopping"] = stopping["stopping"]
+                run.results_summary = BenchmarkSummary.model_validate(summary).model_dump(mode="json")
+                run.status = "completed"
+                run.completed_at = datetime.now(timezone.utc)
+                await db.commit()
+                logger.info(
+                    "Benchmark run %s finished: %s after %d/%d prompts",
+                    run_id, run.results_summary["stopping"]["reason"], test.prompts, test.planned,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Benchmark run %s failed: %s", run_id, exc)
+                await db.rollback()
+                run = await db.get(BenchmarkRun, run_id)
+                run.status = "failed"
+                run.error_message = str(exc)
+                await db.commit()
+
+    async def _evaluate(
+        self,
+        run: BenchmarkRun,
+        dataset: BenchmarkDataset,
+        prompt_ids: List[UUID],
+        test: SequentialTest,
+        sequential: bool,
+        pipeline: Pipeline,
+    ) -> Optional[str]:
+        from app.core.database import AsyncSessionLocal
+
+        slots = self._slots()
+        running: set = set()
+        stop: List[str] = []
+
+        async def one(prompt: BenchmarkPrompt) -> None:
+            try:
+                request = EvaluationCreateRequest.model_construct(
+                    prompt=prompt.prompt_text,
+                    dialect=prompt.dialect or dataset.dialect or "msa",
+                    category=prompt.category or "dialect_understanding",
+                    models=list(run.model_ids),
+                    reference_answer=prompt.reference_answer,
+                    max_tokens=1024,
+                )
+                async with AsyncSessionLocal() as db:
+                    evaluation = Evaluation(
+                        prompt=request.prompt, dialect=request.dialect, category=request.category,
+                        reference_answer=request.reference_answer, max_tokens=request.max_tokens,
+                        status="pending", benchmark_run_id=run.id, benchmark_prompt_id=prompt.id,
+                    )
+                    db.add(evaluation)
+                    await db.commit()
+                search_index.add(KIND_PROMPT, evaluation.id, request.dialect, request.prompt)
+                await pipeline(evaluation.id, request, None)
+
+                async with AsyncSessionLocal() as db:
+                    rows = (await db.execute(
+                        select(ModelResponse.model_id, ModelResponse.score_overall, ModelResponse.cost_usd)
+                        .where(ModelResponse.evaluation_id == evaluation.id)
+                    )).all()
+                test.add({m: score for m, score, _ in rows}, cost_usd=sum(c or 0.0 for _, _, c in rows))
+                reason = test.should_stop()
+                if reason and not stop and (sequential or reason != STOP_SETTLED):
+                    stop.append(reason)
+            finally:
+                slots.release()
+
+        try:
+            for offset in range(0, len(prompt_ids), _PROMPT_CHUNK):
+                chunk = prompt_ids[offset:offset + _PROMPT_CHUNK]
+                async with AsyncSessionLocal() as db:
+                    by_id = {p.id: p for p in await db.scalars(
+                        select(BenchmarkPrompt).where(BenchmarkPrompt.id.in_(chunk))
+                    )}
+                for prompt_id in chunk:
+                    await slots.acquire()
+                    if stop:
+                        slots.release()
+                        break
+                    if prompt_id not in by_id:                 # deleted since sampling
+                        slots.release()
+                        continue
+                    task = asyncio.create_task(one(by_id[prompt_id]))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                if stop:
+                    break
+            await asyncio.gather(*running)
+        finally:
+            for task in running:
+                task.cancel()
+        return stop[0] if stop else None
+
+    async def join(self, run_id: UUID) -> None:
+        """Wait until `run_id` has finished (tests, CLI)."""
+        task = self._runs.get(run_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    @property
+    def active(self) -> int:
+        return len(self._runs)
+
+    async def shutdown(self) -> None:
+        tasks = list(self._runs.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None
+
+
+# Module-level singleton
+benchmark_runner = BenchmarkRunner(settings.BENCHMARK_RUN_CONCURRENCY)
@@ -0,0 +1,401 @@
+"""
+Blob store — response bodies and Arabic metrics, out of the hot table.
+
+model_responses keeps only a SHA-256 digest per payload; the bytes live
+once per distinct content in response_blobs, compressed. Identical
+answers (reruns, deterministic models, shared metrics documents) are
+stored once, and aggregate scans over model_responses no longer drag
+kilobytes of text per row through the buffer cache. Payloads are read
+only when a client asks for them.
+
+Codecs (BLOB_CODEC; the one used is recorded per blob, so changing the
+setting never breaks reads):
+    zstd — needs the optional zstandard package; gzip is used without it
+    gzip
+    raw  — payloads under BLOB_COMPRESS_MIN_BYTES, or that do not shrink
+
+Backends (BLOB_STORE) decide where the compressed bytes go; the catalog
+row in response_blobs exists either way:
+    database — in response_blobs.data
+    local    — files under BLOB_STORE_PATH, sharded by digest prefix,
+               written atomically before the row is committed (a rolled
+               back write leaves an unreferenced file, never a dangling row)
+
+Texts longer than BLOB_FRAME_CHARS characters are compressed a frame
+(that many characters) at a time, and the blob records where each frame
+ends in the stored bytes. A paged read of a response (read_text) then
+fetches and decompresses only the frames its range falls in: a SQL
+substr of response_blobs.data, or a seek into the file. Shorter texts
+and metrics documents are a single frame.
+
+On PostgreSQL each response body also gets a tsvector on its blob row
+(see SEARCH_COLUMN_DDL), so full-text search indexes distinct texts.
+
+Garbage collection: only model_responses rows reference blobs, and
+deleting evaluations or dropping partitions leaves their blobs behind,
+as rolled-back writes leave files of the local backend. sweep() deletes
+blobs no response references and not stored for BLOB_SWEEP_GRACE_SECONDS,
+with their files, then files of that age without a row. Storing content
+that already exists refreshes its used_at and locks the row until the
+writer commits, so a sweep never takes a blob a response is about to
+point at; the grace period only has to outlast write transactions.
+Run it from cron (python -m app.scripts.sweep_blobs) or set
+BLOB_SWEEP_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, LargeBinary, bindparam, delete, func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.evaluation import SEARCH_CONFIG, ModelResponse, ResponseBlob, utcnow
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:                                    # pragma: no cover
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("zstd", "gzip", "raw")
+
+# Rows as the catalog query returns them: digest, codec, bytes (None when on disk)
+StoredRow = Tuple[str, str, Optional[bytes]]
+
+# Storing existing content again marks it used (and locks it against a sweep until commit)
+_PG_INSERT = text(f"""
+    INSERT INTO response_blobs (digest, codec, size, stored_size, data, frames, created_at, used_at, search_vector)
+    VALUES (:digest, :codec, :size, :stored_size, :data, :frames, now(), now(),
+            to_tsvector('{SEARCH_CONFIG}'::regconfig, arabic_fold(:search_text)))
+    ON CONFLICT (digest) DO UPDATE SET used_at = EXCLUDED.used_at
+""").bindparams(bindparam("frames", type_=JSON(none_as_null=True)))
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def document_bytes(document: dict) -> bytes:
+    # Canonical form, so equal documents hash alike
+    return json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class BlobStore:
+    """Content-addressed, compressed payload storage over response_blobs."""
+
+    def __init__(
+        self, backend: str = "database", path: str = "", codec: str = "zstd",
+        compress_min_bytes: int = 512, frame_chars: int = 8192,
+    ):
+        if backend not in ("database", "local"):
+            raise ValueError(f"Unknown BLOB_STORE backend: {backend!r}")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown BLOB_CODEC: {codec!r}")
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.info("zstandard is not installed; response blobs are gzip-compressed")
+            codec = "gzip"
+        self.backend = backend
+        self.path = path
+        self.codec = codec
+        self.compress_min_bytes = compress_min_bytes
+        self.frame_chars = frame_chars
+
+    # ── Codecs ─────────────────────────────────────────────
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return gzip.compress(data, compresslevel=settings.GZIP_COMPRESS_LEVEL, mtime=0)
+
+    def encode(self, data: bytes) -> Tuple[str, bytes]:
+        """(codec, stored bytes); raw when compression would not pay."""
+        if self.codec == "raw" or len(data) < self.compress_min_bytes:
+            return "raw", data
+        packed = self._compress(data)
+        return (self.codec, packed) if len(packed) < len(data) else ("raw", data)
+
+    def encode_text(self, body: str) -> Tuple[str, bytes, Optional[dict]]:
+        """(codec, stored bytes, frames) for a response body; frames is None for a single frame."""
+        if len(body) <= self.frame_chars:
+            return (*self.encode(body.encode("utf-8")), None)
+        chunks = [body[i:i + self.frame_chars].encode("utf-8") for i in range(0, len(body), self.frame_chars)]
+        codec, packed = self.codec, chunks
+        if codec != "raw":
+            packed = [self._compress(chunk) for chunk in chunks]
+            if sum(map(len, packed)) >= sum(map(len, chunks)):
+                codec, packed = "raw", chunks
+        ends = list(itertools.accumulate(map(len, packed)))
+        return codec, b"".join(packed), {"chars": self.frame_chars, "ends": ends}
+
+    @staticmethod
+    def decode(codec: str, stored: bytes) -> bytes:
+        """Uncompressed bytes of one frame or of consecutive frames."""
+        if codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("A zstd-compressed blob needs the zstandard package")
+            # decompress() stops after the first zstd frame
+            out = []
+            while stored:
+                frame = zstandard.ZstdDecompressor().decompressobj()
+                out.append(frame.decompress(stored))
+                stored = frame.unused_data
+            return b"".join(out)
+        if codec == "gzip":
+            return gzip.decompress(stored)                   # reads every member
+        return stored
+
+    # ── Local directory backend ────────────────────────────
+    # Synchronous, so migrations can call them too
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key[2:4], key)
+
+    def write_local(self, blobs: Dict[str, bytes]) -> None:
+        for key, stored in blobs.items():
+            target = self._file(key)
+            if os.path.exists(target):
+                os.utime(target)                             # in use again: too young for the sweep
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(stored)
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def read_local(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        out = {}
+        for key in keys:
+            with open(self._file(key), "rb") as f:
+                out[key] = f.read()
+        return out
+
+    def read_local_range(self, key: str, start: int, length: int) -> bytes:
+        with open(self._file(key), "rb") as f:
+            f.seek(start)
+            return f.read(length)
+
+    def remove_local(self, keys: Iterable[str], older_than: Optional[float] = None) -> int:
+        """Unlink blob files; with older_than, only those not modified since (a write may have reused one)."""
+        removed = 0
+        for key in keys:
+            target = self._file(key)
+            try:
+                if older_than is not None and os.path.getmtime(target) >= older_than:
+                    continue
+                os.unlink(target)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def old_local_files(self, shard: str, older_than: float) -> List[str]:
+        """Keys of the files under one top-level shard last modified before older_than.
+
+        Temporary files of interrupted writes that old are removed on the way.
+        """
+        keys = []
+        for root, _, names in os.walk(os.path.join(self.path, shard)):
+            for name in names:
+                target = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(target) >= older_than:
+                        continue
+                    if name.startswith(".tmp-"):
+                        os.unlink(target)
+                    elif len(name) == 64:
+                        keys.append(name)
+                except FileNotFoundError:
+                    pass
+        return keys
+
+    # ── Writes ─────────────────────────────────────────────
+
+    async def _put(
+        self, db: AsyncSession, payloads: Sequence[Optional[bytes]], texts: Optional[Sequence] = None,
+    ) -> List[Optional[str]]:
+        """
+        Digest per payload (None stays None); new contents are added in the
+        caller's transaction, existing ones marked used. texts are the
+        payloads as str when they are response bodies: framed, and
+        searchable on PostgreSQL.
+        """
+        keys = [digest(p) if p is not None else None for p in payloads]
+        rows: Dict[str, dict] = {}
+        for i, (key, data) in enumerate(zip(keys, payloads)):
+            if key is None or key in rows:
+                continue
+            codec, stored, frames = self.encode_text(texts[i]) if texts else (*self.encode(data), None)
+            rows[key] = {
+                "digest": key, "codec": codec, "size": len(data), "stored_size": len(stored), "data": stored,
+                "frames": frames, "search_text": texts[i] if texts else None,
+            }
+        if not rows:
+            return keys
+
+        files = {}
+        if self.backend == "local":
+            for r in rows.values():
+                files[r["digest"]], r["data"] = r["data"], None
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(_PG_INSERT, list(rows.values()))
+        else:
+            for r in rows.values():
+                del r["search_text"]
+            insert = sqlite_insert(ResponseBlob)
+            await db.execute(
+                insert.on_conflict_do_update(index_elements=["digest"], set_={"used_at": insert.excluded.used_at}),
+                list(rows.values()),
+            )
+        if files:
+            # After the rows: a sweep removing the same content has committed by now, files included
+            await asyncio.to_thread(self.write_local, files)
+        return keys
+
+    async def put_texts(self, db: AsyncSession, texts: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """Store response bodies."""
+        return await self._put(db, [t.encode("utf-8") if t is not None else None for t in texts], texts)
+
+    async def put_documents(self, db: AsyncSession, documents: Sequence[Optional[dict]]) -> List[Optional[str]]:
+        """Store JSON documents (Arabic metrics)."""
+        return await self._put(db, [document_bytes(d) if d is not None else None for d in documents])
+
+    # ── Reads ──────────────────────────────────────────────
+
+    async def resolve(self, rows: Iterable[StoredRow]) -> Dict[str, bytes]:
+        """Uncompressed bytes for catalog rows, reading from disk what is not inline."""
+        rows = [r for r in rows if r[0] is not None]
+        on_disk = [key for key, _, data in rows if data is None]
+        files = await asyncio.to_thread(self.read_local, on_disk) if on_disk else {}
+        return {key: self.decode(codec, data if data is not None else files[key]) for key, codec, data in rows}
+
+    async def get_many(self, db: AsyncSession, digests: Iterable[Optional[str]]) -> Dict[str, bytes]:
+        """Uncompressed bytes by digest. Queries over model_responses join the catalog and call resolve() instead."""
+        wanted = {d for d in digests if d}
+        if not wanted:
+            return {}
+        rows = await db.execute(
+            select(ResponseBlob.digest, ResponseBlob.codec, ResponseBlob.data).where(ResponseBlob.digest.in_(wanted))
+        )
+        return await self.resolve(rows.tuples())
+
+    async def read_text(
+        self, db: AsyncSession, key: str, codec: str, frames: Optional[dict], offset: int, limit: int,
+    ) -> str:
+        """Characters [offset, offset + limit) of a stored text, decompressing only the frames they fall in."""
+        if frames is None:
+            body = (await self.get_many(db, [key]))[key].decode("utf-8")
+            return body[offset:offset + limit]
+        size, ends = frames["chars"], frames["ends"]
+        first, last = offset // size, min((offset + limit - 1) // size, len(ends) - 1)
+        if first >= len(ends):
+            return ""
+        start = ends[first - 1] if first else 0
+        stored = (await db.execute(
+            select(func.substr(ResponseBlob.data, start + 1, ends[last] - start, type_=LargeBinary))
+            .where(ResponseBlob.digest == key)
+        )).scalar()
+        if stored is None:                                   # on disk
+            stored = await asyncio.to_thread(self.read_local_range, key, start, ends[last] - start)
+        skip = offset - first * size
+        return self.decode(codec, stored).decode("utf-8")[skip:skip + limit]
+
+    # ── Garbage collection ─────────────────────────────────
+
+    async def sweep(self, db: AsyncSession, grace_seconds: float, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Delete blobs that no response references and that were last stored
+        more than grace_seconds ago, then blob files of that age without a
+        row. Commits per batch. Returns the number of blobs, their stored
+        bytes and the orphaned files removed.
+        """
+        cutoff = utcnow() - timedelta(seconds=grace_seconds)
+        last_used = func.coalesce(ResponseBlob.used_at, ResponseBlob.created_at)
+        unreferenced = [
+            ~select(ModelResponse.id).where(column == ResponseBlob.digest).exists()
+            for column in (ModelResponse.response_digest, ModelResponse.metrics_digest)
+        ]
+        removed = {"blobs": 0, "bytes": 0, "files": 0}
+        after = ""
+        while True:
+            candidates = (await db.execute(
+                select(ResponseBlob.digest)
+                .where(ResponseBlob.digest > after, last_used < cutoff)
+                .order_by(ResponseBlob.digest)
+                .limit(batch_size)
+            )).scalars().all()
+            if not candidates:
+                break
+            after = candidates[-1]
+            deleted = (await db.execute(
+                delete(ResponseBlob)
+                .where(ResponseBlob.digest.in_(candidates), last_used < cutoff, *unreferenced)
+                .returning(ResponseBlob.digest, ResponseBlob.stored_size)
+                .execution_options(synchronize_session=False)
+            )).all()
+            # Files go before the commit: storing the same content again waits
+            # on the deleted rows until then, and writes its file afterwards.
+            # Blobs held in the database simply have none to remove.
+            if deleted and self.path:
+                await asyncio.to_thread(self.remove_local, [key for key, _ in deleted])
+            await db.commit()
+            removed["blobs"] += len(deleted)
+            removed["bytes"] += sum(size for _, size in deleted)
+
+        if self.path and os.path.isdir(self.path):
+            older_than = cutoff.timestamp()
+            for shard in sorted(os.listdir(self.path)):
+                keys = await asyncio.to_thread(self.old_local_files, shard, older_than)
+                for i in range(0, len(keys), batch_size):
+                    batch = keys[i:i + batch_size]
+                    kept = set((await db.execute(
+                        select(ResponseBlob.digest).where(ResponseBlob.digest.in_(batch))
+                    )).scalars())
+                    orphans = [key for key in batch if key not in kept]
+                    removed["files"] += await asyncio.to_thread(self.remove_local, orphans, older_than)
+        return removed
+
+
+# Module-level singleton
+blob_store = BlobStore(
+    backend=settings.BLOB_STORE,
+    path=settings.BLOB_STORE_PATH,
+    codec=settings.BLOB_CODEC,
+    compress_min_bytes=settings.BLOB_COMPRESS_MIN_BYTES,
+    frame_chars=settings.BLOB_FRAME_CHARS,
+)
+
+
+async def run_sweeps(interval: float) -> None:
+    """Background loop started from the application lifespan."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                removed = await blob_store.sweep(db, settings.BLOB_SWEEP_GRACE_SECONDS)
+            logger.info(
+                "Blob sweep: %d blobs (%d bytes), %d files in %.1fs",
+                removed["blobs"], removed["bytes"], removed["files"], time.perf_counter() - started,
+            )
+        except Exception as exc:
+            logger.exception("Blob sweep failed: %s", exc)
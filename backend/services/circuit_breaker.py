@@ -0,0 +1,271 @@
+"""
+CircuitBreaker — per-provider failure isolation for LLM calls.
+A provider that keeps erroring or responding too slowly is short-circuited
+so callers fail fast instead of burning the full timeout on every request.
+
+States:
+    closed     → calls flow normally; outcomes are tracked in a sliding window
+    open       → calls are rejected immediately with CircuitOpenError
+    half_open  → a limited number of trial calls decide between closed / open
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Sliding-window circuit breaker for a single provider.
+    Trips on either a high error rate or a high slow-call rate once the
+    window holds at least `min_calls` outcomes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        slow_call_ms: int = 30000,
+        slow_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.trip_count = 0
+        self._half_open_in_flight = 0
+        # (timestamp, ok, slow)
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+
+    # ── Call gating ────────────────────────────────────────
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds until an open circuit may admit a trial call."""
+        if self.state != OPEN or self.opened_at is None:
+            return 0
+        remaining = self.open_seconds - (time.monotonic() - self.opened_at)
+        return max(0, int(remaining + 0.999))
+
+    def cooldown_elapsed(self) -> bool:
+        return self.state == OPEN and self.retry_after == 0
+
+    def try_half_open(self) -> bool:
+        """Move an open circuit to half-open once its cooldown has elapsed."""
+        if self.cooldown_elapsed():
+            self.state = HALF_OPEN
+            self._half_open_in_flight = 0
+            logger.info("Circuit %s half-open — admitting trial calls", self.name)
+        return self.state == HALF_OPEN
+
+    def ensure_call_permitted(self) -> None:
+        """Raise CircuitOpenError if the provider must not be called right now."""
+        if self.state == OPEN and not self.try_half_open():
+            raise CircuitOpenError(self.name, self.retry_after)
+        if self.state == HALF_OPEN:
+            if self._half_open_in_flight >= self.half_open_max_calls:
+                raise CircuitOpenError(self.name, 1)
+            self._half_open_in_flight += 1
+
+    def release_trial(self) -> None:
+        """Give back a half-open slot for a call that ended without an outcome."""
+        if self.state == HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    # ── Outcome recording ──────────────────────────────────
+
+    def record_success(self, latency_ms: int) -> None:
+        slow = latency_ms >= self.slow_call_ms
+        if self.state == HALF_OPEN:
+            self.release_trial()
+            if slow:
+                self._trip(f"slow trial call ({latency_ms}ms)")
+            else:
+                self._close()
+            return
+        self._record(ok=True, slow=slow)
+
+    def record_failure(self, error: str) -> None:
+        self.last_error = error
+        if self.state == HALF_OPEN:
+            self.release_trial()
+            self._trip(error)
+            return
+        self._record(ok=False, slow=False)
+
+    @asynccontextmanager
+    async def guard(self):
+        """
+        Wrap a single provider call: reject if open, then record the outcome.
+        Cancellation is not counted as a provider failure.
+        """
+        self.ensure_call_permitted()
+        start = time.monotonic()
+        try:
+            yield self
+        except asyncio.CancelledError:
+            self.release_trial()
+            raise
+        except asyncio.TimeoutError:
+            self.record_failure("timeout")
+            raise
+        except Exception as exc:
+            self.record_failure(str(exc) or type(exc).__name__)
+            raise
+        else:
+            self.record_success(int((time.monotonic() - start) * 1000))
+
+    # ── Internals ──────────────────────────────────────────
+
+    def _record(self, ok: bool, slow: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok, slow))
+        self._evict(now)
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+
+        total = len(self._outcomes)
+        errors = sum(1 for _, o, _ in self._outcomes if not o)
+        slow_calls = sum(1 for _, _, s in self._outcomes if s)
+        if errors / total >= self.error_rate_threshold:
+            self._trip(f"error rate {errors}/{total}")
+        elif slow_calls / total >= self.slow_rate_threshold:
+            self._trip(f"slow-call rate {slow_calls}/{total}")
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _trip(self, reason: str) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trip_count += 1
+        self._outcomes.clear()
+        logger.warning("Circuit %s opened: %s", self.name, reason)
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self.opened_at = None
+        self._outcomes.clear()
+        logger.info("Circuit %s closed — provider recovered", self.name)
+
+    def snapshot(self) -> dict:
+        self._evict(time.monotonic())
+        total = len(self._outcomes)
+        errors = sum(1 for _, o, _ in self._outcomes if not o)
+        return {
+            "state": self.state,
+            "window_calls": total,
+            "window_error_rate": round(errors / total, 3) if total else 0.0,
+            "retry_after_seconds": self.retry_after,
+            "trip_count": self.trip_count,
+            "last_error": self.last_error,
+        }
+
+
+ProbeFn = Callable[[str], Awaitable[None]]
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily creates one breaker per provider and runs the background
+    recovery prober that tests open circuits once their cooldown elapses.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probe: Optional[ProbeFn] = None
+
+    def get(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name=provider,
+                window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+                min_calls=settings.CIRCUIT_MIN_CALLS,
+                error_rate_threshold=settings.CIRCUIT_ERROR_RATE_THRESHOLD,
+                slow_call_ms=settings.CIRCUIT_SLOW_CALL_MS,
+                slow_rate_threshold=settings.CIRCUIT_SLOW_RATE_THRESHOLD,
+                open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            )
+            self._breakers[provider] = breaker
+        return breaker
+
+    @asynccontextmanager
+    async def guard(self, provider: str):
+        """Guard a call to `provider`; a no-op when breakers are disabled."""
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            yield None
+            return
+        async with self.get(provider).guard() as breaker:
+            yield breaker
+
+    def is_open(self, provider: str) -> bool:
+        breaker = self._breakers.get(provider)
+        return breaker is not None and breaker.state == OPEN
+
+    def open_circuits(self) -> tuple:
+        return tuple(sorted(n for n, b in self._breakers.items() if b.state == OPEN))
+
+    def set_probe(self, probe: ProbeFn) -> None:
+        """Register the coroutine used to test a half-open provider."""
+        self._probe = probe
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: b.snapshot() for name, b in sorted(self._breakers.items())}
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+    async def probe_open_circuits(self) -> None:
+        """Run one probe against every open circuit whose cooldown elapsed."""
+        if self._probe is None:
+            return
+        for name, breaker in list(self._breakers.items()):
+            if not breaker.cooldown_elapsed():
+                continue
+            try:
+                async with breaker.guard():
+                    await self._probe(name)
+            except CircuitOpenError:
+                continue
+            except Exception as exc:
+                logger.info("Recovery probe for %s failed: %s", name, exc)
+
+    async def run_prober(self, interval: float) -> None:
+        """Background loop started from the application lifespan."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.probe_open_circuits()
+            except Exception as exc:
+                logger.exception("Circuit prober iteration failed: %s", exc)
+
+
+# Module-level singleton
+circuit_breakers = CircuitBreakerRegistry()
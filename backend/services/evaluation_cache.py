@@ -0,0 +1,148 @@
+"""
+Evaluation cache — pre-serialized JSON bodies of completed evaluations.
+
+A completed evaluation never changes, so GET /evaluations/{id} renders it
+once (when the pipeline finishes, or on the first read after a restart)
+and afterwards serves the stored bytes with a strong ETag; a matching
+If-None-Match gets a 304 with no body. The gzip form is also computed
+once, at maximum compression, and sent as-is to clients that accept it
+(the gzip middleware leaves responses with a Content-Encoding alone).
+
+Two tiers:
+    memory — per-process LRU of EVALUATION_CACHE_SIZE entries (always on)
+    redis  — shared across workers when EVALUATION_CACHE_REDIS is set,
+             entries expire after CACHE_TTL_SECONDS
+
+Redis is best-effort: any error is logged and treated as a miss, so an
+outage only costs the DB read the cache would have saved.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "llm-eval:evaluation:"
+
+
+class RenderedEvaluation:
+    """A serialized evaluation body with its strong ETag and gzip variant."""
+
+    __slots__ = ("body", "etag", "_gzipped")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self._gzipped: Optional[bytes] = None
+
+    def compress(self) -> None:
+        self._gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self.compress()
+        return self._gzipped
+
+    @property
+    def gzip_etag(self) -> str:
+        """Each encoding is its own representation, so it gets its own strong tag."""
+        return self.etag[:-1] + '-gzip"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags or self.gzip_etag in tags
+
+
+class EvaluationCache:
+    def __init__(self, capacity: int, redis_url: Optional[str] = None, ttl_seconds: int = 3600):
+        self.capacity = capacity
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, RenderedEvaluation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+    def _client(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._redis
+
+    def _remember(self, key: str, rendered: RenderedEvaluation) -> None:
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    async def get(self, evaluation_id) -> Optional[RenderedEvaluation]:
+        key = str(evaluation_id)
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+        record_cache("evaluations", rendered is not None)
+        if rendered is not None or not self.redis_url:
+            return rendered
+
+        try:
+            body = await self._client().get(_REDIS_PREFIX + key)
+        except Exception as exc:
+            logger.warning("Evaluation cache: redis get failed: %s", exc)
+            body = None
+        record_cache("evaluations_redis", body is not None)
+        if body is None:
+            return None
+        rendered = RenderedEvaluation(body)
+        self._remember(key, rendered)
+        return rendered
+
+    async def put(self, evaluation_id, body: bytes, precompress: bool = False) -> RenderedEvaluation:
+        """Store `body`; `precompress` builds the gzip form now instead of on first read."""
+        key = str(evaluation_id)
+        rendered = RenderedEvaluation(body)
+        if precompress:
+            rendered.compress()
+        self._remember(key, rendered)
+        if self.redis_url:
+            try:
+                await self._client().set(_REDIS_PREFIX + key, body, ex=self.ttl_seconds)
+            except Exception as exc:
+                logger.warning("Evaluation cache: redis set failed: %s", exc)
+        return rendered
+
+    async def invalidate(self, evaluation_id) -> None:
+        key = str(evaluation_id)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.redis_url:
+            try:
+                await self._client().delete(_REDIS_PREFIX + key)
+            except Exception as exc:
+                logger.warning("Evaluation cache: redis delete failed: %s", exc)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (tests, benchmarks)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Module-level singleton
+evaluation_cache = EvaluationCache(
+    capacity=settings.EVALUATION_CACHE_SIZE,
+    redis_url=settings.REDIS_URL if settings.EVALUATION_CACHE_REDIS else None,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+)
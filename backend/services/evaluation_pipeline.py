@@ -0,0 +1,168 @@
+"""
+Evaluation pipeline — run one evaluation end to end in the background.
+
+Calls every requested model in parallel, scores the responses, stores
+bodies and metrics in the blob store and the scores on model_responses,
+indexes the responses for search, records the Elo update and renders the
+completed evaluation into the read cache. A failure marks the evaluation
+failed with its error message.
+
+POST /evaluations/run schedules it as a background task; batches
+(services/batch_runner.py) and benchmark runs (services/benchmark_runner.py)
+are handed it as the callable they drive.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import EVALUATION_QUEUE, PIPELINE_DURATION, observe_duration, track_in_progress
+from app.core.tracing import EVALUATION_ID, STATUS_ERROR, SpanContext, tracer
+from app.models.evaluation import Evaluation, ModelResponse
+from app.schemas.evaluation import EvaluationCreateRequest
+from app.services import ratings
+from app.services.blob_store import blob_store
+from app.services.evaluation_reader import render_completed
+from app.services.evaluator import run_parallel_evaluation
+from app.services.scorer import score_all_responses
+from app.services.search import KIND_RESPONSE, search_index
+
+logger = logging.getLogger(__name__)
+
+
+@track_in_progress(EVALUATION_QUEUE)
+@observe_duration(PIPELINE_DURATION)
+async def run_evaluation_pipeline(
+    evaluation_id: UUID,
+    request: EvaluationCreateRequest,
+    db: AsyncSession,
+    trace_parent: Optional[SpanContext] = None,
+    trace_link: Optional[SpanContext] = None,
+) -> None:
+    """
+    Background task: run models, score responses, persist to DB.
+    `trace_parent` continues the creating request's trace; without one
+    the pipeline starts its own, optionally linked to `trace_link` (the
+    batch that queued it).
+    """
+    with tracer.span(
+        "evaluation.pipeline",
+        {EVALUATION_ID: str(evaluation_id), "evaluation.model_count": len(request.models)},
+        parent=trace_parent,
+        links=[trace_link] if trace_link is not None else None,
+    ) as span:
+        # Fetch fresh session for background task
+        from app.core.database import AsyncSessionLocal
+        async with AsyncSessionLocal() as bg_db:
+            try:
+                # Mark as running
+                eval_obj = await bg_db.get(Evaluation, evaluation_id)
+                if not eval_obj:
+                    return
+                eval_obj.status = "running"
+                with tracer.span("db.commit", {"db.purpose": "mark_running"}):
+                    await bg_db.commit()
+
+                # Run all models in parallel
+                with tracer.span("evaluation.run_models"):
+                    results = await run_parallel_evaluation(
+                        prompt=request.prompt,
+                        dialect=request.dialect,
+                        model_ids=request.models,
+                        max_tokens=request.max_tokens,
+                    )
+
+                # Score all responses concurrently
+                with tracer.span("evaluation.score"):
+                    all_scores = await score_all_responses(
+                        results=results,
+                        prompt=request.prompt,
+                        dialect=request.dialect,
+                        category=request.category,
+                        reference_answer=request.reference_answer,
+                    )
+
+                # Determine winner (highest overall score among non-error responses)
+                winner_id: Optional[str] = None
+                best_score: float = -1.0
+                for result, scores in zip(results, all_scores):
+                    overall = scores.get("overall") or 0.0
+                    if not result.error and overall > best_score:
+                        best_score = overall
+                        winner_id = result.model_id
+
+                # Persist model responses; bodies and metrics go to the blob store
+                text_digests = await blob_store.put_texts(bg_db, [r.response_text for r in results])
+                metrics_digests = await blob_store.put_documents(bg_db, [r.arabic_metrics for r in results])
+                for result, scores, text_digest, metrics_digest in zip(
+                    results, all_scores, text_digests, metrics_digests,
+                ):
+                    mr = ModelResponse(
+                        evaluation_id=evaluation_id,
+                        model_id=result.model_id,
+                        model_name=result.model_name,
+                        provider=result.provider,
+                        dialect=request.dialect,
+                        category=request.category,
+                        response_digest=text_digest,
+                        response_length=len(result.response_text) if result.response_text is not None else None,
+                        metrics_digest=metrics_digest,
+                        latency_ms=result.latency_ms,
+                        token_count=result.token_count,
+                        input_tokens=result.input_tokens,
+                        usage_source=result.usage_source,
+                        cost_usd=result.cost_usd,
+                        error=result.error,
+                        score_arabic_quality=scores.get("arabic_quality"),
+                        score_accuracy=scores.get("accuracy"),
+                        score_dialect_adherence=scores.get("dialect_adherence"),
+                        score_technical_precision=scores.get("technical_precision"),
+                        score_completeness=scores.get("completeness"),
+                        score_cultural_sensitivity=scores.get("cultural_sensitivity"),
+                        score_overall=scores.get("overall"),
+                        score_reasoning=scores.get("reasoning"),
+                    )
+                    bg_db.add(mr)
+
+                # Update evaluation
+                eval_obj = await bg_db.get(Evaluation, evaluation_id)
+                eval_obj.status = "completed"
+                eval_obj.winner_model_id = winner_id
+                eval_obj.completed_at = datetime.now(timezone.utc)
+                with tracer.span("db.commit", {"db.purpose": "persist_results"}):
+                    await bg_db.commit()
+                span.set_attribute("evaluation.winner", winner_id)
+                await asyncio.to_thread(search_index.add_many, [
+                    (KIND_RESPONSE, evaluation_id, request.dialect, r.response_text, r.model_id)
+                    for r in results if r.response_text
+                ])
+
+                # Online Elo for this evaluation's battles. A failure leaves the
+                # evaluation completed; the batch refit still counts its battles.
+                try:
+                    await ratings.record(
+                        bg_db, request.dialect, winner_id, [r.model_id for r in results if not r.error],
+                    )
+                    await bg_db.commit()
+                except Exception as exc:
+                    await bg_db.rollback()
+                    logger.warning("Rating update for evaluation %s failed: %s", evaluation_id, exc)
+
+                # Completed evaluations are immutable — serialize once for readers
+                await render_completed(bg_db, evaluation_id)
+
+                logger.info("Evaluation %s completed. Winner: %s", evaluation_id, winner_id)
+
+            except Exception as exc:
+                logger.exception("Evaluation %s failed: %s", evaluation_id, exc)
+                span.set_status(STATUS_ERROR, str(exc))
+                async with AsyncSessionLocal() as err_db:
+                    eval_obj = await err_db.get(Evaluation, evaluation_id)
+                    if eval_obj:
+                        eval_obj.status = "failed"
+                        eval_obj.error_message = str(exc)
+                        await err_db.commit()
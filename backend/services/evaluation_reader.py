@@ -0,0 +1,212 @@
+"""
+Evaluation reads — load an evaluation with its responses and render it
+as EvaluationOut.
+
+Shared by the evaluation routes and the pipeline, which renders every
+completed evaluation once into evaluation_cache so later reads serve the
+stored bytes. Loading is a single statement: responses and their blob
+rows are joined in, and a `fields` projection leaves out the columns and
+blobs it does not name.
+"""
+
+import json
+import logging
+from typing import Dict, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, joinedload, noload
+
+from app.core.exceptions import EvaluationNotFoundError
+from app.models.evaluation import Evaluation, ModelResponse
+from app.schemas.evaluation import EvaluationOut, ModelResponseOut, ScoreBreakdown
+from app.schemas.projection import Include, includes
+from app.services.accounting import tokens_per_second
+from app.services.blob_store import blob_store
+from app.services.evaluation_cache import RenderedEvaluation, evaluation_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Columns that only a projection naming them should pay for
+_HEAVY_RESPONSE_COLUMNS = {
+    ("scores", "reasoning"): ModelResponse.score_reasoning,
+}
+
+
+# Payloads joined in from response_blobs when a projection names them
+_PAYLOAD_BLOBS = {
+    "response_text": ModelResponse.text_blob,
+    "arabic_metrics": ModelResponse.metrics_blob,
+}
+
+
+class Payloads(NamedTuple):
+    """Response bodies and Arabic metrics from the blob store, by digest."""
+    texts: Dict[str, str] = {}
+    metrics: Dict[str, dict] = {}
+
+
+async def load_evaluation(
+    db: AsyncSession,
+    evaluation_id: UUID,
+    fields: Optional[Include] = None,
+) -> Evaluation:
+    """
+    Evaluation, its responses and their blob rows in one statement (LEFT
+    OUTER JOINs), best score first; 404 if missing. With a `fields`
+    projection, columns and blobs the client did not ask for are not read
+    at all.
+    """
+    query = (
+        select(Evaluation)
+        .where(Evaluation.id == evaluation_id)
+        .options(defer(Evaluation.reference_answer), defer(Evaluation.error_message))
+    )
+    if not includes(fields, "prompt"):
+        query = query.options(defer(Evaluation.prompt))
+    if includes(fields, "model_responses") or includes(fields, "ranking"):
+        options = [
+            defer(column) for path, column in _HEAVY_RESPONSE_COLUMNS.items()
+            if not includes(fields, "model_responses", *path)
+        ]
+        options += [
+            joinedload(relation) for name, relation in _PAYLOAD_BLOBS.items()
+            if includes(fields, "model_responses", name)
+        ]
+        query = query.options(joinedload(Evaluation.model_responses).options(*options))
+    else:
+        query = query.options(noload(Evaluation.model_responses))
+
+    evaluation = (await db.execute(query)).unique().scalar_one_or_none()
+    if not evaluation:
+        raise EvaluationNotFoundError(str(evaluation_id))
+    return evaluation
+
+
+async def load_for_read(
+    db: AsyncSession,
+    evaluation_id: UUID,
+    fields: Optional[Include] = None,
+) -> Evaluation:
+    """
+    load_evaluation on a read session. An evaluation created moments ago
+    may not have reached the replica yet, so a miss there is retried on
+    the primary before answering 404.
+    """
+    from app.core.database import AsyncSessionLocal, has_replica
+    try:
+        return await load_evaluation(db, evaluation_id, fields)
+    except EvaluationNotFoundError:
+        if not has_replica():
+            raise
+    async with AsyncSessionLocal() as primary:
+        return await load_evaluation(primary, evaluation_id, fields)
+
+
+async def load_payloads(evaluation: Evaluation, fields: Optional[Include] = None) -> Payloads:
+    """Inflate the blob rows load_evaluation joined in for the same `fields`."""
+    responses = evaluation.model_responses
+    wants_text = includes(fields, "model_responses", "response_text")
+    wants_metrics = includes(fields, "model_responses", "arabic_metrics")
+    if not responses or not (wants_text or wants_metrics):
+        return Payloads()
+    blobs = await blob_store.resolve(
+        (blob.digest, blob.codec, blob.data) for r in responses
+        for blob in (r.text_blob if wants_text else None, r.metrics_blob if wants_metrics else None)
+        if blob is not None
+    )
+    return Payloads(
+        texts={r.response_digest: blobs[r.response_digest].decode("utf-8")
+               for r in responses if wants_text and r.response_digest in blobs},
+        metrics={r.metrics_digest: json.loads(blobs[r.metrics_digest])
+                 for r in responses if wants_metrics and r.metrics_digest in blobs},
+    )
+
+
+def _loaded(obj, attr: str):
+    """Column value, or None when it was deferred — never trigger a lazy load."""
+    return None if attr in sa_inspect(obj).unloaded else getattr(obj, attr)
+
+
+def serialize_evaluation(evaluation: Evaluation, payloads: Payloads) -> bytes:
+    out = evaluation_to_out(evaluation, include_responses=True, payloads=payloads)
+    return out.model_dump_json().encode("utf-8")
+
+
+async def render_completed(db: AsyncSession, evaluation_id: UUID) -> Optional[RenderedEvaluation]:
+    """Best-effort: a failure here only means the first read renders it instead."""
+    try:
+        evaluation = await load_evaluation(db, evaluation_id)
+        payloads = await load_payloads(evaluation)
+        return await evaluation_cache.put(evaluation_id, serialize_evaluation(evaluation, payloads), precompress=True)
+    except Exception as exc:
+        logger.warning("Could not pre-render evaluation %s: %s", evaluation_id, exc)
+        return None
+
+
+def evaluation_to_out(
+    evaluation: Evaluation,
+    include_responses: bool = False,
+    payloads: Payloads = Payloads(),
+    text_limit: Optional[int] = None,
+) -> EvaluationOut:
+    responses_out = []
+    if include_responses and evaluation.model_responses:
+        for mr in evaluation.model_responses:
+            text = payloads.texts.get(mr.response_digest)
+            length = None
+            if text is not None:
+                length = mr.response_length if mr.response_length is not None else len(text)
+                text = text[:text_limit] if text_limit is not None else text
+            responses_out.append(ModelResponseOut(
+                model_id=mr.model_id,
+                model_name=mr.model_name,
+                provider=mr.provider,
+                response_text=text,
+                response_text_length=length,
+                response_text_truncated=text is not None and length is not None and len(text) < length,
+                latency_ms=mr.latency_ms,
+                token_count=mr.token_count,
+                input_tokens=mr.input_tokens,
+                usage_source=mr.usage_source,
+                tokens_per_second=tokens_per_second(mr.token_count, mr.latency_ms),
+                cost_usd=mr.cost_usd,
+                cost_per_score_point=(
+                    round(mr.cost_usd / mr.score_overall, 6)
+                    if mr.cost_usd is not None and mr.score_overall else None
+                ),
+                error=mr.error,
+                scores=ScoreBreakdown(
+                    arabic_quality=mr.score_arabic_quality,
+                    accuracy=mr.score_accuracy,
+                    dialect_adherence=mr.score_dialect_adherence,
+                    technical_precision=mr.score_technical_precision,
+                    completeness=mr.score_completeness,
+                    cultural_sensitivity=mr.score_cultural_sensitivity,
+                    overall=mr.score_overall,
+                    reasoning=_loaded(mr, "score_reasoning"),
+                ),
+                arabic_metrics=payloads.metrics.get(mr.metrics_digest),
+            ))
+
+    # Only touch the relationship when responses were loaded — a lazy load
+    # on an async session raises MissingGreenlet.
+    ranking = [
+        r.model_id for r in evaluation.model_responses
+        if r.score_overall is not None
+    ] if include_responses and evaluation.model_responses else []
+
+    return EvaluationOut(
+        id=evaluation.id,
+        prompt=_loaded(evaluation, "prompt") or "",
+        dialect=evaluation.dialect,
+        category=evaluation.category,
+        status=evaluation.status,
+        winner_model_id=evaluation.winner_model_id,
+        ranking=ranking,
+        model_responses=responses_out,
+        created_at=evaluation.created_at,
+        completed_at=evaluation.completed_at,
+    )
@@ -4,14 +4,24 @@ Each model call runs concurrently with a configurable timeout.
 """
 
 import asyncio
+import importlib
 import time
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from app.core.config import settings
-from app.core.exceptions import ModelNotAvailableError, EvaluationTimeoutError
+from app.core.model_registry import model_registry
+from app.core.exceptions import (
+    CircuitOpenError,
+    ModelNotAvailableError,
+    EvaluationTimeoutError,
+)
+from app.core.metrics import record_model_call
+from app.core.tracing import STATUS_ERROR, tracer
+from app.services.accounting import compute_cost, resolve_usage, tokens_per_second
 from app.services.arabic_analyzer import arabic_analyzer
+from app.services.circuit_breaker import circuit_breakers
 
 logger = logging.getLogger(__name__)
 
@@ -36,80 +46,73 @@ class SingleModelResult:
     cost_usd: float
     error: Optional[str]
     arabic_metrics: dict
+    input_tokens: int = 0
+    usage_source: Optional[str] = None
 
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        return tokens_per_second(self.token_count, self.latency_ms)
 
-def _build_llm(model_id: str):
-    """
-    Instantiate the correct LangChain LLM for the given model ID.
-    Raises ModelNotAvailableError if the model is unknown or unconfigured.
-    """
-    try:
-        if model_id.startswith("gpt"):
-            if not settings.OPENAI_API_KEY:
-                raise ModelNotAvailableError(model_id)
-            from langchain_openai import ChatOpenAI
-            return ChatOpenAI(
-                model=model_id,
-                api_key=settings.OPENAI_API_KEY,
-                temperature=settings.DEFAULT_TEMPERATURE,
-                streaming=False,
-            )
 
-        elif model_id.startswith("claude"):
-            if not settings.ANTHROPIC_API_KEY:
-                raise ModelNotAvailableError(model_id)
-            from langchain_anthropic import ChatAnthropic
-            model_map = {
-                "claude-3-5-sonnet": "claude-3-5-sonnet-20241022",
-                "claude-3-opus": "claude-3-opus-20240229",
-            }
-            return ChatAnthropic(
-                model=model_map.get(model_id, model_id),
-                api_key=settings.ANTHROPIC_API_KEY,
-                temperature=settings.DEFAULT_TEMPERATURE,
-            )
+# Cached provider classes keyed by (module, class). A failed import is cached
+# as None so a missing optional package is not re-imported on every call.
+_PROVIDER_CLASSES: Dict[Tuple[str, str], Optional[type]] = {}
 
-        elif model_id.startswith("gemini"):
-            if not settings.GOOGLE_API_KEY:
-                raise ModelNotAvailableError(model_id)
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            return ChatGoogleGenerativeAI(
-                model=model_id,
-                google_api_key=settings.GOOGLE_API_KEY,
-                temperature=settings.DEFAULT_TEMPERATURE,
-            )
 
-        elif model_id == "llama-3-70b":
-            # Via Ollama or Groq — configure GROQ_API_KEY in .env
-            from langchain_groq import ChatGroq
-            return ChatGroq(model="llama3-70b-8192", temperature=settings.DEFAULT_TEMPERATURE)
+def load_provider_class(module: str, name: str) -> Optional[type]:
+    key = (module, name)
+    if key not in _PROVIDER_CLASSES:
+        try:
+            _PROVIDER_CLASSES[key] = getattr(importlib.import_module(module), name)
+        except ImportError as e:
+            logger.error("LangChain provider %s not installed: %s", module, e)
+            _PROVIDER_CLASSES[key] = None
+    return _PROVIDER_CLASSES[key]
+
 
-        elif model_id == "mistral-large":
-            from langchain_mistralai import ChatMistralAI
-            return ChatMistralAI(model="mistral-large-latest", temperature=settings.DEFAULT_TEMPERATURE)
+def provider_key(model_id: str) -> str:
+    """Circuit-breaker key for the upstream provider serving `model_id`."""
+    return model_registry.provider_key(model_id)
 
-        else:
-            raise ModelNotAvailableError(model_id)
 
-    except ModelNotAvailableError:
-        raise
-    except ImportError as e:
-        logger.error("LangChain provider not installed for %s: %s", model_id, e)
+def _build_llm(
+    model_id: str,
+    streaming: bool = False,
+    temperature: Optional[float] = None,
+    judge: bool = False,
+):
+    """
+    Instantiate the correct LangChain LLM for the given model ID.
+    Raises ModelNotAvailableError if the model is unknown or unconfigured.
+    With MOCK_LLM_ENABLED every registered model is served by MockChatModel.
+    """
+    spec = model_registry.get(model_id)
+    if temperature is None:
+        temperature = settings.DEFAULT_TEMPERATURE
+
+    if settings.MOCK_LLM_ENABLED and spec is not None:
+        from app.services.mock_llm import MockChatModel
+        return MockChatModel(
+            model=model_id, temperature=temperature, streaming=streaming, judge=judge,
+        )
+
+    provider = model_registry.provider_for(model_id)
+    if spec is None or provider is None or not provider.is_configured:
         raise ModelNotAvailableError(model_id)
 
+    chat_cls = load_provider_class(provider.module, provider.class_name)
+    if chat_cls is None:
+        raise ModelNotAvailableError(model_id)
 
-MODEL_METADATA: Dict[str, dict] = {
-    "gpt-4o":          {"name": "GPT-4o",           "provider": "OpenAI",      "cost_per_1k_out": 0.015},
-    "gpt-4-turbo":     {"name": "GPT-4 Turbo",       "provider": "OpenAI",      "cost_per_1k_out": 0.030},
-    "gpt-3.5-turbo":   {"name": "GPT-3.5 Turbo",     "provider": "OpenAI",      "cost_per_1k_out": 0.002},
-    "claude-3-5-sonnet":{"name": "Claude 3.5 Sonnet","provider": "Anthropic",   "cost_per_1k_out": 0.015},
-    "claude-3-opus":   {"name": "Claude 3 Opus",     "provider": "Anthropic",   "cost_per_1k_out": 0.075},
-    "gemini-1.5-pro":  {"name": "Gemini 1.5 Pro",    "provider": "Google",      "cost_per_1k_out": 0.007},
-    "gemini-1.5-flash":{"name": "Gemini 1.5 Flash",  "provider": "Google",      "cost_per_1k_out": 0.0007},
-    "llama-3-70b":     {"name": "LLaMA 3 70B",       "provider": "Meta/Groq",   "cost_per_1k_out": 0.0008},
-    "mistral-large":   {"name": "Mistral Large",      "provider": "Mistral AI",  "cost_per_1k_out": 0.006},
-    "jais-30b":        {"name": "Jais 30B",           "provider": "G42/MBZUAI", "cost_per_1k_out": 0.002},
-}
+    kwargs = {
+        "model": spec.upstream_model,
+        "temperature": temperature,
+    }
+    if provider.api_key_kwarg:
+        kwargs[provider.api_key_kwarg] = provider.api_key
+    if streaming:
+        kwargs["streaming"] = True
+    return chat_cls(**kwargs)
 
 
 async def _call_single_model(
@@ -120,61 +123,107 @@ async def _call_single_model(
     timeout: int,
 ) -> SingleModelResult:
     """Call one model and return structured result. Never raises — errors are captured."""
-    meta = MODEL_METADATA.get(model_id, {"name": model_id, "provider": "Unknown", "cost_per_1k_out": 0})
+    spec = model_registry.get(model_id)
+    meta = (
+        {"name": spec.name, "provider": spec.provider}
+        if spec else {"name": model_id, "provider": "Unknown"}
+    )
+    provider = provider_key(model_id)
+    with tracer.span(
+        "model.call",
+        {"model.id": model_id, "model.provider": provider, "evaluation.dialect": dialect},
+    ) as span:
+        start = time.monotonic()
 
-    try:
-        from langchain_core.messages import HumanMessage, SystemMessage
+        try:
+            from langchain_core.messages import HumanMessage, SystemMessage
 
-        llm = _build_llm(model_id)
-        messages = [
-            SystemMessage(content=ARABIC_SYSTEM_PROMPT),
-            HumanMessage(content=prompt),
-        ]
+            llm = _build_llm(model_id)
+            messages = [
+                SystemMessage(content=ARABIC_SYSTEM_PROMPT),
+                HumanMessage(content=prompt),
+            ]
 
-        start = time.monotonic()
-        response = await asyncio.wait_for(
-            llm.ainvoke(messages, max_tokens=max_tokens),
-            timeout=timeout,
-        )
-        latency_ms = int((time.monotonic() - start) * 1000)
-
-        text = response.content if hasattr(response, "content") else str(response)
-        tokens = len(text.split())
-        cost = (tokens / 1000) * meta["cost_per_1k_out"]
-        metrics = arabic_analyzer.analyze(text, dialect=dialect)
-
-        logger.info("Model %s responded in %dms (%d tokens)", model_id, latency_ms, tokens)
-
-        return SingleModelResult(
-            model_id=model_id,
-            model_name=meta["name"],
-            provider=meta["provider"],
-            response_text=text,
-            latency_ms=latency_ms,
-            token_count=tokens,
-            cost_usd=round(cost, 6),
-            error=None,
-            arabic_metrics=metrics,
-        )
+            start = time.monotonic()
+            async with circuit_breakers.guard(provider):
+                response = await asyncio.wait_for(
+                    llm.ainvoke(messages, max_tokens=max_tokens),
+                    timeout=timeout,
+                )
+            latency_ms = int((time.monotonic() - start) * 1000)
 
-    except asyncio.TimeoutError:
-        logger.warning("Model %s timed out after %ds", model_id, timeout)
-        return SingleModelResult(
-            model_id=model_id, model_name=meta["name"], provider=meta["provider"],
-            response_text=None, latency_ms=timeout * 1000,
-            token_count=0, cost_usd=0.0,
-            error=f"Request timed out after {timeout} seconds.",
-            arabic_metrics={},
-        )
-    except Exception as exc:
-        logger.exception("Model %s failed: %s", model_id, exc)
-        return SingleModelResult(
-            model_id=model_id, model_name=meta["name"], provider=meta["provider"],
-            response_text=None, latency_ms=-1,
-            token_count=0, cost_usd=0.0,
-            error=str(exc),
-            arabic_metrics={},
-        )
+            text = response.content if hasattr(response, "content") else str(response)
+            usage = resolve_usage(response, (m.content for m in messages), text)
+            with tracer.span("analyzer.analyze", {"text.chars": len(text)}):
+                metrics = arabic_analyzer.analyze(text, dialect=dialect)
+
+            cost = compute_cost(model_id, usage)
+
+            logger.info(
+                "Model %s responded in %dms (%d in / %d out tokens, %s)",
+                model_id, latency_ms, usage.input_tokens, usage.output_tokens, usage.source,
+            )
+            record_model_call(
+                provider, model_id, dialect, "ok", latency_ms / 1000,
+                usage.input_tokens, usage.output_tokens, cost,
+            )
+            span.set_attributes({
+                "model.outcome": "ok",
+                "model.input_tokens": usage.input_tokens,
+                "model.output_tokens": usage.output_tokens,
+                "model.cost_usd": cost,
+            })
+
+            return SingleModelResult(
+                model_id=model_id,
+                model_name=meta["name"],
+                provider=meta["provider"],
+                response_text=text,
+                latency_ms=latency_ms,
+                token_count=usage.output_tokens,
+                cost_usd=cost,
+                error=None,
+                arabic_metrics=metrics,
+                input_tokens=usage.input_tokens,
+                usage_source=usage.source,
+            )
+
+        except CircuitOpenError as exc:
+            logger.warning("Model %s skipped: %s", model_id, exc.message)
+            record_model_call(provider, model_id, dialect, "circuit_open", 0.0)
+            span.set_attribute("model.outcome", "circuit_open")
+            span.set_status(STATUS_ERROR, exc.message)
+            return SingleModelResult(
+                model_id=model_id, model_name=meta["name"], provider=meta["provider"],
+                response_text=None, latency_ms=0,
+                token_count=0, cost_usd=0.0,
+                error=exc.message,
+                arabic_metrics={},
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Model %s timed out after %ds", model_id, timeout)
+            record_model_call(provider, model_id, dialect, "timeout", time.monotonic() - start)
+            span.set_attribute("model.outcome", "timeout")
+            span.set_status(STATUS_ERROR, f"Timed out after {timeout}s")
+            return SingleModelResult(
+                model_id=model_id, model_name=meta["name"], provider=meta["provider"],
+                response_text=None, latency_ms=timeout * 1000,
+                token_count=0, cost_usd=0.0,
+                error=f"Request timed out after {timeout} seconds.",
+                arabic_metrics={},
+            )
+        except Exception as exc:
+            logger.exception("Model %s failed: %s", model_id, exc)
+            record_model_call(provider, model_id, dialect, "error", time.monotonic() - start)
+            span.set_attribute("model.outcome", "error")
+            span.set_status(STATUS_ERROR, str(exc))
+            return SingleModelResult(
+                model_id=model_id, model_name=meta["name"], provider=meta["provider"],
+                response_text=None, latency_ms=-1,
+                token_count=0, cost_usd=0.0,
+                error=str(exc),
+                arabic_metrics={},
+            )
 
 
 async def run_parallel_evaluation(
@@ -194,3 +243,23 @@ async def run_parallel_evaluation(
     ]
     results = await asyncio.gather(*tasks)
     return list(results)
+
+
+async def probe_provider(provider: str) -> None:
+    """
+    Send a one-token request to `provider`. Raises on any failure so the
+    circuit breaker keeps the circuit open.
+    """
+    from langchain_core.messages import HumanMessage
+
+    spec = model_registry.cheapest_for_provider(provider)
+    if spec is None:
+        raise ModelNotAvailableError(provider)
+    llm = _build_llm(spec.id)
+    await asyncio.wait_for(
+        llm.ainvoke([HumanMessage(content="ping")], max_tokens=1),
+        timeout=10,
+    )
+
+
+circuit_breakers.set_probe(probe_provider)
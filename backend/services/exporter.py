@@ -0,0 +1,266 @@
+"""
+Evaluation export — stream evaluations with their responses and scores
+as JSONL, CSV or Parquet in constant memory.
+
+One query joins evaluations to their responses and is read through a
+server-side cursor (`yield_per`), so rows arrive in fixed-size
+partitions and each partition is encoded and handed on before the next
+is fetched. Nothing holds more than one partition, whatever the size of
+the export.
+
+Response texts and Arabic metrics live in response_blobs: the same
+query outer-joins each response's two blob rows, and every partition
+is inflated (blob_store.resolve) before it is encoded.
+
+    jsonl   — one evaluation per line, responses nested (rows are grouped
+              on the fly: the query is ordered by evaluation)
+    csv     — one row per response, evaluation columns repeated
+    parquet — same flat layout, one row group per partition (needs pyarrow)
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.evaluation import Evaluation, ModelResponse, ResponseBlob
+from app.services.blob_store import blob_store
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:                                    # pragma: no cover
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+FORMATS = ("jsonl", "csv", "parquet")
+MEDIA_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_EVALUATION_COLUMNS = {
+    "evaluation_id": Evaluation.id,
+    "created_at": Evaluation.created_at,
+    "completed_at": Evaluation.completed_at,
+    "status": Evaluation.status,
+    "dialect": Evaluation.dialect,
+    "category": Evaluation.category,
+    "prompt": Evaluation.prompt,
+    "winner_model_id": Evaluation.winner_model_id,
+    "batch_id": Evaluation.batch_id,
+}
+_RESPONSE_COLUMNS = {
+    "model_id": ModelResponse.model_id,
+    "model_name": ModelResponse.model_name,
+    "provider": ModelResponse.provider,
+    "response_text": ModelResponse.response_digest,
+    "latency_ms": ModelResponse.latency_ms,
+    "token_count": ModelResponse.token_count,
+    "input_tokens": ModelResponse.input_tokens,
+    "cost_usd": ModelResponse.cost_usd,
+    "error": ModelResponse.error,
+    "score_arabic_quality": ModelResponse.score_arabic_quality,
+    "score_accuracy": ModelResponse.score_accuracy,
+    "score_dialect_adherence": ModelResponse.score_dialect_adherence,
+    "score_technical_precision": ModelResponse.score_technical_precision,
+    "score_completeness": ModelResponse.score_completeness,
+    "score_cultural_sensitivity": ModelResponse.score_cultural_sensitivity,
+    "score_overall": ModelResponse.score_overall,
+    "score_reasoning": ModelResponse.score_reasoning,
+    "arabic_metrics": ModelResponse.metrics_digest,
+}
+# Columns selected as their blob's digest, codec and bytes, and decoded per partition
+_BLOB_COLUMNS = {
+    "response_text": aliased(ResponseBlob, name="text_blob"),
+    "arabic_metrics": aliased(ResponseBlob, name="metrics_blob"),
+}
+
+
+@dataclass
+class ExportFilters:
+    dialect: Optional[str] = None
+    category: Optional[str] = None
+    model_id: Optional[str] = None
+    status: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    include_text: bool = True
+
+
+def columns(filters: ExportFilters) -> List[str]:
+    names = list(_EVALUATION_COLUMNS) + list(_RESPONSE_COLUMNS)
+    return names if filters.include_text else [n for n in names if n != "response_text"]
+
+
+def _query(filters: ExportFilters):
+    wanted = columns(filters)
+    selected = {**_EVALUATION_COLUMNS, **_RESPONSE_COLUMNS}
+    on = ModelResponse.evaluation_id == Evaluation.id
+    if filters.model_id:
+        on = on & (ModelResponse.model_id == filters.model_id)
+    query = (
+        select(*(selected[name].label(name) for name in wanted))
+        .select_from(Evaluation)
+        .join(ModelResponse, on, isouter=not filters.model_id)
+        .order_by(Evaluation.created_at, Evaluation.id, ModelResponse.score_overall.desc().nulls_last())
+    )
+    for name, blob in _BLOB_COLUMNS.items():
+        if name in wanted:
+            query = (
+                query.add_columns(blob.codec.label(f"{name}_codec"), blob.data.label(f"{name}_data"))
+                .outerjoin(blob, blob.digest == selected[name])
+            )
+    if filters.dialect:
+        query = query.where(Evaluation.dialect == filters.dialect)
+    if filters.category:
+        query = query.where(Evaluation.category == filters.category)
+    if filters.status:
+        query = query.where(Evaluation.status == filters.status)
+    if filters.since:
+        query = query.where(Evaluation.created_at >= filters.since)
+    if filters.until:
+        query = query.where(Evaluation.created_at < filters.until)
+    return query
+
+
+async def stream_rows(
+    db: AsyncSession,
+    filters: ExportFilters,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[dict]]:
+    """Flat rows (one per response) in partitions of `batch_size`."""
+    blob_names = [name for name in _BLOB_COLUMNS if name in columns(filters)]
+    result = await db.stream(_query(filters).execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions(batch_size):
+        rows = [dict(row) for row in partition]
+        stored = {}                                    # each distinct blob is inflated once
+        for row in rows:
+            for name in blob_names:
+                stored[row[name]] = (row[name], row.pop(f"{name}_codec"), row.pop(f"{name}_data"))
+        payloads = await blob_store.resolve(stored.values())
+        for row in rows:
+            for name in blob_names:
+                data = payloads.get(row[name])
+                if data is not None:
+                    data = data.decode("utf-8") if name == "response_text" else json.loads(data)
+                row[name] = data
+        yield rows
+
+
+# ── Encoders ──────────────────────────────────────────────
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value) if value is not None and not isinstance(value, (str, int, float, bool, dict, list)) else value
+
+
+_EVALUATION_KEYS = tuple(_EVALUATION_COLUMNS)
+
+
+async def encode_jsonl(partitions: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    """One JSON object per evaluation, with its responses in `model_responses`."""
+    current: Optional[dict] = None
+    async for rows in partitions:
+        lines = []
+        for row in rows:
+            if current is None or current["evaluation_id"] != str(row["evaluation_id"]):
+                if current is not None:
+                    lines.append(json.dumps(current, ensure_ascii=False))
+                current = {k: _jsonable(row[k]) for k in _EVALUATION_KEYS}
+                current["model_responses"] = []
+            if row["model_id"] is not None:
+                current["model_responses"].append(
+                    {k: _jsonable(v) for k, v in row.items() if k not in _EVALUATION_KEYS}
+                )
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    if current is not None:
+        yield (json.dumps(current, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _flat(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return _jsonable(value)
+
+
+async def encode_csv(partitions: AsyncIterator[List[dict]], header: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for rows in partitions:
+        for row in rows:
+            writer.writerow(["" if row[k] is None else _flat(row[k]) for k in header])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes back on `drain()`."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _parquet_schema(header: List[str]):
+    types: Dict[str, object] = {
+        "created_at": pa.timestamp("us", tz="UTC"),
+        "completed_at": pa.timestamp("us", tz="UTC"),
+        "latency_ms": pa.int64(), "token_count": pa.int64(), "input_tokens": pa.int64(),
+    }
+    for name in header:
+        if name.startswith("score_") and name != "score_reasoning" or name == "cost_usd":
+            types[name] = pa.float64()
+    return pa.schema([(name, types.get(name, pa.string())) for name in header])
+
+
+async def encode_parquet(partitions: AsyncIterator[List[dict]], header: List[str]) -> AsyncIterator[bytes]:
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed")
+    schema = _parquet_schema(header)
+    stringify = [n for n in header if schema.field(n).type == pa.string()]
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for rows in partitions:
+            for row in rows:
+                for name in stringify:
+                    if row[name] is not None:
+                        row[name] = _flat(row[name])
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def encoder(fmt: str, header: List[str]) -> Callable[[AsyncIterator[List[dict]]], AsyncIterator[bytes]]:
+    if fmt == "jsonl":
+        return encode_jsonl
+    if fmt == "csv":
+        return lambda partitions: encode_csv(partitions, header)
+    return lambda partitions: encode_parquet(partitions, header)
@@ -0,0 +1,157 @@
+"""
+Leaderboard and trend queries over model_responses.
+
+Every query reads only model_responses: dialect and category are copied
+onto each response when it is written, so filtering by them needs no
+join to evaluations. Each has a composite index whose INCLUDE columns
+cover everything it reads (see models/evaluation.py), which makes the
+PostgreSQL plans index-only scans.
+
+The statement builders are separate from the executors so that
+scripts/explain_queries.py can EXPLAIN exactly what the API runs.
+"""
+
+from datetime import date, datetime
+from typing import List, Literal, Optional
+
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.evaluation import Evaluation, ModelResponse
+
+Bucket = Literal["day", "week", "month"]
+Order = Literal["best", "worst"]
+
+
+def _filters(
+    dialect: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list:
+    filters = [ModelResponse.score_overall.is_not(None)]
+    if dialect:
+        filters.append(ModelResponse.dialect == dialect)
+    if category:
+        filters.append(ModelResponse.category == category)
+    if since:
+        filters.append(ModelResponse.created_at >= since)
+    if until:
+        filters.append(ModelResponse.created_at < until)
+    return filters
+
+
+def _period(bucket: Bucket, dialect_name: str):
+    """Start of the day / ISO week / month holding created_at, in UTC."""
+    created = ModelResponse.created_at
+    if bucket not in ("day", "week", "month"):
+        raise ValueError(f"Unknown bucket: {bucket!r}")
+    if dialect_name == "postgresql":
+        # literals, not bind parameters: GROUP BY must repeat the SELECT expression exactly
+        return func.date_trunc(literal_column(f"'{bucket}'"), func.timezone(literal_column("'UTC'"), created))
+    if bucket == "week":
+        return func.date(created, "weekday 0", "-6 days")       # Monday, as date_trunc('week')
+    if bucket == "month":
+        return func.date(created, "start of month")
+    return func.date(created)
+
+
+# ── Statements ────────────────────────────────────────────
+
+def leaderboard_query(
+    dialect: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Select:
+    """Mean overall score per model, best first."""
+    mean = func.avg(ModelResponse.score_overall).label("mean_score")
+    return (
+        select(ModelResponse.model_id, func.count().label("responses"), mean)
+        .where(*_filters(dialect, category, since, until))
+        .group_by(ModelResponse.model_id)
+        .order_by(mean.desc(), ModelResponse.model_id)
+    )
+
+
+def leaderboard_join_query(
+    dialect: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Select:
+    """The same ranking filtered on the parent's dialect — what the copy avoids; kept for comparison plans."""
+    mean = func.avg(ModelResponse.score_overall).label("mean_score")
+    filters = _filters(None, None, since, until)
+    if dialect:
+        filters.append(Evaluation.dialect == dialect)
+    return (
+        select(ModelResponse.model_id, func.count().label("responses"), mean)
+        .join(Evaluation, Evaluation.id == ModelResponse.evaluation_id)
+        .where(*filters)
+        .group_by(ModelResponse.model_id)
+        .order_by(mean.desc(), ModelResponse.model_id)
+    )
+
+
+def trend_query(
+    model_id: str,
+    bucket: Bucket = "day",
+    dialect_name: str = "postgresql",
+    dialect: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Select:
+    """One model's response count and mean score per period, oldest first."""
+    period = _period(bucket, dialect_name).label("period")
+    return (
+        select(period, func.count().label("responses"), func.avg(ModelResponse.score_overall).label("mean_score"))
+        .where(ModelResponse.model_id == model_id, *_filters(dialect, category, since, until))
+        .group_by(period)
+        .order_by(period)
+    )
+
+
+def responses_query(model_id: str, dialect: Optional[str] = None, order: Order = "best", limit: int = 20) -> Select:
+    """
+    A model's highest- or lowest-scored responses. No tie-breaker: the
+    (model_id, score_overall) index already returns them in score order.
+    """
+    score = ModelResponse.score_overall
+    return (
+        select(
+            ModelResponse.evaluation_id, ModelResponse.dialect, ModelResponse.category,
+            score, ModelResponse.created_at,
+        )
+        .where(ModelResponse.model_id == model_id, *_filters(dialect))
+        .order_by(score.desc() if order == "best" else score.asc())
+        .limit(limit)
+    )
+
+
+# ── Execution ─────────────────────────────────────────────
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else date.fromisoformat(str(value)[:10])
+
+
+async def leaderboard(db: AsyncSession, **filters) -> List[dict]:
+    rows = await db.execute(leaderboard_query(**filters))
+    return [
+        {"rank": i + 1, "model_id": model_id, "responses": count, "mean_score": round(float(mean), 3)}
+        for i, (model_id, count, mean) in enumerate(rows)
+    ]
+
+
+async def trend(db: AsyncSession, model_id: str, bucket: Bucket = "day", **filters) -> List[dict]:
+    dialect_name = db.get_bind().dialect.name
+    rows = await db.execute(trend_query(model_id, bucket, dialect_name, **filters))
+    return [
+        {"period": _as_date(period), "responses": count, "mean_score": round(float(mean), 3)}
+        for period, count, mean in rows
+    ]
+
+
+async def top_responses(db: AsyncSession, model_id: str, **options) -> List[dict]:
+    rows = await db.execute(responses_query(model_id, **options))
+    return [dict(row._mapping) for row in rows]
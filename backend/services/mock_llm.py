@@ -0,0 +1,173 @@
+"""
+MockChatModel — an offline stand-in for LangChain chat models.
+Enabled with MOCK_LLM_ENABLED=true; every model (and the judge) is then
+served locally so the full pipeline can be load tested without provider
+keys. Content is deterministic per (seed, model, prompt); latency, token
+rate and error injection follow the MOCK_* settings.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.services.arabic_analyzer import DIALECT_MARKERS
+
+# ── Canned Arabic sentences per dialect ───────────────────
+SENTENCES: dict[str, list[str]] = {
+    "msa": [
+        "إن الذكاء الاصطناعي يمثل ثورة تقنية حقيقية في عصرنا الحديث.",
+        "تعتمد خوارزمية التعلم الآلي على بيانات التدريب لاستخلاص الأنماط.",
+        "علاوة على ذلك، فإن معالجة لغة العرب تتطلب فهماً عميقاً للسياق.",
+        "وعليه، ينبغي تقييم النماذج اللغوية وفق معايير دقيقة وشاملة.",
+        "حيث تسهم الشبكة العصبية في تحسين دقة الترجمة الآلية.",
+        "في ضوء ما سبق، يتضح أن الحوسبة السحابية تدعم التوسع السريع.",
+    ],
+    "gulf": [
+        "وش رأيك في الموضوع؟ الذكاء الاصطناعي وايد مفيد.",
+        "شلون نبدأ؟ يبي لنا نفهم البيانات زين أول.",
+        "عاد الحين النماذج صارت تفهم اللهجة الخليجية.",
+    ],
+    "egyptian": [
+        "إيه رأيك في ده؟ الموضوع ده كويس قوي.",
+        "يعني النموذج ده بتاع الترجمة شغال كويس.",
+        "الذكاء الاصطناعي ده عامل شغل حلو في الكتابة.",
+    ],
+    "levantine": [
+        "شو رأيك بهيك موضوع؟ هلق رح نشرح الفكرة.",
+        "عم نشتغل على نموذج لغوي متل هيك.",
+        "بدي قلك إنو التعلم الآلي مش صعب.",
+    ],
+    "maghrebi": [
+        "واش راك؟ هاد الموضوع مهم بزاف.",
+        "كيفاش نخدمو بالذكاء الاصطناعي؟ ديما كاين حل.",
+    ],
+    "iraqi": [
+        "شكو ماكو؟ هالموضوع يحتاج هواية شرح.",
+        "عدنا نموذج لغوي يفهم اللهجة العراقية.",
+    ],
+}
+
+
+# Instances are built per call, so timing / failure draws share one
+# process-wide stream: reproducible for a given seed and call order.
+_timing_rng = random.Random(settings.MOCK_SEED)
+
+
+class MockProviderError(RuntimeError):
+    """Injected failure — counts against the circuit breaker like a real error."""
+
+
+class MockChatModel:
+    """
+    Duck-typed replacement exposing the subset of the LangChain chat model
+    interface the platform uses: `ainvoke` and `astream`.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        temperature: float = 0.0,
+        streaming: bool = False,
+        judge: bool = False,
+        **_: object,
+    ):
+        self.model = model
+        self.judge = judge
+        self.streaming = streaming
+
+    # ── Public interface ───────────────────────────────────
+
+    async def ainvoke(self, messages: list, max_tokens: Optional[int] = None, **_: object):
+        from langchain_core.messages import AIMessage
+
+        text = self._generate(self._prompt(messages), max_tokens)
+        words = text.split()
+        await asyncio.sleep(self._first_token_delay() + len(words) / self._token_rate())
+        self._maybe_fail()
+        return AIMessage(content=text, usage_metadata=self._usage(messages, words))
+
+    async def astream(self, messages: list, max_tokens: Optional[int] = None, **_: object) -> AsyncIterator:
+        from langchain_core.messages import AIMessageChunk
+
+        words = self._generate(self._prompt(messages), max_tokens).split()
+        await asyncio.sleep(self._first_token_delay())
+        self._maybe_fail()
+        delay = 1.0 / self._token_rate()
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            yield AIMessageChunk(
+                content=word if i == 0 else " " + word,
+                usage_metadata=self._usage(messages, words) if last else None,
+            )
+            await asyncio.sleep(delay)
+
+    # ── Generation ─────────────────────────────────────────
+
+    @staticmethod
+    def _prompt(messages: list) -> str:
+        return " ".join(m.content for m in messages if getattr(m, "type", "") != "system")
+
+    def _content_rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{settings.MOCK_SEED}:{self.model}:{prompt}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _generate(self, prompt: str, max_tokens: Optional[int]) -> str:
+        rng = self._content_rng(prompt)
+        if self.judge:
+            return self._judge_json(rng)
+
+        dialect = next(
+            (d for d, markers in DIALECT_MARKERS.items() if any(m in prompt for m in markers)),
+            "msa",
+        )
+        pool = SENTENCES[dialect] + SENTENCES["msa"]
+        target = settings.MOCK_RESPONSE_TOKENS
+        if max_tokens:
+            target = min(target, max_tokens)
+        words: List[str] = []
+        while len(words) < target:
+            words.extend(rng.choice(pool).split())
+        return " ".join(words[:target])
+
+    def _judge_json(self, rng: random.Random) -> str:
+        dims = [
+            "arabic_quality", "accuracy", "dialect_adherence",
+            "technical_precision", "completeness", "cultural_sensitivity",
+        ]
+        scores = {d: round(rng.uniform(6.0, 9.8), 1) for d in dims}
+        scores["reasoning"] = "تقييم تجريبي من المزوّد الوهمي."
+        return json.dumps(scores, ensure_ascii=False)
+
+    # ── Timing & failure injection ─────────────────────────
+
+    def _first_token_delay(self) -> float:
+        mean = settings.MOCK_LATENCY_MS_MEAN / 1000
+        stddev = settings.MOCK_LATENCY_MS_STDDEV / 1000
+        dist = settings.MOCK_LATENCY_DISTRIBUTION
+        if dist == "fixed" or mean <= 0:
+            return max(0.0, mean)
+        if dist == "uniform":
+            return _timing_rng.uniform(max(0.0, mean - stddev), mean + stddev)
+        if dist == "normal":
+            return max(0.0, _timing_rng.gauss(mean, stddev))
+        # lognormal — long right tail like real providers
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        mu = math.log(mean) - sigma ** 2 / 2
+        return _timing_rng.lognormvariate(mu, sigma)
+
+    @staticmethod
+    def _token_rate() -> float:
+        return max(settings.MOCK_TOKENS_PER_SECOND, 1e-3)
+
+    def _maybe_fail(self) -> None:
+        if settings.MOCK_ERROR_RATE > 0 and _timing_rng.random() < settings.MOCK_ERROR_RATE:
+            raise MockProviderError(f"Injected mock failure for {self.model}")
+
+    @staticmethod
+    def _usage(messages: list, words: list) -> dict:
+        inp = sum(len(m.content.split()) for m in messages)
+        return {"input_tokens": inp, "output_tokens": len(words), "total_tokens": inp + len(words)}
@@ -0,0 +1,484 @@
+"""
+Prompt index — exact and near-duplicate lookup over every stored prompt.
+
+Prompts are normalized (NFKC; Arabic diacritics and tatweel dropped;
+alef, ya, ta marbuta, hamza-seat variants folded; punctuation, case and
+whitespace folded) and cut into character 5-gram shingles. Per prompt the
+index keeps:
+
+    exact key  — 64-bit BLAKE2b of the normalized text
+    signature  — one-permutation MinHash: each shingle hash falls in one
+                 of NUM_PERM bins by its top bits, each bin keeps its
+                 minimum, empty bins borrow from the next bin round
+                 (rotation densification). One hash per shingle instead of
+                 NUM_PERM; only the low 16 bits are stored (b-bit MinHash)
+    band keys  — LSH: the signature in BANDS bands of ROWS rows, each band
+                 hashed to 32 bits; prompts sharing a band key are candidates
+
+A lookup hashes the query the same way, gathers candidates band by band
+and estimates Jaccard similarity as the share of equal signature
+positions. With 16 bands of 4 rows a pair at similarity 0.8 becomes a
+candidate with probability > 0.999, one at 0.3 with about 0.12.
+
+Storage is log-structured so inserts are cheap and lookups stay well
+under a millisecond at millions of prompts: a merged segment of numpy
+arrays (band keys sorted per band, found by binary search) plus a small
+delta of dicts, merged in every _MERGE_EVERY inserts. About 360 bytes
+per prompt, with no Python object per entry.
+
+With PROMPT_INDEX_PATH set, inserts are appended to `<path>.log`; every
+PROMPT_INDEX_CHECKPOINT_EVERY of them a background thread writes
+`<path>.npz` and starts a new log. Startup loads
+both; with neither, or no path, the index is rebuilt from the database
+in the background.
+
+Entries are only ids: callers resolve matches against the database,
+where deleted rows simply drop out. Benchmark-run evaluations are not
+indexed — their prompts are the dataset's, indexed as benchmark prompts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KIND_EVALUATION = "evaluation"
+KIND_BENCHMARK_PROMPT = "benchmark_prompt"
+KINDS = (KIND_EVALUATION, KIND_BENCHMARK_PROMPT)
+
+SHINGLE = 5
+NUM_PERM = 64
+BANDS, ROWS = 16, 4
+_FORMAT_VERSION = 1
+_MERGE_EVERY = 4096               # delta entries before they are merged into the sorted segment
+_BUCKET_LIMIT = 2000              # candidates taken from any one band bucket
+
+_BASE = np.uint64(0x100000001B3)
+_BIN_SHIFT = np.uint64(64 - NUM_PERM.bit_length() + 1)    # top log2(NUM_PERM) bits pick the bin
+_LOW32 = np.uint64(0xFFFFFFFF)
+_EMPTY = np.uint64(1 << 32)
+_ROTATION = np.uint64(0x9E3779B1)                          # offset per bin borrowed across
+_BYTE_SUM = np.uint64(0x0101010101010101)
+
+_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")   # harakat, Quranic marks, tatweel
+_FOLD = (("أ", "ا"), ("إ", "ا"), ("آ", "ا"), ("ٱ", "ا"), ("ى", "ي"), ("ة", "ه"), ("ؤ", "و"), ("ئ", "ي"))
+_NON_WORD = re.compile(r"[\W_]+")
+
+# kind(1) id(16) exact(8) bands(4 × BANDS) signature(2 × NUM_PERM)
+_RECORD = np.dtype([
+    ("kind", np.uint8), ("id", "V16"), ("exact", "<u8"),
+    ("bands", "<u4", (BANDS,)), ("sig", "<u2", (NUM_PERM,)),
+])
+
+
+# ── Hashing ───────────────────────────────────────────────
+
+def normalize(text: str) -> str:
+    text = _DIACRITICS.sub("", unicodedata.normalize("NFKC", text)).casefold()
+    for variant, base in _FOLD:                        # str.replace is far faster than translate here
+        text = text.replace(variant, base)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer — spreads the polynomial shingle hashes over all 64 bits."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _shingles(norms: Sequence[str]):
+    """
+    Hashes of every character 5-gram of every text, computed over the
+    texts laid end to end; windows that straddle two texts are dropped.
+    Returns the hashes and each text's offset into them.
+    """
+    padded = [n.ljust(SHINGLE, "\0") for n in norms]
+    lengths = np.array([len(t) for t in padded], dtype=np.int64)
+    points = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    n = len(points) - SHINGLE + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(SHINGLE):
+        h = h * _BASE + points[j:j + n]
+    counts = lengths - SHINGLE + 1
+    offsets = np.cumsum(counts) - counts
+    starts = np.cumsum(lengths) - lengths
+    return _mix(h[np.arange(counts.sum()) + np.repeat(starts - offsets, counts)]), offsets
+
+
+def _exact_key(norm: str) -> int:
+    return int.from_bytes(hashlib.blake2b(norm.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _band_keys(minima: np.ndarray) -> np.ndarray:
+    """(k, NUM_PERM) 32-bit minima → (k, BANDS) uint32 band keys."""
+    rows = minima.reshape(len(minima), BANDS, ROWS)
+    key = np.zeros(rows.shape[:2], dtype=np.uint64)
+    for r in range(ROWS):
+        key = key * _BASE + rows[:, :, r]
+    return (_mix(key) >> np.uint64(32)).astype(np.uint32)
+
+
+def _densify(minima: np.ndarray) -> np.ndarray:
+    """Fill each empty bin from the nearest non-empty bin to its right, wrapping round."""
+    empty = minima == _EMPTY
+    if not empty.any():
+        return minima
+    width = minima.shape[1]
+    doubled = np.concatenate([minima, minima], axis=1)
+    own = np.where(np.concatenate([~empty, ~empty], axis=1), np.arange(2 * width), 2 * width)
+    nearest = np.minimum.accumulate(own[:, ::-1], axis=1)[:, ::-1][:, :width]
+    distance = (nearest - np.arange(width)).astype(np.uint64)
+    borrowed = np.take_along_axis(doubled, nearest, axis=1)
+    return np.where(empty, (borrowed + distance * _ROTATION) & _LOW32, minima)
+
+
+def fingerprint(texts: Sequence[str]) -> np.ndarray:
+    """Records (kind and id left blank) for `texts`, vectorized across prompts."""
+    norms = [normalize(t) for t in texts]
+    out = np.zeros(len(texts), dtype=_RECORD)
+    out["exact"] = [_exact_key(n) for n in norms]
+    hashes, offsets = _shingles(norms)
+    counts = np.diff(np.append(offsets, len(hashes)))
+    cells = np.repeat(np.arange(len(texts), dtype=np.int64) * NUM_PERM, counts) + (hashes >> _BIN_SHIFT).astype(np.int64)
+    minima = np.full(len(texts) * NUM_PERM, _EMPTY, dtype=np.uint64)
+    np.minimum.at(minima, cells, hashes & _LOW32)
+    minima = _densify(minima.reshape(len(texts), NUM_PERM))
+    out["bands"] = _band_keys(minima)
+    out["sig"] = (minima & np.uint64(0xFFFF)).astype(np.uint16)
+    return out
+
+
+# ── Index ─────────────────────────────────────────────────
+
+@dataclass
+class Match:
+    kind: str
+    id: uuid.UUID
+    similarity: float
+    exact: bool
+
+
+def _agreement(sigs: np.ndarray, sig: np.ndarray) -> np.ndarray:
+    """
+    Equal signature positions per row. The boolean comparison is read as
+    8-byte words and summed bytewise (each byte ends up ≤ 8), then one
+    multiply folds the bytes — about 3× faster than count_nonzero(axis=1).
+    """
+    words = (sigs == sig).view(np.uint64)
+    total = words[:, 0].copy()
+    for j in range(1, NUM_PERM // 8):
+        total += words[:, j]
+    return (total * _BYTE_SUM) >> np.uint64(56)
+
+
+def _merge_sorted(keys: np.ndarray, positions: np.ndarray, new_keys: np.ndarray, new_positions: np.ndarray):
+    order = np.argsort(new_keys, kind="stable")
+    new_keys, new_positions = new_keys[order], new_positions[order]
+    at = np.searchsorted(keys, new_keys, side="right")
+    return np.insert(keys, at, new_keys), np.insert(positions, at, new_positions)
+
+
+class PromptIndex:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.ready = False
+        self._lock = threading.RLock()
+        self._checkpointing = threading.Lock()          # one snapshot write at a time
+        self._log = None
+        self._logged = 0
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            # merged segment
+            self._records = np.zeros(0, dtype=_RECORD)
+            self._exact_keys = np.zeros(0, dtype=np.uint64)
+            self._exact_pos = np.zeros(0, dtype=np.uint32)
+            self._band_keys = np.zeros((BANDS, 0), dtype=np.uint32)
+            self._band_pos = np.zeros((BANDS, 0), dtype=np.uint32)
+            # delta
+            self._delta: List[np.ndarray] = []
+            self._delta_exact: Dict[int, List[int]] = {}
+            self._delta_bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._records) + len(self._delta)
+
+    # ── Inserts ────────────────────────────────────────────
+
+    def add(self, kind: str, prompt_id: uuid.UUID, text: str) -> None:
+        self.add_many(kind, [prompt_id], [text])
+
+    def add_many(self, kind: str, prompt_ids: Sequence[uuid.UUID], texts: Sequence[str], log: bool = True) -> None:
+        if not prompt_ids:
+            return
+        records = fingerprint(texts)
+        records["kind"] = KINDS.index(kind)
+        records["id"] = np.frombuffer(b"".join(i.bytes for i in prompt_ids), dtype="V16")
+        with self._lock:
+            self._append(records)
+            if log and self._log is not None:
+                self._log.write(records.tobytes())
+                self._log.flush()
+                self._logged += len(records)
+                if self._logged >= settings.PROMPT_INDEX_CHECKPOINT_EVERY and not self._checkpointing.locked():
+                    threading.Thread(target=self.checkpoint, name="prompt-index-checkpoint", daemon=True).start()
+
+    def _append(self, records: np.ndarray) -> None:
+        if len(records) >= _MERGE_EVERY:                   # bulk: straight into the sorted segment
+            self._merge(records)
+            return
+        for record in records:
+            position = len(self)
+            self._delta.append(record)
+            self._delta_exact.setdefault(int(record["exact"]), []).append(position)
+            for b, key in enumerate(record["bands"].tolist()):
+                self._delta_bands[b].setdefault(key, []).append(position)
+        if len(self._delta) >= _MERGE_EVERY:
+            self._merge()
+
+    def _merge(self, bulk: Optional[np.ndarray] = None) -> None:
+        parts = ([np.array(self._delta, dtype=_RECORD)] if self._delta else []) + ([bulk] if bulk is not None else [])
+        if not parts:
+            return
+        delta = np.concatenate(parts)
+        positions = np.arange(len(self._records), len(self._records) + len(delta), dtype=np.uint32)
+        self._exact_keys, self._exact_pos = _merge_sorted(
+            self._exact_keys, self._exact_pos, delta["exact"], positions,
+        )
+        keys, pos = [], []
+        for b in range(BANDS):
+            k, p = _merge_sorted(self._band_keys[b], self._band_pos[b], delta["bands"][:, b], positions)
+            keys.append(k)
+            pos.append(p)
+        self._band_keys, self._band_pos = np.stack(keys), np.stack(pos)
+        self._records = np.concatenate([self._records, delta])
+        self._delta, self._delta_exact = [], {}
+        self._delta_bands = [{} for _ in range(BANDS)]
+
+    # ── Lookups ────────────────────────────────────────────
+
+    def _record(self, position: int) -> np.void:
+        n = len(self._records)
+        return self._records[position] if position < n else self._delta[position - n]
+
+    def _column(self, name: str, positions: np.ndarray) -> np.ndarray:
+        n = len(self._records)
+        if not self._delta or not len(positions) or positions.max() < n:
+            return self._records[name][positions]
+        merged = positions < n
+        out = np.empty((len(positions),) + _RECORD[name].shape, dtype=_RECORD[name].base)
+        out[merged] = self._records[name][positions[merged]]
+        out[~merged] = np.stack([self._delta[p - n][name] for p in positions[~merged]])
+        return out
+
+    def similar(
+        self,
+        text: str,
+        threshold: float = 0.8,
+        limit: int = 10,
+        kinds: Optional[Iterable[str]] = None,
+        exclude: Iterable[uuid.UUID] = (),
+    ) -> List[Match]:
+        """Prompts whose estimated similarity to `text` is at least `threshold`, best first."""
+        return self.similar_many([text], threshold, limit, kinds, [exclude])[0]
+
+    def similar_many(
+        self,
+        texts: Sequence[str],
+        threshold: float = 0.8,
+        limit: int = 10,
+        kinds: Optional[Iterable[str]] = None,
+        exclude: Optional[Sequence[Iterable[uuid.UUID]]] = None,
+    ) -> List[List[Match]]:
+        """`similar` for many texts at once, fingerprinted in one pass; `exclude` is per text."""
+        queries = fingerprint(texts)
+        wanted = {KINDS.index(k) for k in (kinds or KINDS)}
+        with self._lock:
+            return [
+                self._lookup(query, threshold, limit, wanted, {i.bytes for i in (exclude[n] if exclude else ())})
+                for n, query in enumerate(queries)
+            ]
+
+    def _lookup(self, query: np.void, threshold: float, limit: int, wanted: set, skip: set) -> List[Match]:
+        parts = []
+        bands = query["bands"]
+        for b, key in enumerate(bands.tolist()):
+            keys, probe = self._band_keys[b], bands[b:b + 1]       # same dtype: no cast of `keys`
+            lo, hi = int(np.searchsorted(keys, probe, "left")[0]), int(np.searchsorted(keys, probe, "right")[0])
+            if hi > lo:
+                parts.append(self._band_pos[b, lo:min(hi, lo + _BUCKET_LIMIT)])
+            bucket = self._delta_bands[b].get(key)
+            if bucket:
+                parts.append(np.asarray(bucket[:_BUCKET_LIMIT], dtype=np.uint32))
+        if not parts:
+            return []
+        # compare first, dedupe after: most candidates fall below the threshold
+        candidates = np.concatenate(parts)
+        agree = _agreement(self._column("sig", candidates), query["sig"])
+        keep = agree >= threshold * NUM_PERM
+        candidates, first = np.unique(candidates[keep], return_index=True)
+        agree = agree[keep][first]
+        exact = self._column("exact", candidates) == query["exact"]
+        matches, seen = [], set()
+        for i in np.lexsort((-agree, ~exact)):                    # exact first, then most similar
+            record = self._record(int(candidates[i]))
+            raw = record["id"].tobytes()
+            if record["kind"] not in wanted or raw in skip or raw in seen:
+                continue
+            seen.add(raw)
+            matches.append(Match(KINDS[record["kind"]], uuid.UUID(bytes=raw), 1.0 if exact[i] else round(float(agree[i]) / NUM_PERM, 4), bool(exact[i])))
+            if len(matches) == limit:
+                break
+        return matches
+
+    def exact(self, text: str, kinds: Optional[Iterable[str]] = None) -> List[uuid.UUID]:
+        """Ids of prompts whose normalized text equals `text`'s."""
+        key = _exact_key(normalize(text))
+        wanted = {KINDS.index(k) for k in (kinds or KINDS)}
+        with self._lock:
+            probe = np.array([key], dtype=np.uint64)
+            lo = int(np.searchsorted(self._exact_keys, probe, "left")[0])
+            hi = int(np.searchsorted(self._exact_keys, probe, "right")[0])
+            positions = [*self._exact_pos[lo:hi].tolist(), *self._delta_exact.get(key, [])]
+            records = [self._record(p) for p in positions]
+        return list(dict.fromkeys(uuid.UUID(bytes=r["id"].tobytes()) for r in records if r["kind"] in wanted))
+
+    def stats(self) -> dict:
+        with self._lock:
+            merged = sum(a.nbytes for a in (
+                self._records, self._exact_keys, self._exact_pos, self._band_keys, self._band_pos,
+            ))
+            return {
+                "ready": self.ready,
+                "entries": len(self),
+                "merged": len(self._records),
+                "pending_merge": len(self._delta),
+                "memory_bytes": merged + len(self._delta) * (_RECORD.itemsize + 100 * (BANDS + 1)),
+                "logged_since_checkpoint": self._logged,
+                "persistent": bool(self.path),
+            }
+
+    # ── Persistence ────────────────────────────────────────
+
+    def _open_log(self) -> None:
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._log = open(self.path + ".log", "ab")
+
+    def load(self) -> bool:
+        """Snapshot plus logs from PROMPT_INDEX_PATH; False if there is nothing usable."""
+        snapshot = self.path + ".npz"
+        if not self.path or not os.path.exists(snapshot):
+            return False
+        with np.load(snapshot) as data:
+            if int(data["version"]) != _FORMAT_VERSION:
+                logger.warning("Prompt index snapshot %s has an old format; rebuilding", snapshot)
+                return False
+            with self._lock:
+                self.clear()
+                self._records = data["records"]
+                self._exact_keys, self._exact_pos = data["exact_keys"], data["exact_pos"]
+                self._band_keys, self._band_pos = data["band_keys"], data["band_pos"]
+        # .log.old is only left behind by a checkpoint that did not finish
+        for log in (self.path + ".log.old", self.path + ".log"):
+            if not os.path.exists(log):
+                continue
+            with open(log, "rb") as f:
+                raw = f.read()
+            whole = len(raw) - len(raw) % _RECORD.itemsize          # drop a torn last record
+            with self._lock:
+                self._append(np.frombuffer(raw[:whole], dtype=_RECORD))
+                self._logged += whole // _RECORD.itemsize
+        self._open_log()
+        return True
+
+    def checkpoint(self) -> None:
+        """
+        Write a snapshot of everything indexed so far and start an empty log.
+        Only the merge and the log swap hold the lock; merged arrays are never
+        modified in place, so the snapshot is written from references while
+        inserts go on. A crash before the snapshot is in place leaves
+        `.log.old` to be replayed; one after it replays entries the snapshot
+        already has, which lookups dedupe by id.
+        """
+        if not self.path:
+            return
+        log, old = self.path + ".log", self.path + ".log.old"
+        with self._checkpointing:
+            with self._lock:
+                self._merge()
+                arrays = {
+                    "version": np.array(_FORMAT_VERSION), "records": self._records,
+                    "exact_keys": self._exact_keys, "exact_pos": self._exact_pos,
+                    "band_keys": self._band_keys, "band_pos": self._band_pos,
+                }
+                if self._log is not None:
+                    self._log.close()
+                    self._log = None
+                if os.path.exists(log):
+                    os.replace(log, old)
+                self._open_log()
+                self._logged = 0
+            tmp = self.path + ".tmp.npz"
+            np.savez(tmp, **arrays)
+            os.replace(tmp, self.path + ".npz")
+            if os.path.exists(old):
+                os.remove(old)
+
+    async def rebuild(self, batch: int = 50_000) -> None:
+        """Index every prompt in the database from scratch."""
+        from sqlalchemy import select
+
+        from app.core.database import AsyncSessionLocal
+        from app.models.benchmark import BenchmarkPrompt
+        from app.models.evaluation import Evaluation
+
+        self.clear()
+        sources = (
+            (KIND_EVALUATION, select(Evaluation.id, Evaluation.prompt).where(Evaluation.benchmark_run_id.is_(None))),
+            (KIND_BENCHMARK_PROMPT, select(BenchmarkPrompt.id, BenchmarkPrompt.prompt_text)),
+        )
+        async with AsyncSessionLocal() as db:
+            for kind, query in sources:
+                result = await db.stream(query.execution_options(yield_per=batch))
+                async for rows in result.partitions():
+                    await asyncio.to_thread(self.add_many, kind, [r[0] for r in rows], [r[1] for r in rows], False)
+        await asyncio.to_thread(self.checkpoint)
+
+    async def warm(self) -> None:
+        """Startup: load from disk, else rebuild from the database. Started from the lifespan."""
+        try:
+            if await asyncio.to_thread(self.load):
+                logger.info("Prompt index loaded: %d prompts", len(self))
+            else:
+                await self.rebuild()
+                logger.info("Prompt index rebuilt: %d prompts", len(self))
+        except Exception as exc:
+            logger.exception("Prompt index warm-up failed: %s", exc)
+        finally:
+            self.ready = True
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+# Module-level singleton
+prompt_index = PromptIndex(settings.PROMPT_INDEX_PATH)
@@ -0,0 +1,185 @@
+"""
+Ratings — Elo and Bradley-Terry ratings from evaluation battles.
+
+A completed evaluation with a winner is a set of battles: the winner
+beat every other model that answered without error. Ratings are kept per
+scope — "all" plus each dialect — in the model_ratings table.
+
+    online  — `record` applies Elo updates for one evaluation's battles
+              when it completes. It reads and writes only the rating rows
+              of the models involved, O(models), never past evaluations.
+    batch   — `refit` counts every battle per (scope, winner, loser) with
+              one GROUP BY, then fits Bradley-Terry strengths per scope
+              (services/aggregation) and stores them on the Elo scale.
+              The database does the counting, so a million battles refit
+              in seconds; run it periodically (RATING_REFIT_INTERVAL_SECONDS),
+              via POST /ratings/refit, or app.scripts.recompute_ratings.
+
+Online Elo depends on the order results arrive in; the batch fit does
+not, and is the one to trust for rankings once it has run.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.evaluation import Evaluation, ModelResponse
+from app.models.rating import ModelRating
+from app.services.aggregation import ELO_BASE, bradley_terry, elo_scale
+
+logger = logging.getLogger(__name__)
+
+SCOPE_ALL = "all"
+
+
+# ── Online Elo ────────────────────────────────────────────
+
+def expected_score(rating: float, opponent: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400))
+
+
+def elo_update(ratings: Dict[str, float], winner: str, losers: Sequence[str], k: float) -> Dict[str, float]:
+    """
+    New ratings after `winner` beat each of `losers`. Every battle is
+    scored against the ratings before this evaluation, so the result does
+    not depend on the order of `losers`.
+    """
+    updated = dict(ratings)
+    for loser in losers:
+        delta = k * (1.0 - expected_score(ratings[winner], ratings[loser]))
+        updated[winner] += delta
+        updated[loser] -= delta
+    return updated
+
+
+async def record(
+    db: AsyncSession,
+    dialect: str,
+    winner: Optional[str],
+    participants: Sequence[str],
+) -> int:
+    """
+    Apply one evaluation's battles to the "all" and `dialect` scopes.
+    Does not commit. Returns the number of battles.
+    """
+    losers = [m for m in dict.fromkeys(participants) if m != winner]
+    if winner is None or not losers:
+        return 0
+    models = [winner, *losers]
+    scopes = [SCOPE_ALL, dialect] if dialect != SCOPE_ALL else [SCOPE_ALL]
+    rows = {
+        (r.scope, r.model_id): r
+        for r in await db.scalars(
+            select(ModelRating)
+            .where(ModelRating.scope.in_(scopes), ModelRating.model_id.in_(models))
+            .with_for_update()
+        )
+    }
+    for scope in scopes:
+        for model_id in models:
+            if (scope, model_id) not in rows:
+                row = ModelRating(scope=scope, model_id=model_id, elo=ELO_BASE, battles=0, wins=0)
+                db.add(row)
+                rows[(scope, model_id)] = row
+        current = {m: rows[(scope, m)].elo for m in models}
+        for model_id, elo in elo_update(current, winner, losers, settings.RATING_ELO_K).items():
+            row = rows[(scope, model_id)]
+            row.elo = elo
+            row.battles += len(losers) if model_id == winner else 1
+        rows[(scope, winner)].wins += len(losers)
+    return len(losers)
+
+
+# ── Batch Bradley-Terry ───────────────────────────────────
+
+@dataclass
+class BattleCounts:
+    scopes: List[str]              # SCOPE_ALL first, then dialects
+    model_ids: List[str]
+    wins: np.ndarray               # (scopes, models, models): wins[s, i, j] = i beat j
+
+    @property
+    def total(self) -> int:
+        return int(self.wins[0].sum())
+
+
+async def battle_counts(db: AsyncSession) -> BattleCounts:
+    """Every battle, counted per (dialect, winner, loser) by the database."""
+    rows = (await db.execute(
+        select(Evaluation.dialect, Evaluation.winner_model_id, ModelResponse.model_id, func.count())
+        .join(ModelResponse, ModelResponse.evaluation_id == Evaluation.id)
+        .where(
+            Evaluation.status == "completed",
+            Evaluation.winner_model_id.is_not(None),
+            ModelResponse.error.is_(None),
+            ModelResponse.model_id != Evaluation.winner_model_id,
+        )
+        .group_by(Evaluation.dialect, Evaluation.winner_model_id, ModelResponse.model_id)
+    )).all()
+    dialects = sorted({d for d, _, _, _ in rows})
+    model_ids = sorted({m for _, winner, loser, _ in rows for m in (winner, loser)})
+    scope_index = {d: i + 1 for i, d in enumerate(dialects)}
+    model_index = {m: i for i, m in enumerate(model_ids)}
+    wins = np.zeros((len(dialects) + 1, len(model_ids), len(model_ids)))
+    if rows:
+        s, winner, loser, n = zip(*((scope_index[d], model_index[a], model_index[b], c) for d, a, b, c in rows))
+        np.add.at(wins, (list(s), list(winner), list(loser)), list(n))
+        wins[0] = wins[1:].sum(axis=0)
+    return BattleCounts([SCOPE_ALL, *dialects], model_ids, wins)
+
+
+def fit(counts: BattleCounts) -> Dict[str, Dict[str, Tuple[float, int]]]:
+    """{scope: {model_id: (Bradley-Terry rating on the Elo scale, battles)}}."""
+    out: Dict[str, Dict[str, Tuple[float, int]]] = {}
+    for s, scope in enumerate(counts.scopes):
+        wins = counts.wins[s]
+        battles = wins.sum(axis=0) + wins.sum(axis=1)
+        present = np.flatnonzero(battles)                  # models never seen in this scope get no rating
+        if len(present) < 2:
+            continue
+        ratings = elo_scale(bradley_terry(wins[np.ix_(present, present)]))
+        out[scope] = {
+            counts.model_ids[j]: (round(float(r), 2), int(battles[j]))
+            for j, r in zip(present, ratings)
+        }
+    return out
+
+
+async def refit(db: AsyncSession) -> dict:
+    """Refit Bradley-Terry ratings for every scope from all battles; commits."""
+    counts = await battle_counts(db)
+    fitted = await asyncio.to_thread(fit, counts)
+    now = datetime.now(timezone.utc)
+    rows = {(r.scope, r.model_id): r for r in await db.scalars(select(ModelRating))}
+    for scope, models in fitted.items():
+        for model_id, (rating, battles) in models.items():
+            row = rows.get((scope, model_id))
+            if row is None:
+                row = ModelRating(scope=scope, model_id=model_id, elo=ELO_BASE, battles=0, wins=0)
+                db.add(row)
+            row.bt_rating = rating
+            row.bt_battles = battles
+            row.fitted_at = now
+    await db.commit()
+    return {"battles": counts.total, "scopes": len(fitted), "models": len(counts.model_ids), "fitted_at": now}
+
+
+async def run_refits(interval: float) -> None:
+    """Background loop started from the application lifespan."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await refit(db)
+            logger.info("Ratings refit: %d battles, %d scopes", result["battles"], result["scopes"])
+        except Exception as exc:
+            logger.exception("Ratings refit failed: %s", exc)
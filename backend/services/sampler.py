@@ -0,0 +1,173 @@
+"""
+Benchmark sampler — seeded, stratified samples of a dataset's prompts.
+
+Every prompt gets a uniform random `sample_key` in [0, 1) when it is
+stored. Keys are independent of content, so any contiguous key range is a
+uniform random sample. A seed picks where the range starts; the sample is
+the first n prompts at or after that point (wrapping round to 0), read
+straight off an index — no `ORDER BY random()` full scan. The same seed
+on the same dataset yields the same prompts, which is what makes a
+benchmark run repeatable: the run stores its seed and stratification and
+the sample is re-derived from them.
+
+Stratification (by any of dialect, category, difficulty) splits the
+sample size across strata, either in proportion to their sizes or
+equally (capped by what a stratum holds; the shortfall is shared among
+the rest). Allocation then continues down to each (dialect, category,
+difficulty) cell, and each cell is one range read on
+ix_benchmark_prompts_strata_sample, so cost grows with the number of
+cells, not with the size of the table.
+"""
+
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.benchmark import BenchmarkPrompt
+
+STRATA_FIELDS = ("dialect", "category", "difficulty")
+ALLOCATIONS = ("proportional", "equal")
+MAX_SEED = 2 ** 53                                     # stays exact in JSON clients
+
+Cell = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(MAX_SEED)
+
+
+def seed_offset(seed: int) -> float:
+    """Where in [0, 1) the key range for `seed` starts."""
+    digest = hashlib.sha256(str(seed).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+def allocate(sizes: Dict[Hashable, int], n: int, equal: bool = False) -> Dict[Hashable, int]:
+    """
+    Split `n` across strata of the given sizes: proportionally to size, or
+    equally. Never gives a stratum more than it holds; what a full
+    stratum cannot take is shared among the others. Rounding uses largest
+    remainders with ties broken by stratum order, so it is deterministic.
+    """
+    alloc = {key: 0 for key in sizes}
+    remaining = min(n, sum(sizes.values()))
+    while remaining > 0:
+        open_ = [k for k in sizes if alloc[k] < sizes[k]]
+        weights = {k: 1 if equal else sizes[k] - alloc[k] for k in open_}
+        total = sum(weights.values())
+        quotas = {k: remaining * weights[k] / total for k in open_}
+        given = 0
+        for k in open_:
+            take = min(int(quotas[k]), sizes[k] - alloc[k])
+            alloc[k] += take
+            given += take
+        if given == 0:
+            # Fewer units than open strata: hand out one each, largest remainder first.
+            for k in sorted(open_, key=lambda k: (-(quotas[k] - int(quotas[k])), open_.index(k))):
+                if given == remaining:
+                    break
+                alloc[k] += 1
+                given += 1
+        remaining -= given
+    return alloc
+
+
+@dataclass
+class Sample:
+    seed: int
+    prompt_ids: List[UUID] = field(default_factory=list)
+    strata: Dict[str, int] = field(default_factory=dict)   # label → prompts drawn
+    population: int = 0                                     # prompts with a sample key
+
+
+def _label(stratify_by: Sequence[str], key: Tuple) -> str:
+    if not stratify_by:
+        return "all"
+    return ",".join(f"{name}={value if value is not None else 'none'}" for name, value in zip(stratify_by, key))
+
+
+def _where(dataset_id: UUID, cell: Optional[Cell]):
+    conditions = [BenchmarkPrompt.dataset_id == dataset_id]
+    if cell is not None:
+        for name, value in zip(STRATA_FIELDS, cell):
+            column = getattr(BenchmarkPrompt, name)
+            conditions.append(column.is_(None) if value is None else column == value)
+    return conditions
+
+
+async def _range(db: AsyncSession, dataset_id: UUID, cell: Optional[Cell], start: float, k: int) -> List[UUID]:
+    """The first `k` prompts at or after `start` in key order, wrapping past 1.0."""
+    where = _where(dataset_id, cell)
+    ids = list(await db.scalars(
+        select(BenchmarkPrompt.id)
+        .where(*where, BenchmarkPrompt.sample_key >= start)
+        .order_by(BenchmarkPrompt.sample_key)
+        .limit(k)
+    ))
+    if len(ids) < k:
+        ids += list(await db.scalars(
+            select(BenchmarkPrompt.id)
+            .where(*where, BenchmarkPrompt.sample_key < start)
+            .order_by(BenchmarkPrompt.sample_key)
+            .limit(k - len(ids))
+        ))
+    return ids
+
+
+async def draw(
+    db: AsyncSession,
+    dataset_id: UUID,
+    size: Optional[int],
+    seed: int,
+    stratify_by: Sequence[str] = (),
+    allocation: str = "proportional",
+) -> Sample:
+    """Draw the sample for (`seed`, `stratify_by`, `allocation`); `size=None` takes every prompt."""
+    start = seed_offset(seed)
+    sample = Sample(seed=seed)
+
+    if not stratify_by:
+        sample.population = await db.scalar(
+            select(func.count()).where(*_where(dataset_id, None), BenchmarkPrompt.sample_key.isnot(None))
+        )
+        k = sample.population if size is None else min(size, sample.population)
+        sample.prompt_ids = await _range(db, dataset_id, None, start, k) if k else []
+        sample.strata = {"all": len(sample.prompt_ids)}
+        return sample
+
+    columns = [getattr(BenchmarkPrompt, name) for name in STRATA_FIELDS]
+    rows = await db.execute(
+        select(*columns, func.count())
+        .where(*_where(dataset_id, None), BenchmarkPrompt.sample_key.isnot(None))
+        .group_by(*columns)
+    )
+    cells: Dict[Cell, int] = {tuple(row[:3]): row[3] for row in rows}
+    sample.population = sum(cells.values())
+    picks = [STRATA_FIELDS.index(name) for name in stratify_by]
+
+    def stratum(cell: Cell) -> Tuple:
+        return tuple(cell[i] for i in picks)
+
+    # Sorted so allocation (and its tie-breaking) does not depend on row order.
+    order = lambda key: tuple((v is None, v or "") for v in key)   # noqa: E731
+    strata: Dict[Tuple, Dict[Cell, int]] = {}
+    for cell in sorted(cells, key=order):
+        strata.setdefault(stratum(cell), {})[cell] = cells[cell]
+    strata = dict(sorted(strata.items(), key=lambda item: order(item[0])))
+
+    n = sample.population if size is None else size
+    per_stratum = allocate({s: sum(c.values()) for s, c in strata.items()}, n, equal=allocation == "equal")
+    for key, stratum_cells in strata.items():
+        drawn = 0
+        for cell, k in allocate(stratum_cells, per_stratum[key]).items():
+            if k:
+                ids = await _range(db, dataset_id, cell, start, k)
+                sample.prompt_ids.extend(ids)
+                drawn += len(ids)
+        sample.strata[_label(stratify_by, key)] = drawn
+    return sample
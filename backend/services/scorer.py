@@ -7,11 +7,15 @@ across 6 linguistic and quality dimensions.
 import json
 import logging
 import asyncio
+import time
 from typing import Optional
 
 from app.core.config import settings
-from app.core.exceptions import ScoringError
-from app.services.evaluator import SingleModelResult
+from app.core.exceptions import CircuitOpenError, ModelNotAvailableError, ScoringError
+from app.core.metrics import JUDGE_LATENCY
+from app.core.tracing import STATUS_ERROR, tracer
+from app.services.circuit_breaker import circuit_breakers
+from app.services.evaluator import SingleModelResult, _build_llm, provider_key
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +107,12 @@ def _parse_score_json(raw: str) -> dict:
         return {dim: None for dim in SCORE_DIMENSIONS} | {"overall": None, "reasoning": "Scoring parse error."}
 
 
+def _observe_judge(outcome: str, start: float) -> None:
+    JUDGE_LATENCY.labels(
+        provider=provider_key(settings.JUDGE_MODEL), model=settings.JUDGE_MODEL, outcome=outcome,
+    ).observe(time.perf_counter() - start)
+
+
 async def score_single_response(
     prompt: str,
     response_text: str,
@@ -115,19 +125,16 @@ async def score_single_response(
     Call the judge model to score one response.
     Retries up to `retries` times on failure.
     """
-    if not settings.OPENAI_API_KEY:
-        logger.warning("No OPENAI_API_KEY configured — returning null scores.")
+    try:
+        judge = _build_llm(
+            settings.JUDGE_MODEL, temperature=settings.JUDGE_TEMPERATURE, judge=True,
+        )
+    except ModelNotAvailableError:
+        logger.warning("Judge model %s not configured — returning null scores.", settings.JUDGE_MODEL)
         return {dim: None for dim in SCORE_DIMENSIONS} | {"overall": None, "reasoning": "Judge model not configured."}
 
-    from langchain_openai import ChatOpenAI
     from langchain_core.messages import HumanMessage, SystemMessage
 
-    judge = ChatOpenAI(
-        model=settings.JUDGE_MODEL,
-        api_key=settings.OPENAI_API_KEY,
-        temperature=settings.JUDGE_TEMPERATURE,
-    )
-
     ref_block = f"\nReference Answer:\n{reference_answer}" if reference_answer else ""
     user_content = (
         f"Dialect requested: {dialect}\n"
@@ -139,26 +146,47 @@ async def score_single_response(
     )
 
     for attempt in range(retries + 1):
-        try:
-            messages = [
-                SystemMessage(content=JUDGE_SYSTEM_PROMPT),
-                HumanMessage(content=user_content),
-            ]
-            result = await judge.ainvoke(messages, max_tokens=512)
-            raw = result.content if hasattr(result, "content") else str(result)
-            scores = _parse_score_json(raw)
-            logger.debug("Scored response for model (attempt %d)", attempt + 1)
-            return scores
-        except Exception as exc:
-            logger.warning("Judge attempt %d/%d failed: %s", attempt + 1, retries + 1, exc)
-            if attempt < retries:
-                await asyncio.sleep(1.5 ** attempt)
-            else:
-                logger.error("All judge attempts exhausted for response.")
+        start = time.perf_counter()
+        with tracer.span(
+            "judge.attempt", {"judge.model": settings.JUDGE_MODEL, "judge.attempt": attempt + 1},
+        ) as span:
+            try:
+                messages = [
+                    SystemMessage(content=JUDGE_SYSTEM_PROMPT),
+                    HumanMessage(content=user_content),
+                ]
+                async with circuit_breakers.guard(provider_key(settings.JUDGE_MODEL)):
+                    result = await judge.ainvoke(messages, max_tokens=512)
+                _observe_judge("ok", start)
+                raw = result.content if hasattr(result, "content") else str(result)
+                scores = _parse_score_json(raw)
+                span.set_attribute("judge.overall", scores.get("overall"))
+                logger.debug("Scored response for model (attempt %d)", attempt + 1)
+                return scores
+            except CircuitOpenError as exc:
+                _observe_judge("circuit_open", start)
+                span.set_status(STATUS_ERROR, exc.message)
+                logger.warning("Judge skipped: %s", exc.message)
                 return {dim: None for dim in SCORE_DIMENSIONS} | {
                     "overall": None,
-                    "reasoning": f"Scoring failed after {retries + 1} attempts: {exc}",
+                    "reasoning": exc.message,
                 }
+            except Exception as exc:
+                _observe_judge("error", start)
+                span.set_status(STATUS_ERROR, str(exc))
+                logger.warning("Judge attempt %d/%d failed: %s", attempt + 1, retries + 1, exc)
+                if attempt == retries:
+                    logger.error("All judge attempts exhausted for response.")
+                    return {dim: None for dim in SCORE_DIMENSIONS} | {
+                        "overall": None,
+                        "reasoning": f"Scoring failed after {retries + 1} attempts: {exc}",
+                    }
+        # Back off outside the span so attempt durations stay comparable
+        await asyncio.sleep(1.5 ** attempt)
+
+
+async def _null_scores(reason: str) -> dict:
+    return {dim: None for dim in SCORE_DIMENSIONS} | {"overall": None, "reasoning": reason}
 
 
 async def score_all_responses(
@@ -186,11 +214,7 @@ async def score_all_responses(
             )
         else:
             # Failed responses get null scores immediately
-            tasks.append(
-                asyncio.coroutine(lambda: {dim: None for dim in SCORE_DIMENSIONS} | {
-                    "overall": None, "reasoning": "Model returned an error."
-                })()
-            )
+            tasks.append(_null_scores("Model returned an error."))
 
     all_scores = await asyncio.gather(*tasks, return_exceptions=True)
     out = []
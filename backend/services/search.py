@@ -0,0 +1,361 @@
+"""
+Full-text search over evaluation prompts and model responses.
+
+Two backends behind one query path:
+
+    postgres — a `search_vector` tsvector column on evaluations and on
+               response_blobs (models/evaluation.py), built with
+               arabic_fold() (diacritics, tatweel and letter variants
+               folded) and the `arabic_eval` configuration (a copy of the
+               built-in Arabic Snowball one), GIN-indexed. The prompt's is
+               generated by PostgreSQL; a response body's is computed once
+               per distinct text when the blob store saves it. Queries use
+               websearch_to_tsquery and ts_rank_cd.
+    memory   — for SQLite and other databases: an in-process inverted
+               index (term → posting arrays of document ordinals and term
+               frequencies), BM25-ranked, kept current by the code paths
+               that create evaluations and persist responses and rebuilt
+               from the database at startup.
+
+SEARCH_BACKEND=auto uses postgres when DATABASE_URL is PostgreSQL.
+
+Query syntax (both backends): words are ANDed; `-word` excludes; on
+PostgreSQL "quoted phrases" and `or` work too. Words are normalized like
+prompt_index.normalize() and, in memory, reduced with the Light10 Arabic
+light stemmer (prefixes و, ال, وال, بال, كال, فال, لل; suffixes ها, ان,
+ات, ون, ين, يه, ه, ي).
+
+Highlights are cut from the stored text in Python for the returned page
+only, with matches wrapped in <mark> (the rest is HTML-escaped).
+"""
+
+import asyncio
+import html
+import logging
+import math
+import re
+import threading
+import uuid
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.prompt_index import normalize
+
+logger = logging.getLogger(__name__)
+
+KIND_PROMPT = "prompt"
+KIND_RESPONSE = "response"
+KINDS = (KIND_PROMPT, KIND_RESPONSE)
+
+BM25_K1, BM25_B = 1.2, 0.75
+_MAX_TF = 0xFFFF
+
+_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")          # longest first
+_SUFFIXES = ("ها", "ان", "ات", "ون", "ين", "يه", "ه", "ي")     # ية and ة after folding
+_STOPWORDS = frozenset(normalize(w) for w in (
+    "في من على الى إلى عن مع هذا هذه ذلك تلك التي الذي الذين هو هي هم انا أنت نحن "
+    "ما ماذا لا لم لن ان أن إن كان كانت قد كل بعض او أو ثم بين عند حتى اذا إذا لكن "
+    "the a an of to in and or is are"
+).split())
+_WORD = re.compile(r"[\w\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]+")      # words with their diacritics
+
+
+# ── Terms ─────────────────────────────────────────────────
+
+def stem(token: str) -> str:
+    """Light10 (Larkey et al.) on an already normalized token."""
+    if token.startswith("و") and len(token) >= 4:
+        token = token[1:]
+    for prefix in _PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            token = token[len(prefix):]
+            break
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            token = token[:-len(suffix)]
+    return token
+
+
+def terms(text: str) -> List[str]:
+    return [stem(t) for t in normalize(text).split() if t not in _STOPWORDS]
+
+
+@dataclass
+class Query:
+    include: List[str]
+    exclude: List[str]
+
+    @classmethod
+    def parse(cls, raw: str) -> "Query":
+        include, exclude = [], []
+        for word in raw.replace('"', " ").split():
+            if word.lower() == "or":                   # PostgreSQL only; ANDed in memory
+                continue
+            target = exclude if word.startswith("-") and len(word) > 1 else include
+            target.extend(terms(word.lstrip("-") if target is exclude else word))
+        return cls(list(dict.fromkeys(include)), list(dict.fromkeys(exclude)))
+
+
+def highlight(text: str, wanted: Iterable[str], fragments: int = 2, width: int = 80) -> List[str]:
+    """
+    Up to `fragments` snippets of `text` around words whose term is in
+    `wanted`, matches wrapped in <mark>. Scans only as far as it needs to.
+    """
+    wanted, cache = set(wanted), {}
+    spans: List[Tuple[int, int]] = []
+    for m in _WORD.finditer(text or ""):
+        word = m.group()
+        if word not in cache:
+            norm = normalize(word)
+            cache[word] = bool(norm) and norm not in _STOPWORDS and stem(norm) in wanted
+        if cache[word]:
+            spans.append(m.span())
+            if len(spans) >= 16 * fragments:
+                break
+    if not spans:
+        return []
+    out, windows = [], []
+    for start, end in spans:
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], min(len(text), end + width))
+        elif len(windows) < fragments:
+            windows.append([max(0, start - width), min(len(text), end + width)])
+    for lo, hi in windows:
+        # widen to whole words
+        while lo > 0 and not text[lo - 1].isspace():
+            lo -= 1
+        while hi < len(text) and not text[hi].isspace():
+            hi += 1
+        pieces, at = [], lo
+        for start, end in spans:
+            if start >= lo and end <= hi:
+                pieces += [html.escape(text[at:start]), "<mark>", html.escape(text[start:end]), "</mark>"]
+                at = end
+        pieces.append(html.escape(text[at:hi]))
+        out.append(("…" if lo > 0 else "") + "".join(pieces).strip() + ("…" if hi < len(text) else ""))
+    return out
+
+
+# ── In-process index ──────────────────────────────────────
+
+@dataclass
+class Hit:
+    kind: str
+    evaluation_id: uuid.UUID
+    model_id: Optional[str]
+    score: float
+
+
+def _locate(postings: np.ndarray, docs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of `docs` in sorted `postings` and which are present — binary search, no re-sort as np.isin would."""
+    at = np.searchsorted(postings, docs)
+    found = at < len(postings)
+    found[found] = postings[at[found]] == docs[found]
+    return at, found
+
+
+class SearchIndex:
+    """
+    Inverted index for databases without native full-text search. Postings
+    are compact arrays (4-byte ordinal + 2-byte frequency per term per
+    document), appended in ordinal order so every list stays sorted;
+    document fields are parallel arrays. Nothing is ever removed: callers
+    resolve hits against the database, where deleted rows drop out.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._terms: Dict[str, int] = {}
+            self._docs: List[array] = []           # term id → document ordinals
+            self._freqs: List[array] = []          # term id → frequency in each of those documents
+            self._kind = array("B")
+            self._evaluation = bytearray()         # 16 bytes per document
+            self._model = array("H")               # index into _models; 0 = prompt
+            self._dialect = array("B")             # index into _dialects
+            self._length = array("I")
+            self._models: List[Optional[str]] = [None]
+            self._model_ids: Dict[str, int] = {}
+            self._dialects: List[str] = []
+            self._dialect_ids: Dict[str, int] = {}
+            self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._kind)
+
+    @property
+    def active(self) -> bool:
+        backend = settings.SEARCH_BACKEND
+        return backend == "memory" or (backend == "auto" and not settings.DATABASE_URL.startswith("postgresql"))
+
+    # ── Inserts ────────────────────────────────────────────
+
+    def _intern(self, table: Dict[str, int], values: list, value: str) -> int:
+        if value not in table:
+            table[value] = len(values)
+            values.append(value)
+        return table[value]
+
+    def add(self, kind: str, evaluation_id: uuid.UUID, dialect: str, text: Optional[str], model_id: Optional[str] = None) -> None:
+        self.add_many([(kind, evaluation_id, dialect, text, model_id)])
+
+    def add_many(self, docs: Sequence[Tuple[str, uuid.UUID, str, Optional[str], Optional[str]]]) -> None:
+        """(kind, evaluation id, dialect, text, model id) per document. Tokenizes outside the lock."""
+        if not self.active:
+            return
+        counted = []
+        for kind, evaluation_id, dialect, text, model_id in docs:
+            counts: Dict[str, int] = {}
+            for term in terms(text or ""):
+                counts[term] = counts.get(term, 0) + 1
+            counted.append((kind, evaluation_id, dialect, model_id, counts))
+        with self._lock:
+            for kind, evaluation_id, dialect, model_id, counts in counted:
+                ordinal = len(self._kind)
+                self._kind.append(KINDS.index(kind))
+                self._evaluation += evaluation_id.bytes
+                self._model.append(self._intern(self._model_ids, self._models, model_id) if model_id else 0)
+                self._dialect.append(self._intern(self._dialect_ids, self._dialects, dialect))
+                length = sum(counts.values())
+                self._length.append(length)
+                self._total_length += length
+                for term, count in counts.items():
+                    term_id = self._terms.get(term)
+                    if term_id is None:
+                        term_id = self._terms[term] = len(self._docs)
+                        self._docs.append(array("I"))
+                        self._freqs.append(array("H"))
+                    self._docs[term_id].append(ordinal)
+                    self._freqs[term_id].append(min(count, _MAX_TF))
+
+    # ── Lookups ────────────────────────────────────────────
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self._terms.get(term)
+        if term_id is None:
+            return np.zeros(0, np.uint32), np.zeros(0, np.uint16)
+        # copies: a live buffer view would stop the arrays from growing
+        return np.array(self._docs[term_id], dtype=np.uint32), np.array(self._freqs[term_id], dtype=np.uint16)
+
+    def search(
+        self,
+        query: Query,
+        kinds: Sequence[str] = KINDS,
+        dialect: Optional[str] = None,
+        model_id: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Hit]:
+        """Best `limit` documents holding every included term and no excluded one, by BM25."""
+        if not query.include:
+            return []
+        with self._lock:
+            n = len(self._kind)
+            if not n:
+                return []
+            if (dialect is not None and dialect not in self._dialect_ids) or (
+                model_id is not None and model_id not in self._model_ids
+            ):
+                return []
+            postings = sorted((self._postings(t) for t in query.include), key=lambda p: len(p[0]))
+            docs = postings[0][0]
+            # column filters first, on the rarest term's documents, then intersect
+            mask = np.isin(np.frombuffer(self._kind, np.uint8)[docs], [KINDS.index(k) for k in kinds])
+            if dialect is not None:
+                mask &= np.frombuffer(self._dialect, np.uint8)[docs] == self._dialect_ids[dialect]
+            if model_id is not None:
+                mask &= np.frombuffer(self._model, np.uint16)[docs] == self._model_ids[model_id]
+            positions = [np.flatnonzero(mask)]            # per included term: where each doc sits in its postings
+            docs = docs[positions[0]]
+            for other, _ in postings[1:]:                 # rarest first keeps the running set small
+                at, found = _locate(other, docs)
+                docs, positions = docs[found], [p[found] for p in positions] + [at[found]]
+            for term in query.exclude:
+                keep = ~_locate(self._postings(term)[0], docs)[1]
+                docs, positions = docs[keep], [p[keep] for p in positions]
+            if not len(docs):
+                return []
+
+            lengths = np.frombuffer(self._length, np.uint32)[docs].astype(np.float64)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self._total_length / n))
+            scores = np.zeros(len(docs))
+            for (term_docs, freqs), at in zip(postings, positions):
+                idf = math.log(1 + (n - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+                tf = freqs[at].astype(np.float64)
+                scores += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if len(docs) > limit:                         # partial selection, then order just those
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                top = top[np.argsort(-scores[top], kind="stable")]
+            else:
+                top = np.argsort(-scores, kind="stable")
+            hits = []
+            for i in top:
+                d = int(docs[i])
+                hits.append(Hit(
+                    KINDS[self._kind[d]],
+                    uuid.UUID(bytes=bytes(self._evaluation[16 * d:16 * d + 16])),
+                    self._models[self._model[d]],
+                    round(float(scores[i]), 4),
+                ))
+            return hits
+
+    def stats(self) -> dict:
+        with self._lock:
+            postings = sum(len(d) for d in self._docs)
+            return {
+                "ready": self.ready,
+                "documents": len(self._kind),
+                "terms": len(self._terms),
+                "postings": postings,
+                "memory_bytes": postings * 6 + len(self._kind) * 24 + len(self._terms) * 120,
+            }
+
+    # ── Startup ────────────────────────────────────────────
+
+    async def rebuild(self, batch: int = 5000) -> None:
+        """Index every prompt and response in the database from scratch."""
+        from sqlalchemy import select
+
+        from app.core.database import AsyncSessionLocal
+        from app.models.evaluation import Evaluation, ModelResponse, ResponseBlob
+        from app.services.blob_store import blob_store
+
+        self.clear()
+        sources = (
+            select(Evaluation.id, Evaluation.dialect, Evaluation.prompt),
+            select(
+                ModelResponse.evaluation_id, Evaluation.dialect, ModelResponse.model_id,
+                ResponseBlob.digest, ResponseBlob.codec, ResponseBlob.data,
+            )
+            .join(Evaluation, Evaluation.id == ModelResponse.evaluation_id)
+            .join(ResponseBlob, ResponseBlob.digest == ModelResponse.response_digest),
+        )
+        async with AsyncSessionLocal() as db:
+            for kind, query in zip(KINDS, sources):
+                result = await db.stream(query.execution_options(yield_per=batch))
+                async for rows in result.partitions():
+                    if kind == KIND_RESPONSE:
+                        bodies = await blob_store.resolve((d, codec, data) for *_, d, codec, data in rows)
+                        rows = [(e, dialect, bodies[d].decode("utf-8"), model) for e, dialect, model, d, _, _ in rows]
+                    await asyncio.to_thread(self.add_many, [(kind, *row) for row in rows])
+
+    async def warm(self) -> None:
+        """Startup, when this backend is in use. Started from the lifespan."""
+        try:
+            await self.rebuild()
+            logger.info("Search index rebuilt: %d documents, %d terms", len(self), len(self._terms))
+        except Exception as exc:
+            logger.exception("Search index rebuild failed: %s", exc)
+        finally:
+            self.ready = True
+
+
+# Module-level singleton
+search_index = SearchIndex()
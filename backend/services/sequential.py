@@ -0,0 +1,164 @@
+"""
+Sequential testing — decide when a benchmark comparison can stop early.
+
+The test watches per-prompt overall scores as they arrive. It keeps
+running moments (Welford) per model and per pair of models, so memory
+stays constant however many prompts are scored. A ranking is settled
+when every pair of adjacent models in it (ordered by mean score) is
+either separated (the paired-difference confidence interval excludes 0)
+or tied (the interval lies inside ±tie_margin).
+
+Comparisons are paired: both models answered the same prompt, which
+removes the prompt-difficulty variance that dominates raw score spread.
+Looking at the data repeatedly inflates false positives, so the decision
+intervals are Bonferroni-corrected over every planned look and every
+pair. The reported per-model intervals are the plain, uncorrected ones.
+"""
+
+import math
+from dataclasses import dataclass, field
+from itertools import combinations
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+STOP_SETTLED = "ranking_settled"
+STOP_BUDGET = "budget_exhausted"
+STOP_EXHAUSTED = "sample_exhausted"
+
+
+@dataclass
+class RunningMoments:
+    """Welford's online mean and variance."""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def stderr(self) -> float:
+        if self.n < 2:
+            return math.inf
+        return math.sqrt(self.m2 / (self.n - 1) / self.n)
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        half = z * self.stderr
+        return self.mean - half, self.mean + half
+
+
+@dataclass
+class SequentialOptions:
+    confidence: float = 0.95
+    min_prompts: int = 20
+    check_every: int = 10
+    tie_margin: float = 0.0              # |mean difference| below this counts as a tie
+    budget_usd: Optional[float] = None
+
+
+@dataclass
+class SequentialTest:
+    model_ids: List[str]
+    planned: int                         # prompts in the full sample
+    options: SequentialOptions = field(default_factory=SequentialOptions)
+
+    def __post_init__(self):
+        self.models: Dict[str, RunningMoments] = {m: RunningMoments() for m in self.model_ids}
+        self.pairs: Dict[Tuple[str, str], RunningMoments] = {
+            pair: RunningMoments() for pair in combinations(self.model_ids, 2)
+        }
+        self.prompts = 0
+        self.cost_usd = 0.0
+        alpha = 1 - self.options.confidence
+        looks = max(1, math.ceil(self.planned / max(1, self.options.check_every)))
+        self.z = NormalDist().inv_cdf(1 - alpha / 2)
+        self.z_decision = NormalDist().inv_cdf(1 - alpha / (2 * looks * max(1, len(self.pairs))))
+
+    def add(self, scores: Dict[str, Optional[float]], cost_usd: float = 0.0) -> None:
+        """One prompt's overall score per model (None: no score)."""
+        self.prompts += 1
+        self.cost_usd += cost_usd
+        for model_id, score in scores.items():
+            if score is not None and model_id in self.models:
+                self.models[model_id].add(score)
+        for (a, b), moments in self.pairs.items():
+            if scores.get(a) is not None and scores.get(b) is not None:
+                moments.add(scores[a] - scores[b])
+
+    def ranking(self) -> List[str]:
+        return sorted(self.model_ids, key=lambda m: (-self.models[m].mean, m))
+
+    def _pair(self, a: str, b: str) -> Tuple[RunningMoments, float]:
+        """Moments of a − b, whichever order the pair was stored in."""
+        if (a, b) in self.pairs:
+            return self.pairs[(a, b)], 1.0
+        return self.pairs[(b, a)], -1.0
+
+    def _verdict(self, a: str, b: str) -> Optional[str]:
+        moments, sign = self._pair(a, b)
+        low, high = moments.interval(self.z_decision)
+        low, high = sorted((sign * low, sign * high))
+        if low > 0 or high < 0:
+            return "separated"
+        margin = self.options.tie_margin
+        if margin > 0 and -margin < low and high < margin:
+            return "tied"
+        return None
+
+    def should_stop(self) -> Optional[str]:
+        """The stopping reason if the run can stop after this prompt, else None."""
+        budget = self.options.budget_usd
+        if budget is not None and self.cost_usd >= budget:
+            return STOP_BUDGET
+        if self.prompts >= self.planned:
+            return STOP_EXHAUSTED
+        if len(self.model_ids) < 2 or self.prompts < self.options.min_prompts:
+            return None
+        if self.prompts % max(1, self.options.check_every):
+            return None
+        ranking = self.ranking()
+        if all(self._verdict(a, b) for a, b in zip(ranking, ranking[1:])):
+            return STOP_SETTLED
+        return None
+
+    def summary(self, reason: Optional[str] = None) -> dict:
+        ranking = self.ranking()
+        models = {}
+        for model_id in ranking:
+            m = self.models[model_id]
+            low, high = m.interval(self.z)
+            models[model_id] = {
+                "n": m.n,
+                "mean": round(m.mean, 4),
+                "ci_low": round(low, 4) if m.n > 1 else None,
+                "ci_high": round(high, 4) if m.n > 1 else None,
+            }
+        adjacent = []
+        for a, b in zip(ranking, ranking[1:]):
+            moments, sign = self._pair(a, b)
+            low, high = sorted((sign * x for x in moments.interval(self.z_decision)))
+            adjacent.append({
+                "models": [a, b],
+                "n": moments.n,
+                "mean_difference": round(sign * moments.mean, 4),
+                "ci_low": round(low, 4) if moments.n > 1 else None,
+                "ci_high": round(high, 4) if moments.n > 1 else None,
+                "verdict": self._verdict(a, b) or "undecided",
+            })
+        return {
+            "ranking": ranking,
+            "models": models,
+            "adjacent_pairs": adjacent,
+            "stopping": {
+                "reason": reason,
+                "prompts_evaluated": self.prompts,
+                "prompts_planned": self.planned,
+                "prompts_saved": max(0, self.planned - self.prompts),
+                "cost_usd": round(self.cost_usd, 6),
+                "confidence": self.options.confidence,
+                "decision_z": round(self.z_decision, 3),
+            },
+        }
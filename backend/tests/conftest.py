@@ -7,7 +7,9 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.config import settings
+from app.core.database import Base, get_db, get_read_db
+from app.models import evaluation, user, benchmark, rating  # noqa: F401
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_llm_eval.db"
 
@@ -44,8 +46,51 @@ async def client(db_session: AsyncSession):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """Serve every model (and the judge) from the mock provider, instantly."""
+    from app.services.availability import availability
+
+    monkeypatch.setattr(settings, "MOCK_LLM_ENABLED", True)
+    monkeypatch.setattr(settings, "MOCK_LATENCY_DISTRIBUTION", "fixed")
+    monkeypatch.setattr(settings, "MOCK_LATENCY_MS_MEAN", 0.0)
+    monkeypatch.setattr(settings, "MOCK_TOKENS_PER_SECOND", 1_000_000.0)
+    monkeypatch.setattr(settings, "MOCK_RESPONSE_TOKENS", 40)
+    monkeypatch.setattr(settings, "MOCK_ERROR_RATE", 0.0)
+    availability.refresh_static()
+    yield
+    monkeypatch.undo()
+    availability.refresh_static()
+
+
+@pytest.fixture
+def pipeline_db(db_session, monkeypatch):
+    """Point the session factories used outside requests (pipeline, export stream) at the test database."""
+    import app.core.database as database
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", TestSessionLocal)
+    monkeypatch.setattr(database, "ReadSessionLocal", TestSessionLocal)
+    return db_session
+
+
+@pytest.fixture
+def sql_statements():
+    """List that collects every SQL statement run against the test database."""
+    from sqlalchemy import event
+
+    statements: list = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
@@ -0,0 +1,57 @@
+"""Unit tests for token usage extraction and cost accounting."""
+
+from types import SimpleNamespace
+
+from app.services.accounting import (
+    USAGE_PROVIDER, TokenUsage, compute_cost, count_tokens, extract_usage,
+    resolve_usage, tokens_per_second,
+)
+
+
+class TestExtractUsage:
+    def test_standard_usage_metadata(self):
+        msg = SimpleNamespace(
+            usage_metadata={"input_tokens": 120, "output_tokens": 80, "total_tokens": 200},
+            response_metadata={},
+        )
+        usage = extract_usage(msg)
+        assert (usage.input_tokens, usage.output_tokens) == (120, 80)
+        assert usage.source == USAGE_PROVIDER
+
+    def test_openai_token_usage(self):
+        msg = SimpleNamespace(response_metadata={
+            "token_usage": {"prompt_tokens": 30, "completion_tokens": 12},
+        })
+        usage = extract_usage(msg)
+        assert (usage.input_tokens, usage.output_tokens) == (30, 12)
+
+    def test_google_usage_metadata(self):
+        msg = SimpleNamespace(response_metadata={
+            "usage_metadata": {"prompt_token_count": 7, "candidates_token_count": 9},
+        })
+        assert extract_usage(msg).total_tokens == 16
+
+    def test_missing_usage_falls_back_to_estimate(self):
+        msg = SimpleNamespace(content="مرحبا")
+        assert extract_usage(msg) is None
+        usage = resolve_usage(msg, ["اشرح الذكاء الاصطناعي"], "الذكاء الاصطناعي هو")
+        assert usage.input_tokens > 0
+        assert usage.output_tokens > 0
+        assert usage.source != USAGE_PROVIDER
+
+
+class TestCost:
+    def test_input_and_output_priced(self):
+        usage = TokenUsage(input_tokens=1000, output_tokens=1000, source=USAGE_PROVIDER)
+        # gpt-4o: 0.005 in + 0.015 out
+        assert compute_cost("gpt-4o", usage) == 0.02
+
+    def test_unknown_model_is_free(self):
+        assert compute_cost("unknown", TokenUsage(500, 500, USAGE_PROVIDER)) == 0.0
+
+    def test_empty_text_has_no_tokens(self):
+        assert count_tokens("")[0] == 0
+
+    def test_tokens_per_second(self):
+        assert tokens_per_second(200, 2000) == 100.0
+        assert tokens_per_second(200, -1) is None
@@ -0,0 +1,106 @@
+"""Tests for the vectorized benchmark statistics engine."""
+
+import numpy as np
+import pytest
+
+from app.services.aggregation import (
+    ELO_BASE, ScoreMatrix, bootstrap_means, bradley_terry, dialect_means, elo_scale, pairwise_wins,
+    poisson_weights, summarize,
+)
+from app.services.scorer import SCORE_DIMENSIONS
+
+
+def _matrix(p: int = 400, offsets=(1.5, 0.0, -1.5), seed: int = 0) -> ScoreMatrix:
+    rng = np.random.default_rng(seed)
+    m, d = len(offsets), len(SCORE_DIMENSIONS)
+    difficulty = rng.uniform(3, 8, size=(p, 1, 1))
+    scores = difficulty + np.asarray(offsets)[None, :, None] + rng.normal(0, 0.5, size=(p, m, d))
+    return ScoreMatrix(
+        model_ids=[f"m{j}" for j in range(m)],
+        scores=scores,
+        overall=scores.mean(axis=2),
+        dialects=np.array(["msa", "gulf"] * (p // 2)),
+    )
+
+
+def test_poisson_weights_have_unit_mean_and_variance():
+    w = poisson_weights(np.random.default_rng(0), (1000, 1000))
+    assert w.mean() == pytest.approx(1.0, abs=0.01)
+    assert w.var() == pytest.approx(1.0, abs=0.01)
+
+
+class TestBootstrap:
+    def test_interval_brackets_mean_and_shrinks_with_n(self):
+        rng = np.random.default_rng(1)
+        small = bootstrap_means(rng.normal(5, 1, (100, 1)), 500, 0.95, rng)
+        large = bootstrap_means(rng.normal(5, 1, (10_000, 1)), 500, 0.95, rng)
+        for out in (small, large):
+            assert out["low"][0] < out["mean"][0] < out["high"][0]
+        assert (large["high"] - large["low"])[0] < (small["high"] - small["low"])[0] / 5
+        # ≈ 2 × 1.96 / √n
+        assert (large["high"] - large["low"])[0] == pytest.approx(2 * 1.96 / 100, rel=0.2)
+
+    def test_missing_values_are_ignored(self):
+        values = np.array([[1.0, np.nan], [3.0, 4.0], [5.0, np.nan]])
+        out = bootstrap_means(values, 200, 0.9, np.random.default_rng(0))
+        assert list(out["n"]) == [3, 1]
+        assert out["mean"] == pytest.approx([3.0, 4.0])
+        assert out["low"][1] == out["high"][1] == 4.0
+
+    def test_all_missing_column_is_nan(self):
+        out = bootstrap_means(np.full((5, 1), np.nan), 50, 0.95, np.random.default_rng(0))
+        assert np.isnan(out["mean"][0]) and out["n"][0] == 0
+
+
+class TestRatings:
+    def test_pairwise_wins_count_ties_half(self):
+        overall = np.array([[9.0, 5.0], [5.0, 5.0], [np.nan, 7.0]])
+        pairs = pairwise_wins(overall)
+        assert pairs["wins"][0, 1] == 1.5 and pairs["wins"][1, 0] == 0.5
+        assert pairs["games"][0, 1] == 2
+
+    def test_bradley_terry_orders_and_centers(self):
+        wins = np.array([[0, 70, 90], [30, 0, 70], [10, 30, 0]], dtype=float)
+        ratings = elo_scale(bradley_terry(wins))
+        assert ratings[0] > ratings[1] > ratings[2]
+        assert ratings.mean() == pytest.approx(ELO_BASE)
+
+    def test_unbeaten_model_stays_finite(self):
+        ratings = elo_scale(bradley_terry(np.array([[0, 50], [0, 0]], dtype=float)))
+        assert np.all(np.isfinite(ratings)) and ratings[0] > ratings[1]
+
+
+def test_dialect_means():
+    overall = np.array([[8.0, 6.0], [6.0, np.nan], [4.0, 2.0]])
+    out = dialect_means(overall, np.array(["msa", "msa", "gulf"]))
+    assert out["msa"]["prompts"] == 2
+    assert list(out["msa"]["mean"]) == [7.0, 6.0]
+    assert list(out["gulf"]["mean"]) == [4.0, 2.0]
+
+
+class TestSummarize:
+    def test_summary_shape_and_ranking(self):
+        summary = summarize(_matrix(), n_bootstrap=200)
+        assert summary["ranking"] == ["m0", "m1", "m2"]
+        assert summary["prompts"] == 400 and summary["bootstrap_samples"] == 200
+        top = summary["models"]["m0"]
+        assert top["n"] == 400 and top["ci_low"] < top["mean"] < top["ci_high"]
+        assert set(top["dimensions"]) == set(SCORE_DIMENSIONS)
+        assert top["rating"] > summary["models"]["m1"]["rating"] > summary["models"]["m2"]["rating"]
+        assert summary["pairwise"][0] == {"models": ["m0", "m1"], "n": 400, "win_rate": pytest.approx(1.0, abs=0.05)}
+        assert [d["dialect"] for d in summary["dialects"]] == ["gulf", "msa"]
+        assert all(d["ranking"] == ["m0", "m1", "m2"] for d in summary["dialects"])
+
+    def test_same_seed_same_summary(self):
+        matrix = _matrix()
+        assert summarize(matrix, seed=7) == summarize(matrix, seed=7)
+        assert summarize(matrix, seed=7)["models"] != summarize(matrix, seed=8)["models"]
+
+    def test_unscored_model_ranks_last(self):
+        matrix = _matrix(p=20)
+        matrix.overall[:, 0] = np.nan
+        matrix.scores[:, 0] = np.nan
+        summary = summarize(matrix, n_bootstrap=50)
+        assert summary["ranking"][-1] == "m0"
+        assert summary["models"]["m0"]["mean"] is None and summary["models"]["m0"]["n"] == 0
+        assert summary["pairwise"][0]["win_rate"] is None
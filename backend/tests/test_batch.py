@@ -0,0 +1,107 @@
+"""Tests for bulk evaluation submission (POST /evaluations/batch)."""
+
+import json
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.batch_runner import batch_runner
+
+PROMPTS = [
+    "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي",
+    "ما هي أبرز التحديات التي يواجهها الذكاء الاصطناعي العربي؟",
+    "اكتب قصة قصيرة عن رحلة في الصحراء العربية",
+]
+
+
+def _item(prompt: str, **overrides) -> dict:
+    return {"prompt": prompt, "dialect": "msa", "models": ["gpt-4o", "jais-30b"], **overrides}
+
+
+@pytest.mark.asyncio
+async def test_batch_json_array_runs_to_completion(client: AsyncClient, pipeline_db, mock_llm, sql_statements):
+    sql_statements.clear()
+    response = await client.post("/api/v1/evaluations/batch", json=[_item(p) for p in PROMPTS])
+    assert response.status_code == 202
+    batch = response.json()
+    assert batch["total"] == 3 and batch["pending"] == 3
+    assert len(batch["evaluation_ids"]) == 3
+    inserts = [s for s in sql_statements if s.lstrip().upper().startswith("INSERT INTO EVALUATIONS")]
+    assert len(inserts) == 1
+
+    await batch_runner.join(UUID(batch["id"]))
+    progress = (await client.get(f"/api/v1/evaluations/batch/{batch['id']}")).json()
+    assert progress["status"] == "completed"
+    assert progress["completed"] == 3 and progress["pending"] == 0
+    assert "evaluation_ids" not in progress
+
+    one = (await client.get(f"/api/v1/evaluations/{batch['evaluation_ids'][0]}")).json()
+    assert one["status"] == "completed" and len(one["model_responses"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_jsonl(client: AsyncClient, pipeline_db, mock_llm):
+    body = "\n".join(json.dumps(_item(p), ensure_ascii=False) for p in PROMPTS) + "\n"
+    response = await client.post(
+        "/api/v1/evaluations/batch",
+        content=body.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 202
+    assert response.json()["total"] == 3
+    await batch_runner.join(UUID(response.json()["id"]))
+
+
+@pytest.mark.asyncio
+async def test_batch_is_validated_as_a_whole(client: AsyncClient, pipeline_db, mock_llm):
+    items = [_item(PROMPTS[0]), _item(PROMPTS[1], dialect="klingon"), _item("short")]
+    response = await client.post("/api/v1/evaluations/batch", json=items)
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "INVALID_BATCH"
+    assert [e["index"] for e in error["detail"]["errors"]] == [1, 2]
+
+    listing = (await client.get("/api/v1/evaluations")).json()
+    assert listing["total"] == 0                 # nothing stored
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_unavailable_models(client: AsyncClient):
+    response = await client.post("/api/v1/evaluations/batch", json=[_item(PROMPTS[0])])
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "MODEL_NOT_AVAILABLE"
+    assert error["message"] == "Models 'gpt-4o', 'jais-30b' are not available or misconfigured."
+
+
+@pytest.mark.asyncio
+async def test_batch_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/evaluations/batch/00000000-0000-0000-0000-000000000000")
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "BATCH_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_batch_evaluations_get_their_own_traces(client: AsyncClient, pipeline_db, mock_llm):
+    from app.core.tracing import tracer
+
+    tracer.timelines.clear()
+    batch = (await client.post("/api/v1/evaluations/batch", json=[_item(p) for p in PROMPTS])).json()
+    await batch_runner.join(UUID(batch["id"]))
+
+    timelines = [
+        (await client.get(f"/api/v1/evaluations/{evaluation_id}/timeline")).json()
+        for evaluation_id in batch["evaluation_ids"]
+    ]
+    assert len({t["trace_id"] for t in timelines}) == 3
+    for evaluation_id, timeline in zip(batch["evaluation_ids"], timelines):
+        pipelines = [s for s in timeline["spans"] if s["name"] == "evaluation.pipeline"]
+        assert len(pipelines) == 1 and pipelines[0]["parent_id"] is None
+        assert pipelines[0]["attributes"]["evaluation.id"] == evaluation_id
+        assert all(s["name"] != "evaluation.batch_create" for s in timeline["spans"])
+
+    links = [s["links"] for t in timelines for s in t["spans"] if s["name"] == "evaluation.pipeline"]
+    assert all(len(span_links) == 1 for span_links in links)
+    assert len({link[0]["trace_id"] for link in links}) == 1          # the batch's own trace
+    assert links[0][0]["trace_id"] not in {t["trace_id"] for t in timelines}
@@ -0,0 +1,132 @@
+"""Tests for streaming benchmark prompt import (POST /benchmarks/{slug}/prompts)."""
+
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.security import generate_api_key
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+from app.models.user import APIKey, User
+from app.services.benchmark_importer import content_hash
+
+PROMPTS = [
+    {"prompt": "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي", "dialect": "msa", "category": "reasoning"},
+    {"prompt": "شو أحسن طريقة لتعلم البرمجة؟", "dialect": "levantine", "category": "code_generation"},
+    {"prompt": "ايش رايك في مستقبل الذكاء الاصطناعي بالخليج؟", "dialect": "gulf", "tags": ["future"]},
+    {"prompt": "اكتب قصة قصيرة عن رحلة في الصحراء", "category": "creative_writing", "difficulty": "easy"},
+]
+
+
+async def _admin_headers(db, is_admin: bool = True) -> dict:
+    user = User(email=f"importer-{is_admin}@example.com", name="ops", hashed_password="x", is_admin=is_admin)
+    db.add(user)
+    await db.flush()
+    raw, hashed = generate_api_key()
+    db.add(APIKey(user_id=user.id, name="ops", key_hash=hashed, prefix=raw[:8]))
+    await db.commit()
+    return {"Authorization": f"Bearer {raw}"}
+
+
+async def _dataset(db, slug: str = "arabic-core") -> BenchmarkDataset:
+    dataset = BenchmarkDataset(slug=slug, name="Arabic Core", prompt_count=0)
+    db.add(dataset)
+    await db.commit()
+    return dataset
+
+
+def _jsonl(records) -> bytes:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+
+
+def test_content_hash_ignores_whitespace_layout():
+    assert content_hash("مرحبا   بالعالم\n") == content_hash(" مرحبا بالعالم")
+    assert content_hash("مرحبا بالعالم") != content_hash("مرحبا بالعالم!")
+
+
+@pytest.mark.asyncio
+async def test_import_jsonl_dedupes_and_reports(client: AsyncClient, db_session, sql_statements, monkeypatch):
+    headers = await _admin_headers(db_session)
+    await _dataset(db_session)
+    monkeypatch.setattr(settings, "BENCHMARK_IMPORT_BATCH_SIZE", 2)
+    records = PROMPTS + [
+        {"prompt": PROMPTS[0]["prompt"] + "  ", "dialect": "msa"},      # duplicate after normalization
+        {"prompt": "سؤال بلهجة غير معروفة", "dialect": "klingon"},
+    ]
+    sql_statements.clear()
+    response = await client.post(
+        "/api/v1/benchmarks/arabic-core/prompts",
+        content=_jsonl(records) + b"{not json\n",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["read"] == 7
+    assert summary["inserted"] == 4 and summary["duplicates"] == 1 and summary["rejected"] == 2
+    assert summary["prompt_count"] == 4
+    assert [e["position"] for e in summary["errors"]] == [6, 7]
+
+    inserts = [s for s in sql_statements if s.lstrip().upper().startswith("INSERT INTO BENCHMARK_PROMPTS")]
+    assert len(inserts) == 2                          # one executemany per batch of 2 new prompts
+
+    dataset = (await client.get("/api/v1/benchmarks/arabic-core")).json()
+    assert dataset["prompt_count"] == 4
+
+    again = await client.post(
+        "/api/v1/benchmarks/arabic-core/prompts", content=_jsonl(PROMPTS), headers=headers,
+    )
+    assert again.json()["inserted"] == 0 and again.json()["duplicates"] == 4
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client: AsyncClient, db_session):
+    headers = await _admin_headers(db_session)
+    dataset = await _dataset(db_session)
+    body = (
+        "prompt,dialect,category,tags\n"
+        "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي,msa,reasoning,ml|basics\n"
+        '"ما هي عاصمة مصر، ولماذا؟",egyptian,culture_heritage,\n'
+    ).encode("utf-8")
+    response = await client.post(
+        "/api/v1/benchmarks/arabic-core/prompts?format=csv", content=body, headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 2
+
+    tags = await db_session.scalar(
+        select(BenchmarkPrompt.tags).where(BenchmarkPrompt.dataset_id == dataset.id, BenchmarkPrompt.dialect == "msa")
+    )
+    assert tags == ["ml", "basics"]
+
+
+@pytest.mark.asyncio
+async def test_import_strict_rolls_back(client: AsyncClient, db_session):
+    headers = await _admin_headers(db_session)
+    dataset = await _dataset(db_session)
+    records = PROMPTS + [{"prompt": "فئة غير صالحة", "category": "astrology"}]
+    response = await client.post(
+        "/api/v1/benchmarks/arabic-core/prompts?strict=true", content=_jsonl(records), headers=headers,
+    )
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "INVALID_IMPORT"
+    assert error["detail"]["errors"][0]["position"] == 5
+
+    count = await db_session.scalar(
+        select(func.count()).select_from(BenchmarkPrompt).where(BenchmarkPrompt.dataset_id == dataset.id)
+    )
+    assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_import_requires_admin_and_dataset(client: AsyncClient, db_session):
+    await _dataset(db_session)
+    user_headers = await _admin_headers(db_session, is_admin=False)
+    response = await client.post("/api/v1/benchmarks/arabic-core/prompts", content=_jsonl(PROMPTS), headers=user_headers)
+    assert response.status_code == 403
+
+    admin_headers = await _admin_headers(db_session)
+    response = await client.post("/api/v1/benchmarks/missing/prompts", content=_jsonl(PROMPTS), headers=admin_headers)
+    assert response.status_code == 404
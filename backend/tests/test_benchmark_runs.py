@@ -0,0 +1,135 @@
+"""Tests for benchmark run execution and sequential early stopping."""
+
+import random
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, insert, select
+
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+from app.models.evaluation import Evaluation
+from app.services.benchmark_runner import benchmark_runner
+from app.services.sequential import (
+    STOP_BUDGET, STOP_EXHAUSTED, STOP_SETTLED, RunningMoments, SequentialOptions, SequentialTest,
+)
+
+
+async def _dataset(db, size: int = 120, slug: str = "run-me") -> uuid.UUID:
+    dataset = BenchmarkDataset(slug=slug, name="Run me", prompt_count=size, dialect="msa")
+    db.add(dataset)
+    await db.flush()
+    rng = random.Random(3)
+    await db.execute(insert(BenchmarkPrompt), [
+        {
+            "id": uuid.uuid4(), "dataset_id": dataset.id, "prompt_text": f"اشرح المفهوم رقم {i} بالتفصيل",
+            "category": "reasoning", "sample_key": rng.random(),
+        }
+        for i in range(size)
+    ])
+    await db.commit()
+    return dataset.id
+
+
+class TestSequentialTest:
+    def test_running_moments(self):
+        m = RunningMoments()
+        for x in (2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0):
+            m.add(x)
+        assert m.mean == pytest.approx(5.0)
+        assert m.m2 / (m.n - 1) == pytest.approx(32 / 7)
+
+    def test_clear_leader_stops_early(self):
+        rng = random.Random(1)
+        test = SequentialTest(["a", "b", "c"], planned=1000, options=SequentialOptions(min_prompts=20))
+        reason = None
+        while reason is None:
+            base = rng.uniform(3, 9)                       # prompt difficulty, shared by all models
+            test.add({"a": base + 1.5 + rng.gauss(0, 0.5), "b": base + rng.gauss(0, 0.5), "c": base - 1.5 + rng.gauss(0, 0.5)})
+            reason = test.should_stop()
+        assert reason == STOP_SETTLED
+        assert test.prompts < 100
+        summary = test.summary(reason)
+        assert summary["ranking"] == ["a", "b", "c"]
+        assert [p["verdict"] for p in summary["adjacent_pairs"]] == ["separated", "separated"]
+        assert summary["stopping"]["prompts_saved"] == 1000 - test.prompts
+
+    def test_equal_models_run_to_the_end(self):
+        rng = random.Random(2)
+        test = SequentialTest(["a", "b"], planned=200)
+        reasons = []
+        for _ in range(200):
+            base = rng.uniform(3, 9)
+            test.add({"a": base + rng.gauss(0, 1), "b": base + rng.gauss(0, 1)})
+            reasons.append(test.should_stop())
+        assert reasons[-1] == STOP_EXHAUSTED
+        assert STOP_SETTLED not in reasons
+
+    def test_tie_margin_settles_equal_models(self):
+        rng = random.Random(2)
+        test = SequentialTest(["a", "b"], planned=500, options=SequentialOptions(tie_margin=0.5))
+        reason = None
+        while reason is None:
+            base = rng.uniform(3, 9)
+            test.add({"a": base + rng.gauss(0, 0.3), "b": base + rng.gauss(0, 0.3)})
+            reason = test.should_stop()
+        assert reason == STOP_SETTLED and test.prompts < 500
+        assert test.summary(reason)["adjacent_pairs"][0]["verdict"] == "tied"
+
+    def test_budget(self):
+        test = SequentialTest(["a", "b"], planned=100, options=SequentialOptions(budget_usd=0.01))
+        test.add({"a": 5, "b": 6}, cost_usd=0.004)
+        assert test.should_stop() is None
+        test.add({"a": 5, "b": 6}, cost_usd=0.007)
+        assert test.should_stop() == STOP_BUDGET
+
+
+async def _run(client: AsyncClient, **body) -> dict:
+    response = await client.post("/api/v1/benchmarks/runs", json={
+        "dataset_slug": "run-me", "model_ids": ["gpt-4o", "jais-30b"], **body,
+    })
+    assert response.status_code == 202, response.text
+    await benchmark_runner.join(uuid.UUID(response.json()["id"]))
+    return (await client.get(f"/api/v1/benchmarks/runs/{response.json()['id']}")).json()
+
+
+@pytest.mark.asyncio
+async def test_full_run_evaluates_whole_sample(client: AsyncClient, pipeline_db, mock_llm):
+    await _dataset(pipeline_db)
+    run = await _run(client, sample_size=12)
+    assert run["status"] == "completed" and run["started_at"]
+    summary = run["results_summary"]
+    assert summary["stopping"]["reason"] == STOP_EXHAUSTED
+    assert summary["stopping"]["prompts_evaluated"] == 12
+    assert set(summary["models"]) == {"gpt-4o", "jais-30b"}
+    assert all(m["n"] == 12 for m in summary["models"].values())
+    assert summary["prompts"] == 12 and len(summary["pairwise"]) == 1
+    assert sum(m["rating"] for m in summary["models"].values()) == pytest.approx(3000, abs=0.2)
+    assert [d["dialect"] for d in summary["dialects"]] == ["msa"]
+    assert summary["ranking"] == sorted(summary["models"], key=lambda m: -summary["models"][m]["mean"])
+
+    evaluations = await pipeline_db.scalar(
+        select(func.count()).select_from(Evaluation).where(Evaluation.benchmark_run_id == uuid.UUID(run["id"]))
+    )
+    assert evaluations == 12
+
+
+@pytest.mark.asyncio
+async def test_sequential_run_stops_when_settled(client: AsyncClient, pipeline_db, mock_llm):
+    await _dataset(pipeline_db)
+    run = await _run(client, sequential={"min_prompts": 10, "check_every": 10, "tie_margin": 5.0})
+    stopping = run["results_summary"]["stopping"]
+    assert stopping["reason"] == STOP_SETTLED
+    assert stopping["prompts_planned"] == 120
+    assert stopping["prompts_evaluated"] < 40                 # stop at 10, plus what was in flight
+    assert stopping["prompts_saved"] > 80
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_unavailable_models(client: AsyncClient, db_session):
+    await _dataset(db_session)
+    response = await client.post("/api/v1/benchmarks/runs", json={"dataset_slug": "run-me", "model_ids": ["gpt-4o"]})
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "MODEL_NOT_AVAILABLE"
+    assert error["message"] == "Model 'gpt-4o' is not available or misconfigured."
@@ -0,0 +1,33 @@
+"""Smoke tests for the benchmark suite — every case runs one quick round."""
+
+import pytest
+
+from app.benchmarks import cases  # noqa: F401
+from app.benchmarks.harness import CASES, RunConfig, compare, run_case, to_report
+
+QUICK = RunConfig(
+    min_rounds=1, max_rounds=1, max_time=0.0, warmup_rounds=0,
+    params={"dataset_size": 50, "ws_clients": 2, "ws_models": 2},
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(CASES))
+async def test_case_runs(name):
+    result = await run_case(CASES[name], QUICK)
+    assert result.stats["rounds"] == 1
+    assert result.items > 0
+
+
+@pytest.mark.asyncio
+async def test_report_and_compare():
+    result = await run_case(CASES["scorer.parse_score_json[clean]"], QUICK)
+    report = to_report([result], QUICK)
+    assert report["benchmarks"][0]["name"] == "scorer.parse_score_json[clean]"
+    assert {"median", "p95", "ops"} <= set(report["benchmarks"][0]["stats"])
+
+    slower = {"benchmarks": [{"name": "x", "stats": {"median": 1.3}}]}
+    baseline = {"benchmarks": [{"name": "x", "stats": {"median": 1.0}}]}
+    (row,) = compare(baseline, slower, threshold=0.15)
+    assert row["regressed"] and row["change"] == pytest.approx(0.3)
+    assert not compare(baseline, slower, threshold=0.5)[0]["regressed"]
@@ -0,0 +1,129 @@
+"""Tests for the content-addressed response blob store."""
+
+import os
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models.evaluation import Evaluation, ModelResponse, ResponseBlob
+from app.services.blob_store import BlobStore, blob_store, digest
+
+LONG = "يعتمد الذكاء الاصطناعي على البيانات والخوارزميات لتعلم الأنماط. " * 40
+
+
+def test_codecs_round_trip_and_skip_small_payloads():
+    data = LONG.encode("utf-8")
+    for codec in ("zstd", "gzip"):
+        store = BlobStore(codec=codec)
+        used, stored = store.encode(data)
+        assert used == codec and len(stored) < len(data) / 5
+        assert BlobStore.decode(used, stored) == data
+    assert BlobStore(codec="zstd").encode("قصير".encode("utf-8"))[0] == "raw"
+    assert BlobStore(codec="raw").encode(data) == ("raw", data)
+    with pytest.raises(ValueError):
+        BlobStore(backend="s3")
+
+
+@pytest.mark.asyncio
+async def test_identical_payloads_are_stored_once(db_session):
+    keys = await blob_store.put_texts(db_session, [LONG, None, LONG])
+    again = await blob_store.put_texts(db_session, [LONG])
+    documents = await blob_store.put_documents(db_session, [{"b": 1, "a": "ع"}, {"a": "ع", "b": 1}])
+    await db_session.commit()
+
+    assert keys == [digest(LONG.encode("utf-8")), None, keys[0]] and again == [keys[0]]
+    assert documents[0] == documents[1]
+    assert (await db_session.execute(select(func.count()).select_from(ResponseBlob))).scalar() == 2
+    row = await db_session.get(ResponseBlob, keys[0])
+    assert row.size == len(LONG.encode("utf-8")) and row.stored_size < row.size / 5
+    payloads = await blob_store.get_many(db_session, [keys[0], documents[0], "0" * 64])
+    assert payloads == {keys[0]: LONG.encode("utf-8"), documents[0]: '{"a":"ع","b":1}'.encode("utf-8")}
+
+
+@pytest.mark.asyncio
+async def test_local_backend_keeps_bytes_on_disk(db_session, tmp_path):
+    store = BlobStore(backend="local", path=str(tmp_path), codec="gzip")
+    (key,) = await store.put_texts(db_session, [LONG])
+    await db_session.commit()
+
+    row = await db_session.get(ResponseBlob, key)
+    assert row.data is None and row.codec == "gzip"
+    assert os.path.getsize(tmp_path / key[:2] / key[2:4] / key) == row.stored_size
+    assert (await store.get_many(db_session, [key]))[key].decode("utf-8") == LONG
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stores_digests_not_payloads(client: AsyncClient, pipeline_db, mock_llm):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "اشرح مفهوم الحوسبة السحابية باختصار",
+        "dialect": "msa",
+        "models": ["gpt-4o", "jais-30b"],
+    })
+    evaluation = (await client.get(f"/api/v1/evaluations/{response.json()['id']}")).json()
+    assert "response_text" not in ModelResponse.__table__.c and "arabic_metrics" not in ModelResponse.__table__.c
+
+    rows = (await pipeline_db.execute(
+        select(ModelResponse.model_id, ModelResponse.response_digest, ModelResponse.response_length,
+               ModelResponse.metrics_digest)
+    )).all()
+    payloads = await blob_store.get_many(pipeline_db, [d for row in rows for d in row[1::2]])
+    served = {r["model_id"]: r for r in evaluation["model_responses"]}
+    for model_id, text_digest, length, metrics_digest in rows:
+        assert payloads[text_digest].decode("utf-8") == served[model_id]["response_text"]
+        assert length == served[model_id]["response_text_length"]
+        assert metrics_digest in payloads and served[model_id]["arabic_metrics"]["token_count"] > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend,codec", [("database", "zstd"), ("database", "gzip"), ("local", "raw")])
+async def test_ranged_reads_decompress_only_their_frames(db_session, tmp_path, monkeypatch, backend, codec):
+    store = BlobStore(backend=backend, path=str(tmp_path), codec=codec, frame_chars=100)
+    (key,) = await store.put_texts(db_session, [LONG])
+    await db_session.commit()
+    row = await db_session.get(ResponseBlob, key)
+    assert row.codec == codec and len(row.frames["ends"]) == -(-len(LONG) // 100)
+    assert (await store.get_many(db_session, [key]))[key].decode("utf-8") == LONG
+
+    decoded = []
+    original = BlobStore.decode
+    monkeypatch.setattr(BlobStore, "decode", staticmethod(lambda c, s: decoded.append(len(s)) or original(c, s)))
+    for offset, limit in ((0, 10), (95, 10), (250, 100), (len(LONG) - 5, 50), (len(LONG) + 1, 10)):
+        text = await store.read_text(db_session, key, row.codec, row.frames, offset, limit)
+        assert text == LONG[offset:offset + limit]
+    ends = [0] + row.frames["ends"]
+    frame = max(b - a for a, b in zip(ends, ends[1:]))
+    assert decoded and max(decoded) <= 2 * frame < row.stored_size
+
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_unreferenced_blobs_and_files(db_session, tmp_path):
+    store = BlobStore(backend="local", path=str(tmp_path), codec="gzip")
+    evaluation = Evaluation(prompt="سؤال", dialect="msa", category="general", status="completed")
+    db_session.add(evaluation)
+    await db_session.flush()
+    body, orphan = await store.put_texts(db_session, [LONG, LONG + "؟"])
+    (metrics,) = await store.put_documents(db_session, [{"token_count": 3}])
+    db_session.add(ModelResponse(
+        evaluation_id=evaluation.id, model_id="gpt-4o", model_name="GPT-4o", provider="openai",
+        response_digest=body, response_length=len(LONG), metrics_digest=metrics,
+    ))
+    await db_session.commit()
+    stray = tmp_path / "ab" / "cd" / ("abcd" + "0" * 60)        # a rolled-back write's file
+    stray.parent.mkdir(parents=True)
+    stray.write_bytes(b"x")
+
+    assert await store.sweep(db_session, grace_seconds=3600) == {"blobs": 0, "bytes": 0, "files": 0}
+    os.utime(stray, (0, 0))
+    removed = await store.sweep(db_session, grace_seconds=0)
+    stored = {key: os.path.exists(store._file(key)) for key in (body, orphan, metrics)}
+    assert removed["blobs"] == 1 and removed["files"] == 1 and not stray.exists()
+    assert stored == {body: True, orphan: False, metrics: True}
+    remaining = set((await db_session.execute(select(ResponseBlob.digest))).scalars())
+    assert remaining == {body, metrics}
+
+    # Storing swept content again brings the row and its file back
+    assert await store.put_texts(db_session, [LONG + "؟"]) == [orphan]
+    await db_session.commit()
+    assert (await store.get_many(db_session, [orphan]))[orphan].decode("utf-8") == LONG + "؟"
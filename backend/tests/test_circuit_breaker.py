@@ -0,0 +1,126 @@
+"""Unit tests for the per-provider CircuitBreaker."""
+
+import time
+
+import pytest
+
+from app.core.exceptions import CircuitOpenError
+from app.services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry,
+)
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(
+        name="openai",
+        min_calls=4,
+        error_rate_threshold=0.5,
+        slow_call_ms=1000,
+        slow_rate_threshold=0.75,
+        open_seconds=0.05,
+    )
+
+
+class TestTripping:
+    def test_stays_closed_below_min_calls(self, breaker):
+        for _ in range(3):
+            breaker.record_failure("boom")
+        assert breaker.state == CLOSED
+
+    def test_opens_on_error_rate(self, breaker):
+        breaker.record_success(100)
+        breaker.record_success(100)
+        breaker.record_failure("boom")
+        breaker.record_failure("boom")
+        assert breaker.state == OPEN
+        assert breaker.last_error == "boom"
+
+    def test_opens_on_slow_calls(self, breaker):
+        for _ in range(4):
+            breaker.record_success(5000)
+        assert breaker.state == OPEN
+
+    def test_open_circuit_fails_fast(self, breaker):
+        for _ in range(4):
+            breaker.record_failure("boom")
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.ensure_call_permitted()
+        assert exc_info.value.status_code == 503
+
+
+class TestRecovery:
+    def _trip(self, breaker):
+        for _ in range(4):
+            breaker.record_failure("boom")
+
+    def test_half_open_admits_single_trial(self, breaker):
+        self._trip(breaker)
+        time.sleep(0.06)
+        breaker.ensure_call_permitted()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.ensure_call_permitted()
+
+    def test_successful_trial_closes(self, breaker):
+        self._trip(breaker)
+        time.sleep(0.06)
+        breaker.ensure_call_permitted()
+        breaker.record_success(50)
+        assert breaker.state == CLOSED
+
+    def test_failed_trial_reopens(self, breaker):
+        self._trip(breaker)
+        time.sleep(0.06)
+        breaker.ensure_call_permitted()
+        breaker.record_failure("still down")
+        assert breaker.state == OPEN
+        assert breaker.trip_count == 2
+
+    @pytest.mark.asyncio
+    async def test_guard_records_failure(self, breaker):
+        for _ in range(4):
+            with pytest.raises(RuntimeError):
+                async with breaker.guard():
+                    raise RuntimeError("provider error")
+        assert breaker.state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_background_probe_closes_circuit(self):
+        registry = CircuitBreakerRegistry()
+        probed = []
+
+        async def probe(provider: str) -> None:
+            probed.append(provider)
+
+        registry.set_probe(probe)
+        b = registry.get("anthropic")
+        b.open_seconds = 0.0
+        for _ in range(b.min_calls):
+            b.record_failure("down")
+        assert b.state == OPEN
+
+        await registry.probe_open_circuits()
+        assert probed == ["anthropic"]
+        assert registry.snapshot()["anthropic"]["state"] == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_stream_disconnect_before_first_token_releases_trial(breaker, monkeypatch):
+    from fastapi import WebSocketDisconnect
+    from app.api import streaming
+
+    class GoneClient:
+        async def send_json(self, _):
+            raise WebSocketDisconnect()
+
+    monkeypatch.setattr(streaming, "circuit_breakers", type("Registry", (), {"get": lambda self, _: breaker})())
+    monkeypatch.setattr(streaming, "_build_llm", lambda *_, **__: object())
+    for _ in range(4):
+        breaker.record_failure("boom")
+    time.sleep(0.06)
+
+    with pytest.raises(WebSocketDisconnect):
+        await streaming._stream_model(GoneClient(), "gpt-4o", "مرحبا", "msa", 16)
+    assert breaker.state == HALF_OPEN
+    breaker.ensure_call_permitted()                   # the trial slot is free again
@@ -0,0 +1,97 @@
+"""Tests for read/write session routing and connection pool metrics."""
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.core.database as database
+from app.core.config import settings
+from app.core.database import Base, get_read_db
+from app.main import app
+from app.models.evaluation import Evaluation
+
+from tests.conftest import TestSessionLocal
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_POOL_TIMEOUT", 0.05)
+    engine = database.make_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", "test", 1, 1)
+    waits = _sample("llm_eval_db_pool_wait_seconds_count", pool="test")
+
+    first, second = await engine.connect(), await engine.connect()
+    assert _sample("llm_eval_db_pool_checked_out", pool="test") == 2
+    assert _sample("llm_eval_db_pool_overflow", pool="test") == 1
+    with pytest.raises(exc.TimeoutError):
+        await engine.connect()
+    assert _sample("llm_eval_db_pool_timeouts_total", pool="test") == 1
+    assert _sample("llm_eval_db_pool_wait_seconds_count", pool="test") == waits + 3
+    assert _sample("llm_eval_db_pool_wait_seconds_sum", pool="test") >= 0.05
+
+    await first.close()
+    await second.close()
+    assert _sample("llm_eval_db_pool_checked_out", pool="test") == 0
+    assert _sample("llm_eval_db_pool_overflow", pool="test") == 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_are_never_committed(db_session, monkeypatch):
+    monkeypatch.setattr(database, "ReadSessionLocal", TestSessionLocal)
+    sessions = get_read_db()
+    session = await sessions.__anext__()
+    session.add(Evaluation(prompt="مسودة", dialect="msa", category="general", status="pending"))
+    await session.flush()
+    await sessions.aclose()
+
+    assert (await db_session.execute(select(func.count()).select_from(Evaluation))).scalar() == 0
+
+
+@pytest_asyncio.fixture
+async def lagging_replica(tmp_path, monkeypatch):
+    """A read engine on an empty copy of the schema, as if replication had not caught up."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_read_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    monkeypatch.setattr(database, "read_engine", engine)
+    yield
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_replica(client: AsyncClient, pipeline_db, mock_llm, lagging_replica, monkeypatch):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "ما الفرق بين الطقس والمناخ؟",
+        "dialect": "msa",
+        "models": ["gpt-4o", "jais-30b"],
+    })
+    evaluation_id = response.json()["id"]
+    assert (await pipeline_db.execute(text("SELECT count(*) FROM evaluations"))).scalar() == 1
+
+    assert (await client.get("/api/v1/evaluations")).json()["total"] == 0
+    assert (await client.get("/api/v1/leaderboard")).json()["models"] == []
+
+    # Not replicated yet: a single evaluation is looked up on the primary instead
+    found = await client.get(f"/api/v1/evaluations/{evaluation_id}", params={"fields": "status"})
+    assert found.status_code == 200 and found.json()["status"] == "completed"
+    chunk = await client.get(f"/api/v1/evaluations/{evaluation_id}/responses/gpt-4o/text")
+    assert chunk.status_code == 200 and chunk.json()["length"] > 0
+    missing = await client.get(f"/api/v1/evaluations/{evaluation_id}/responses/no-such-model/text")
+    assert missing.status_code == 404
+
+    monkeypatch.setattr(database, "read_engine", database.engine)
+    assert (await client.get(f"/api/v1/evaluations/{evaluation_id}", params={"fields": "status"})).status_code == 404
@@ -4,6 +4,9 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 
+from app.core.compression import accepts_gzip
+from app.services.blob_store import blob_store
+
 
 @pytest.mark.asyncio
 async def test_health_check(client: AsyncClient):
@@ -24,6 +27,31 @@ async def test_list_models(client: AsyncClient):
     assert all("id" in m for m in models)
 
 
+@pytest.mark.asyncio
+async def test_list_models_etag(client: AsyncClient):
+    first = await client.get("/api/v1/models")
+    etag = first.headers["etag"]
+    second = await client.get("/api/v1/models", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+
+    single = await client.get("/api/v1/models/gpt-4o")
+    assert single.status_code == 200
+    assert single.json()["cost_per_1k_input_usd"] > 0
+
+    missing = await client.get("/api/v1/models/not-a-model")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_evaluation_create_validation_unknown_model(client: AsyncClient):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "اشرح مفهوم الذكاء الاصطناعي",
+        "dialect": "msa",
+        "models": ["gpt-4o", "not-a-model"],
+    })
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_evaluation_create_validation_min_models(client: AsyncClient):
     """Should fail with only 1 model (minimum is 2)."""
@@ -72,3 +100,224 @@ async def test_list_evaluations_pagination(client: AsyncClient):
     assert "total" in data
     assert "page" in data
     assert data["page"] == 1
+
+
+@pytest.mark.asyncio
+async def test_models_report_unconfigured_providers_unavailable(client: AsyncClient):
+    # No provider keys are configured in the test environment.
+    response = await client.get("/api/v1/models/gpt-4o")
+    assert response.json()["available"] is False
+
+
+@pytest.mark.asyncio
+async def test_evaluation_rejected_for_unavailable_models(client: AsyncClient):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "اشرح مفهوم الذكاء الاصطناعي",
+        "dialect": "msa",
+        "models": ["gpt-4o", "claude-3-5-sonnet"],
+    })
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "MODEL_NOT_AVAILABLE"
+    assert set(error["detail"]["models"]) == {"gpt-4o", "claude-3-5-sonnet"}
+    assert error["message"] == "Models 'claude-3-5-sonnet', 'gpt-4o' are not available or misconfigured."
+
+
+async def _completed_evaluation(client: AsyncClient) -> str:
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي",
+        "dialect": "msa",
+        "models": ["gpt-4o", "claude-3-5-sonnet"],
+    })
+    assert response.status_code == 202
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_completed_evaluation_served_from_cache(client: AsyncClient, pipeline_db, mock_llm):
+    from app.services.evaluation_cache import evaluation_cache
+
+    eval_id = await _completed_evaluation(client)
+    rendered = await evaluation_cache.get(eval_id)
+    assert rendered is not None              # pre-rendered by the pipeline
+
+    first = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200
+    assert first.headers["etag"] == rendered.etag
+    data = first.json()
+    assert data["status"] == "completed"
+    assert len(data["model_responses"]) == 2
+    scores = [r["scores"]["overall"] for r in data["model_responses"]]
+    assert scores == sorted(scores, reverse=True)
+
+    second = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"If-None-Match": rendered.etag})
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+@pytest.mark.asyncio
+async def test_evaluation_rendered_on_first_read(client: AsyncClient, pipeline_db, mock_llm):
+    from app.services.evaluation_cache import evaluation_cache
+
+    eval_id = await _completed_evaluation(client)
+    await evaluation_cache.invalidate(eval_id)   # e.g. another worker, or after a restart
+
+    first = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200 and "etag" in first.headers
+    assert (await evaluation_cache.get(eval_id)).etag == first.headers["etag"]
+    assert (await client.get(f"/api/v1/evaluations/{eval_id}")).content == first.content
+
+
+def _queries(statements: list) -> list:
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.asyncio
+async def test_get_evaluation_is_one_query(client: AsyncClient, pipeline_db, mock_llm, sql_statements):
+    from app.services.evaluation_cache import evaluation_cache
+
+    eval_id = await _completed_evaluation(client)
+    await evaluation_cache.invalidate(eval_id)
+
+    sql_statements.clear()
+    response = await client.get(f"/api/v1/evaluations/{eval_id}")
+    assert response.status_code == 200
+    assert len(response.json()["model_responses"]) == 2
+    assert len(_queries(sql_statements)) == 1
+
+    sql_statements.clear()
+    await client.get(f"/api/v1/evaluations/{eval_id}")
+    assert _queries(sql_statements) == []       # served from the cache
+
+
+@pytest.mark.asyncio
+async def test_get_evaluation_fields_projection(client: AsyncClient, pipeline_db, mock_llm, sql_statements):
+    eval_id = await _completed_evaluation(client)
+
+    sql_statements.clear()
+    response = await client.get(
+        f"/api/v1/evaluations/{eval_id}",
+        params={"fields": "status,ranking,model_responses.model_id,model_responses.scores.overall"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"id", "status", "ranking", "model_responses"}
+    assert all(set(r) == {"model_id", "scores"} and set(r["scores"]) == {"overall"}
+               for r in data["model_responses"])
+    assert len(data["ranking"]) == 2
+    queries = _queries(sql_statements)
+    assert len(queries) == 1
+    assert "response_text" not in queries[0] and "arabic_metrics" not in queries[0]
+
+    sql_statements.clear()
+    response = await client.get(f"/api/v1/evaluations/{eval_id}", params={"fields": "status"})
+    assert response.json() == {"id": eval_id, "status": "completed"}
+    assert "model_responses" not in _queries(sql_statements)[0]
+
+
+@pytest.mark.asyncio
+async def test_get_evaluation_unknown_field(client: AsyncClient, pipeline_db, mock_llm):
+    eval_id = await _completed_evaluation(client)
+    response = await client.get(f"/api/v1/evaluations/{eval_id}", params={"fields": "status,nope"})
+    assert response.status_code == 422
+    assert response.json()["error"]["detail"]["unknown"] == ["nope"]
+
+
+@pytest.mark.asyncio
+async def test_list_evaluations_query_count(client: AsyncClient, pipeline_db, mock_llm, sql_statements):
+    for _ in range(3):
+        await _completed_evaluation(client)
+
+    sql_statements.clear()
+    response = await client.get("/api/v1/evaluations", params={"status": "completed"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert all(item["model_count"] == 2 for item in data["items"])
+    assert len(_queries(sql_statements)) == 2    # count + page, regardless of page size
+
+
+@pytest.mark.asyncio
+async def test_list_evaluations_fields_and_include(client: AsyncClient, pipeline_db, mock_llm, sql_statements):
+    await _completed_evaluation(client)
+
+    sql_statements.clear()
+    response = await client.get("/api/v1/evaluations", params={"fields": "status", "include": "model_responses"})
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert set(item) == {"id", "status", "model_responses"}
+    assert [set(r) for r in item["model_responses"]] == [
+        {"model_id", "provider", "latency_ms", "token_count", "cost_usd", "error", "scores"}
+    ] * 2
+    assert "reasoning" not in item["model_responses"][0]["scores"]
+    queries = _queries(sql_statements)
+    assert len(queries) == 3                     # count + page + one summaries query
+    assert "response_text" not in queries[2]
+
+    plain = (await client.get("/api/v1/evaluations")).json()["items"][0]
+    assert "model_responses" not in plain and plain["model_count"] == 2
+
+    bad = await client.get("/api/v1/evaluations", params={"include": "everything"})
+    assert bad.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_evaluation_text_limit(client: AsyncClient, pipeline_db, mock_llm):
+    eval_id = await _completed_evaluation(client)
+    full = (await client.get(f"/api/v1/evaluations/{eval_id}")).json()["model_responses"][0]
+    assert full["response_text_length"] == len(full["response_text"])
+    assert full["response_text_truncated"] is False
+
+    cut = (await client.get(f"/api/v1/evaluations/{eval_id}", params={"text_limit": 10})).json()
+    first = cut["model_responses"][0]
+    assert first["response_text"] == full["response_text"][:10]
+    assert first["response_text_length"] == full["response_text_length"]
+    assert first["response_text_truncated"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frame_chars", [8192, 16])
+async def test_response_text_chunks(client: AsyncClient, pipeline_db, mock_llm, monkeypatch, frame_chars):
+    monkeypatch.setattr(blob_store, "frame_chars", frame_chars)
+    eval_id = await _completed_evaluation(client)
+    full = (await client.get(f"/api/v1/evaluations/{eval_id}")).json()["model_responses"][0]
+
+    url = f"/api/v1/evaluations/{eval_id}/responses/{full['model_id']}/text"
+    parts, offset = [], 0
+    while offset is not None:
+        chunk = (await client.get(url, params={"offset": offset, "limit": 50})).json()
+        assert chunk["total_length"] == len(full["response_text"])
+        parts.append(chunk["text"])
+        offset = chunk["next_offset"]
+    assert "".join(parts) == full["response_text"]
+
+    missing = await client.get(f"/api/v1/evaluations/{eval_id}/responses/no-such-model/text")
+    assert missing.status_code == 404
+    assert missing.json()["error"]["code"] == "MODEL_RESPONSE_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_completed_evaluation_precompressed(client: AsyncClient, pipeline_db, mock_llm):
+    eval_id = await _completed_evaluation(client)
+    plain = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"Accept-Encoding": "identity"})
+    gz = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["etag"] != plain.headers["etag"]
+    assert gz.content == plain.content               # httpx decodes transparently
+    again = await client.get(
+        f"/api/v1/evaluations/{eval_id}",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+    refused = await client.get(f"/api/v1/evaluations/{eval_id}", headers={"Accept-Encoding": "gzip;q=0, x-gzip;q=0"})
+    assert "content-encoding" not in refused.headers and refused.headers["etag"] == plain.headers["etag"]
+
+
+@pytest.mark.parametrize("header, accepted", [
+    ("gzip", True), ("br, gzip;q=0.5", True), ("x-gzip", True), ("*", True), ("GZIP; Q=1", True),
+    (None, False), ("identity", False), ("gzip;q=0", False), ("gzip; q=0.0, *", False),
+    ("x-gzip;q=0", False), ("*;q=0", False), ("gzip;q=oops", False),
+])
+def test_accepts_gzip_reads_q_values(header, accepted):
+    assert accepts_gzip(header) is accepted
@@ -0,0 +1,95 @@
+"""Tests for the streaming evaluation export (GET /evaluations/export)."""
+
+import csv
+import io
+import json
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import exporter
+from app.services.batch_runner import batch_runner
+
+PROMPTS = [
+    ("اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي", "msa"),
+    ("شو أحسن طريقة لتعلم البرمجة من الصفر؟", "levantine"),
+    ("ايش رايك في مستقبل الذكاء الاصطناعي بالخليج؟", "gulf"),
+]
+
+
+async def _seed(client: AsyncClient) -> list:
+    items = [{"prompt": p, "dialect": d, "models": ["gpt-4o", "jais-30b"]} for p, d in PROMPTS]
+    response = await client.post("/api/v1/evaluations/batch", json=items)
+    assert response.status_code == 202
+    await batch_runner.join(UUID(response.json()["id"]))
+    return response.json()["evaluation_ids"]
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_nests_responses(client: AsyncClient, pipeline_db, mock_llm):
+    ids = await _seed(client)
+    response = await client.get("/api/v1/evaluations/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(e["evaluation_id"] for e in lines) == sorted(ids)
+    for evaluation in lines:
+        assert evaluation["status"] == "completed"
+        assert {r["model_id"] for r in evaluation["model_responses"]} == {"gpt-4o", "jais-30b"}
+        assert all(r["response_text"] for r in evaluation["model_responses"])
+
+
+@pytest.mark.asyncio
+async def test_export_filters(client: AsyncClient, pipeline_db, mock_llm):
+    await _seed(client)
+    gulf = await client.get("/api/v1/evaluations/export", params={"dialect": "gulf"})
+    assert [json.loads(line)["dialect"] for line in gulf.text.splitlines()] == ["gulf"]
+
+    one_model = await client.get("/api/v1/evaluations/export", params={"model": "jais-30b", "include_text": "false"})
+    for line in one_model.text.splitlines():
+        responses = json.loads(line)["model_responses"]
+        assert [r["model_id"] for r in responses] == ["jais-30b"]
+        assert "response_text" not in responses[0]
+
+    future = await client.get("/api/v1/evaluations/export", params={"since": "2999-01-01T00:00:00"})
+    assert future.text == ""
+
+
+@pytest.mark.asyncio
+async def test_export_csv_one_row_per_response(client: AsyncClient, pipeline_db, mock_llm):
+    await _seed(client)
+    response = await client.get("/api/v1/evaluations/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2 * len(PROMPTS)
+    assert float(rows[0]["score_overall"]) >= 0
+    assert isinstance(json.loads(rows[0]["arabic_metrics"]), dict)
+
+
+@pytest.mark.asyncio
+async def test_export_streams_in_partitions(client: AsyncClient, pipeline_db, mock_llm, monkeypatch):
+    from app.core.config import settings
+
+    await _seed(client)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 1)
+    response = await client.get("/api/v1/evaluations/export")
+    assert len(response.text.splitlines()) == len(PROMPTS)   # grouping survives partition boundaries
+
+
+@pytest.mark.asyncio
+async def test_export_parquet(client: AsyncClient, pipeline_db, mock_llm):
+    if not exporter.PARQUET_AVAILABLE:
+        response = await client.get("/api/v1/evaluations/export", params={"format": "parquet"})
+        assert response.status_code == 501
+        assert response.json()["error"]["code"] == "EXPORT_FORMAT_UNAVAILABLE"
+        return
+
+    import pyarrow.parquet as pq
+
+    await _seed(client)
+    response = await client.get("/api/v1/evaluations/export", params={"format": "parquet"})
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 2 * len(PROMPTS)
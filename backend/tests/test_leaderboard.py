@@ -0,0 +1,100 @@
+"""Tests for leaderboard and trend queries over model_responses."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+
+from app.models.evaluation import Evaluation, ModelResponse
+
+START = datetime(2025, 3, 3, 12, 0, tzinfo=timezone.utc)         # a Monday
+
+
+async def _seed(db) -> None:
+    """Every other day for six days: one gulf and one msa evaluation, each answered by two models."""
+    evals, resps = [], []
+    for day in range(6):
+        for dialect, scores in (("gulf", {"gpt-4o": 6.0 + day, "jais-30b": 8.0}), ("msa", {"gpt-4o": 9.0, "jais-30b": 5.0})):
+            eval_id = uuid.uuid4()
+            created = START + timedelta(days=2 * day)
+            evals.append({
+                "id": eval_id, "prompt": "سؤال", "dialect": dialect, "category": "reasoning",
+                "status": "completed", "created_at": created,
+            })
+            for model_id, score in scores.items():
+                resps.append({
+                    "id": uuid.uuid4(), "evaluation_id": eval_id, "model_id": model_id, "model_name": model_id,
+                    "provider": "test", "dialect": dialect, "category": "reasoning",
+                    "score_overall": score, "created_at": created,
+                })
+    resps.append({                                                 # errored: no score, never counted
+        "id": uuid.uuid4(), "evaluation_id": evals[0]["id"], "model_id": "gemini-1.5-pro",
+        "model_name": "gemini", "provider": "test", "dialect": "gulf", "category": "reasoning",
+        "error": "timeout", "created_at": START,
+    })
+    await db.execute(insert(Evaluation), evals)
+    await db.execute(insert(ModelResponse), resps)
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_ranks_by_mean_score(client: AsyncClient, db_session):
+    await _seed(db_session)
+
+    overall = (await client.get("/api/v1/leaderboard")).json()["models"]
+    assert [(m["rank"], m["model_id"], m["responses"]) for m in overall] == [(1, "gpt-4o", 12), (2, "jais-30b", 12)]
+    assert overall[0]["mean_score"] == pytest.approx((sum(6.0 + d for d in range(6)) + 9.0 * 6) / 12, abs=1e-3)
+
+    gulf = (await client.get("/api/v1/leaderboard", params={"dialect": "gulf"})).json()["models"]
+    assert [(m["model_id"], m["mean_score"]) for m in gulf] == [("gpt-4o", 8.5), ("jais-30b", 8.0)]
+
+    window = {"dialect": "gulf", "since": (START + timedelta(days=4)).isoformat()}
+    assert [m["model_id"] for m in (await client.get("/api/v1/leaderboard", params=window)).json()["models"]] == [
+        "gpt-4o", "jais-30b",
+    ]
+    early = {"dialect": "gulf", "until": (START + timedelta(days=2)).isoformat()}
+    assert [m["model_id"] for m in (await client.get("/api/v1/leaderboard", params=early)).json()["models"]] == [
+        "jais-30b", "gpt-4o",
+    ]
+    assert (await client.get("/api/v1/leaderboard", params={"category": "translation"})).json()["models"] == []
+    assert (await client.get("/api/v1/leaderboard", params={"dialect": "klingon"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_trend_buckets(client: AsyncClient, db_session):
+    await _seed(db_session)
+
+    daily = (await client.get("/api/v1/leaderboard/gpt-4o/trend", params={"dialect": "gulf"})).json()
+    assert [(p["period"], p["responses"], p["mean_score"]) for p in daily["points"]] == [
+        ((START + timedelta(days=2 * d)).date().isoformat(), 1, 6.0 + d) for d in range(6)
+    ]
+    weekly = (await client.get("/api/v1/leaderboard/gpt-4o/trend", params={"bucket": "week"})).json()["points"]
+    assert [(p["period"], p["responses"]) for p in weekly] == [("2025-03-03", 8), ("2025-03-10", 4)]
+    monthly = (await client.get("/api/v1/leaderboard/jais-30b/trend", params={"bucket": "month"})).json()["points"]
+    assert [(p["period"], p["responses"], p["mean_score"]) for p in monthly] == [("2025-03-01", 12, 6.5)]
+    assert (await client.get("/api/v1/leaderboard/gpt-4o/trend", params={"bucket": "year"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_best_and_worst_responses(client: AsyncClient, db_session):
+    await _seed(db_session)
+
+    best = (await client.get("/api/v1/leaderboard/gpt-4o/responses", params={"dialect": "gulf", "limit": 2})).json()
+    assert [i["score_overall"] for i in best["items"]] == [11.0, 10.0]
+    worst = (await client.get("/api/v1/leaderboard/gpt-4o/responses", params={"order": "worst", "limit": 3})).json()
+    assert [(i["dialect"], i["score_overall"]) for i in worst["items"]] == [("gulf", 6.0), ("gulf", 7.0), ("gulf", 8.0)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_copies_dialect_and_category(client: AsyncClient, pipeline_db, mock_llm):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "اشرح مفهوم الحوسبة السحابية باختصار",
+        "dialect": "egyptian",
+        "category": "technical_terminology",
+        "models": ["gpt-4o", "jais-30b"],
+    })
+    assert response.status_code == 202
+    rows = (await pipeline_db.execute(select(ModelResponse.dialect, ModelResponse.category))).all()
+    assert rows == [("egyptian", "technical_terminology")] * 2
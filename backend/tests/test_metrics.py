@@ -0,0 +1,80 @@
+"""Tests for Prometheus instrumentation and the /metrics endpoint."""
+
+import uuid
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.metrics import _sql_operation, dialect_label
+from app.services.arabic_analyzer import arabic_analyzer
+from app.services.evaluator import run_parallel_evaluation
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestLabels:
+    def test_unknown_dialect_is_clamped(self):
+        assert dialect_label("gulf") == "gulf"
+        assert dialect_label("klingon") == "other"
+        assert dialect_label(None) == "other"
+
+    def test_sql_operation(self):
+        assert _sql_operation("  select * from evaluations") == "SELECT"
+        assert _sql_operation("INSERT INTO model_responses ...") == "INSERT"
+        assert _sql_operation("PRAGMA table_info(x)") == "OTHER"
+
+
+def test_analyzer_records_cpu_time():
+    before = _sample("llm_eval_analyzer_cpu_seconds_count", dialect="levantine")
+    arabic_analyzer.analyze("شو رأيك بهيك موضوع؟ هلق رح نشرح الفكرة.", dialect="levantine")
+    assert _sample("llm_eval_analyzer_cpu_seconds_count", dialect="levantine") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_model_call_records_latency_tokens_and_cost(monkeypatch):
+    monkeypatch.setattr(settings, "MOCK_LLM_ENABLED", True)
+    monkeypatch.setattr(settings, "MOCK_LATENCY_DISTRIBUTION", "fixed")
+    monkeypatch.setattr(settings, "MOCK_LATENCY_MS_MEAN", 0.0)
+    monkeypatch.setattr(settings, "MOCK_TOKENS_PER_SECOND", 1_000_000.0)
+    monkeypatch.setattr(settings, "MOCK_RESPONSE_TOKENS", 30)
+    monkeypatch.setattr(settings, "MOCK_ERROR_RATE", 0.0)
+    labels = {"provider": "openai", "model": "gpt-4o"}
+    calls = _sample("llm_eval_model_latency_seconds_count", dialect="gulf", outcome="ok", **labels)
+    tokens = _sample("llm_eval_model_tokens_total", direction="output", **labels)
+
+    await run_parallel_evaluation("وش رأيك في الذكاء الاصطناعي؟", "gulf", ["gpt-4o"])
+
+    assert _sample("llm_eval_model_latency_seconds_count", dialect="gulf", outcome="ok", **labels) == calls + 1
+    assert _sample("llm_eval_model_tokens_total", direction="output", **labels) == tokens + 30
+    assert _sample("llm_eval_model_cost_usd_total", dialect="gulf", **labels) > 0
+    assert _sample("llm_eval_model_tokens_per_second_count", **labels) >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_route_templates(client):
+    await client.get(f"/api/v1/evaluations/{uuid.uuid4()}")
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'route="/api/v1/evaluations/{evaluation_id}"' in body
+    assert "llm_eval_evaluation_queue_depth" in body
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_times_queries():
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.core.metrics import instrument_engine
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    before = _sample("llm_eval_db_query_seconds_count", operation="SELECT")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+    assert _sample("llm_eval_db_query_seconds_count", operation="SELECT") == before + 1
@@ -0,0 +1,125 @@
+"""Tests for the Alembic migrations: they build the schema the models declare, and carry data forward."""
+
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database import Base
+from app.models import benchmark, evaluation, rating, user  # noqa: F401
+from app.services.blob_store import blob_store
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+TEXT = "الحوسبة السحابية هي تقديم خدمات الحوسبة عبر الإنترنت. " * 20
+
+
+@pytest.fixture
+def migrate(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+
+    def run(action: str, revision: str) -> None:
+        config = Config()
+        config.set_main_option("script_location", MIGRATIONS)
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            getattr(command, action)(config, revision)
+
+    run.engine = engine
+    yield run
+    engine.dispose()
+
+
+def test_head_matches_models_and_downgrades_to_nothing(migrate):
+    migrate("upgrade", "head")
+    with migrate.engine.connect() as connection:
+        # SQLite reflects UUID columns as NUMERIC, so types are left out; tables, columns and indexes are not
+        context = MigrationContext.configure(connection, opts={"compare_type": False})
+        assert compare_metadata(context, Base.metadata) == []
+
+    migrate("downgrade", "base")
+    assert inspect(migrate.engine).get_table_names() == ["alembic_version"]
+
+
+def test_data_is_carried_forward_and_back(migrate):
+    """0002 copies dialect/category onto responses; 0004 moves texts and metrics into deduplicated blobs."""
+    migrate("upgrade", "0001")
+    evaluation_id = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+    with migrate.engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO evaluations (id, prompt, dialect, category, status, created_at) "
+                "VALUES (:id, 'سؤال', 'gulf', 'reasoning', 'completed', :now)"
+            ),
+            {"id": evaluation_id, "now": now},
+        )
+        for model in ("gpt-4o", "jais-30b"):
+            connection.execute(
+                text(
+                    "INSERT INTO model_responses (id, evaluation_id, model_id, model_name, provider, response_text, "
+                    "arabic_metrics, score_overall, created_at) "
+                    "VALUES (:id, :evaluation_id, :model, :model, 'test', :text, :metrics, 7.5, :now)"
+                ),
+                {
+                    "id": uuid.uuid4().hex, "evaluation_id": evaluation_id, "model": model, "now": now,
+                    "text": TEXT, "metrics": '{"token_count": 4, "dialect_match": true}',
+                },
+            )
+
+    migrate("upgrade", "head")
+    with migrate.engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT dialect, category, response_digest, response_length, metrics_digest FROM model_responses"
+        )).all()
+        indexes = {i["name"] for i in inspect(connection).get_indexes("model_responses")}
+        blobs = connection.execute(text("SELECT digest, codec, data FROM response_blobs")).all()
+    assert [r[:2] for r in rows] == [("gulf", "reasoning")] * 2
+    assert "ix_model_responses_dialect_model_created" in indexes and "ix_model_responses_model_id" not in indexes
+    assert len({r[2] for r in rows}) == 1 and rows[0][3] == len(TEXT)
+    assert len(blobs) == 2                      # one body and one metrics document, shared by both responses
+    payloads = {key: blob_store.decode(codec, data) for key, codec, data in blobs}
+    assert payloads[rows[0][2]].decode("utf-8") == TEXT
+    assert json.loads(payloads[rows[0][4]]) == {"token_count": 4, "dialect_match": True}
+
+    migrate("downgrade", "0003")
+    with migrate.engine.connect() as connection:
+        restored = connection.execute(text("SELECT response_text, arabic_metrics FROM model_responses")).all()
+    assert [(t, json.loads(m)) for t, m in restored] == [(TEXT, {"token_count": 4, "dialect_match": True})] * 2
+
+    migrate("downgrade", "0001")
+    with migrate.engine.connect() as connection:
+        columns = {c["name"] for c in inspect(connection).get_columns("model_responses")}
+        assert "dialect" not in columns
+        assert connection.execute(text("SELECT count(*) FROM model_responses")).scalar() == 2
+
+
+def test_prompts_stored_before_sampling_are_backfilled(migrate):
+    """0001a gives existing benchmark prompts a sample key and a content hash, NULL for repeats."""
+    migrate("upgrade", "0001")
+    dataset_id = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+    with migrate.engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO benchmark_datasets (id, slug, name, created_at) VALUES (:id, 'old', 'Old', :now)"),
+            {"id": dataset_id, "now": now},
+        )
+        connection.execute(
+            text("INSERT INTO benchmark_prompts (id, dataset_id, prompt_text) VALUES (:id, :dataset_id, :text)"),
+            [
+                {"id": uuid.uuid4().hex, "dataset_id": dataset_id, "text": t}
+                for t in ("ما هو المناخ؟", "ما  هو المناخ؟ ", "اشرح الطقس")
+            ],
+        )
+
+    migrate("upgrade", "head")
+    with migrate.engine.connect() as connection:
+        rows = connection.execute(text("SELECT content_hash, sample_key FROM benchmark_prompts")).all()
+    assert all(0 <= key < 1 for _, key in rows)
+    assert sorted(h is None for h, _ in rows) == [False, False, True]     # the repeat keeps no hash
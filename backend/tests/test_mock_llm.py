@@ -0,0 +1,62 @@
+"""Tests for the offline mock provider and the pipeline running on it."""
+
+import pytest
+
+from app.core.config import settings
+from app.services.evaluator import _build_llm, run_parallel_evaluation
+from app.services.mock_llm import MockChatModel
+from app.services.scorer import _parse_score_json, score_all_responses
+
+
+@pytest.fixture
+def mock_provider(monkeypatch):
+    monkeypatch.setattr(settings, "MOCK_LLM_ENABLED", True)
+    monkeypatch.setattr(settings, "MOCK_LATENCY_DISTRIBUTION", "fixed")
+    monkeypatch.setattr(settings, "MOCK_LATENCY_MS_MEAN", 0.0)
+    monkeypatch.setattr(settings, "MOCK_TOKENS_PER_SECOND", 1_000_000.0)
+    monkeypatch.setattr(settings, "MOCK_RESPONSE_TOKENS", 40)
+    monkeypatch.setattr(settings, "MOCK_ERROR_RATE", 0.0)
+
+
+def _messages(prompt: str):
+    from langchain_core.messages import HumanMessage
+    return [HumanMessage(content=prompt)]
+
+
+class TestMockChatModel:
+    def test_build_llm_returns_mock(self, mock_provider):
+        assert isinstance(_build_llm("gpt-4o"), MockChatModel)
+
+    @pytest.mark.asyncio
+    async def test_responses_are_deterministic(self, mock_provider):
+        llm = _build_llm("gpt-4o")
+        a = await llm.ainvoke(_messages("اشرح الذكاء الاصطناعي"))
+        b = await llm.ainvoke(_messages("اشرح الذكاء الاصطناعي"))
+        assert a.content == b.content
+        assert a.usage_metadata["output_tokens"] == 40
+
+    @pytest.mark.asyncio
+    async def test_judge_returns_parseable_json(self, mock_provider):
+        judge = _build_llm("gpt-4o", judge=True)
+        raw = (await judge.ainvoke(_messages("Score this response."))).content
+        scores = _parse_score_json(raw)
+        assert 0.0 <= scores["overall"] <= 10.0
+
+    @pytest.mark.asyncio
+    async def test_error_rate_injects_failures(self, mock_provider, monkeypatch):
+        monkeypatch.setattr(settings, "MOCK_ERROR_RATE", 1.0)
+        with pytest.raises(RuntimeError):
+            await _build_llm("gpt-4o").ainvoke(_messages("مرحبا بكم"))
+
+
+@pytest.mark.asyncio
+async def test_full_pipeline_on_mock(mock_provider):
+    results = await run_parallel_evaluation(
+        "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي", "msa",
+        ["gpt-4o", "claude-3-5-sonnet", "jais-30b"],
+    )
+    scores = await score_all_responses(
+        results, "اشرح الفرق", "msa", "reasoning", None,
+    )
+    assert all(r.error is None and r.token_count == 40 for r in results)
+    assert all(s["overall"] is not None for s in scores)
@@ -0,0 +1,150 @@
+"""Tests for the sampling profiler, slow-callback detection and the admin endpoints."""
+
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.profiling import LoopWatchdog, SamplingProfiler, SlowCallbackDetector, profile_for
+from app.core.exceptions import ProfilerBusyError
+from app.core.security import generate_api_key
+from app.models.user import APIKey, User
+
+
+def _busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    def test_collapsed_output_contains_hot_function(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            _busy_wait(0.2)
+        result = profiler.result()
+        assert result.samples > 10
+        hot = [line for line in result.collapsed().splitlines() if "test_profiling.py:_busy_wait" in line]
+        assert hot
+        stack, count = hot[0].rsplit(" ", 1)
+        assert stack.startswith("MainThread;") and int(count) > 0
+
+    def test_top_functions_ranks_leaf_first(self):
+        with SamplingProfiler(interval=0.001, thread_ids=[threading.get_ident()]) as profiler:
+            _busy_wait(0.1)
+        top = profiler.result().top_functions(5)
+        assert top[0]["function"] == "test_profiling.py:_busy_wait"
+        assert top[0]["self_samples"] <= top[0]["total_samples"]
+
+    @pytest.mark.asyncio
+    async def test_only_one_profile_at_a_time(self):
+        first = asyncio.ensure_future(profile_for(0.1, 0.005))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusyError):
+            await profile_for(0.1, 0.005)
+        assert (await first).samples > 0
+
+
+class TestSlowCallbackDetector:
+    @pytest.mark.asyncio
+    async def test_reports_blocking_step(self, caplog):
+        detector = SlowCallbackDetector(min_log_interval=0)
+
+        async def blocker():
+            _busy_wait(0.05)
+
+        detector.install(threshold_ms=20)
+        try:
+            with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+                await asyncio.create_task(blocker(), name="blocker")
+        finally:
+            detector.uninstall()
+        assert detector.slow_count >= 1
+        assert any("blocker" in r.getMessage() for r in caplog.records)
+        assert not detector.enabled
+
+    @pytest.mark.asyncio
+    async def test_fast_steps_are_ignored(self):
+        detector = SlowCallbackDetector()
+        detector.install(threshold_ms=1000)
+        try:
+            await asyncio.sleep(0)
+        finally:
+            detector.uninstall()
+        assert detector.slow_count == 0
+
+
+class TestLoopWatchdog:
+    @pytest.mark.asyncio
+    async def test_logs_blocking_stack_once_per_stall(self, caplog):
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.05, min_log_interval=0)
+        task = asyncio.create_task(watchdog.run())
+        await asyncio.sleep(0.05)
+        try:
+            with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+                _busy_wait(0.3)
+                await asyncio.sleep(0.05)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        assert watchdog.blocked_count == 1
+        assert watchdog.max_lag >= 0.2
+        assert any("_busy_wait" in r.getMessage() for r in caplog.records)
+        assert not watchdog.running
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_reports_no_stalls(self):
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.2)
+        task = asyncio.create_task(watchdog.run())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert watchdog.blocked_count == 0
+        assert watchdog.status()["last_lag_ms"] < 200
+
+
+async def _api_key(db, is_admin: bool) -> str:
+    user = User(email=f"{is_admin}@example.com", name="ops", hashed_password="x", is_admin=is_admin)
+    db.add(user)
+    await db.flush()
+    raw, hashed = generate_api_key()
+    db.add(APIKey(user_id=user.id, name="ops", key_hash=hashed, prefix=raw[:8]))
+    await db.commit()
+    return raw
+
+
+class TestAdminEndpoints:
+    @pytest.mark.asyncio
+    async def test_requires_api_key(self, client: AsyncClient):
+        resp = await client.post("/api/v1/admin/profile?seconds=0.1")
+        assert resp.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_requires_admin(self, client: AsyncClient, db_session):
+        key = await _api_key(db_session, is_admin=False)
+        resp = await client.post(
+            "/api/v1/admin/profile?seconds=0.1", headers={"Authorization": f"Bearer {key}"},
+        )
+        assert resp.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_profile_returns_collapsed_stacks(self, client: AsyncClient, db_session):
+        key = await _api_key(db_session, is_admin=True)
+        resp = await client.post(
+            "/api/v1/admin/profile?seconds=0.2&interval_ms=1",
+            headers={"Authorization": f"Bearer {key}"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert int(resp.headers["x-profile-samples"]) > 0
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in resp.text.splitlines())
+
+    @pytest.mark.asyncio
+    async def test_toggle_slow_callbacks(self, client: AsyncClient, db_session):
+        headers = {"Authorization": f"Bearer {await _api_key(db_session, is_admin=True)}"}
+        resp = await client.post("/api/v1/admin/slow-callbacks?threshold_ms=250", headers=headers)
+        assert resp.json()["enabled"] is True and resp.json()["threshold_ms"] == 250
+        resp = await client.post("/api/v1/admin/slow-callbacks?threshold_ms=0", headers=headers)
+        assert resp.json()["enabled"] is False
@@ -0,0 +1,190 @@
+"""Tests for the MinHash/LSH prompt index, duplicate reuse and contamination reports."""
+
+import json
+import random
+import uuid
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.core.security import generate_api_key
+from app.models.benchmark import BenchmarkDataset
+from app.models.evaluation import Evaluation
+from app.models.user import APIKey, User
+from app.services import prompt_index as pi
+from app.services.prompt_index import (
+    KIND_BENCHMARK_PROMPT,
+    KIND_EVALUATION,
+    PromptIndex,
+    normalize,
+    prompt_index,
+)
+
+PROMPT = "ما هي أفضل الطرق لتعلم اللغة العربية الفصحى بسرعة وإتقان للمبتدئين؟"
+EDITED = "ما هي  افضل الطرق لتعلّم اللغة العربية الفصحى بسرعة وإتقان للمبتدئين؟!"     # alef, shadda, spacing, punctuation
+NEAR = "ما هي أفضل الطرق لتعلم اللغة العربية الفصحى بسرعة وإتقان للمبتدئين الكبار؟"
+OTHER = "اكتب قصة قصيرة عن رحلة في الصحراء مع قافلة من الجمال"
+
+_WORDS = "كتاب قلم بيت مدرسة طالب معلم سيارة طريق مدينة قرية بحر جبل شمس قمر نجم ماء خبز".split()
+
+
+def _random_prompts(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_WORDS, k=12)) + f" {i}" for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def _empty_index():
+    prompt_index.clear()
+    yield
+    prompt_index.clear()
+
+
+async def _admin_headers(db) -> dict:
+    user = User(email="prompts@example.com", name="ops", hashed_password="x", is_admin=True)
+    db.add(user)
+    await db.flush()
+    raw, hashed = generate_api_key()
+    db.add(APIKey(user_id=user.id, name="ops", key_hash=hashed, prefix=raw[:8]))
+    await db.commit()
+    return {"Authorization": f"Bearer {raw}"}
+
+
+def test_normalize_folds_diacritics_letter_variants_and_punctuation():
+    assert normalize("مَدْرَسَةٌ  جميلة!") == normalize("مدرسه جميله")
+    assert normalize("أحمد إلى آخر") == normalize("احمد الي اخر")
+    assert normalize("كـــتاب") == "كتاب"
+
+
+class TestLookups:
+    def test_exact_and_near_duplicates(self):
+        index = PromptIndex()
+        ids = [uuid.uuid4() for _ in range(3)]
+        index.add_many(KIND_EVALUATION, ids, [PROMPT, NEAR, OTHER])
+
+        assert index.exact(EDITED) == [ids[0]]
+        matches = index.similar(EDITED, threshold=0.5)
+        assert [m.id for m in matches] == [ids[0], ids[1]]
+        assert matches[0].exact and matches[0].similarity == 1.0
+        assert 0.5 <= matches[1].similarity < 1.0 and not matches[1].exact
+        assert index.similar(EDITED, threshold=0.5, exclude=[ids[0]])[0].id == ids[1]
+        assert index.similar(EDITED, threshold=0.5, kinds=[KIND_BENCHMARK_PROMPT]) == []
+        assert index.similar("سؤال مختلف تماما عن كل ما سبق", threshold=0.5) == []
+
+    def test_similarity_tracks_jaccard(self):
+        index = PromptIndex()
+        texts = _random_prompts(200)
+        index.add_many(KIND_EVALUATION, [uuid.uuid4() for _ in texts], texts)
+        for text in texts[:20]:
+            assert index.similar(text, threshold=0.99)[0].exact
+            assert len(index.similar(text, threshold=0.9)) == 1
+
+    def test_merged_segment_and_delta_agree(self, monkeypatch):
+        monkeypatch.setattr(pi, "_MERGE_EVERY", 64)
+        index = PromptIndex()
+        texts = _random_prompts(300)
+        ids = [uuid.uuid4() for _ in texts]
+        index.add_many(KIND_EVALUATION, ids[:100], texts[:100])          # bulk: straight to the segment
+        for i in range(100, 300):
+            index.add(KIND_BENCHMARK_PROMPT, ids[i], texts[i])            # through the delta, merged every 64
+        assert len(index) == 300 and index.stats()["pending_merge"] == 200 % 64
+        for i in (0, 99, 150, 299):
+            assert index.exact(texts[i]) == [ids[i]]
+            assert index.similar(texts[i], threshold=0.95)[0].id == ids[i]
+
+
+def test_checkpoint_and_log_survive_restart(tmp_path):
+    path = str(tmp_path / "index" / "prompts")
+    index = PromptIndex(path)
+    index._open_log()
+    texts = _random_prompts(50)
+    ids = [uuid.uuid4() for _ in texts]
+    index.add_many(KIND_EVALUATION, ids[:30], texts[:30])
+    index.checkpoint()
+    index.add_many(KIND_BENCHMARK_PROMPT, ids[30:], texts[30:])
+    index.close()
+    with open(path + ".log", "ab") as f:
+        f.write(b"\x01" * 17)                                            # torn record from a crash
+
+    restored = PromptIndex(path)
+    assert restored.load()
+    assert len(restored) == 50 and restored.stats()["logged_since_checkpoint"] == 20
+    assert restored.exact(texts[10]) == [ids[10]]
+    assert restored.similar(texts[40], threshold=0.95)[0].kind == KIND_BENCHMARK_PROMPT
+    restored.close()
+    assert not PromptIndex(str(tmp_path / "missing")).load()
+
+
+def test_fingerprint_is_vectorized_consistently():
+    texts = _random_prompts(20)
+    one_by_one = np.concatenate([pi.fingerprint([t]) for t in texts])
+    assert one_by_one.tobytes() == pi.fingerprint(texts).tobytes()
+
+
+@pytest.mark.asyncio
+async def test_similar_endpoint_resolves_against_database(client: AsyncClient, db_session):
+    kept = Evaluation(prompt=PROMPT, dialect="msa", category="general", status="completed")
+    db_session.add(kept)
+    await db_session.commit()
+    prompt_index.add(KIND_EVALUATION, kept.id, PROMPT)
+    prompt_index.add(KIND_EVALUATION, uuid.uuid4(), NEAR)                 # row since deleted
+
+    response = await client.post("/api/v1/prompts/similar", json={"prompt": EDITED, "threshold": 0.5})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["threshold"] == 0.5
+    assert [(m["id"], m["exact"], m["status"]) for m in body["matches"]] == [(str(kept.id), True, "completed")]
+
+    stats = (await client.get("/api/v1/prompts/index")).json()
+    assert stats["entries"] == 2 and stats["persistent"] is False
+
+
+@pytest.mark.asyncio
+async def test_run_reuses_completed_duplicate(client: AsyncClient, pipeline_db, mock_llm):
+    request = {"prompt": PROMPT, "dialect": "msa", "models": ["gpt-4o", "jais-30b"]}
+    first = await client.post("/api/v1/evaluations/run", json=request)
+    assert first.status_code == 202
+    evaluation_id = first.json()["id"]
+
+    reused = await client.post("/api/v1/evaluations/run", params={"reuse": "true"}, json={**request, "prompt": EDITED})
+    assert reused.status_code == 200
+    assert reused.headers["X-Reused-Evaluation"] == evaluation_id
+    assert reused.json()["id"] == evaluation_id and reused.json()["status"] == "completed"
+
+    other_models = await client.post(
+        "/api/v1/evaluations/run", params={"reuse": "true"}, json={**request, "models": ["gpt-4o", "claude-3-5-sonnet"]},
+    )
+    assert other_models.status_code == 202 and other_models.json()["id"] != evaluation_id
+    assert (await client.post("/api/v1/evaluations/run", json=request)).status_code == 202     # opt-in only
+
+
+@pytest.mark.asyncio
+async def test_contamination_report(client: AsyncClient, db_session):
+    headers = await _admin_headers(db_session)
+    for slug in ("core", "extra"):
+        db_session.add(BenchmarkDataset(slug=slug, name=slug, prompt_count=0))
+    await db_session.commit()
+
+    def jsonl(prompts):
+        return "".join(json.dumps({"prompt": p}, ensure_ascii=False) + "\n" for p in prompts).encode("utf-8")
+
+    for slug, prompts in (("core", [PROMPT, NEAR, OTHER]), ("extra", [EDITED])):
+        response = await client.post(
+            f"/api/v1/benchmarks/{slug}/prompts", content=jsonl(prompts),
+            headers={**headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200, response.text
+    evaluation = Evaluation(prompt=OTHER, dialect="msa", category="general", status="completed")
+    db_session.add(evaluation)
+    await db_session.commit()
+    prompt_index.add(KIND_EVALUATION, evaluation.id, OTHER)
+
+    report = (await client.get("/api/v1/benchmarks/core/contamination", params={"threshold": 0.5})).json()
+    assert report["prompts_checked"] == 3 and report["flagged"] == 3
+    assert (report["within_dataset"], report["cross_dataset"], report["evaluations"]) == (2, 2, 1)
+    flagged = {p["prompt"]: p["matches"] for p in report["prompts"]}
+    assert [(m["kind"], m["dataset_slug"]) for m in flagged[OTHER]] == [(KIND_EVALUATION, None)]
+    assert {m["dataset_slug"] for m in flagged[PROMPT]} == {"core", "extra"}
+
+    assert (await client.get("/api/v1/benchmarks/missing/contamination")).status_code == 404
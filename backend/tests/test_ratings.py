@@ -0,0 +1,153 @@
+"""Tests for online Elo and batch Bradley-Terry model ratings."""
+
+import uuid
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+
+from app.core.security import generate_api_key
+from app.models.evaluation import Evaluation, ModelResponse
+from app.models.rating import ModelRating
+from app.models.user import APIKey, User
+from app.services.ratings import SCOPE_ALL, battle_counts, elo_update, fit, record, refit
+
+
+async def _admin_headers(db) -> dict:
+    user = User(email="ratings@example.com", name="ops", hashed_password="x", is_admin=True)
+    db.add(user)
+    await db.flush()
+    raw, hashed = generate_api_key()
+    db.add(APIKey(user_id=user.id, name="ops", key_hash=hashed, prefix=raw[:8]))
+    await db.commit()
+    return {"Authorization": f"Bearer {raw}"}
+
+
+async def _battles(db, results) -> None:
+    """results: (dialect, winner, [participants], errored participants)."""
+    evals, resps = [], []
+    for dialect, winner, models, errored in results:
+        eval_id = uuid.uuid4()
+        evals.append({
+            "id": eval_id, "prompt": "سؤال", "dialect": dialect, "category": "general",
+            "status": "completed", "winner_model_id": winner,
+        })
+        for m in models:
+            resps.append({
+                "id": uuid.uuid4(), "evaluation_id": eval_id, "model_id": m, "model_name": m,
+                "provider": "test", "error": "timeout" if m in errored else None,
+            })
+    await db.execute(insert(Evaluation), evals)
+    await db.execute(insert(ModelResponse).execution_options(render_nulls=True), resps)
+    await db.commit()
+
+
+class TestElo:
+    def test_winner_gains_what_losers_lose(self):
+        updated = elo_update({"a": 1500, "b": 1500, "c": 1500}, "a", ["b", "c"], k=16)
+        assert updated["a"] == pytest.approx(1516)
+        assert updated["b"] == updated["c"] == pytest.approx(1492)
+        assert sum(updated.values()) == pytest.approx(4500)
+
+    def test_upset_moves_more(self):
+        expected = elo_update({"a": 1700, "b": 1500}, "a", ["b"], k=16)
+        upset = elo_update({"a": 1700, "b": 1500}, "b", ["a"], k=16)
+        assert upset["b"] - 1500 > expected["a"] - 1700
+
+
+@pytest.mark.asyncio
+async def test_record_updates_overall_and_dialect_scopes(db_session):
+    assert await record(db_session, "gulf", "a", ["a", "b", "c"]) == 2
+    assert await record(db_session, "gulf", "b", ["a", "b"]) == 1
+    await db_session.commit()
+    rows = {(r.scope, r.model_id): r for r in await db_session.scalars(select(ModelRating))}
+    assert set(rows) == {(s, m) for s in (SCOPE_ALL, "gulf") for m in "abc"}
+    a = rows[(SCOPE_ALL, "a")]
+    assert (a.battles, a.wins) == (3, 2)
+    assert rows[("gulf", "b")].wins == 1 and rows[("gulf", "c")].battles == 1
+    assert sum(r.elo for (s, _), r in rows.items() if s == SCOPE_ALL) == pytest.approx(4500)
+
+    assert await record(db_session, "msa", None, ["a", "b"]) == 0       # no winner: no battles
+    assert await record(db_session, "msa", "a", ["a"]) == 0             # nobody else answered
+
+
+@pytest.mark.asyncio
+async def test_battle_counts_skip_errored_responses(db_session):
+    await _battles(db_session, [
+        ("msa", "a", ["a", "b", "c"], {"c"}),
+        ("gulf", "b", ["a", "b"], set()),
+        ("gulf", None, ["a", "b"], set()),
+    ])
+    counts = await battle_counts(db_session)
+    assert counts.scopes == [SCOPE_ALL, "gulf", "msa"] and counts.model_ids == ["a", "b"]
+    assert counts.total == 2
+    assert counts.wins[0].tolist() == [[0, 1], [1, 0]]
+    assert counts.wins[1].tolist() == [[0, 0], [1, 0]]
+
+
+def test_fit_recovers_strength_order():
+    from app.services.ratings import BattleCounts
+
+    rng = np.random.default_rng(0)
+    strength = np.array([1.0, 0.0, -1.0])
+    wins = np.zeros((2, 3, 3))
+    for _ in range(3000):
+        i, j = rng.choice(3, 2, replace=False)
+        p = 1 / (1 + np.exp(strength[j] - strength[i]))
+        winner, loser = (i, j) if rng.random() < p else (j, i)
+        wins[1, winner, loser] += 1
+    wins[0] = wins[1]
+    fitted = fit(BattleCounts([SCOPE_ALL, "msa"], ["a", "b", "c"], wins))
+    ratings = {m: r for m, (r, _) in fitted[SCOPE_ALL].items()}
+    assert ratings["a"] > ratings["b"] > ratings["c"]
+    assert np.mean(list(ratings.values())) == pytest.approx(1500, abs=0.1)
+    # 1 natural-log unit of strength ≈ 173.7 Elo points
+    assert ratings["a"] - ratings["b"] == pytest.approx(400 / np.log(10), rel=0.15)
+
+
+@pytest.mark.asyncio
+async def test_refit_and_ratings_endpoint(client: AsyncClient, db_session):
+    await _battles(db_session, [("msa", "a", ["a", "b"], set())] * 8 + [("gulf", "b", ["a", "b"], set())] * 3)
+    await record(db_session, "msa", "b", ["a", "b"])                     # online only, never refit
+    await db_session.commit()
+
+    response = await client.post("/api/v1/ratings/refit", headers=await _admin_headers(db_session))
+    assert response.status_code == 200, response.text
+    assert response.json()["battles"] == 11 and response.json()["scopes"] == 3
+
+    overall = (await client.get("/api/v1/ratings")).json()
+    assert overall["scope"] == SCOPE_ALL and overall["method"] == "bt" and overall["fitted_at"]
+    assert [m["model_id"] for m in overall["models"]] == ["a", "b"]
+    assert overall["models"][0]["bt_battles"] == 11
+
+    by_elo = (await client.get("/api/v1/ratings", params={"method": "elo"})).json()
+    assert [m["model_id"] for m in by_elo["models"]] == ["b", "a"]
+
+    gulf = (await client.get("/api/v1/ratings", params={"dialect": "gulf"})).json()
+    assert [m["model_id"] for m in gulf["models"]] == ["b", "a"]
+    assert (await client.get("/api/v1/ratings", params={"dialect": "klingon"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_refit_requires_admin(client: AsyncClient):
+    assert (await client.post("/api/v1/ratings/refit")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_completed_evaluation_updates_ratings(client: AsyncClient, pipeline_db, mock_llm):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "ما هي عاصمة المملكة العربية السعودية؟",
+        "dialect": "gulf",
+        "models": ["gpt-4o", "claude-3-5-sonnet", "jais-30b"],
+    })
+    assert response.status_code == 202
+    evaluation = (await client.get(f"/api/v1/evaluations/{response.json()['id']}")).json()
+    winner = evaluation["winner_model_id"]
+
+    gulf = (await client.get("/api/v1/ratings", params={"dialect": "gulf", "method": "elo"})).json()
+    assert gulf["models"][0]["model_id"] == winner
+    assert {m["model_id"]: m["battles"] for m in gulf["models"]} == {
+        m: 2 if m == winner else 1 for m in ("gpt-4o", "claude-3-5-sonnet", "jais-30b")
+    }
+    assert (await refit(pipeline_db))["battles"] == 2
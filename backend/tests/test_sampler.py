@@ -0,0 +1,116 @@
+"""Tests for seeded, stratified benchmark sampling."""
+
+import random
+import uuid
+from collections import Counter
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+
+from app.models.benchmark import BenchmarkDataset, BenchmarkPrompt
+from app.services.benchmark_runner import benchmark_runner
+from app.services.sampler import allocate, draw, seed_offset
+
+DIALECTS = ["msa", "msa", "msa", "gulf", "egyptian", "levantine"]     # msa is half the data
+CATEGORIES = ["reasoning", "translation"]
+
+
+async def _dataset(db, size: int = 600, slug: str = "sample-me") -> uuid.UUID:
+    dataset = BenchmarkDataset(slug=slug, name="Sample me", prompt_count=size)
+    db.add(dataset)
+    await db.flush()
+    rng = random.Random(7)
+    await db.execute(insert(BenchmarkPrompt), [
+        {
+            "id": uuid.uuid4(), "dataset_id": dataset.id, "prompt_text": f"سؤال {i}",
+            "dialect": DIALECTS[i % len(DIALECTS)], "category": CATEGORIES[i % len(CATEGORIES)],
+            "sample_key": rng.random(),
+        }
+        for i in range(size)
+    ])
+    await db.commit()
+    return dataset.id
+
+
+class TestAllocate:
+    def test_proportional(self):
+        assert allocate({"a": 50, "b": 30, "c": 20}, 10) == {"a": 5, "b": 3, "c": 2}
+
+    def test_equal_redistributes_capped_strata(self):
+        assert allocate({"a": 100, "b": 2, "c": 100}, 30, equal=True) == {"a": 14, "b": 2, "c": 14}
+
+    def test_rounding_is_exact_and_deterministic(self):
+        sizes = {"a": 10, "b": 10, "c": 10}
+        assert sum(allocate(sizes, 7).values()) == 7
+        assert allocate(sizes, 7) == allocate(dict(sizes), 7)
+
+    def test_never_exceeds_population(self):
+        assert allocate({"a": 3, "b": 4}, 100) == {"a": 3, "b": 4}
+
+
+def test_seed_offset_is_stable_and_spread():
+    assert seed_offset(42) == seed_offset(42)
+    offsets = [seed_offset(s) for s in range(1000)]
+    assert 0 <= min(offsets) < 0.01 and 0.99 < max(offsets) < 1
+
+
+@pytest.mark.asyncio
+async def test_same_seed_same_sample(db_session):
+    dataset_id = await _dataset(db_session)
+    first = await draw(db_session, dataset_id, 50, seed=1234)
+    again = await draw(db_session, dataset_id, 50, seed=1234)
+    other = await draw(db_session, dataset_id, 50, seed=4321)
+    assert len(first.prompt_ids) == 50 and len(set(first.prompt_ids)) == 50
+    assert first.prompt_ids == again.prompt_ids
+    assert first.prompt_ids != other.prompt_ids
+    assert first.population == 600
+
+
+@pytest.mark.asyncio
+async def test_stratified_proportional_and_equal(db_session):
+    dataset_id = await _dataset(db_session)
+    proportional = await draw(db_session, dataset_id, 60, seed=9, stratify_by=["dialect"])
+    assert proportional.strata == {
+        "dialect=egyptian": 10, "dialect=gulf": 10, "dialect=levantine": 10, "dialect=msa": 30,
+    }
+    equal = await draw(db_session, dataset_id, 60, seed=9, stratify_by=["dialect"], allocation="equal")
+    assert set(equal.strata.values()) == {15}
+
+    rows = await db_session.execute(
+        select(BenchmarkPrompt.dialect, BenchmarkPrompt.category).where(BenchmarkPrompt.id.in_(equal.prompt_ids))
+    )
+    by_dialect = Counter(d for d, _ in rows)
+    assert by_dialect == {"msa": 15, "gulf": 15, "egyptian": 15, "levantine": 15}
+
+
+@pytest.mark.asyncio
+async def test_sample_wraps_past_the_end(db_session):
+    dataset_id = await _dataset(db_session, size=40)
+    seed = next(s for s in range(10_000) if seed_offset(s) > 0.97)   # few keys above the start
+    sample = await draw(db_session, dataset_id, 30, seed=seed)
+    assert len(set(sample.prompt_ids)) == 30
+
+
+@pytest.mark.asyncio
+async def test_run_records_seed_and_reproduces_prompts(client: AsyncClient, pipeline_db, mock_llm):
+    await _dataset(pipeline_db)
+    body = {"dataset_slug": "sample-me", "model_ids": ["gpt-4o"], "sample_size": 40, "stratify_by": ["category"]}
+    run = (await client.post("/api/v1/benchmarks/runs", json=body)).json()
+    await benchmark_runner.join(uuid.UUID(run["id"]))
+    assert isinstance(run["seed"], int)
+    assert run["sampling"] == {"stratify_by": ["category"], "allocation": "proportional"}
+
+    prompts = (await client.get(f"/api/v1/benchmarks/runs/{run['id']}/prompts")).json()
+    assert prompts["size"] == 40 and prompts["strata"] == {"category=reasoning": 20, "category=translation": 20}
+
+    rerun = (await client.post("/api/v1/benchmarks/runs", json={**body, "seed": run["seed"]})).json()
+    await benchmark_runner.join(uuid.UUID(rerun["id"]))
+    rerun_prompts = (await client.get(f"/api/v1/benchmarks/runs/{rerun['id']}/prompts")).json()
+    assert rerun_prompts["prompt_ids"] == prompts["prompt_ids"]
+
+    preview = (await client.get(
+        "/api/v1/benchmarks/sample-me/sample",
+        params={"size": 40, "seed": run["seed"], "stratify_by": "category"},
+    )).json()
+    assert preview["prompt_ids"] == prompts["prompt_ids"]
@@ -0,0 +1,146 @@
+"""Tests for Arabic full-text search over prompts and responses."""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.evaluation import Evaluation
+from app.services.search import (
+    KIND_PROMPT,
+    KIND_RESPONSE,
+    Query,
+    SearchIndex,
+    highlight,
+    search_index,
+    stem,
+    terms,
+)
+
+
+@pytest.fixture(autouse=True)
+def _memory_backend(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "memory")
+    search_index.clear()
+    yield
+    search_index.clear()
+
+
+def test_terms_fold_spelling_and_strip_affixes():
+    assert terms("والمدرسةُ العربيّة") == terms("المدرسه العربيه") == ["مدرس", "عرب"]
+    assert stem("بالكتاب") == "كتاب" and stem("كتابها") == "كتاب"
+    assert stem("ولد") == "ولد"                                       # too short to lose و
+    assert terms("ذهب الطالب إلى المدرسة في الصباح") == ["ذهب", "طالب", "مدرس", "صباح"]   # stopwords dropped
+
+
+def test_query_parse():
+    query = Query.parse('المدرسة "العربية" -القديمة or طلاب')
+    assert query.include == ["مدرس", "عرب", "طلاب"] and query.exclude == ["قديم"]
+
+
+def test_highlight_marks_variants_and_escapes():
+    text = "<b>تنبيه</b> " + "كلام " * 40 + "زرنا المدرسةَ الكبيرة ثم المدرسه الصغيرة"
+    (snippet,) = highlight(text, terms("مدرسة"))
+    assert "<mark>المدرسةَ</mark>" in snippet and "<mark>المدرسه</mark>" in snippet
+    assert snippet.startswith("…") and "<b>" not in snippet
+    assert highlight(text, terms("تنبيه"))[0].startswith("&lt;b&gt;<mark>تنبيه</mark>")
+    assert highlight(text, terms("جامعة")) == []
+
+
+class TestIndex:
+    def _index(self):
+        index = SearchIndex()
+        ids = [uuid.uuid4() for _ in range(4)]
+        index.add_many([
+            (KIND_PROMPT, ids[0], "msa", "ما هي فوائد القراءة اليومية للأطفال؟", None),
+            (KIND_RESPONSE, ids[0], "msa", "القراءة تنمي الخيال. القراءة اليومية مفيدة جدا.", "gpt-4o"),
+            (KIND_RESPONSE, ids[0], "msa", "للقراءة فوائد كثيرة", "jais-30b"),
+            (KIND_PROMPT, ids[1], "gulf", "شو فوائد الرياضة؟", None),
+        ])
+        return index, ids
+
+    def test_all_words_must_match_ranked_by_bm25(self):
+        index, ids = self._index()
+        hits = index.search(Query.parse("القراءة"))
+        assert [(h.kind, h.model_id) for h in hits] == [
+            (KIND_RESPONSE, "gpt-4o"), (KIND_RESPONSE, "jais-30b"), (KIND_PROMPT, None),
+        ]
+        assert hits[0].score > hits[1].score > 0
+        assert {h.model_id for h in index.search(Query.parse("القراءة اليومية"))} == {"gpt-4o", None}
+        assert [h.model_id for h in index.search(Query.parse("القراءة -الخيال"))] == ["jais-30b", None]
+        assert index.search(Query.parse("القراءة الرياضة")) == []
+
+    def test_filters(self):
+        index, ids = self._index()
+        assert [h.evaluation_id for h in index.search(Query.parse("فوائد"), dialect="gulf")] == [ids[1]]
+        assert [h.model_id for h in index.search(Query.parse("فوائد"), model_id="jais-30b")] == ["jais-30b"]
+        assert [h.kind for h in index.search(Query.parse("فوائد"), kinds=[KIND_PROMPT])] == [KIND_PROMPT] * 2
+        assert index.search(Query.parse("فوائد"), dialect="iraqi") == []
+        assert len(index.search(Query.parse("فوائد"), limit=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(client: AsyncClient, pipeline_db, mock_llm):
+    response = await client.post("/api/v1/evaluations/run", json={
+        "prompt": "ما هي فوائد القراءة اليومية للأطفال في المدرسة؟",
+        "dialect": "gulf",
+        "models": ["gpt-4o", "jais-30b"],
+    })
+    evaluation_id = response.json()["id"]
+    evaluation = (await client.get(f"/api/v1/evaluations/{evaluation_id}")).json()
+    word = max(evaluation["model_responses"][0]["response_text"].split(), key=len)
+
+    found = (await client.get("/api/v1/search", params={"q": "القراءه المدرسة", "dialect": "gulf"})).json()
+    assert found["backend"] == "memory" and found["has_more"] is False
+    (hit,) = found["items"]
+    assert (hit["kind"], hit["evaluation_id"], hit["status"]) == (KIND_PROMPT, evaluation_id, "completed")
+    assert "<mark>القراءة</mark>" in hit["highlights"][0] and "<mark>المدرسة</mark>" in hit["highlights"][0]
+
+    responses = (await client.get("/api/v1/search", params={"q": word, "scope": "response"})).json()["items"]
+    assert responses and all(h["kind"] == KIND_RESPONSE and h["evaluation_id"] == evaluation_id for h in responses)
+    assert all("<mark>" in h["highlights"][0] for h in responses)
+
+    assert (await client.get("/api/v1/search", params={"q": "القراءة", "status": "failed"})).json()["items"] == []
+    assert (await client.get("/api/v1/search", params={"q": "القراءة", "dialect": "msa"})).json()["items"] == []
+    assert (await client.get("/api/v1/search", params={"q": "القراءة", "dialect": "klingon"})).status_code == 422
+
+    await pipeline_db.execute(delete(Evaluation))
+    await pipeline_db.commit()
+    assert (await client.get("/api/v1/search", params={"q": "القراءة"})).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_pages(client: AsyncClient, db_session):
+    evaluations = [
+        Evaluation(prompt=f"سؤال عن الفلك رقم {i}", dialect="msa", category="general", status="completed")
+        for i in range(5)
+    ]
+    db_session.add_all(evaluations)
+    await db_session.commit()
+    search_index.add_many([(KIND_PROMPT, e.id, e.dialect, e.prompt, None) for e in evaluations])
+
+    first = (await client.get("/api/v1/search", params={"q": "الفلك", "page_size": 3})).json()
+    second = (await client.get("/api/v1/search", params={"q": "الفلك", "page_size": 3, "page": 2})).json()
+    assert (len(first["items"]), first["has_more"], len(second["items"]), second["has_more"]) == (3, True, 2, False)
+    ids = {h["evaluation_id"] for h in first["items"] + second["items"]}
+    assert ids == {str(e.id) for e in evaluations}
+
+
+@pytest.mark.asyncio
+async def test_postgres_query_uses_gin_indexed_vectors():
+    from app.api.search import _postgres_hits
+
+    class Capture:
+        async def execute(self, statement):
+            self.sql = str(statement.compile(dialect=postgresql.dialect()))
+            return []
+
+    db = Capture()
+    await _postgres_hits(db, "القراءة", Query.parse("القراءة"), [KIND_PROMPT, KIND_RESPONSE], "msa", None, None, 0, 21)
+    assert "evaluations.search_vector @@ websearch_to_tsquery('arabic_eval'::regconfig, arabic_fold(" in db.sql
+    assert "response_blobs.search_vector @@" in db.sql and "UNION ALL" in db.sql
+    assert "JOIN response_blobs ON response_blobs.digest = model_responses.response_digest" in db.sql
+    assert "LIKE" not in db.sql.upper()
@@ -0,0 +1,126 @@
+"""Tests for span tracing and the per-evaluation timeline API."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.tracing import (
+    EVALUATION_ID, STATUS_ERROR, InMemoryExporter, SpanContext, Tracer,
+    parse_traceparent,
+)
+
+
+class TestTraceparent:
+    def test_round_trip(self):
+        ctx = SpanContext(trace_id="4bf92f3577b34da6a3ce929d0e0e4736", span_id="00f067aa0ba902b7")
+        assert parse_traceparent(ctx.traceparent()) == ctx
+
+    @pytest.mark.parametrize("header", [
+        None, "", "garbage",
+        "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+        "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01",
+    ])
+    def test_invalid_headers_are_ignored(self, header):
+        assert parse_traceparent(header) is None
+
+
+class TestTracer:
+    @pytest.mark.asyncio
+    async def test_nested_and_concurrent_children_share_trace(self):
+        exporter = InMemoryExporter()
+        t = Tracer(exporter=exporter)
+
+        async def child(i):
+            with t.span("child", {"i": i}):
+                await asyncio.sleep(0)
+
+        with t.span("root") as root:
+            await asyncio.gather(child(1), child(2))
+        children = exporter.by_name("child")
+        assert len(children) == 2
+        assert all(c.parent_id == root.context.span_id for c in children)
+        assert all(c.context.trace_id == root.context.trace_id for c in children)
+        assert root.parent_id is None and root.status == "ok"
+
+    def test_exception_marks_span_errored(self):
+        exporter = InMemoryExporter()
+        t = Tracer(exporter=exporter)
+        with pytest.raises(ValueError):
+            with t.span("boom"):
+                raise ValueError("bad")
+        assert exporter.spans[0].status == STATUS_ERROR
+        assert exporter.spans[0].status_message == "bad"
+
+    def test_disabled_tracer_records_nothing(self):
+        exporter = InMemoryExporter()
+        t = Tracer(exporter=exporter, enabled=False)
+        with t.span("x") as span:
+            span.set_attribute("k", "v")
+        assert exporter.spans == []
+
+    def test_timeline_store_evicts_oldest_trace(self):
+        t = Tracer(timeline_capacity=2)
+        for i in range(3):
+            with t.span("root", {EVALUATION_ID: f"e{i}"}):
+                pass
+        assert t.timelines.get("e0") is None
+        assert t.timelines.get("e2")[0].name == "root"
+
+    def test_timeline_store_caps_spans_per_trace(self):
+        t = Tracer(timeline_capacity=2, timeline_max_spans=3)
+        with t.span("root", {EVALUATION_ID: "busy"}):
+            for _ in range(5):
+                with t.span("child"):
+                    pass
+        assert len(t.timelines.get("busy")) == 3 and t.timelines.dropped("busy") == 3
+
+        # A full trace stops refreshing its LRU slot, so it is still evicted
+        for i in range(2):
+            with t.span("root", {EVALUATION_ID: f"e{i}"}):
+                pass
+        assert t.timelines.get("busy") is None and t.timelines.dropped("busy") == 0
+        assert [s.name for s in t.timelines.get("e0")] == ["root"] and t.timelines.get("e1") is not None
+
+        # The evicted trace's evaluation is forgotten, not left pointing at a reused slot
+        with t.span("root", {EVALUATION_ID: "e2"}):
+            pass
+        assert t.timelines.get("busy") is None and t.timelines.get("e0") is None
+        assert t.timelines.get("e2") is not None
+
+
+@pytest.mark.asyncio
+async def test_evaluation_timeline(client: AsyncClient, pipeline_db, mock_llm):
+    parent = SpanContext(trace_id="4bf92f3577b34da6a3ce929d0e0e4736", span_id="00f067aa0ba902b7")
+    response = await client.post(
+        "/api/v1/evaluations/run",
+        json={
+            "prompt": "اشرح الفرق بين التعلم الآلي والذكاء الاصطناعي",
+            "dialect": "msa",
+            "category": "reasoning",
+            "models": ["gpt-4o", "claude-3-5-sonnet"],
+        },
+        headers={"traceparent": parent.traceparent()},
+    )
+    assert response.status_code == 202
+    eval_id = response.json()["id"]
+
+    timeline = (await client.get(f"/api/v1/evaluations/{eval_id}/timeline")).json()
+    assert timeline["trace_id"] == parent.trace_id
+    names = [s["name"] for s in timeline["spans"]]
+    assert names[0] == "evaluation.create"
+    for expected in ("evaluation.pipeline", "db.commit", "analyzer.analyze"):
+        assert expected in names
+    assert names.count("model.call") == 2
+    assert names.count("judge.attempt") == 2
+    by_id = {s["span_id"]: s for s in timeline["spans"]}
+    pipeline = next(s for s in timeline["spans"] if s["name"] == "evaluation.pipeline")
+    assert by_id[pipeline["parent_id"]]["name"] == "evaluation.create"
+    assert all(s["offset_ms"] >= 0 for s in timeline["spans"])
+
+
+@pytest.mark.asyncio
+async def test_timeline_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/evaluations/00000000-0000-0000-0000-000000000000/timeline")
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "TIMELINE_NOT_FOUND"
@@ -4,7 +4,7 @@
 
 import {
   Evaluation, EvaluationRequest, PaginatedEvaluations,
-  ModelInfo, EvaluationListItem
+  ModelInfo, EvaluationListItem, SearchResults, SearchScope
 } from "@/types";
 import { API_BASE_URL } from "./constants";
 
@@ -67,6 +67,27 @@ export const evaluationsApi = {
     request<Evaluation>(`/api/v1/evaluations/${id}`),
 };
 
+// ── Search ────────────────────────────────────────────────
+
+export const searchApi = {
+  search: (params: {
+    q: string;
+    scope?: SearchScope;
+    dialect?: string;
+    status?: string;
+    page?: number;
+    page_size?: number;
+  }): Promise<SearchResults> => {
+    const qs = new URLSearchParams({ q: params.q });
+    if (params.scope)      qs.set("scope",     params.scope);
+    if (params.dialect)    qs.set("dialect",   params.dialect);
+    if (params.status)     qs.set("status",    params.status);
+    if (params.page)       qs.set("page",      String(params.page));
+    if (params.page_size)  qs.set("page_size", String(params.page_size));
+    return request<SearchResults>(`/api/v1/search?${qs}`);
+  },
+};
+
 // ── Models ────────────────────────────────────────────────
 
 export const modelsApi = {
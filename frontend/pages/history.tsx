@@ -4,8 +4,8 @@ import Link from "next/link";
 import { Layout } from "@/components/Layout";
 import { Card } from "@/components/ui/Card";
 import { Badge } from "@/components/ui/Badge";
-import { evaluationsApi } from "@/lib/api";
-import { PaginatedEvaluations } from "@/types";
+import { evaluationsApi, searchApi } from "@/lib/api";
+import { PaginatedEvaluations, SearchResults, SearchScope } from "@/types";
 
 function StatusBadge({ status }: { status: string }) {
   const v = status === "completed" ? "green" : status === "failed" ? "red" : status === "running" ? "gold" : "default";
@@ -17,6 +17,11 @@ export default function HistoryPage() {
   const [page, setPage] = useState(1);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [input, setInput] = useState("");
+  const [query, setQuery] = useState("");
+  const [scope, setScope] = useState<SearchScope>("all");
+  const [results, setResults] = useState<SearchResults | null>(null);
+  const [searchPage, setSearchPage] = useState(1);
 
   useEffect(() => {
     setLoading(true);
@@ -26,6 +31,25 @@ export default function HistoryPage() {
       .finally(() => setLoading(false));
   }, [page]);
 
+  useEffect(() => {
+    if (!query) {
+      setResults(null);
+      return;
+    }
+    setLoading(true);
+    searchApi.search({ q: query, scope, page: searchPage, page_size: 20 })
+      .then(setResults)
+      .catch((e) => setError(e.message))
+      .finally(() => setLoading(false));
+  }, [query, scope, searchPage]);
+
+  const submitSearch = (e: React.FormEvent) => {
+    e.preventDefault();
+    setError(null);
+    setSearchPage(1);
+    setQuery(input.trim());
+  };
+
   return (
     <>
       <Head><title>History — LLM-Eval-Arabic</title></Head>
@@ -38,6 +62,39 @@ export default function HistoryPage() {
             </h1>
           </div>
 
+          {/* Search */}
+          <form onSubmit={submitSearch} className="flex gap-2 mb-6">
+            <input
+              value={input}
+              onChange={(e) => setInput(e.target.value)}
+              placeholder="ابحث في الأسئلة والإجابات…"
+              dir="rtl"
+              className="flex-1 bg-transparent border border-white/10 focus:border-amber-500/40 outline-none px-3 py-2 text-[13px] text-white/80"
+              style={{ fontFamily: "'Scheherazade New', serif" }}
+            />
+            <select
+              value={scope}
+              onChange={(e) => { setSearchPage(1); setScope(e.target.value as SearchScope); }}
+              className="bg-transparent border border-white/10 px-2 text-[10px] font-mono text-white/50"
+            >
+              <option value="all">ALL</option>
+              <option value="prompt">PROMPTS</option>
+              <option value="response">RESPONSES</option>
+            </select>
+            <button type="submit" className="border border-amber-500/40 bg-amber-500/10 text-amber-400 px-4 text-[10px] font-mono">
+              SEARCH
+            </button>
+            {query && (
+              <button
+                type="button"
+                onClick={() => { setInput(""); setQuery(""); }}
+                className="border border-white/10 text-white/30 px-3 text-[10px] font-mono"
+              >
+                CLEAR
+              </button>
+            )}
+          </form>
+
           {loading && (
             <div className="flex justify-center py-20">
               <div className="w-8 h-8 border-2 border-amber-500/20 border-t-amber-500 rounded-full animate-spin" />
@@ -50,7 +107,69 @@ export default function HistoryPage() {
             </div>
           )}
 
-          {data && !loading && (
+          {results && !loading && (
+            <>
+              <div className="text-[9px] text-white/25 mb-4 font-mono">
+                results for “{results.query}” — page {results.page}
+              </div>
+              <div className="flex flex-col gap-2">
+                {results.items.length === 0 && (
+                  <div className="text-center py-20 text-white/20 text-sm">No prompts or responses match.</div>
+                )}
+                {results.items.map((hit) => (
+                  <Link key={`${hit.evaluation_id}-${hit.kind}-${hit.model_id ?? ""}`} href={`/evaluation/${hit.evaluation_id}`}>
+                    <Card className="p-4 hover:border-amber-500/20 cursor-pointer">
+                      <div className="flex items-start gap-4">
+                        <StatusBadge status={hit.status} />
+                        <div className="flex-1 min-w-0">
+                          {/* Snippets are HTML-escaped by the API; only <mark> is markup */}
+                          {hit.highlights.map((snippet, i) => (
+                            <div key={i} className="text-[12px] text-white/70 [&_mark]:bg-amber-500/30 [&_mark]:text-amber-200" dir="rtl"
+                              style={{ fontFamily: "'Scheherazade New', serif", fontSize: 13 }}
+                              dangerouslySetInnerHTML={{ __html: snippet }} />
+                          ))}
+                          <div className="flex gap-3 mt-1">
+                            <span className="text-[9px] text-amber-500/50 font-mono">
+                              {hit.kind === "prompt" ? "PROMPT" : hit.model_id}
+                            </span>
+                            <span className="text-[9px] text-white/30">{hit.dialect.toUpperCase()}</span>
+                            <span className="text-[9px] text-white/20">{hit.category}</span>
+                            {hit.kind === "response" && (
+                              <span className="text-[9px] text-white/20 truncate" dir="rtl">{hit.prompt}</span>
+                            )}
+                          </div>
+                        </div>
+                        <div className="text-[9px] text-white/20 shrink-0">
+                          {new Date(hit.created_at).toLocaleDateString()}
+                        </div>
+                      </div>
+                    </Card>
+                  </Link>
+                ))}
+              </div>
+
+              {(searchPage > 1 || results.has_more) && (
+                <div className="flex justify-center gap-2 mt-6">
+                  <button
+                    disabled={searchPage === 1}
+                    onClick={() => setSearchPage(searchPage - 1)}
+                    className="px-3 h-8 text-[10px] font-mono border border-white/10 text-white/30 hover:border-white/20 disabled:opacity-30"
+                  >
+                    ‹ PREV
+                  </button>
+                  <button
+                    disabled={!results.has_more}
+                    onClick={() => setSearchPage(searchPage + 1)}
+                    className="px-3 h-8 text-[10px] font-mono border border-white/10 text-white/30 hover:border-white/20 disabled:opacity-30"
+                  >
+                    NEXT ›
+                  </button>
+                </div>
+              )}
+            </>
+          )}
+
+          {data && !results && !query && !loading && (
             <>
               <div className="text-[9px] text-white/25 mb-4 font-mono">{data.total} evaluations total</div>
               <div className="flex flex-col gap-2">
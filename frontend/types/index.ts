@@ -37,7 +37,11 @@ export interface ModelResponse {
   response_text: string | null;
   latency_ms: number | null;
   token_count: number | null;
+  input_tokens?: number | null;
+  usage_source?: "provider" | "tokenizer" | "estimate" | null;
+  tokens_per_second?: number | null;
   cost_usd: number | null;
+  cost_per_score_point?: number | null;
   error: string | null;
   scores: ScoreBreakdown;
   arabic_metrics: ArabicMetrics | null;
@@ -75,6 +79,30 @@ export interface PaginatedEvaluations {
   pages: number;
 }
 
+export type SearchScope = "all" | "prompt" | "response";
+
+export interface SearchHit {
+  evaluation_id: string;
+  kind: "prompt" | "response";
+  model_id: string | null;
+  score: number;
+  highlights: string[];   // HTML-escaped snippets, matches wrapped in <mark>
+  prompt: string;
+  dialect: Dialect;
+  category: EvalCategory;
+  status: EvalStatus;
+  created_at: string;
+}
+
+export interface SearchResults {
+  query: string;
+  backend: "postgres" | "memory";
+  page: number;
+  page_size: number;
+  has_more: boolean;
+  items: SearchHit[];
+}
+
 export interface ModelInfo {
   id: string;
   name: string;
@@ -110,6 +138,8 @@ export interface WsEvent {
   token?: string;
   latency_ms?: number;
   token_count?: number;
+  input_tokens?: number;
+  cost_usd?: number;
   evaluation_id?: string;
   models?: string[];
   error?: string;